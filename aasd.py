@@ -10,7 +10,12 @@
 import sys
 import os
 
-from server.daemon import AASd
+# installed before the daemon imports to time them with '--profile-startup'
+from libs.tools.startup import StartupCategory, StartupProfiler
+
+StartupProfiler.install()
+with StartupProfiler.span(StartupCategory.PHASE, "imports"):
+    from server.daemon import AASd
 
 if __name__ == "__main__":
     # change current directory to main script location
@@ -0,0 +1,183 @@
+# -*- coding: UTF-8 -*-
+"""
+Benchmark runner.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-11
+
+Purpose: Run the benchmark suite and compare results between commits.
+
+Usage:
+    python -m benchmarks [--quick] [--only NAME,...] [--output FILE]
+                         [--compare BASELINE] [--threshold 0.1]
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+
+from importlib import import_module
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, List, Optional
+
+# benchmark modules in run order, each exposes `SCENARIOS` and `run()`
+BENCHMARKS: List[str] = [
+    "message",
+    "channels",
+    "routing",
+    "config",
+    "loader",
+    "dispatcher",
+]
+
+# metric name suffixes where a larger value is better
+HIGHER_IS_BETTER: List[str] = ["_per_s", "speedup"]
+
+# metric name fragments of timings where a smaller value is better
+LOWER_IS_BETTER: List[str] = ["_ms", "_us"]
+
+
+def compare(
+    results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], threshold: float
+) -> List[Dict[str, Any]]:
+    """Compare timing metrics with a baseline run.
+
+    ### Arguments:
+    * results: List[Dict[str, Any]] - Current benchmark results.
+    * baseline: List[Dict[str, Any]] - Results of the baseline run.
+    * threshold: float - Relative slowdown reported as a regression.
+
+    ### Returns:
+    List[Dict[str, Any]] - One entry per metric present in both runs, with
+    `change` as the relative slowdown (negative when faster).
+    """
+    old: Dict[str, Dict[str, Any]] = {item["benchmark"]: item for item in baseline}
+    out: List[Dict[str, Any]] = []
+    for item in results:
+        reference: Optional[Dict[str, Any]] = old.get(item["benchmark"])
+        if reference is None:
+            continue
+        for key, value in item.items():
+            before: Any = reference.get(key)
+            if not isinstance(value, (int, float)) or not before:
+                continue
+            if any(key.endswith(suffix) for suffix in HIGHER_IS_BETTER):
+                change: float = before / value - 1 if value else float("inf")
+            elif any(fragment in key for fragment in LOWER_IS_BETTER):
+                change = value / before - 1
+            else:
+                continue
+            out.append(
+                {
+                    "benchmark": item["benchmark"],
+                    "metric": key,
+                    "baseline": before,
+                    "current": value,
+                    "change": round(change, 3),
+                    "regression": change > threshold,
+                }
+            )
+    return out
+
+
+def git_commit() -> Optional[str]:
+    """Return the current commit hash, or `None` outside a git tree.
+
+    ### Returns:
+    Optional[str] - Commit hash with a `-dirty` suffix for modified trees.
+    """
+    root: Path = Path(__file__).resolve().parent.parent
+    try:
+        commit: str = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=root,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+        dirty: str = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=root,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}-dirty" if dirty else commit
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the selected benchmarks and print a JSON document.
+
+    ### Arguments:
+    * argv: Optional[List[str]] - Command line arguments.
+
+    ### Returns:
+    int - Exit code, `1` when a comparison found regressions.
+    """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--quick", action="store_true", help="run the small scenarios")
+    parser.add_argument(
+        "--only", default="", help=f"comma separated subset of: {','.join(BENCHMARKS)}"
+    )
+    parser.add_argument("--output", help="write the JSON document to this file")
+    parser.add_argument("--compare", help="JSON document of a baseline run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slowdown reported as a regression (default: 0.1)",
+    )
+    args = parser.parse_args(argv)
+
+    names: List[str] = [item for item in args.only.split(",") if item] or BENCHMARKS
+    unknown: List[str] = [item for item in names if item not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+    profile: str = "quick" if args.quick else "full"
+
+    results: List[Dict[str, Any]] = []
+    for name in names:
+        module: ModuleType = import_module(f"benchmarks.bench_{name}")
+        print(f"running {name} ({profile})...", file=sys.stderr)
+        results.append(module.run(**module.SCENARIOS[profile]))
+
+    document: Dict[str, Any] = {
+        "meta": {
+            "commit": git_commit(),
+            "created": int(time.time()),
+            "machine": platform.machine(),
+            "profile": profile,
+            "python": platform.python_version(),
+        },
+        "results": results,
+    }
+    regressions: int = 0
+    if args.compare:
+        baseline: Dict[str, Any] = json.loads(
+            Path(args.compare).read_text(encoding="utf-8")
+        )
+        document["baseline"] = baseline.get("meta")
+        document["comparison"] = compare(
+            results, baseline.get("results", []), args.threshold
+        )
+        regressions = len(
+            [item for item in document["comparison"] if item["regression"]]
+        )
+
+    text: str = json.dumps(document, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# #[EOF]#######################################################################
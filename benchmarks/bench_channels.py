@@ -0,0 +1,86 @@
+# -*- coding: UTF-8 -*-
+"""
+Channel scheduler benchmark.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-11
+
+Purpose: Measure `AtChannel` and `Channel` polling with many channels.
+"""
+
+import json
+import random
+import time
+
+from typing import Any, Dict, List
+
+from libs.com.message import AtChannel, Channel
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "quick": {"channels": 20, "polls": 500},
+    "full": {"channels": 200, "polls": 5000},
+}
+
+
+def build_definitions(channels: int, seed: int = 13) -> Dict[str, List[str]]:
+    """Return cron-like and interval definitions for `channels` channels.
+
+    ### Arguments:
+    * channels: int - Number of channels of each kind.
+    * seed: int - Random seed for reproducible definitions.
+
+    ### Returns:
+    Dict[str, List[str]] - `at` and `interval` definition lists.
+    """
+    rnd = random.Random(seed)
+    at: List[str] = []
+    interval: List[str] = []
+    for idx in range(1, channels + 1):
+        minutes: str = "|".join(str(rnd.randint(0, 59)) for _ in range(3))
+        at.append(f"{idx}:{minutes};8-18;*;*;1-5")
+        interval.append(f"{idx}:{rnd.randint(1, 600)}m")
+    return {"at": at, "interval": interval}
+
+
+def run(channels: int = 200, polls: int = 5000) -> Dict[str, Any]:
+    """Build both schedulers and poll their due channels.
+
+    ### Arguments:
+    * channels: int - Number of channels of each kind.
+    * polls: int - Number of `check`/`get` polls per scheduler.
+
+    ### Returns:
+    Dict[str, Any] - Benchmark results.
+    """
+    definitions: Dict[str, List[str]] = build_definitions(channels)
+    start: float = time.perf_counter()
+    at_channel = AtChannel(definitions["at"])
+    interval_channel = Channel(definitions["interval"])
+    build_time: float = time.perf_counter() - start
+
+    results: Dict[str, Any] = {
+        "benchmark": "channels",
+        "channels": channels,
+        "polls": polls,
+        "build_ms": round(build_time * 1000, 3),
+    }
+    for name, scheduler in (("at", at_channel), ("interval", interval_channel)):
+        start = time.perf_counter()
+        for _ in range(polls):
+            scheduler.check
+        results[f"{name}_check_us"] = round(
+            (time.perf_counter() - start) / polls * 1e6, 3
+        )
+        start = time.perf_counter()
+        for _ in range(polls):
+            scheduler.get
+        results[f"{name}_get_us"] = round(
+            (time.perf_counter() - start) / polls * 1e6, 3
+        )
+    return results
+
+
+if __name__ == "__main__":
+    print(json.dumps(run()))
+
+# #[EOF]#######################################################################
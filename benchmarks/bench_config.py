@@ -0,0 +1,76 @@
+# -*- coding: UTF-8 -*-
+"""
+Plugin config parsing benchmark.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-11
+
+Purpose: Measure loading a large config file and parsing its plugin sections.
+"""
+
+import json
+import tempfile
+import time
+
+from pathlib import Path
+from typing import Any, Dict
+
+from jsktoolbox.configtool import Config as ConfigTool
+
+from benchmarks.fixtures import build_schema, write_config
+from libs.plugins import PluginConfigParser
+from libs.templates import PluginConfigSchema
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "quick": {"sections": 10, "fields": 20},
+    "full": {"sections": 100, "fields": 40},
+}
+
+
+def run(sections: int = 100, fields: int = 40) -> Dict[str, Any]:
+    """Load a generated config and parse every plugin section.
+
+    ### Arguments:
+    * sections: int - Number of plugin sections.
+    * fields: int - Number of fields per section.
+
+    ### Returns:
+    Dict[str, Any] - Benchmark results.
+    """
+    schema: PluginConfigSchema = build_schema(fields)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "aasd.conf"
+        write_config(path, sections, fields)
+        size: int = path.stat().st_size
+
+        start: float = time.perf_counter()
+        cfg = ConfigTool(str(path), "AASd")
+        cfg.load()
+        load_time: float = time.perf_counter() - start
+
+        names = [f"plugin_{idx:03d}" for idx in range(sections)]
+        start = time.perf_counter()
+        for name in names:
+            PluginConfigParser.parse(cfg, name, schema)
+        parse_time: float = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for name in names:
+            PluginConfigParser.snapshot(cfg, name, schema)
+        snapshot_time: float = time.perf_counter() - start
+
+    return {
+        "benchmark": "config",
+        "sections": sections,
+        "fields": fields,
+        "file_bytes": size,
+        "load_ms": round(load_time * 1000, 3),
+        "parse_ms_per_section": round(parse_time / sections * 1000, 3),
+        "snapshot_ms_per_section": round(snapshot_time / sections * 1000, 3),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run()))
+
+# #[EOF]#######################################################################
@@ -0,0 +1,162 @@
+# -*- coding: UTF-8 -*-
+"""
+Dispatcher benchmark.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-11
+
+Purpose: Measure `ThDispatcher` throughput, delivery latency and per-lane
+wait times.
+"""
+
+import json
+import time
+
+from queue import Empty, Queue
+from threading import Event, Thread
+from typing import Any, Dict, List
+
+from jsktoolbox.logstool import LoggerQueue
+
+from benchmarks.fixtures import build_messages
+from libs.com.message import Message, Priority, ThDispatcher
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "quick": {"channels": 5, "messages": 2000, "rate": 500, "duration": 1.0},
+    "full": {"channels": 50, "messages": 50000, "rate": 2000, "duration": 5.0},
+}
+
+# every n-th burst message is sent on the critical lane to probe its latency
+CRITICAL_EVERY: int = 100
+
+
+def percentile(values: List[float], rank: float) -> float:
+    """Return the `rank` percentile of `values`.
+
+    ### Arguments:
+    * values: List[float] - Samples.
+    * rank: float - Percentile between 0 and 100.
+
+    ### Returns:
+    float - Nearest-rank percentile, `0.0` for no samples.
+    """
+    if not values:
+        return 0.0
+    ordered: List[float] = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * rank / 100))]
+
+
+def deliver(channels: int, batch: List[Message], rate: float = 0.0) -> Dict[str, Any]:
+    """Publish `batch` through a running dispatcher and collect deliveries.
+
+    ### Arguments:
+    * channels: int - Number of channels with one consumer each.
+    * batch: List[Message] - Messages to publish.
+    * rate: float - Messages per second, `0` publishes as fast as possible.
+
+    ### Returns:
+    Dict[str, Any] - Elapsed time, delivered count, latencies in ms and
+    the dispatcher lane metrics.
+    """
+    qlog = LoggerQueue()
+    qcom: Queue = Queue()
+    dispatcher = ThDispatcher(qlog=qlog, qcom=qcom, debug=False, verbose=False)
+    sent: Dict[int, float] = {}
+    latencies: List[float] = []
+    done = Event()
+
+    def consume(queue: Queue) -> None:
+        while not done.is_set():
+            try:
+                message: Message = queue.get(timeout=0.05)
+            except Empty:
+                continue
+            latencies.append(time.perf_counter() - sent[id(message)])
+            queue.task_done()
+
+    consumers: List[Thread] = [
+        Thread(target=consume, args=(dispatcher.register_queue(idx),), daemon=True)
+        for idx in range(1, channels + 1)
+    ]
+    for consumer in consumers:
+        consumer.start()
+    dispatcher.start()
+
+    start: float = time.perf_counter()
+    for idx, message in enumerate(batch):
+        if rate:
+            delay: float = start + idx / rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        sent[id(message)] = time.perf_counter()
+        qcom.put(message)
+    qcom.join()
+    deadline: float = time.perf_counter() + 5.0
+    while len(latencies) < len(batch) and time.perf_counter() < deadline:
+        time.sleep(0.001)
+    elapsed: float = time.perf_counter() - start
+
+    done.set()
+    dispatcher.stop()
+    dispatcher.join()
+    for consumer in consumers:
+        consumer.join()
+    return {
+        "elapsed": elapsed,
+        "delivered": len(latencies),
+        "latencies": [item * 1000 for item in latencies],
+        "lanes": dispatcher.lane_metrics,
+    }
+
+
+def run(
+    channels: int = 50,
+    messages: int = 50000,
+    rate: float = 2000,
+    duration: float = 5.0,
+) -> Dict[str, Any]:
+    """Measure burst throughput and latency under a fixed publish rate.
+
+    Every `CRITICAL_EVERY`-th burst message is critical, so the per-lane wait
+    times of the burst show whether critical traffic stays flat in a flood.
+
+    ### Arguments:
+    * channels: int - Number of channels with one consumer each.
+    * messages: int - Number of messages in the burst scenario.
+    * rate: float - Messages per second in the paced scenario.
+    * duration: float - Length of the paced scenario in seconds.
+
+    ### Returns:
+    Dict[str, Any] - Benchmark results.
+    """
+    flood: List[Message] = build_messages(messages, channels)
+    for message in flood[::CRITICAL_EVERY]:
+        message.priority = Priority.CRITICAL
+    burst: Dict[str, Any] = deliver(channels, flood)
+    paced: Dict[str, Any] = deliver(
+        channels, build_messages(int(rate * duration), channels), rate=rate
+    )
+    if burst["delivered"] != messages:
+        raise AssertionError(f"delivered {burst['delivered']} of {messages} messages")
+    result: Dict[str, Any] = {
+        "benchmark": "dispatcher",
+        "channels": channels,
+        "messages": messages,
+        "rate": rate,
+        "burst_messages_per_s": round(messages / burst["elapsed"], 1),
+        "burst_p99_ms": round(percentile(burst["latencies"], 99), 3),
+        "paced_delivered": paced["delivered"],
+        "paced_p50_ms": round(percentile(paced["latencies"], 50), 3),
+        "paced_p99_ms": round(percentile(paced["latencies"], 99), 3),
+    }
+    for lane, item in burst["lanes"].items():
+        result[f"burst_{lane}_dispatched"] = item["dispatched"]
+        result[f"burst_{lane}_wait_avg_ms"] = round(item["wait_avg"] * 1000, 3)
+        result[f"burst_{lane}_wait_max_ms"] = round(item["wait_max"] * 1000, 3)
+    return result
+
+
+if __name__ == "__main__":
+    print(json.dumps(run()))
+
+# #[EOF]#######################################################################
@@ -0,0 +1,64 @@
+# -*- coding: UTF-8 -*-
+"""
+Plugin discovery benchmark.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-11
+
+Purpose: Measure `PluginLoader.discover()` over generated plugin directories.
+"""
+
+import json
+import tempfile
+import time
+
+from pathlib import Path
+from typing import Any, Dict, List
+
+from benchmarks.fixtures import write_plugins
+from libs.plugins import PluginDefinition, PluginLoader
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "quick": {"plugins": 10, "fields": 10, "rounds": 2},
+    "full": {"plugins": 100, "fields": 30, "rounds": 3},
+}
+
+
+def run(plugins: int = 100, fields: int = 30, rounds: int = 3) -> Dict[str, Any]:
+    """Discover a generated plugins directory several times.
+
+    The first round compiles the plugin modules, later rounds reload them the
+    way a config reload does.
+
+    ### Arguments:
+    * plugins: int - Number of plugin instances.
+    * fields: int - Number of schema fields per plugin.
+    * rounds: int - Number of discovery rounds.
+
+    ### Returns:
+    Dict[str, Any] - Benchmark results.
+    """
+    times: List[float] = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        plugins_dir: Path = write_plugins(Path(tmp_dir), plugins, fields)
+        for _ in range(rounds):
+            start: float = time.perf_counter()
+            found: List[PluginDefinition] = PluginLoader.discover(plugins_dir)
+            times.append(time.perf_counter() - start)
+            if len(found) != plugins:
+                raise AssertionError(f"discovered {len(found)} of {plugins} plugins")
+    return {
+        "benchmark": "loader",
+        "plugins": plugins,
+        "fields": fields,
+        "rounds": rounds,
+        "first_ms": round(times[0] * 1000, 3),
+        "reload_ms": round(min(times[1:] or times) * 1000, 3),
+        "ms_per_plugin": round(min(times) / plugins * 1000, 3),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run()))
+
+# #[EOF]#######################################################################
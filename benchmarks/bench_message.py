@@ -0,0 +1,58 @@
+# -*- coding: UTF-8 -*-
+"""
+Message container benchmark.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-11
+
+Purpose: Measure building and reading `Message` objects.
+"""
+
+import json
+import time
+
+from typing import Any, Dict, List
+
+from benchmarks.fixtures import build_messages
+from libs.com.message import Message
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "quick": {"messages": 2000},
+    "full": {"messages": 50000},
+}
+
+
+def run(messages: int = 50000) -> Dict[str, Any]:
+    """Build messages and read back the fields the dispatcher touches.
+
+    ### Arguments:
+    * messages: int - Number of messages.
+
+    ### Returns:
+    Dict[str, Any] - Benchmark results.
+    """
+    start: float = time.perf_counter()
+    Message()
+    batch: List[Message] = build_messages(messages, channels=10)
+    build_time: float = time.perf_counter() - start
+
+    start = time.perf_counter()
+    total: int = 0
+    for item in batch:
+        if item.correlation_id is None and item.in_reply_to is None:
+            total += item.channel + item.priority + len(item.messages)  # type: ignore
+    read_time: float = time.perf_counter() - start
+    if not total:
+        raise AssertionError("no message fields were read")
+    return {
+        "benchmark": "message",
+        "messages": messages,
+        "build_us_per_message": round(build_time / messages * 1e6, 3),
+        "read_us_per_message": round(read_time / messages * 1e6, 3),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run()))
+
+# #[EOF]#######################################################################
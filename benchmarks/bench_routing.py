@@ -0,0 +1,123 @@
+# -*- coding: UTF-8 -*-
+"""
+Routing table benchmark.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Measure routing lookups against a generated table of 1,000 rules.
+"""
+
+import json
+import random
+import time
+
+from typing import Any, Dict, List
+
+from libs.com.message import Message, Priority
+from libs.com.routing import RoutingTable
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "quick": {"rules": 100, "messages": 1000},
+    "full": {"rules": 1000, "messages": 10000},
+}
+
+
+def build_rules(count: int = 1000, seed: int = 7) -> List[str]:
+    """Generate routing rules spread over channels and plugin instances.
+
+    ### Arguments:
+    * count: int - Number of rules.
+    * seed: int - Random seed for reproducible tables.
+
+    ### Returns:
+    List[str] - Rule definitions.
+    """
+    rnd = random.Random(seed)
+    out: List[str] = []
+    for idx in range(count):
+        parts: List[str] = [f"channel={rnd.randint(1, 100)}"]
+        if rnd.random() < 0.8:
+            parts.append(f"origin=worker{rnd.randint(1, 50)}")
+        if rnd.random() < 0.3:
+            parts.append("priority=critical|high")
+        if rnd.random() < 0.3:
+            parts.append(f"subject=^alert {idx % 10}")
+        out.append(f"{';'.join(parts)} -> {rnd.randint(101, 120)}")
+    return out
+
+
+def build_messages(count: int = 10000, seed: int = 11) -> List[Message]:
+    """Generate messages matching the shape of `build_rules()`.
+
+    ### Arguments:
+    * count: int - Number of messages.
+    * seed: int - Random seed for reproducible input.
+
+    ### Returns:
+    List[Message] - Messages to route.
+    """
+    rnd = random.Random(seed)
+    out: List[Message] = []
+    for _ in range(count):
+        message = Message()
+        message.channel = rnd.randint(1, 100)
+        message.origin = f"worker{rnd.randint(1, 50)}"
+        message.priority = rnd.choice([Priority.CRITICAL, Priority.NORMAL])
+        message.subject = f"alert {rnd.randint(0, 9)}"
+        out.append(message)
+    return out
+
+
+def run(rules: int = 1000, messages: int = 10000) -> Dict[str, Any]:
+    """Compare indexed lookups with a linear scan of the same rules.
+
+    ### Arguments:
+    * rules: int - Number of generated rules.
+    * messages: int - Number of routed messages.
+
+    ### Returns:
+    Dict[str, Any] - Benchmark results.
+    """
+    definitions: List[str] = build_rules(rules)
+    start: float = time.perf_counter()
+    table = RoutingTable(definitions)
+    compile_time: float = time.perf_counter() - start
+    batch: List[Message] = build_messages(messages)
+
+    start = time.perf_counter()
+    indexed: List[Any] = [table.route(item) for item in batch]
+    indexed_time: float = time.perf_counter() - start
+
+    start = time.perf_counter()
+    linear: List[Any] = []
+    for item in batch:
+        targets = None
+        for rule in table.rules:
+            if (
+                (not rule.channels or item.channel in rule.channels)
+                and (not rule.origins or item.origin in rule.origins)
+                and rule.matches(item)
+            ):
+                targets = list(rule.targets)
+                break
+        linear.append(targets)
+    linear_time: float = time.perf_counter() - start
+
+    if indexed != linear:
+        raise AssertionError("indexed routing differs from the linear scan")
+    return {
+        "benchmark": "routing",
+        "rules": len(table.rules),
+        "messages": messages,
+        "compile_ms": round(compile_time * 1000, 3),
+        "indexed_us_per_message": round(indexed_time / messages * 1e6, 3),
+        "linear_us_per_message": round(linear_time / messages * 1e6, 3),
+        "speedup": round(linear_time / indexed_time, 1) if indexed_time else None,
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(run()))
+
+# #[EOF]#######################################################################
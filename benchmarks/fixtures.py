@@ -0,0 +1,199 @@
+# -*- coding: UTF-8 -*-
+"""
+Benchmark fixtures.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-11
+
+Purpose: Generate reproducible plugin directories, config files and messages.
+"""
+
+import random
+
+from pathlib import Path
+from typing import Any, List
+
+from jsktoolbox.configtool import Config as ConfigTool
+
+from libs.com.message import Message, Priority
+from libs.templates import PluginConfigField, PluginConfigSchema
+
+# generated field types cycle through this list
+FIELD_TYPES: List[type] = [int, str, list, bool]
+
+
+def build_schema(fields: int) -> PluginConfigSchema:
+    """Return a schema with `fields` fields of mixed types.
+
+    ### Arguments:
+    * fields: int - Number of fields.
+
+    ### Returns:
+    PluginConfigSchema - Generated schema.
+    """
+    out: List[PluginConfigField] = []
+    for idx in range(fields):
+        field_type: type = FIELD_TYPES[idx % len(FIELD_TYPES)]
+        out.append(
+            PluginConfigField(
+                name=f"field_{idx:03d}",
+                field_type=field_type,
+                default=field_type(),
+                required=idx % 3 == 0,
+                description=f"Generated {field_type.__name__} field.",
+                choices=["a", "b", "c"] if field_type is str and idx % 8 == 1 else None,
+            )
+        )
+    return PluginConfigSchema(title="Benchmark plugin.", fields=out)
+
+
+def field_value(field: PluginConfigField, rnd: random.Random) -> Any:
+    """Return a random value valid for `field`.
+
+    ### Arguments:
+    * field: PluginConfigField - Field definition.
+    * rnd: random.Random - Random source.
+
+    ### Returns:
+    Any - Generated value.
+    """
+    if field.choices:
+        return rnd.choice(field.choices)
+    if field.field_type is int:
+        return rnd.randint(0, 100000)
+    if field.field_type is bool:
+        return rnd.random() < 0.5
+    if field.field_type is list:
+        return [f"{rnd.randint(1, 100)}:{rnd.randint(1, 60)}m" for _ in range(4)]
+    return f"value-{rnd.randint(0, 100000)}"
+
+
+def write_config(path: Path, sections: int, fields: int, seed: int = 5) -> ConfigTool:
+    """Write a config file with `sections` plugin sections.
+
+    ### Arguments:
+    * path: Path - Target config file.
+    * sections: int - Number of plugin sections named `plugin_000...`.
+    * fields: int - Number of fields per section, see `build_schema()`.
+    * seed: int - Random seed for reproducible values.
+
+    ### Returns:
+    ConfigTool - Handler with the file loaded.
+    """
+    rnd = random.Random(seed)
+    schema: PluginConfigSchema = build_schema(fields)
+    cfg = ConfigTool(str(path), "AASd", auto_create=True)
+    cfg.set("AASd", varname="salt", value=rnd.randint(10000, 99999))
+    for idx in range(sections):
+        section: str = f"plugin_{idx:03d}"
+        cfg.set(section, desc=f"generated section {idx}")
+        for field in schema.fields:
+            cfg.set(section, varname=field.name, value=field_value(field, rnd))
+    cfg.save()
+    cfg.load()
+    return cfg
+
+
+def write_plugins(root: Path, count: int, fields: int) -> Path:
+    """Write `count` plugin instance directories under `root/plugins`.
+
+    Every plugin exposes a `get_plugin_spec()` with a generated schema and a
+    packaged runtime imported relatively, the layout used by real plugins.
+
+    ### Arguments:
+    * root: Path - Parent directory.
+    * count: int - Number of plugin instances.
+    * fields: int - Number of schema fields per plugin.
+
+    ### Returns:
+    Path - Generated plugins directory.
+    """
+    plugins_dir: Path = root / "plugins"
+    plugins_dir.mkdir(parents=True, exist_ok=True)
+    for idx in range(count):
+        target: Path = plugins_dir / f"bench_{idx:03d}"
+        package: Path = target / "plugin"
+        package.mkdir(parents=True, exist_ok=True)
+        (target / "__init__.py").write_text("", encoding="utf-8")
+        (package / "__init__.py").write_text("", encoding="utf-8")
+        (package / "runtime.py").write_text(
+            "\n".join(
+                [
+                    "from libs.plugins import (",
+                    "    PluginHealth,",
+                    "    PluginHealthSnapshot,",
+                    "    PluginState,",
+                    "    PluginStateSnapshot,",
+                    ")",
+                    "",
+                    "class Runtime(object):",
+                    "    def __init__(self, context):",
+                    "        self.context = context",
+                    "    def initialize(self):",
+                    "        return None",
+                    "    def start(self):",
+                    "        return None",
+                    "    def stop(self, timeout=None):",
+                    "        return None",
+                    "    def state(self):",
+                    "        return PluginStateSnapshot(state=PluginState.STOPPED)",
+                    "    def health(self):",
+                    "        return PluginHealthSnapshot(health=PluginHealth.HEALTHY)",
+                    "",
+                ]
+            ),
+            encoding="utf-8",
+        )
+        (target / "load.py").write_text(
+            "\n".join(
+                [
+                    "from benchmarks.fixtures import build_schema",
+                    "from libs.plugins import PluginKind, PluginSpec",
+                    "",
+                    "from .plugin.runtime import Runtime",
+                    "",
+                    "def get_plugin_spec():",
+                    "    return PluginSpec(",
+                    "        api_version=1,",
+                    f"        config_schema=build_schema({fields}),",
+                    f"        plugin_id='benchmarks.bench_{idx:03d}',",
+                    "        plugin_kind=PluginKind.WORKER,",
+                    f"        plugin_name='bench_{idx:03d}',",
+                    "        runtime_factory=Runtime,",
+                    "    )",
+                    "",
+                ]
+            ),
+            encoding="utf-8",
+        )
+    return plugins_dir
+
+
+def build_messages(
+    count: int, channels: int, size: int = 4, seed: int = 3
+) -> List[Message]:
+    """Return `count` messages spread over `channels` channels.
+
+    ### Arguments:
+    * count: int - Number of messages.
+    * channels: int - Number of target channels, numbered from 1.
+    * size: int - Number of body lines per message.
+    * seed: int - Random seed for reproducible input.
+
+    ### Returns:
+    List[Message] - Generated messages.
+    """
+    rnd = random.Random(seed)
+    out: List[Message] = []
+    for idx in range(count):
+        message = Message()
+        message.channel = rnd.randint(1, channels)
+        message.origin = f"worker{idx % 50}"
+        message.priority = rnd.choice([Priority.HIGH, Priority.NORMAL, Priority.LOW])
+        message.subject = f"event {idx}"
+        message.messages = [f"line {line} of event {idx}" for line in range(size)]
+        out.append(message)
+    return out
+
+
+# #[EOF]#######################################################################
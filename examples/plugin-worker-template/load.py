@@ -48,12 +48,22 @@ def get_plugin_spec() -> PluginSpec:
                     "`['3:0;8|20;*;*;*']`."
                 ),
             ),
+            PluginConfigField(
+                name=PluginCommonKeys.SLEEP_PERIOD,
+                field_type=str,
+                default="",
+                required=False,
+                description=(
+                    "Time between periodic ticks, seconds or `s|m|h|d|w`, "
+                    "empty ticks only at startup and on due channels."
+                ),
+            ),
             PluginConfigField(
                 name=Keys.MESSAGE_TEXT,
                 field_type=str,
                 default="Hello from worker template plugin.",
                 required=True,
-                description="Message emitted during startup by the worker plugin.",
+                description="Message emitted to the due notification channels.",
             ),
         ],
     )
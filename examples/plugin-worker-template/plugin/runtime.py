@@ -8,206 +8,38 @@ Created: 2026-03-24
 Purpose: Provide a starter thread-based runtime for new AASd worker plugins.
 """
 
-from threading import Event, Thread
-from time import time
-from typing import Optional
+from typing import List
 
 from libs.com.message import Message
-from libs.plugins import (
-    NotificationScheduler,
-    PluginCommonKeys,
-    PluginContext,
-    PluginHealth,
-    PluginHealthSnapshot,
-    PluginState,
-    PluginStateSnapshot,
-    ThPluginMixin,
-)
+from libs.plugins import PluginContext, ThWorkerRuntime
 
 from .config import Keys
 
 
-class WorkerTemplateRuntime(Thread, ThPluginMixin):
+class WorkerTemplateRuntime(ThWorkerRuntime):
     """Minimal worker runtime used as a template for new plugins."""
 
-    _notifications: Optional[NotificationScheduler] = None
-
-    # #[CONSTRUCTOR]##################################################################
-    def __init__(self, context: PluginContext) -> None:
-        """Initialize the worker template runtime.
+    # #[PUBLIC METHODS]################################################################
+    def tick(self, due: List[int]) -> bool:
+        """Emit the configured message to the due notification channels.
 
         ### Arguments:
-        * context: PluginContext - Plugin runtime context.
-        """
-        Thread.__init__(self, name=context.instance_name)
-        self.daemon = True
-        self._context = context
-        self._health = PluginHealthSnapshot(health=PluginHealth.UNKNOWN)
-        self._notifications = NotificationScheduler.from_config(context.config)
-        self._state = PluginStateSnapshot(state=PluginState.CREATED)
-        self._stop_event = Event()
-
-    # #[PUBLIC METHODS]################################################################
-    def health(self) -> PluginHealthSnapshot:
-        """Return the current health snapshot.
+        * due: List[int] - Notification channels due now.
 
         ### Returns:
-        PluginHealthSnapshot - Current plugin health snapshot.
+        bool - `True` when the tick succeeded.
         """
-        health: Optional[PluginHealthSnapshot] = self._health
-        if health is None:
-            return PluginHealthSnapshot(
-                health=PluginHealth.UNKNOWN,
-                message="Health snapshot is not initialized.",
-            )
-        return health
-
-    def initialize(self) -> None:
-        """Prepare the runtime before startup."""
-        self._state = PluginStateSnapshot(state=PluginState.INITIALIZED)
-
-    def run(self) -> None:
-        """Run a minimal startup action and stop."""
-        stop_event: Optional[Event] = self._stop_event
-        if stop_event is None:
-            self._health = PluginHealthSnapshot(
-                health=PluginHealth.UNHEALTHY,
-                last_error_at=int(time()),
-                message="Stop event is not initialized.",
-            )
-            self._state = PluginStateSnapshot(
-                state=PluginState.FAILED,
-                failure_count=1,
-                message="Stop event is not initialized.",
-                stopped_at=int(time()),
-            )
-            return None
-        context: Optional[PluginContext] = self._context
-        if context is None:
-            self._health = PluginHealthSnapshot(
-                health=PluginHealth.UNHEALTHY,
-                last_error_at=int(time()),
-                message="Plugin context is not initialized.",
-            )
-            self._state = PluginStateSnapshot(
-                state=PluginState.FAILED,
-                failure_count=1,
-                message="Plugin context is not initialized.",
-                stopped_at=int(time()),
-            )
-            return None
-
-        notifications: Optional[NotificationScheduler] = self._notifications
-        if notifications is None:
-            self._health = PluginHealthSnapshot(
-                health=PluginHealth.UNHEALTHY,
-                last_error_at=int(time()),
-                message="Notification scheduler is not initialized.",
-            )
-            self._state = PluginStateSnapshot(
-                state=PluginState.FAILED,
-                failure_count=1,
-                message="Notification scheduler is not initialized.",
-                stopped_at=int(time()),
-            )
-            return None
-
-        for channel in notifications.due_channels():
+        context: PluginContext = self._context  # type: ignore
+        for channel in due:
             message = Message()
             message.channel = int(channel)
             message.diagnostic_source = self._c_name
-            message.subject = (
-                f"[{context.instance_name}] worker template startup notification"
-            )
+            message.subject = f"[{context.instance_name}] worker template notification"
             message.messages = [str(context.config[Keys.MESSAGE_TEXT])]
             context.dispatcher.publish(message)
-        context.logger.message_info = "worker template startup message emitted"
-
-        now = int(time())
-        self._health = PluginHealthSnapshot(
-            health=PluginHealth.HEALTHY,
-            last_ok_at=now,
-            message="Worker template runtime completed its startup action.",
-        )
-        self._state = PluginStateSnapshot(
-            state=PluginState.STOPPED,
-            started_at=now,
-            stopped_at=now,
-        )
-        stop_event.set()
-
-    def start(self) -> None:
-        """Start the runtime thread."""
-        self._state = PluginStateSnapshot(
-            state=PluginState.STARTING,
-            started_at=int(time()),
-        )
-        Thread.start(self)
-
-    def state(self) -> PluginStateSnapshot:
-        """Return the current lifecycle snapshot.
-
-        ### Returns:
-        PluginStateSnapshot - Current plugin lifecycle snapshot.
-        """
-        state: Optional[PluginStateSnapshot] = self._state
-        if state is None:
-            return PluginStateSnapshot(
-                state=PluginState.FAILED,
-                failure_count=1,
-                message="Lifecycle snapshot is not initialized.",
-            )
-        if self.is_alive() and state.state == PluginState.STARTING:
-            state = PluginStateSnapshot(
-                state=PluginState.RUNNING,
-                started_at=state.started_at,
-            )
-            self._state = state
-        return state
-
-    def stop(self, timeout: Optional[float] = None) -> None:
-        """Request plugin shutdown.
-
-        ### Arguments:
-        * timeout: Optional[float] - Optional join timeout.
-        """
-        stop_event: Optional[Event] = self._stop_event
-        if stop_event is None:
-            self._health = PluginHealthSnapshot(
-                health=PluginHealth.UNHEALTHY,
-                last_error_at=int(time()),
-                message="Stop event is not initialized.",
-            )
-            self._state = PluginStateSnapshot(
-                state=PluginState.FAILED,
-                failure_count=1,
-                message="Stop event is not initialized.",
-                stopped_at=int(time()),
-            )
-            return None
-        state: Optional[PluginStateSnapshot] = self._state
-        if state is None:
-            self._state = PluginStateSnapshot(
-                state=PluginState.FAILED,
-                failure_count=1,
-                message="Lifecycle snapshot is not initialized.",
-                stopped_at=int(time()),
-            )
-            return None
-        if state.state not in (PluginState.STOPPED, PluginState.FAILED):
-            self._state = PluginStateSnapshot(
-                state=PluginState.STOPPING,
-                started_at=state.started_at,
-            )
-        stop_event.set()
-        if self.is_alive():
-            self.join(timeout=timeout)
-        state = self._state
-        self._state = PluginStateSnapshot(
-            state=PluginState.STOPPED,
-            started_at=state.started_at if state is not None else None,
-            stopped_at=int(time()),
-        )
+        if due:
+            context.logger.message_info = "worker template message emitted"
+        return True
 
 
 # #[EOF]#######################################################################
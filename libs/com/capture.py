@@ -0,0 +1,310 @@
+# -*- coding: UTF-8 -*-
+"""
+Dispatcher message capture and replay.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-16
+
+Purpose: Record routed messages into a JSON-lines capture and feed a capture
+back into the dispatcher with the recorded timing.
+"""
+
+import gzip
+import json
+import time
+
+from dataclasses import dataclass
+from threading import Event
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from jsktoolbox.attribtool import ReadOnlyClass
+from jsktoolbox.basetool import BData
+
+from libs.com.message import Message, Priority
+from libs.tools.jsonlog import ThJsonLogWriter
+
+
+class _Keys(object, metaclass=ReadOnlyClass):
+    """Define internal storage keys for the message capture."""
+
+    # #[CONSTANTS]####################################################################
+    RECORDED: str = "__recorded__"
+    WRITER: str = "__writer__"
+
+
+class CaptureField(object, metaclass=ReadOnlyClass):
+    """Expose the short field names of a capture record.
+
+    Empty fields, the normal priority, and routed channels equal to the
+    message channel are left out to keep records small.
+    """
+
+    # #[CONSTANTS]####################################################################
+    CHANNEL: str = "ch"
+    DIAGNOSTIC_SOURCE: str = "src"
+    FOOTER: str = "ft"
+    MESSAGES: str = "m"
+    MULTIPART: str = "mm"
+    ORIGIN: str = "o"
+    PRIORITY: str = "p"
+    REPLY_TO: str = "rt"
+    ROUTED: str = "r"
+    SENDER: str = "snd"
+    SUBJECT: str = "s"
+    TIMESTAMP: str = "ts"
+    TO: str = "to"
+
+
+@dataclass(frozen=True, slots=True)
+class CapturedMessage:
+    """Store one message read back from a capture."""
+
+    message: Message
+    routed: Tuple[int, ...]
+    timestamp: float
+
+
+@dataclass(slots=True)
+class ReplayStats:
+    """Describe the outcome of one replay run."""
+
+    elapsed: float = 0.0
+    published: int = 0
+    throttled: int = 0
+
+
+def decode_message(record: Dict[str, Any]) -> Message:
+    """Rebuild a message from a capture record.
+
+    ### Arguments:
+    * record: Dict[str, Any] - Decoded capture line.
+
+    ### Returns:
+    Message - Message carrying the recorded channel, priority, and payload.
+    """
+    message = Message()
+    if record.get(CaptureField.CHANNEL) is not None:
+        message.channel = int(record[CaptureField.CHANNEL])
+    message.priority = int(record.get(CaptureField.PRIORITY, Priority.NORMAL))
+    if record.get(CaptureField.MESSAGES):
+        message.messages = list(record[CaptureField.MESSAGES])
+    if record.get(CaptureField.MULTIPART):
+        message.mmessages = dict(record[CaptureField.MULTIPART])
+    for field, name in (
+        (CaptureField.DIAGNOSTIC_SOURCE, "diagnostic_source"),
+        (CaptureField.FOOTER, "footer"),
+        (CaptureField.ORIGIN, "origin"),
+        (CaptureField.REPLY_TO, "reply_to"),
+        (CaptureField.SENDER, "sender"),
+        (CaptureField.SUBJECT, "subject"),
+        (CaptureField.TO, "to"),
+    ):
+        if record.get(field) is not None:
+            setattr(message, name, record[field])
+    return message
+
+
+def encode_message(
+    message: Message, channels: List[Any], timestamp: float
+) -> Dict[str, Any]:
+    """Return the capture record of one routed message.
+
+    ### Arguments:
+    * message: Message - Routed message.
+    * channels: List[Any] - Channels the dispatcher delivered the message to.
+    * timestamp: float - `time.time()` at routing.
+
+    ### Returns:
+    Dict[str, Any] - JSON-serializable record without empty fields.
+    """
+    record: Dict[str, Any] = {
+        CaptureField.TIMESTAMP: round(timestamp, 6),
+        CaptureField.CHANNEL: message.channel,
+    }
+    if channels != [message.channel]:
+        record[CaptureField.ROUTED] = channels
+    if message.priority != Priority.NORMAL:
+        record[CaptureField.PRIORITY] = message.priority
+    for field, value in (
+        (CaptureField.ORIGIN, message.origin),
+        (CaptureField.DIAGNOSTIC_SOURCE, message.diagnostic_source),
+        (CaptureField.SUBJECT, message.subject),
+        (CaptureField.MESSAGES, message.messages),
+        (CaptureField.MULTIPART, message.mmessages),
+        (CaptureField.TO, message.to),
+        (CaptureField.SENDER, message.sender),
+        (CaptureField.REPLY_TO, message.reply_to),
+        (CaptureField.FOOTER, message.footer),
+    ):
+        if value:
+            record[field] = value
+    return record
+
+
+def read_capture(path: str) -> Iterator[CapturedMessage]:
+    """Yield messages stored in a capture file in recorded order.
+
+    Files ending with `.gz` are read through `gzip`, so rotated captures can
+    be compressed before they are copied off the host. Lines that are not
+    valid capture records are skipped.
+
+    ### Arguments:
+    * path: str - Capture file written by `MessageCapture`.
+
+    ### Returns:
+    Iterator[CapturedMessage] - Captured messages with their timestamps.
+    """
+    file: IO[str]
+    if path.endswith(".gz"):
+        file = gzip.open(path, "rt", encoding="utf-8")
+    else:
+        file = open(path, "r", encoding="utf-8")
+    with file:
+        for line in file:
+            try:
+                record: Dict[str, Any] = json.loads(line)
+                timestamp: float = float(record[CaptureField.TIMESTAMP])
+                message: Message = decode_message(record)
+            except (KeyError, TypeError, ValueError):
+                continue
+            yield CapturedMessage(
+                message=message,
+                routed=tuple(record.get(CaptureField.ROUTED, [message.channel])),
+                timestamp=timestamp,
+            )
+
+
+def replay_capture(
+    messages: Iterator[CapturedMessage],
+    publish: Callable[[Message], bool],
+    speed: float = 1.0,
+    stop_event: Optional[Event] = None,
+) -> ReplayStats:
+    """Publish captured messages with their recorded spacing.
+
+    Each message is due at its offset from the first captured message divided
+    by `speed`, measured from the replay start, so a late publish does not
+    shift the remaining schedule.
+
+    ### Arguments:
+    * messages: Iterator[CapturedMessage] - Messages from `read_capture()`.
+    * publish: Callable[[Message], bool] - Publish callback, for example
+      `DispatcherAdapter.publish`.
+    * speed: float - Time scale, `2.0` replays twice as fast, `0` or less
+      publishes as fast as possible.
+    * stop_event: Optional[Event] - Event ending the replay early.
+
+    ### Returns:
+    ReplayStats - Published and throttled counts and the replay duration.
+    """
+    stats = ReplayStats()
+    started: float = time.monotonic()
+    first: Optional[float] = None
+    for item in messages:
+        if stop_event is not None and stop_event.is_set():
+            break
+        if first is None:
+            first = item.timestamp
+        if speed > 0:
+            delay: float = started + (item.timestamp - first) / speed - time.monotonic()
+            if delay > 0:
+                if stop_event is None:
+                    time.sleep(delay)
+                elif stop_event.wait(delay):
+                    break
+        if publish(item.message):
+            stats.published += 1
+        else:
+            stats.throttled += 1
+    stats.elapsed = time.monotonic() - started
+    return stats
+
+
+class MessageCapture(BData):
+    """Record routed messages into a JSON-lines capture file.
+
+    Records are serialized on the dispatcher thread and written to disk by a
+    `ThJsonLogWriter` in batches, so capturing costs one `json.dumps()` per
+    message on the routing path.
+    """
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self, path: str, rotate_size: int = 0, rotate_count: int = 5) -> None:
+        """Initialize the capture.
+
+        ### Arguments:
+        * path: str - Capture file, appended to when it exists.
+        * rotate_size: int - File size in bytes triggering rotation, 0 disables.
+        * rotate_count: int - Number of rotated files kept.
+        """
+        self._set_data(
+            key=_Keys.WRITER,
+            value=ThJsonLogWriter(
+                path=path,
+                flush_records=1000,
+                rotate_size=rotate_size,
+                rotate_count=rotate_count,
+            ),
+            set_default_type=ThJsonLogWriter,
+        )
+        self._set_data(key=_Keys.RECORDED, value=0, set_default_type=int)
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def path(self) -> str:
+        """Return the capture file path.
+
+        ### Returns:
+        str - JSON-lines capture file.
+        """
+        return self.__writer.path
+
+    @property
+    def recorded(self) -> int:
+        """Return the number of recorded messages.
+
+        ### Returns:
+        int - Messages passed to `record()`.
+        """
+        return self._get_data(key=_Keys.RECORDED)  # type: ignore
+
+    # #[PUBLIC METHODS]###############################################################
+    def close(self) -> None:
+        """Flush pending records and stop the writer thread.
+
+        The join is bounded since it runs on the dispatcher thread, which the
+        daemon shutdown waits for.
+        """
+        writer: ThJsonLogWriter = self.__writer
+        if writer.is_alive():
+            writer.stop()
+            writer.join(timeout=5.0)
+
+    def open(self) -> None:
+        """Start the writer thread."""
+        writer: ThJsonLogWriter = self.__writer
+        if not writer.is_alive():
+            writer.start()
+
+    def record(self, message: Message, channels: List[Any]) -> None:
+        """Queue one routed message for writing.
+
+        ### Arguments:
+        * message: Message - Routed message.
+        * channels: List[Any] - Channels the message was delivered to.
+        """
+        self.__writer.write(encode_message(message, channels, time.time()))
+        self._set_data(key=_Keys.RECORDED, value=self.recorded + 1)
+
+    # #[PRIVATE PROPERTIES]###########################################################
+    @property
+    def __writer(self) -> ThJsonLogWriter:
+        """Return the asynchronous file writer.
+
+        ### Returns:
+        ThJsonLogWriter - Writer appending capture lines.
+        """
+        return self._get_data(key=_Keys.WRITER)  # type: ignore
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,320 @@
+# -*- coding: UTF-8 -*-
+"""
+Message coalescing stage for communication plugins.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Merge bursts of similar messages read from a consumer queue.
+"""
+
+import html
+import time
+
+from queue import Empty, Queue
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from jsktoolbox.attribtool import ReadOnlyClass
+from jsktoolbox.basetool import BData
+
+from libs.com.message import Message, Multipart
+
+
+class _Keys(object, metaclass=ReadOnlyClass):
+    """Define internal storage keys for the coalescing stage."""
+
+    # #[CONSTANTS]####################################################################
+    GROUPS: str = "__groups__"
+    MAX_SIZE: str = "__max_size__"
+    MERGED: str = "__merged__"
+    QUEUE: str = "__queue__"
+    READY: str = "__ready__"
+    WINDOW: str = "__window__"
+
+
+class MessageCoalescer(BData):
+    """Wrap a consumer `Queue` and merge messages arriving within a window.
+
+    Messages with the same channel, recipients, subject, and body kind (plain
+    or `Multipart`) are collected from the first arrival for `window` seconds,
+    or until `max_size` messages were collected, and then returned as one
+    message. The object mimics the `Queue.get()` contract used by consumer
+    loops, including `queue.Empty` on timeout and a `task_done()` call.
+    """
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self, queue: Queue, window: float = 2.0, max_size: int = 50) -> None:
+        """Initialize the coalescing stage.
+
+        ### Arguments:
+        * queue: Queue - Consumer queue returned by `register_consumer()`.
+        * window: float - Seconds a group stays open after its first message.
+        * max_size: int - Number of messages that closes a group immediately.
+        """
+        self._set_data(key=_Keys.QUEUE, value=queue, set_default_type=Queue)
+        self._set_data(key=_Keys.WINDOW, value=float(window), set_default_type=float)
+        self._set_data(
+            key=_Keys.MAX_SIZE, value=max(1, int(max_size)), set_default_type=int
+        )
+        self._set_data(key=_Keys.GROUPS, value={}, set_default_type=Dict)
+        self._set_data(key=_Keys.READY, value=[], set_default_type=List)
+        self._set_data(key=_Keys.MERGED, value=0, set_default_type=int)
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def merged(self) -> int:
+        """Return how many messages were folded into other messages.
+
+        ### Returns:
+        int - Deliveries saved by coalescing.
+        """
+        return self._get_data(key=_Keys.MERGED)  # type: ignore
+
+    @property
+    def pending(self) -> int:
+        """Return the number of source messages held in open groups.
+
+        ### Returns:
+        int - Buffered message count.
+        """
+        groups: Dict[Tuple, Tuple[float, List[Message]]] = self.__groups
+        return sum(len(item[1]) for item in groups.values())
+
+    # #[PUBLIC METHODS]###############################################################
+    def add(self, message: Message) -> None:
+        """Put one message into its group.
+
+        ### Arguments:
+        * message: Message - Message read from the consumer queue.
+        """
+        groups: Dict[Tuple, Tuple[float, List[Message]]] = self.__groups
+        key: Tuple = self.group_key(message)
+        if key not in groups:
+            groups[key] = (time.monotonic() + self._get_data(key=_Keys.WINDOW), [])
+        groups[key][1].append(message)
+        if len(groups[key][1]) >= self._get_data(key=_Keys.MAX_SIZE):
+            self.__ready.append(self.merge(groups.pop(key)[1]))
+
+    def flush(self) -> List[Message]:
+        """Close every open group and return all merged messages.
+
+        ### Returns:
+        List[Message] - Ready and merged messages in arrival order.
+        """
+        out: List[Message] = list(self.__ready)
+        self.__ready.clear()
+        groups: Dict[Tuple, Tuple[float, List[Message]]] = self.__groups
+        for key in sorted(groups, key=lambda item: groups[item][0]):
+            out.append(self.merge(groups[key][1]))
+        groups.clear()
+        return out
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Message:
+        """Return the next merged message.
+
+        ### Arguments:
+        * block: bool - Wait for a message when none is ready.
+        * timeout: Optional[float] - Maximum wait in seconds, `None` waits forever.
+
+        ### Returns:
+        Message - Merged message.
+
+        ### Raises:
+        * Empty: When no merged message became ready in time.
+        """
+        queue: Queue = self._get_data(key=_Keys.QUEUE)  # type: ignore
+        limit: Optional[float] = (
+            time.monotonic() + timeout if block and timeout is not None else None
+        )
+        while True:
+            self.__close_due()
+            if self.__ready:
+                return self.__ready.pop(0)
+            now: float = time.monotonic()
+            deadline: Optional[float] = self.__next_deadline()
+            waits: List[float] = []
+            if deadline is not None:
+                waits.append(deadline - now)
+            if not block:
+                waits.append(0.0)
+            elif limit is not None:
+                waits.append(limit - now)
+            wait: Optional[float] = max(0.0, min(waits)) if waits else None
+            try:
+                message: Message = queue.get(
+                    block=wait is None or wait > 0.0, timeout=wait
+                )
+            except Empty:
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    continue
+                if not block or (limit is not None and now >= limit):
+                    raise
+                continue
+            queue.task_done()
+            self.add(message)
+            # drain what is already queued before deciding
+            while True:
+                try:
+                    self.add(queue.get_nowait())
+                except Empty:
+                    break
+                queue.task_done()
+
+    def get_nowait(self) -> Message:
+        """Return a ready merged message without waiting.
+
+        ### Returns:
+        Message - Merged message.
+
+        ### Raises:
+        * Empty: When no merged message is ready.
+        """
+        return self.get(block=False)
+
+    @classmethod
+    def group_key(cls, message: Message) -> Tuple:
+        """Return the grouping key of a message.
+
+        ### Arguments:
+        * message: Message - Message to classify.
+
+        ### Returns:
+        Tuple - Channel, recipients, subject, multipart flag, and correlation
+        id, which keeps requests out of merged groups.
+        """
+        recipients: Any = message.to
+        if isinstance(recipients, list):
+            recipients = tuple(recipients)
+        return (
+            message.channel,
+            recipients,
+            message.subject,
+            message.mmessages is not None,
+            message.correlation_id,
+        )
+
+    def merge(self, messages: List[Message]) -> Message:
+        """Merge messages of one group into a single message.
+
+        Plain fragments are concatenated. For `Multipart` groups the plain and
+        HTML parts are concatenated separately; a member without an HTML part
+        contributes its escaped plain text to the HTML body. The merged
+        message takes the highest member priority and the origin shared by
+        every member.
+
+        ### Arguments:
+        * messages: List[Message] - Group members in arrival order.
+
+        ### Returns:
+        Message - The only member, or a new merged message.
+        """
+        if len(messages) == 1:
+            return messages[0]
+        self._set_data(key=_Keys.MERGED, value=self.merged + len(messages) - 1)
+        first: Message = messages[0]
+        out = Message()
+        if first.channel is not None:
+            out.channel = first.channel
+        for name in ("diagnostic_source", "footer", "reply_to", "sender", "subject"):
+            value: Optional[str] = getattr(first, name)
+            if value is not None:
+                setattr(out, name, value)
+        if first.to:
+            out.to = list(first.to) if isinstance(first.to, list) else first.to
+        out.priority = min(item.priority for item in messages)
+        origins: Set[Optional[str]] = {item.origin for item in messages}
+        origin: Optional[str] = origins.pop() if len(origins) == 1 else None
+        if origin is not None:
+            out.origin = origin
+        if first.mmessages is None:
+            for item in messages:
+                out.messages = list(item.messages)
+            return out
+        plain: List[str] = []
+        rich: List[str] = []
+        with_html: bool = any(
+            Multipart.HTML in (item.mmessages or {}) for item in messages
+        )
+        for item in messages:
+            parts: Dict[str, Any] = item.mmessages or {}
+            lines: List[str] = self.__lines(parts.get(Multipart.PLAIN, item.messages))
+            plain.extend(lines)
+            if with_html:
+                if Multipart.HTML in parts:
+                    rich.extend(self.__lines(parts[Multipart.HTML]))
+                else:
+                    rich.append(
+                        "<pre>" + html.escape("\n".join(lines)) + "</pre>"
+                    )
+        parts_out: Dict[str, Any] = {Multipart.PLAIN: plain}
+        if with_html:
+            parts_out[Multipart.HTML] = rich
+        out.mmessages = parts_out
+        return out
+
+    def task_done(self) -> None:
+        """Accept the consumer acknowledgement of a merged message.
+
+        Source messages are acknowledged on the wrapped queue as they are read,
+        so this call only keeps consumer loops written for `Queue` working.
+        """
+
+    # #[PRIVATE PROPERTIES]###########################################################
+    @property
+    def __groups(self) -> Dict[Tuple, Tuple[float, List[Message]]]:
+        """Return open groups keyed by `group_key()`.
+
+        ### Returns:
+        Dict[Tuple, Tuple[float, List[Message]]] - Deadline and members.
+        """
+        return self._get_data(key=_Keys.GROUPS)  # type: ignore
+
+    @property
+    def __ready(self) -> List[Message]:
+        """Return merged messages waiting for `get()`.
+
+        ### Returns:
+        List[Message] - Ready messages.
+        """
+        return self._get_data(key=_Keys.READY)  # type: ignore
+
+    # #[PRIVATE METHODS]##############################################################
+    def __close_due(self) -> None:
+        """Move groups whose window elapsed to the ready list."""
+        groups: Dict[Tuple, Tuple[float, List[Message]]] = self.__groups
+        now: float = time.monotonic()
+        for key in sorted(
+            [key for key, item in groups.items() if item[0] <= now],
+            key=lambda item: groups[item][0],
+        ):
+            self.__ready.append(self.merge(groups.pop(key)[1]))
+
+    def __lines(self, value: Any) -> List[str]:
+        """Return message fragments as a list of strings.
+
+        ### Arguments:
+        * value: Any - Fragment list or string.
+
+        ### Returns:
+        List[str] - Fragments.
+        """
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [value]
+        return [str(item) for item in value]
+
+    def __next_deadline(self) -> Optional[float]:
+        """Return the earliest open group deadline.
+
+        ### Returns:
+        Optional[float] - Monotonic deadline or `None` without open groups.
+        """
+        groups: Dict[Tuple, Tuple[float, List[Message]]] = self.__groups
+        if not groups:
+            return None
+        return min(item[0] for item in groups.values())
+
+
+# #[EOF]#######################################################################
@@ -8,10 +8,27 @@ Created: 2023-11-14
 Purpose: Provide message containers, channel schedulers, and dispatcher logic.
 """
 
-from datetime import datetime
+import hashlib
+import heapq
+import time
+import uuid
+
+from collections import OrderedDict, deque
+from concurrent.futures import Future, InvalidStateError
+from datetime import datetime, timedelta
 from inspect import currentframe
-from typing import Any, Dict, List, Mapping, Optional, Union
-from threading import Thread, Event
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Deque,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+from threading import Event, Lock, Thread
 from queue import Queue, Empty, Full
 
 from jsktoolbox.attribtool import ReadOnlyClass
@@ -25,6 +42,10 @@ from libs.base import ThProcessorMixin
 from libs.plugins.keys import PluginCommonKeys
 from libs.tools import MDateTime, MIntervals
 
+if TYPE_CHECKING:
+    from libs.com.capture import MessageCapture
+    from libs.com.routing import RoutingTable
+
 
 class _Keys(object, metaclass=ReadOnlyClass):
     """Define internal storage keys for the messaging subsystem."""
@@ -46,6 +67,9 @@ class AtChannel(BData):
         AT_MINUTE: str = "minute"
         AT_MONTH: str = "month"
 
+    # days searched by `next_due()`, covers `29` February on a fixed weekday
+    NEXT_DUE_DAYS: int = 366 * 28
+
     # #[CONSTRUCTOR]##################################################################
     def __init__(self, config_channel: List[str]) -> None:
         """Initialize the cron-style channel scheduler.
@@ -134,6 +158,29 @@ class AtChannel(BData):
         """
         return self._get_data(key=_Keys.CHANNELS)  # type: ignore
 
+    # #[PUBLIC METHODS]################################################################
+    def next_due(self, after: Optional[datetime] = None) -> Optional[datetime]:
+        """Return the first minute after `after` at which a channel is due.
+
+        ### Arguments:
+        * after: Optional[datetime] - Reference local time, now by default;
+          its own minute is never returned.
+
+        ### Returns:
+        Optional[datetime] - Start of the next due minute, or `None` when no
+        schedule matches within the next `NEXT_DUE_DAYS` days.
+        """
+        start: datetime = (after or MDateTime.now()).replace(
+            second=0, microsecond=0
+        ) + timedelta(minutes=1)
+        out: Optional[datetime] = None
+        for chan in self.channels:
+            for item in self.get_channels[chan]:
+                found: Optional[datetime] = self.__next_match(item, start)
+                if found is not None and (out is None or found < out):
+                    out = found
+        return out
+
     # #[PRIVATE METHODS]###############################################################
     def __build_cron_data(self, cron: str) -> Dict[str, List[int]]:
         """Convert a cron-style channel definition to internal scheduling data.
@@ -278,6 +325,42 @@ class AtChannel(BData):
                 channels[channel] = []
             channels[channel].append(self.__build_cron_data(cron))
 
+    def __next_match(
+        self, item: Dict[str, List[int]], start: datetime
+    ) -> Optional[datetime]:
+        """Return the first minute not before `start` matching one entry.
+
+        ### Arguments:
+        * item: Dict[str, List[int]] - Parsed cron entry.
+        * start: datetime - First candidate minute.
+
+        ### Returns:
+        Optional[datetime] - Matching minute or `None`.
+        """
+        hours: List[int] = sorted(set(item[self.__Keys.AT_HOUR]))
+        minutes: List[int] = sorted(set(item[self.__Keys.AT_MINUTE]))
+        for offset in range(self.NEXT_DUE_DAYS):
+            day: datetime = start + timedelta(days=offset)
+            if (
+                day.day not in item[self.__Keys.AT_DAY]
+                or day.month not in item[self.__Keys.AT_MONTH]
+            ):
+                continue
+            if not (
+                day.weekday() == 6
+                and (
+                    0 in item[self.__Keys.AT_DAY_WEEK]
+                    or 7 in item[self.__Keys.AT_DAY_WEEK]
+                )
+            ) and (day.weekday() + 1 not in item[self.__Keys.AT_DAY_WEEK]):
+                continue
+            for hour in hours:
+                for minute in minutes:
+                    found: datetime = day.replace(hour=hour, minute=minute)
+                    if found >= start:
+                        return found
+        return None
+
 
 class Channel(BData):
     """Implement interval-based scheduling for message channels."""
@@ -362,6 +445,24 @@ class Channel(BData):
             )
         return obj
 
+    @property
+    def next_due(self) -> Optional[int]:
+        """Return when the earliest channel with an interval becomes due.
+
+        Channels without an interval are due on every check and are left out.
+
+        ### Returns:
+        Optional[int] - Unix timestamp, or `None` without interval channels.
+        """
+        out: Optional[int] = None
+        for item in self.get_channels.values():
+            if not item[self.__Keys.CHECK_INTERVAL]:
+                continue
+            due: int = int(item[self.__Keys.CHECK_NEXT]) + 1
+            if out is None or due < out:
+                out = due
+        return out
+
     # #[PRIVATE METHODS]###############################################################
     def __add_channel(self, channel: str, interval: int) -> None:
         """Register one channel and its interval in the internal mapping.
@@ -531,7 +632,7 @@ class NotificationScheduler(BData):
 
         raw_message_channel = config.get(message_channel_key)
         if raw_message_channel is not None:
-            if not isinstance(raw_message_channel, list):
+            if not isinstance(raw_message_channel, (list, tuple)):
                 raise Raise.error(
                     f"Expected list type for '{message_channel_key}'.",
                     TypeError,
@@ -542,7 +643,7 @@ class NotificationScheduler(BData):
 
         raw_at_channel = config.get(at_channel_key)
         if raw_at_channel is not None:
-            if not isinstance(raw_at_channel, list):
+            if not isinstance(raw_at_channel, (list, tuple)):
                 raise Raise.error(
                     f"Expected list type for '{at_channel_key}'.",
                     TypeError,
@@ -553,6 +654,26 @@ class NotificationScheduler(BData):
 
         return cls(message_channel=message_channel, at_channel=at_channel)
 
+    def next_due(self) -> Optional[float]:
+        """Return when the next interval or cron-like channel becomes due.
+
+        Interval channels without an interval are due on every call of
+        `due_channels()` and do not count.
+
+        ### Returns:
+        Optional[float] - Unix timestamp, or `None` when nothing is scheduled.
+        """
+        out: List[float] = []
+        if self._interval_scheduler is not None:
+            interval_due: Optional[int] = self._interval_scheduler.next_due
+            if interval_due is not None:
+                out.append(float(interval_due))
+        if self._at_scheduler is not None:
+            at_due: Optional[datetime] = self._at_scheduler.next_due()
+            if at_due is not None:
+                out.append(at_due.timestamp())
+        return min(out) if out else None
+
     # #[PRIVATE METHODS]###############################################################
     def __normalize_channels(self, channels: List[str]) -> List[int]:
         """Convert raw channel identifiers to integers.
@@ -585,6 +706,20 @@ class Multipart(object, metaclass=ReadOnlyClass):
     HTML: str = "html"
 
 
+class Priority(object, metaclass=ReadOnlyClass):
+    """Expose message priorities used by the dispatcher scheduler.
+
+    Lower values are served first. `CRITICAL` messages bypass every other lane;
+    the remaining lanes share the dispatcher by weight.
+    """
+
+    # #[CONSTANTS]#####################################################################
+    CRITICAL: int = 0
+    HIGH: int = 1
+    NORMAL: int = 2
+    LOW: int = 3
+
+
 class Message(BData):
     """Store a message exchanged between worker and communication plugins."""
 
@@ -593,11 +728,16 @@ class Message(BData):
 
         # #[CONSTANTS]#####################################################################
         MSG_CHANNEL: str = "__channel__"
+        MSG_CORRELATION: str = "__correlation__"
         MSG_COUNTER: str = "__counter__"
         MSG_DIAGNOSTIC_SOURCE: str = "__diagnostic_source__"
         MSG_FOOTER: str = "__foot__"
+        MSG_ID: str = "__id__"
+        MSG_IN_REPLY_TO: str = "__in_reply_to__"
         MSG_MESS: str = "__message__"
         MSG_MULTIPART: str = "__m_message__"
+        MSG_ORIGIN: str = "__origin__"
+        MSG_PRIORITY: str = "__priority__"
         MSG_REPLY: str = "__reply__"
         MSG_SENDER: str = "__sender__"
         MSG_SUBJECT: str = "__subject__"
@@ -638,6 +778,21 @@ class Message(BData):
         self._set_data(
             key=self.__Keys.MSG_FOOTER, value=None, set_default_type=Optional[str]
         )
+        self._set_data(
+            key=self.__Keys.MSG_ORIGIN, value=None, set_default_type=Optional[str]
+        )
+        self._set_data(
+            key=self.__Keys.MSG_PRIORITY, value=Priority.NORMAL, set_default_type=int
+        )
+        self._set_data(
+            key=self.__Keys.MSG_CORRELATION, value=None, set_default_type=Optional[str]
+        )
+        self._set_data(
+            key=self.__Keys.MSG_IN_REPLY_TO, value=None, set_default_type=Optional[str]
+        )
+        self._set_data(
+            key=self.__Keys.MSG_ID, value=uuid.uuid4().hex[:16], set_default_type=str
+        )
 
     # #[PUBLIC PROPERTIES]#############################################################
     @property
@@ -661,6 +816,24 @@ class Message(BData):
             value=value,
         )
 
+    @property
+    def correlation_id(self) -> Optional[str]:
+        """Return the request identifier awaiting a reply.
+
+        ### Returns:
+        Optional[str] - Correlation id set by `DispatcherAdapter.request()`.
+        """
+        return self._get_data(key=self.__Keys.MSG_CORRELATION)
+
+    @correlation_id.setter
+    def correlation_id(self, value: str) -> None:
+        """Store the request identifier awaiting a reply.
+
+        ### Arguments:
+        * value: str - Correlation id.
+        """
+        self._set_data(key=self.__Keys.MSG_CORRELATION, value=value)
+
     @property
     def counter(self) -> int:
         """Increment and return the internal message counter.
@@ -716,6 +889,53 @@ class Message(BData):
         """
         self._set_data(key=self.__Keys.MSG_DIAGNOSTIC_SOURCE, value=value)
 
+    @property
+    def in_reply_to(self) -> Optional[str]:
+        """Return the correlation id of the request answered by this message.
+
+        ### Returns:
+        Optional[str] - Answered correlation id or `None` for regular messages.
+        """
+        return self._get_data(key=self.__Keys.MSG_IN_REPLY_TO)
+
+    @in_reply_to.setter
+    def in_reply_to(self, value: str) -> None:
+        """Store the correlation id of the request answered by this message.
+
+        ### Arguments:
+        * value: str - Correlation id copied from the request.
+        """
+        self._set_data(key=self.__Keys.MSG_IN_REPLY_TO, value=value)
+
+    @property
+    def log_fields(self) -> str:
+        """Return `channel=` and `message_id=` tokens for log lines.
+
+        The JSON log sink promotes both tokens to top-level record fields.
+
+        ### Returns:
+        str - Tokens identifying the message in log lines.
+        """
+        return f"channel={self.channel} message_id={self.message_id}"
+
+    @property
+    def message_id(self) -> str:
+        """Return the message identifier used to trace it through the logs.
+
+        ### Returns:
+        str - Random identifier assigned at construction.
+        """
+        return self._get_data(key=self.__Keys.MSG_ID)  # type: ignore
+
+    @message_id.setter
+    def message_id(self, value: str) -> None:
+        """Store the message identifier.
+
+        ### Arguments:
+        * value: str - Identifier, for example restored from a capture.
+        """
+        self._set_data(key=self.__Keys.MSG_ID, value=value)
+
     @property
     def reply_to(self) -> Optional[str]:
         """Return the reply-to address.
@@ -807,6 +1027,52 @@ class Message(BData):
                 )
         mmessages.update(msg_dict)
 
+    @property
+    def origin(self) -> Optional[str]:
+        """Return the plugin instance that published the message.
+
+        ### Returns:
+        Optional[str] - Publishing instance name or `None`.
+        """
+        return self._get_data(key=self.__Keys.MSG_ORIGIN)
+
+    @origin.setter
+    def origin(self, value: str) -> None:
+        """Store the plugin instance that published the message.
+
+        ### Arguments:
+        * value: str - Publishing instance name, set by `DispatcherAdapter`.
+        """
+        self._set_data(key=self.__Keys.MSG_ORIGIN, value=value)
+
+    @property
+    def priority(self) -> int:
+        """Return the dispatcher priority.
+
+        ### Returns:
+        int - One of the `Priority` values, `Priority.NORMAL` by default.
+        """
+        return self._get_data(key=self.__Keys.MSG_PRIORITY)  # type: ignore
+
+    @priority.setter
+    def priority(self, value: int) -> None:
+        """Store the dispatcher priority.
+
+        ### Arguments:
+        * value: int - One of the `Priority` values.
+
+        ### Raises:
+        * ValueError: If `value` is not a known priority.
+        """
+        if not isinstance(value, int) or not Priority.CRITICAL <= value <= Priority.LOW:
+            raise Raise.error(
+                f"Expected Priority value, received '{value}'.",
+                ValueError,
+                self._c_name,
+                currentframe(),
+            )
+        self._set_data(key=self.__Keys.MSG_PRIORITY, value=value)
+
     @property
     def sender(self) -> Optional[str]:
         """Return the sender address override.
@@ -888,6 +1154,590 @@ class Message(BData):
             )
 
 
+class MessageDeduplicator(BData):
+    """Suppress repeated messages for `ttl` seconds after the first one.
+
+    Messages are fingerprinted by diagnostic source, channel, subject, and a
+    hash of the body. The first message of a fingerprint passes, repeats are
+    counted and dropped until `ttl` seconds after it; repeats do not extend
+    the window, so a source that keeps repeating is summarised at least once
+    per `ttl`. Fingerprints are kept in first-seen order, bounded by
+    `max_size`. When an entry with suppressed repeats expires or is evicted,
+    `expire()` returns a summary message for it.
+    """
+
+    class __Keys(object, metaclass=ReadOnlyClass):
+        """Define internal storage keys for the duplicate filter."""
+
+        # #[CONSTANTS]#####################################################################
+        ENTRIES: str = "__entries__"
+        EVICTED: str = "__evicted__"
+        MAX_SIZE: str = "__max_size__"
+        PASSED: str = "__passed__"
+        SUPPRESSED: str = "__suppressed__"
+        TTL: str = "__ttl__"
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self, ttl: float = 300.0, max_size: int = 4096) -> None:
+        """Initialize the duplicate filter.
+
+        ### Arguments:
+        * ttl: float - Seconds a fingerprint stays suppressed after its first
+          message.
+        * max_size: int - Maximum number of remembered fingerprints.
+        """
+        self._set_data(key=self.__Keys.TTL, value=float(ttl), set_default_type=float)
+        self._set_data(
+            key=self.__Keys.MAX_SIZE, value=max(1, int(max_size)), set_default_type=int
+        )
+        self._set_data(
+            key=self.__Keys.ENTRIES, value=OrderedDict(), set_default_type=OrderedDict
+        )
+        self._set_data(key=self.__Keys.EVICTED, value=[], set_default_type=List)
+        self._set_data(key=self.__Keys.PASSED, value=0, set_default_type=int)
+        self._set_data(key=self.__Keys.SUPPRESSED, value=0, set_default_type=int)
+
+    # #[PUBLIC PROPERTIES]#############################################################
+    @property
+    def passed(self) -> int:
+        """Return the number of messages let through.
+
+        ### Returns:
+        int - Passed message count.
+        """
+        return self._get_data(key=self.__Keys.PASSED)  # type: ignore
+
+    @property
+    def size(self) -> int:
+        """Return the number of remembered fingerprints.
+
+        ### Returns:
+        int - Current LRU size.
+        """
+        return len(self.__entries)
+
+    @property
+    def suppressed(self) -> int:
+        """Return the number of dropped duplicates.
+
+        ### Returns:
+        int - Suppressed message count.
+        """
+        return self._get_data(key=self.__Keys.SUPPRESSED)  # type: ignore
+
+    # #[PUBLIC METHODS]################################################################
+    def check(self, message: Message, now: Optional[float] = None) -> bool:
+        """Record one message and decide whether it should be delivered.
+
+        ### Arguments:
+        * message: Message - Message read by the dispatcher.
+        * now: Optional[float] - Monotonic time, current time when `None`.
+
+        ### Returns:
+        bool - `True` for a new fingerprint, `False` for a suppressed duplicate.
+        """
+        if now is None:
+            now = time.monotonic()
+        entries: OrderedDict = self.__entries
+        key: Tuple = self.fingerprint(message)
+        deadline: float = now + self._get_data(key=self.__Keys.TTL)  # type: ignore
+        entry: Optional[List[Any]] = entries.get(key)
+        if entry is not None and entry[0] > now:
+            entry[1] += 1
+            self._set_data(key=self.__Keys.SUPPRESSED, value=self.suppressed + 1)
+            return False
+        if entry is not None:
+            # expired but not collected yet
+            self.__retire(entries.pop(key))
+        entries[key] = [deadline, 0, message]
+        while len(entries) > self._get_data(key=self.__Keys.MAX_SIZE):  # type: ignore
+            self.__retire(entries.popitem(last=False)[1])
+        self._set_data(key=self.__Keys.PASSED, value=self.passed + 1)
+        return True
+
+    def expire(
+        self, now: Optional[float] = None, force: bool = False
+    ) -> List[Message]:
+        """Forget expired fingerprints and return summaries of suppressed repeats.
+
+        ### Arguments:
+        * now: Optional[float] - Monotonic time, current time when `None`.
+        * force: bool - Forget every fingerprint regardless of its deadline.
+
+        ### Returns:
+        List[Message] - One summary per fingerprint with suppressed repeats.
+        """
+        if now is None:
+            now = time.monotonic()
+        entries: OrderedDict = self.__entries
+        # entries are ordered by first message, so deadlines are ordered too
+        while entries:
+            entry: List[Any] = next(iter(entries.values()))
+            if not force and entry[0] > now:
+                break
+            self.__retire(entries.popitem(last=False)[1])
+        evicted: List[Message] = self._get_data(key=self.__Keys.EVICTED)  # type: ignore
+        out: List[Message] = list(evicted)
+        evicted.clear()
+        return out
+
+    @classmethod
+    def fingerprint(cls, message: Message) -> Tuple:
+        """Return the deduplication key of a message.
+
+        ### Arguments:
+        * message: Message - Message to classify.
+
+        ### Returns:
+        Tuple - Diagnostic source, channel, subject, and body digest.
+        """
+        body = hashlib.blake2b(digest_size=16)
+        for item in message.messages:
+            body.update(str(item).encode("utf-8", "replace"))
+            body.update(b"\0")
+        if message.mmessages:
+            for name in sorted(message.mmessages):
+                body.update(f"\1{name}\1".encode())
+                for item in message.mmessages[name]:
+                    body.update(str(item).encode("utf-8", "replace"))
+                    body.update(b"\0")
+        return (
+            message.diagnostic_source,
+            message.channel,
+            message.subject,
+            body.digest(),
+        )
+
+    # #[PRIVATE PROPERTIES]############################################################
+    @property
+    def __entries(self) -> OrderedDict:
+        """Return remembered fingerprints in first-seen order.
+
+        ### Returns:
+        OrderedDict - Fingerprint to `[deadline, suppressed, first message]`.
+        """
+        return self._get_data(key=self.__Keys.ENTRIES)  # type: ignore
+
+    # #[PRIVATE METHODS]###############################################################
+    def __retire(self, entry: List[Any]) -> None:
+        """Queue a summary for a forgotten entry with suppressed repeats.
+
+        ### Arguments:
+        * entry: List[Any] - Removed `[deadline, suppressed, first message]` entry.
+        """
+        count: int = entry[1]
+        if count < 1:
+            return None
+        first: Message = entry[2]
+        out = Message()
+        if first.channel is not None:
+            out.channel = first.channel
+        if first.to:
+            out.to = list(first.to) if isinstance(first.to, list) else first.to
+        for name in ("diagnostic_source", "footer", "origin", "reply_to", "sender"):
+            value: Optional[str] = getattr(first, name)
+            if value is not None:
+                setattr(out, name, value)
+        out.priority = first.priority
+        label: str = f"suppressed {count} duplicate{'s' if count > 1 else ''}"
+        out.subject = f"[{label}] {first.subject}" if first.subject else label
+        preview: List[str] = list(first.messages)
+        if not preview and first.mmessages:
+            preview = list(first.mmessages.get(Multipart.PLAIN, []))
+        out.messages = [f"{label} of:"] + [str(item) for item in preview]
+        self._get_data(key=self.__Keys.EVICTED).append(out)  # type: ignore
+
+
+class MessageScheduler(BData):
+    """Order queued messages by priority lane and publishing source.
+
+    `Priority.CRITICAL` messages are served first, in arrival order. The other
+    lanes share the dispatcher with self-clocked weighted fair queuing: every
+    source (`Message.origin`, then `diagnostic_source`) within a lane is a
+    separate flow, so one flooding worker cannot delay messages of others.
+    Per-lane depth and wait time are kept for diagnostics.
+    """
+
+    # lane weights for weighted fair queuing, critical traffic is strict
+    WEIGHTS: Dict[int, int] = {Priority.HIGH: 4, Priority.NORMAL: 2, Priority.LOW: 1}
+
+    # lane names used in metrics
+    LANES: Dict[int, str] = {
+        Priority.CRITICAL: "critical",
+        Priority.HIGH: "high",
+        Priority.NORMAL: "normal",
+        Priority.LOW: "low",
+    }
+
+    class __Keys(object, metaclass=ReadOnlyClass):
+        """Define internal storage keys for the dispatcher scheduler."""
+
+        # #[CONSTANTS]#####################################################################
+        CRITICAL: str = "__critical__"
+        FINISH: str = "__finish__"
+        HEAP: str = "__heap__"
+        METRICS: str = "__metrics__"
+        SEQUENCE: str = "__sequence__"
+        VIRTUAL: str = "__virtual__"
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self) -> None:
+        """Initialize empty lanes."""
+        self._set_data(key=self.__Keys.CRITICAL, value=deque(), set_default_type=deque)
+        self._set_data(key=self.__Keys.HEAP, value=[], set_default_type=List)
+        self._set_data(key=self.__Keys.FINISH, value={}, set_default_type=Dict)
+        self._set_data(key=self.__Keys.SEQUENCE, value=0, set_default_type=int)
+        self._set_data(key=self.__Keys.VIRTUAL, value=0.0, set_default_type=float)
+        self._set_data(
+            key=self.__Keys.METRICS,
+            value={
+                lane: {
+                    "depth": 0,
+                    "dispatched": 0,
+                    "enqueued": 0,
+                    "wait_max": 0.0,
+                    "wait_total": 0.0,
+                }
+                for lane in self.LANES
+            },
+            set_default_type=Dict,
+        )
+
+    # #[PUBLIC PROPERTIES]#############################################################
+    @property
+    def depth(self) -> int:
+        """Return the number of scheduled messages.
+
+        ### Returns:
+        int - Messages waiting in every lane.
+        """
+        return len(self.__critical) + len(self.__heap)
+
+    @property
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Return per-lane counters.
+
+        ### Returns:
+        Dict[str, Dict[str, float]] - Lane name mapped to `depth`, `enqueued`,
+        `dispatched`, `wait_avg`, and `wait_max` (seconds).
+        """
+        out: Dict[str, Dict[str, float]] = {}
+        for lane, item in self.__metrics.items():
+            out[self.LANES[lane]] = {
+                "depth": item["depth"],
+                "dispatched": item["dispatched"],
+                "enqueued": item["enqueued"],
+                "wait_avg": (
+                    item["wait_total"] / item["dispatched"] if item["dispatched"] else 0.0
+                ),
+                "wait_max": item["wait_max"],
+            }
+        return out
+
+    # #[PUBLIC METHODS]################################################################
+    def get(self, now: Optional[float] = None) -> Optional[Message]:
+        """Return the next message to dispatch.
+
+        ### Arguments:
+        * now: Optional[float] - Monotonic time, current time when `None`.
+
+        ### Returns:
+        Optional[Message] - Next message or `None` when every lane is empty.
+        """
+        critical: Deque[Tuple[float, Message]] = self.__critical
+        heap: List[Tuple[float, int, float, Message]] = self.__heap
+        if critical:
+            queued_at, message = critical.popleft()
+        elif heap:
+            finish, _, queued_at, message = heapq.heappop(heap)
+            self._set_data(key=self.__Keys.VIRTUAL, value=finish)
+            if not heap:
+                # idle scheduler, restart virtual time and forget flows
+                self._set_data(key=self.__Keys.VIRTUAL, value=0.0)
+                self.__finish.clear()
+        else:
+            return None
+        wait: float = (time.monotonic() if now is None else now) - queued_at
+        item: Dict[str, Any] = self.__metrics[message.priority]
+        item["depth"] -= 1
+        item["dispatched"] += 1
+        item["wait_total"] += wait
+        item["wait_max"] = max(item["wait_max"], wait)
+        return message
+
+    def put(self, message: Message, now: Optional[float] = None) -> None:
+        """Schedule one message.
+
+        ### Arguments:
+        * message: Message - Message read from the dispatcher input queue.
+        * now: Optional[float] - Monotonic time, current time when `None`.
+        """
+        queued_at: float = time.monotonic() if now is None else now
+        lane: int = message.priority
+        item: Dict[str, Any] = self.__metrics[lane]
+        item["depth"] += 1
+        item["enqueued"] += 1
+        if lane == Priority.CRITICAL:
+            self.__critical.append((queued_at, message))
+            return None
+        flow: Tuple[int, str] = (
+            lane,
+            message.origin or message.diagnostic_source or "unknown",
+        )
+        finishes: Dict[Tuple[int, str], float] = self.__finish
+        finish: float = max(
+            self._get_data(key=self.__Keys.VIRTUAL), finishes.get(flow, 0.0)  # type: ignore
+        ) + 1.0 / self.WEIGHTS[lane]
+        finishes[flow] = finish
+        sequence: int = self._get_data(key=self.__Keys.SEQUENCE)  # type: ignore
+        self._set_data(key=self.__Keys.SEQUENCE, value=sequence + 1)
+        heapq.heappush(self.__heap, (finish, sequence, queued_at, message))
+
+    # #[PRIVATE PROPERTIES]############################################################
+    @property
+    def __critical(self) -> Deque[Tuple[float, Message]]:
+        """Return the strict-priority lane.
+
+        ### Returns:
+        Deque[Tuple[float, Message]] - Enqueue time and message pairs.
+        """
+        return self._get_data(key=self.__Keys.CRITICAL)  # type: ignore
+
+    @property
+    def __finish(self) -> Dict[Tuple[int, str], float]:
+        """Return the last virtual finish time of every active flow.
+
+        ### Returns:
+        Dict[Tuple[int, str], float] - Lane and source mapped to finish time.
+        """
+        return self._get_data(key=self.__Keys.FINISH)  # type: ignore
+
+    @property
+    def __heap(self) -> List[Tuple[float, int, float, Message]]:
+        """Return the weighted lanes ordered by virtual finish time.
+
+        ### Returns:
+        List[Tuple[float, int, float, Message]] - Heap of finish time,
+        sequence, enqueue time, and message.
+        """
+        return self._get_data(key=self.__Keys.HEAP)  # type: ignore
+
+    @property
+    def __metrics(self) -> Dict[int, Dict[str, Any]]:
+        """Return raw per-lane counters.
+
+        ### Returns:
+        Dict[int, Dict[str, Any]] - Priority mapped to counters.
+        """
+        return self._get_data(key=self.__Keys.METRICS)  # type: ignore
+
+
+class PendingRequests(BData):
+    """Track requests waiting for a reply routed back through the dispatcher.
+
+    Every request owns a `Future` keyed by its correlation id. Deadlines are
+    kept in a heap, so `expire()` only touches requests whose timeout passed
+    instead of scanning the whole table; entries answered earlier are skipped
+    when their heap slot comes due.
+    """
+
+    class __Keys(object, metaclass=ReadOnlyClass):
+        """Define internal storage keys for the pending request table."""
+
+        # #[CONSTANTS]#####################################################################
+        DEADLINES: str = "__deadlines__"
+        EXPIRED: str = "__expired__"
+        LOCK: str = "__lock__"
+        PENDING: str = "__pending__"
+        RESOLVED: str = "__resolved__"
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self) -> None:
+        """Initialize an empty request table."""
+        self._set_data(key=self.__Keys.PENDING, value={}, set_default_type=Dict)
+        self._set_data(key=self.__Keys.DEADLINES, value=[], set_default_type=List)
+        self._set_data(key=self.__Keys.LOCK, value=Lock())
+        self._set_data(key=self.__Keys.EXPIRED, value=0, set_default_type=int)
+        self._set_data(key=self.__Keys.RESOLVED, value=0, set_default_type=int)
+
+    # #[PUBLIC PROPERTIES]#############################################################
+    @property
+    def expired(self) -> int:
+        """Return the number of requests failed by their timeout.
+
+        ### Returns:
+        int - Expired request count.
+        """
+        return self._get_data(key=self.__Keys.EXPIRED)  # type: ignore
+
+    @property
+    def resolved(self) -> int:
+        """Return the number of requests answered by a reply.
+
+        ### Returns:
+        int - Resolved request count.
+        """
+        return self._get_data(key=self.__Keys.RESOLVED)  # type: ignore
+
+    @property
+    def size(self) -> int:
+        """Return the number of requests waiting for a reply.
+
+        ### Returns:
+        int - Pending request count.
+        """
+        return len(self.__pending)
+
+    # #[PUBLIC METHODS]################################################################
+    def add(
+        self, correlation_id: str, timeout: float, now: Optional[float] = None
+    ) -> Future:
+        """Register one request and return its future.
+
+        ### Arguments:
+        * correlation_id: str - Request identifier copied into the reply.
+        * timeout: float - Seconds to wait for the reply.
+        * now: Optional[float] - Monotonic time, current time when `None`.
+
+        ### Returns:
+        Future - Future resolved with the reply `Message`.
+
+        ### Raises:
+        * KeyError: If the correlation id is already pending.
+        """
+        if now is None:
+            now = time.monotonic()
+        future: Future = Future()
+        with self.__lock:
+            if correlation_id in self.__pending:
+                raise Raise.error(
+                    f"Request '{correlation_id}' is already pending.",
+                    KeyError,
+                    self._c_name,
+                    currentframe(),
+                )
+            self.__pending[correlation_id] = future
+            heapq.heappush(self.__deadlines, (now + timeout, correlation_id))
+        return future
+
+    def expire(self, now: Optional[float] = None, force: bool = False) -> int:
+        """Fail requests whose timeout passed with `TimeoutError`.
+
+        ### Arguments:
+        * now: Optional[float] - Monotonic time, current time when `None`.
+        * force: bool - Fail every pending request, used on shutdown.
+
+        ### Returns:
+        int - Number of failed requests.
+        """
+        if now is None:
+            now = time.monotonic()
+        deadlines: List[Tuple[float, str]] = self.__deadlines
+        futures: List[Tuple[str, Future]] = []
+        with self.__lock:
+            while deadlines and (force or deadlines[0][0] <= now):
+                _, correlation_id = heapq.heappop(deadlines)
+                future: Optional[Future] = self.__pending.pop(correlation_id, None)
+                if future is not None:
+                    futures.append((correlation_id, future))
+            self._set_data(key=self.__Keys.EXPIRED, value=self.expired + len(futures))
+        for correlation_id, future in futures:
+            self.__complete(
+                future,
+                error=TimeoutError(f"No reply to request '{correlation_id}'."),
+            )
+        return len(futures)
+
+    def fail(self, correlation_id: str, error: BaseException) -> bool:
+        """Fail one pending request before its timeout.
+
+        ### Arguments:
+        * correlation_id: str - Request identifier.
+        * error: BaseException - Exception set on the request future.
+
+        ### Returns:
+        bool - `True` when the request was pending.
+        """
+        with self.__lock:
+            future: Optional[Future] = self.__pending.pop(correlation_id, None)
+        if future is None:
+            return False
+        self.__complete(future, error=error)
+        return True
+
+    def resolve(self, message: Message) -> bool:
+        """Complete the request answered by a reply message.
+
+        ### Arguments:
+        * message: Message - Reply with `in_reply_to` set.
+
+        ### Returns:
+        bool - `True` when a pending request was answered, `False` for
+        unknown or already expired correlation ids.
+        """
+        with self.__lock:
+            future: Optional[Future] = self.__pending.pop(
+                str(message.in_reply_to), None
+            )
+            if future is None:
+                return False
+            self._set_data(key=self.__Keys.RESOLVED, value=self.resolved + 1)
+        self.__complete(future, result=message)
+        return True
+
+    # #[PRIVATE PROPERTIES]############################################################
+    @property
+    def __deadlines(self) -> List[Tuple[float, str]]:
+        """Return the deadline heap.
+
+        ### Returns:
+        List[Tuple[float, str]] - Deadline and correlation id pairs.
+        """
+        return self._get_data(key=self.__Keys.DEADLINES)  # type: ignore
+
+    @property
+    def __lock(self) -> Lock:
+        """Return the table lock shared by plugin and dispatcher threads.
+
+        ### Returns:
+        Lock - Table lock.
+        """
+        return self._get_data(key=self.__Keys.LOCK)  # type: ignore
+
+    @property
+    def __pending(self) -> Dict[str, Future]:
+        """Return futures keyed by correlation id.
+
+        ### Returns:
+        Dict[str, Future] - Pending requests.
+        """
+        return self._get_data(key=self.__Keys.PENDING)  # type: ignore
+
+    # #[PRIVATE METHODS]###############################################################
+    def __complete(
+        self,
+        future: Future,
+        result: Optional[Message] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Set the outcome of a future the caller has not cancelled.
+
+        ### Arguments:
+        * future: Future - Request future.
+        * result: Optional[Message] - Reply message.
+        * error: Optional[BaseException] - Failure reason.
+        """
+        if future.done():
+            return None
+        try:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            pass
+
+
 class ThDispatcher(Thread, ThBaseObject, ThProcessorMixin):
     """Route outbound messages to queues registered for communication plugins."""
 
@@ -895,7 +1745,18 @@ class ThDispatcher(Thread, ThBaseObject, ThProcessorMixin):
         """Define internal storage keys for dispatcher queue registration."""
 
         # #[CONSTANTS]#####################################################################
+        MSG_CAPTURE: str = "__capture__"
         MSG_COM_QUEUES: str = "__com_q__"
+        MSG_DEDUP: str = "__dedup__"
+        MSG_REQUESTS: str = "__requests__"
+        MSG_ROUTING: str = "__routing__"
+        MSG_SCHEDULER: str = "__scheduler__"
+
+    # maximum number of messages moved from `qcom` to the lanes per dispatch
+    INGEST_BATCH: int = 1000
+
+    # maximum number of messages held in the lanes, the rest waits in `qcom`
+    LANE_LIMIT: int = 3000
 
     # #[CONSTRUCTOR]##################################################################
     def __init__(
@@ -904,6 +1765,10 @@ class ThDispatcher(Thread, ThBaseObject, ThProcessorMixin):
         qcom: Queue,
         verbose: bool = False,
         debug: bool = False,
+        dedup_ttl: float = 0.0,
+        dedup_size: int = 4096,
+        routing: Optional["RoutingTable"] = None,
+        capture: Optional["MessageCapture"] = None,
     ) -> None:
         """Initialize the dispatcher thread.
 
@@ -912,6 +1777,12 @@ class ThDispatcher(Thread, ThBaseObject, ThProcessorMixin):
         * qcom: Queue - Shared message queue read by the dispatcher.
         * verbose: bool - Initial verbose flag value.
         * debug: bool - Initial debug flag value.
+        * dedup_ttl: float - Duplicate suppression period, `0` disables it.
+        * dedup_size: int - Maximum number of remembered message fingerprints.
+        * routing: Optional[RoutingTable] - Content-based routing rules applied
+          before the channel lookup.
+        * capture: Optional[MessageCapture] - Recorder of routed messages,
+          opened and closed together with the routing loop.
         """
         # Thread initialization
         Thread.__init__(self, name=self._c_name)
@@ -937,6 +1808,92 @@ class ThDispatcher(Thread, ThBaseObject, ThProcessorMixin):
         # }
         self._set_data(key=self.__Keys.MSG_COM_QUEUES, value={}, set_default_type=Dict)
 
+        # optional duplicate and flap suppression
+        self._set_data(
+            key=self.__Keys.MSG_DEDUP,
+            value=(
+                MessageDeduplicator(ttl=dedup_ttl, max_size=dedup_size)
+                if dedup_ttl > 0
+                else None
+            ),
+            set_default_type=Optional[MessageDeduplicator],
+        )
+
+        # optional content-based routing table
+        self._set_data(key=self.__Keys.MSG_ROUTING, value=routing)
+
+        # optional recorder of routed messages
+        self._set_data(key=self.__Keys.MSG_CAPTURE, value=capture)
+
+        # requests waiting for replies routed back to the publishing plugin
+        self._set_data(
+            key=self.__Keys.MSG_REQUESTS,
+            value=PendingRequests(),
+            set_default_type=PendingRequests,
+        )
+
+        # priority lanes between the shared queue and the target queues
+        self._set_data(
+            key=self.__Keys.MSG_SCHEDULER,
+            value=MessageScheduler(),
+            set_default_type=MessageScheduler,
+        )
+
+    # #[PUBLIC PROPERTIES]#############################################################
+    @property
+    def capture(self) -> Optional["MessageCapture"]:
+        """Return the recorder of routed messages.
+
+        ### Returns:
+        Optional[MessageCapture] - Capture or `None` when capturing is disabled.
+        """
+        return self._get_data(key=self.__Keys.MSG_CAPTURE)
+
+    @property
+    def dedup(self) -> Optional[MessageDeduplicator]:
+        """Return the duplicate filter.
+
+        ### Returns:
+        Optional[MessageDeduplicator] - Filter or `None` when disabled.
+        """
+        return self._get_data(key=self.__Keys.MSG_DEDUP)
+
+    @property
+    def lane_metrics(self) -> Dict[str, Dict[str, float]]:
+        """Return per-lane depth and wait-time counters.
+
+        ### Returns:
+        Dict[str, Dict[str, float]] - See `MessageScheduler.metrics`.
+        """
+        return self.scheduler.metrics
+
+    @property
+    def requests(self) -> PendingRequests:
+        """Return the table of requests waiting for a reply.
+
+        ### Returns:
+        PendingRequests - Request table shared with `DispatcherAdapter`.
+        """
+        return self._get_data(key=self.__Keys.MSG_REQUESTS)  # type: ignore
+
+    @property
+    def routing(self) -> Optional["RoutingTable"]:
+        """Return the content-based routing table.
+
+        ### Returns:
+        Optional[RoutingTable] - Routing table or `None` for channel routing.
+        """
+        return self._get_data(key=self.__Keys.MSG_ROUTING)
+
+    @property
+    def scheduler(self) -> MessageScheduler:
+        """Return the priority lane scheduler.
+
+        ### Returns:
+        MessageScheduler - Scheduler used by the routing loop.
+        """
+        return self._get_data(key=self.__Keys.MSG_SCHEDULER)  # type: ignore
+
     # #[PRIVATE PROPERTIES]############################################################
     @property
     def __get_comm_queues(self) -> Dict[str, List[Queue]]:
@@ -967,14 +1924,39 @@ class ThDispatcher(Thread, ThBaseObject, ThProcessorMixin):
                 self._c_name,
                 currentframe(),
             )
-        if str(channel) not in self.__get_comm_queues.keys():
-            self.__get_comm_queues[str(channel)] = []
         queue = Queue(maxsize=3000)
         if self._debug:
             self.logs.message_debug = f"add queue for communication channel: {channel}"
-        self.__get_comm_queues[str(channel)].append(queue)
+        # copy-on-write keeps the routing loop safe while queues are registered
+        self.__get_comm_queues[str(channel)] = self.__get_comm_queues.get(
+            str(channel), []
+        ) + [queue]
         return queue
 
+    def unregister_queue(self, channel: int, queue: Queue) -> bool:
+        """Remove a target queue registered for the selected channel.
+
+        ### Arguments:
+        * channel: int - Channel identifier the queue was registered for.
+        * queue: Queue - Queue returned by `register_queue()`.
+
+        ### Returns:
+        bool - `True` when the queue was registered and has been removed.
+        """
+        queues: List[Queue] = self.__get_comm_queues.get(str(channel), [])
+        if queue not in queues:
+            return False
+        remaining: List[Queue] = [item for item in queues if item is not queue]
+        if remaining:
+            self.__get_comm_queues[str(channel)] = remaining
+        else:
+            self.__get_comm_queues.pop(str(channel), None)
+        if self._debug:
+            self.logs.message_debug = (
+                f"remove queue for communication channel: {channel}"
+            )
+        return True
+
     def run(self) -> None:
         """Read shared messages and forward them to registered channel queues."""
         # 1. read qcom
@@ -984,31 +1966,44 @@ class ThDispatcher(Thread, ThBaseObject, ThProcessorMixin):
             self.logs.message_debug = "entering to the main loop"
 
         if self.qcom is not None:
+            scheduler: MessageScheduler = self.scheduler
+            capture: Optional["MessageCapture"] = self.capture
+            if capture is not None:
+                capture.open()
             while self.stopped != True:
                 try:
-                    message: Message = self.qcom.get(block=True, timeout=0.1)
-                    if message is None:
-                        continue
-
-                    try:
-                        self.__dispatch_message(message)
-                    except Exception as ex:
-                        self.logs.message_critical = (
-                            f'error while dispatch message: "{ex}"'
-                        )
-                    self.qcom.task_done()
-
+                    self.__ingest_messages()
                 except Empty:
                     pass
                 except Exception as ex:
                     self.logs.message_critical = (
                         f'error while processing message: "{ex}"'
                     )
+                self.__dispatch_next()
+                self.__expire_duplicates()
+                self.requests.expire()
+            while scheduler.depth:
+                self.__dispatch_next()
+            self.__expire_duplicates(force=True)
+            self.requests.expire(force=True)
+            if capture is not None:
+                capture.close()
+            if self._debug:
+                self.__log_lane_metrics()
 
         if self._debug:
             self.logs.message_debug = "exit from loop"
 
     # #[PRIVATE METHODS]###############################################################
+    def __log_lane_metrics(self) -> None:
+        """Log dispatched count and wait times of every priority lane."""
+        for lane, item in self.lane_metrics.items():
+            self.logs.message_debug = (
+                f"lane {lane}: dispatched={int(item['dispatched'])} "
+                f"wait_avg={item['wait_avg'] * 1000:.3f}ms "
+                f"wait_max={item['wait_max'] * 1000:.3f}ms"
+            )
+
     def __dispatch_message(self, message: Message) -> None:
         """Forward one message to every queue registered for its channel.
 
@@ -1026,25 +2021,142 @@ class ThDispatcher(Thread, ThBaseObject, ThProcessorMixin):
                 currentframe(),
             )
         if self._debug:
-            self.logs.message_debug = (
-                f"Received message for channel: '{message.channel}'"
-            )
-        if str(message.channel) in self.__get_comm_queues.keys():
-            for item in self.__get_comm_queues[str(message.channel)]:
+            self.logs.message_debug = f"Received message {message.log_fields}"
+        dedup: Optional[MessageDeduplicator] = self.dedup
+        if (
+            dedup is not None
+            and message.correlation_id is None
+            and not dedup.check(message)
+        ):
+            if self._debug:
+                self.logs.message_debug = (
+                    f"Suppressed duplicate from '{self.__message_source(message)}' "
+                    f"{message.log_fields}"
+                )
+            return None
+        self.__forward(message)
+
+    def __dispatch_next(self) -> None:
+        """Dispatch the next scheduled message and acknowledge it on `qcom`."""
+        qcom: Optional[Queue] = self.qcom
+        if qcom is None:
+            return None
+        message: Optional[Message] = self.scheduler.get()
+        if message is None:
+            return None
+        try:
+            self.__dispatch_message(message)
+        except Exception as ex:
+            self.logs.message_critical = f'error while dispatch message: "{ex}"'
+        qcom.task_done()
+
+    def __expire_duplicates(self, force: bool = False) -> None:
+        """Dispatch summaries of duplicates whose suppression ended.
+
+        ### Arguments:
+        * force: bool - End every suppression, used on shutdown.
+        """
+        dedup: Optional[MessageDeduplicator] = self.dedup
+        if dedup is None:
+            return None
+        for summary in dedup.expire(force=force):
+            try:
+                self.__forward(summary)
+            except Exception as ex:
+                self.logs.message_critical = (
+                    f'error while dispatch duplicate summary: "{ex}"'
+                )
+
+    def __forward(self, message: Message) -> None:
+        """Put one message into every queue registered for its target channels.
+
+        Target channels come from the first matching routing rule, or from
+        `message.channel` when no rule matches. The message is recorded by the
+        capture, when enabled, before delivery.
+
+        ### Arguments:
+        * message: Message - Message object to deliver.
+        """
+        channels: List[Any] = [message.channel]
+        routing: Optional["RoutingTable"] = self.routing
+        if routing is not None:
+            targets: Optional[List[int]] = routing.route(message)
+            if targets is not None:
+                channels = targets
+                if self._debug:
+                    self.logs.message_debug = (
+                        f"Routed message {message.log_fields} "
+                        f"to channels: {targets}"
+                    )
+        capture: Optional["MessageCapture"] = self.capture
+        if capture is not None:
+            capture.record(message, channels)
+        comm_queues: Dict[str, List[Queue]] = self.__get_comm_queues
+        queues: List[Queue] = []
+        for channel in channels:
+            queues.extend(comm_queues.get(str(channel), []))
+        if queues:
+            for item in queues:
                 try:
                     queue: Queue = item
                     queue.put(message, block=True, timeout=0.1)
                 except Full:
                     self.logs.message_critical = (
-                        f"Queue is full exception... check procedure."
+                        f"Queue is full exception... check procedure. "
+                        f"{message.log_fields}"
                     )
         else:
+            if message.correlation_id is not None:
+                # fail the request now instead of waiting for its timeout
+                self.requests.fail(
+                    message.correlation_id,
+                    LookupError(f"No consumer for channel '{message.channel}'."),
+                )
             self.logs.message_warning = (
-                f"Discarded message for unregistered channel '{message.channel}'. "
+                "Discarded message for unregistered channel "
+                f"'{'|'.join(str(item) for item in channels)}'. "
                 f"Source: '{self.__message_source(message)}'. "
                 f"Summary: {self.__message_summary(message)}"
             )
 
+    def __ingest_messages(self) -> None:
+        """Move queued messages from `qcom` into the priority lanes.
+
+        Waits for the first message only while every lane is empty, then takes
+        what is already queued, up to `INGEST_BATCH` messages and while the
+        lanes hold fewer than `LANE_LIMIT` messages, so a flood stays in `qcom`
+        instead of growing the lanes. Replies to pending requests bypass the
+        lanes and complete their request at once.
+
+        ### Raises:
+        * Empty: When no message is waiting.
+        """
+        qcom: Optional[Queue] = self.qcom
+        scheduler: MessageScheduler = self.scheduler
+        if qcom is None or scheduler.depth >= self.LANE_LIMIT:
+            return None
+        message: Optional[Message] = qcom.get(block=scheduler.depth == 0, timeout=0.1)
+        count: int = 0
+        while True:
+            if isinstance(message, Message) and message.in_reply_to is not None:
+                self.__resolve_reply(message)
+                qcom.task_done()
+            elif isinstance(message, Message):
+                scheduler.put(message)
+            else:
+                if message is not None:
+                    try:
+                        self.__dispatch_message(message)
+                    except Exception as ex:
+                        self.logs.message_critical = (
+                            f'error while dispatch message: "{ex}"'
+                        )
+                qcom.task_done()
+            count += 1
+            if count >= self.INGEST_BATCH or scheduler.depth >= self.LANE_LIMIT:
+                return None
+            message = qcom.get(block=False)
+
     def __message_source(self, message: Message) -> str:
         """Return a human-readable technical source for dispatcher diagnostics.
 
@@ -1089,8 +2201,19 @@ class ThDispatcher(Thread, ThBaseObject, ThProcessorMixin):
 
         return (
             f"{summary}, recipients={recipients_count}, "
-            f"fragments={fragments_count}, channel={message.channel}"
+            f"fragments={fragments_count}, {message.log_fields}"
         )
 
+    def __resolve_reply(self, message: Message) -> None:
+        """Complete the pending request answered by a reply.
+
+        ### Arguments:
+        * message: Message - Reply with `in_reply_to` set.
+        """
+        if not self.requests.resolve(message) and self._debug:
+            self.logs.message_debug = (
+                f"Dropped reply to unknown or expired request '{message.in_reply_to}'"
+            )
+
 
 # #[EOF]#######################################################################
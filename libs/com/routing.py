@@ -0,0 +1,292 @@
+# -*- coding: UTF-8 -*-
+"""
+Content-based message routing.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Compile declarative routing rules into an index used by the dispatcher.
+"""
+
+import re
+
+from dataclasses import dataclass
+from inspect import currentframe
+from typing import Dict, FrozenSet, List, Optional, Pattern, Tuple
+
+from jsktoolbox.attribtool import ReadOnlyClass
+from jsktoolbox.basetool import BData
+from jsktoolbox.raisetool import Raise
+
+from libs.com.message import Message, Priority
+
+
+class _Keys(object, metaclass=ReadOnlyClass):
+    """Define internal storage keys for the routing table."""
+
+    # #[CONSTANTS]####################################################################
+    CACHE: str = "__cache__"
+    ERRORS: str = "__errors__"
+    INDEX: str = "__index__"
+    RULES: str = "__rules__"
+
+
+@dataclass(frozen=True, slots=True)
+class RoutingRule:
+    """Store one compiled routing rule.
+
+    Empty `channels`, `origins`, and `priorities` match any value.
+    """
+
+    index: int
+    text: str
+    targets: Tuple[int, ...]
+    channels: Tuple[int, ...] = ()
+    origins: Tuple[str, ...] = ()
+    priorities: FrozenSet[int] = frozenset()
+    subject: Optional[Pattern] = None
+
+    # #[PUBLIC METHODS]###############################################################
+    def matches(self, message: Message) -> bool:
+        """Check the conditions not covered by the routing index.
+
+        ### Arguments:
+        * message: Message - Routed message.
+
+        ### Returns:
+        bool - `True` when priority and subject conditions match.
+        """
+        if self.priorities and message.priority not in self.priorities:
+            return False
+        if self.subject is not None:
+            return self.subject.search(message.subject or "") is not None
+        return True
+
+
+class RoutingTable(BData):
+    """Route messages to channels selected by the first matching rule.
+
+    Rules use the `conditions -> targets` format, for example
+    `channel=1;origin=ping;priority=critical;subject=^DOWN -> 9|10`.
+    Conditions are `channel`, `origin` (plugin instance), `priority` (names or
+    numbers), and `subject` (regular expression, always the last condition).
+    `|` separates alternatives; `*` or no conditions match every message.
+
+    Rules are indexed by channel and origin at load time, so a lookup checks
+    only the rules that can match the message pair instead of the whole table.
+    """
+
+    # lookup cache bound, distinct channel and origin pairs
+    CACHE_SIZE: int = 4096
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self, rules: List[str]) -> None:
+        """Compile routing rules.
+
+        Invalid rules are skipped and reported through `errors`.
+
+        ### Arguments:
+        * rules: List[str] - Rule definitions in evaluation order.
+        """
+        self._set_data(key=_Keys.RULES, value=[], set_default_type=List)
+        self._set_data(key=_Keys.ERRORS, value=[], set_default_type=List)
+        self._set_data(key=_Keys.INDEX, value={}, set_default_type=Dict)
+        self._set_data(key=_Keys.CACHE, value={}, set_default_type=Dict)
+        index: Dict[Tuple[Optional[int], Optional[str]], List[RoutingRule]] = (
+            self.__index
+        )
+        for text in rules:
+            try:
+                rule: RoutingRule = self.parse_rule(str(text), len(self.rules))
+            except ValueError as ex:
+                self.errors.append(str(ex))
+                continue
+            self.rules.append(rule)
+            for channel in rule.channels or (None,):
+                for origin in rule.origins or (None,):
+                    index.setdefault((channel, origin), []).append(rule)
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def errors(self) -> List[str]:
+        """Return messages for rules rejected at load time.
+
+        ### Returns:
+        List[str] - One message per invalid rule.
+        """
+        return self._get_data(key=_Keys.ERRORS)  # type: ignore
+
+    @property
+    def rules(self) -> List[RoutingRule]:
+        """Return compiled rules in evaluation order.
+
+        ### Returns:
+        List[RoutingRule] - Compiled rules.
+        """
+        return self._get_data(key=_Keys.RULES)  # type: ignore
+
+    # #[PUBLIC METHODS]###############################################################
+    @classmethod
+    def parse_rule(cls, text: str, index: int = 0) -> RoutingRule:
+        """Compile one rule definition.
+
+        ### Arguments:
+        * text: str - Rule in `conditions -> targets` format.
+        * index: int - Rule position used for first-match ordering.
+
+        ### Returns:
+        RoutingRule - Compiled rule.
+
+        ### Raises:
+        * ValueError: If the rule cannot be parsed.
+        """
+        conditions, sep, targets = text.rpartition("->")
+        if not sep:
+            raise Raise.error(
+                f"Routing rule '{text}' is missing the '->' target separator.",
+                ValueError,
+                cls.__name__,
+                currentframe(),
+            )
+        fields: Dict[str, str] = {}
+        rest: str = conditions.strip()
+        if rest == "*":
+            rest = ""
+        while rest:
+            key, eq, value = rest.partition("=")
+            key = key.strip().lower()
+            if not eq or key not in ("channel", "origin", "priority", "subject"):
+                raise Raise.error(
+                    f"Routing rule '{text}' has an unknown condition '{key}'.",
+                    ValueError,
+                    cls.__name__,
+                    currentframe(),
+                )
+            if key == "subject":
+                # the expression may contain ';', it always ends the conditions
+                fields[key], rest = value.strip(), ""
+            else:
+                value, _, rest = value.partition(";")
+                fields[key] = value.strip()
+                rest = rest.strip()
+        try:
+            channels: Tuple[int, ...] = tuple(cls.__alternatives(targets, int))
+            if not channels:
+                raise ValueError("no target channels")
+            return RoutingRule(
+                index=index,
+                text=text,
+                targets=channels,
+                channels=tuple(cls.__alternatives(fields.get("channel", ""), int)),
+                origins=tuple(cls.__alternatives(fields.get("origin", ""), str)),
+                priorities=frozenset(
+                    cls.__priority(item)
+                    for item in cls.__alternatives(fields.get("priority", ""), str)
+                ),
+                subject=re.compile(fields["subject"]) if "subject" in fields else None,
+            )
+        except (re.error, ValueError) as ex:
+            raise Raise.error(
+                f"Routing rule '{text}' is invalid: {ex}",
+                ValueError,
+                cls.__name__,
+                currentframe(),
+            )
+
+    def route(self, message: Message) -> Optional[List[int]]:
+        """Return the target channels of the first matching rule.
+
+        ### Arguments:
+        * message: Message - Routed message.
+
+        ### Returns:
+        Optional[List[int]] - Target channels, `None` when no rule matches.
+        """
+        for rule in self.__candidates(message.channel, message.origin):
+            if rule.matches(message):
+                return list(rule.targets)
+        return None
+
+    # #[PRIVATE PROPERTIES]###########################################################
+    @property
+    def __index(self) -> Dict[Tuple[Optional[int], Optional[str]], List[RoutingRule]]:
+        """Return rules keyed by channel and origin, `None` for any value.
+
+        ### Returns:
+        Dict[Tuple[Optional[int], Optional[str]], List[RoutingRule]] - Index.
+        """
+        return self._get_data(key=_Keys.INDEX)  # type: ignore
+
+    # #[PRIVATE METHODS]##############################################################
+    @classmethod
+    def __alternatives(cls, value: str, kind: type) -> List:
+        """Split a `|` separated condition value.
+
+        ### Arguments:
+        * value: str - Raw condition value.
+        * kind: type - Conversion applied to every item.
+
+        ### Returns:
+        List - Converted items, empty for an empty value or `*`.
+        """
+        value = value.strip()
+        if not value or value == "*":
+            return []
+        return [kind(item.strip()) for item in value.split("|") if item.strip()]
+
+    def __candidates(
+        self, channel: Optional[int], origin: Optional[str]
+    ) -> List[RoutingRule]:
+        """Return the rules that can match a channel and origin pair.
+
+        ### Arguments:
+        * channel: Optional[int] - Message channel.
+        * origin: Optional[str] - Publishing plugin instance.
+
+        ### Returns:
+        List[RoutingRule] - Candidate rules in evaluation order.
+        """
+        cache: Dict[Tuple[Optional[int], Optional[str]], List[RoutingRule]] = (
+            self._get_data(key=_Keys.CACHE)  # type: ignore
+        )
+        key: Tuple[Optional[int], Optional[str]] = (channel, origin)
+        out: Optional[List[RoutingRule]] = cache.get(key)
+        if out is not None:
+            return out
+        index = self.__index
+        out = []
+        for item in {
+            (channel, origin),
+            (channel, None),
+            (None, origin),
+            (None, None),
+        }:
+            out.extend(index.get(item, []))
+        out.sort(key=lambda rule: rule.index)
+        if len(cache) >= self.CACHE_SIZE:
+            cache.clear()
+        cache[key] = out
+        return out
+
+    @classmethod
+    def __priority(cls, value: str) -> int:
+        """Return a priority from its name or number.
+
+        ### Arguments:
+        * value: str - `Priority` name, for example `critical`, or number.
+
+        ### Returns:
+        int - Priority value.
+
+        ### Raises:
+        * ValueError: If the priority is unknown.
+        """
+        if value.isdigit():
+            return int(value)
+        out: Optional[int] = getattr(Priority, value.upper(), None)
+        if not isinstance(out, int):
+            raise ValueError(f"unknown priority '{value}'")
+        return out
+
+
+# #[EOF]#######################################################################
@@ -9,10 +9,11 @@ Purpose: Provide configuration loading, generation, and plugin discovery logic.
 """
 
 import socket
+import tempfile
 
 from inspect import currentframe
 from pathlib import Path
-from typing import Dict, Optional, List, Tuple
+from typing import Any, Dict, Optional, List, Tuple
 
 from jsktoolbox.attribtool import ReadOnlyClass
 from jsktoolbox.raisetool import Raise
@@ -32,6 +33,8 @@ from libs.plugins import PluginDefinition, PluginLoader
 from libs.plugins.config import PluginConfigParser
 from libs.templates import PluginConfigSchemaRenderer
 from libs.templates.modules import TemplateConfigItem
+from libs.tools.confdigest import ConfigChangeSet, ConfigDigest
+from libs.tools.startup import StartupCategory, StartupProfiler
 
 
 class _Keys(object, metaclass=ReadOnlyClass):
@@ -41,6 +44,8 @@ class _Keys(object, metaclass=ReadOnlyClass):
     # internal vars
     APP_NAME: str = "__app_name__"
     CF: str = "__cf__"
+    CONF_CHANGES: str = "__config_changes__"
+    CONF_DIGESTS: str = "__config_digests__"
     CONF_FILE: str = "__CONF_FILE__"
     CONF_REVIEW_MESSAGE: str = "__config_review_message__"
     CONF_REVIEW_REQUIRED: str = "__config_review_required__"
@@ -52,15 +57,32 @@ class _Keys(object, metaclass=ReadOnlyClass):
     PASSWORD: str = "__password__"
     PASSWORD_SECTION: str = "__pass_section__"
     PASSWORD_VARNAME: str = "__pass_var__"
+    PLUGIN_INSTANCES: str = "__plugin_instances__"
     START_TIME: str = "__start_time__"
     VERBOSE: str = "__VERBOSE__"
     VERSION: str = "__VERSION__"
 
     # config keys
+    MC_AUTO_RELOAD: str = "auto_reload"
+    MC_CAPTURE_FILE: str = "capture_file"
     MC_DEBUG: str = "debug"
+    MC_DEDUP_SIZE: str = "dedup_size"
+    MC_DEDUP_TTL: str = "dedup_ttl"
+    MC_JSON_LOG: str = "json_log"
+    MC_JSON_LOG_ROTATE_COUNT: str = "json_log_rotate_count"
+    MC_JSON_LOG_ROTATE_SIZE: str = "json_log_rotate_size"
+    MC_LOG_BURST: str = "log_burst"
+    MC_LOG_QUEUE_SIZE: str = "log_queue_size"
+    MC_LOG_RATE: str = "log_rate"
+    MC_LOG_RATE_EXEMPT: str = "log_rate_exempt"
+    MC_PROFILE_DIR: str = "profile_dir"
+    MC_PROFILE_RATE: str = "profile_rate"
     MC_SALT: str = "salt"
+    MC_USAGE_INTERVAL: str = "usage_interval"
+    MC_USAGE_MEMORY: str = "usage_memory"
     MC_VERBOSE: str = "verbose"
     MC_PLUGINS_DIR: str = "plugins_dir"
+    MC_ROUTES: str = "routes"
 
 
 class _MainConfig(PluginConfigMixin):
@@ -156,6 +178,32 @@ class AppConfig(LogsMixin, ConfigHandlerMixin, ConfigSectionMixin):
         self.__main._set_data(key=_Keys.APP_NAME, value=value, set_default_type=str)
         self._section = value
 
+    @property
+    def auto_reload(self) -> bool:
+        """Return whether file changes should trigger an automatic reload.
+
+        ### Returns:
+        bool - Value of the main-section `auto_reload` flag, `False` when unset.
+        """
+        if self._cfh and self._section and self._cfh.get(
+            self._section, _Keys.MC_AUTO_RELOAD
+        ):
+            return True
+        return False
+
+    @property
+    def capture_file(self) -> Optional[str]:
+        """Return the dispatcher message capture file path.
+
+        ### Returns:
+        Optional[str] - File path from the main section, `None` when disabled.
+        """
+        if self._cfh and self._section:
+            path: Optional[str] = self._cfh.get(self._section, _Keys.MC_CAPTURE_FILE)
+            if path:
+                return str(path)
+        return None
+
     @property
     def cf(self) -> Optional[ConfigTool]:
         """Return the bound configuration handler.
@@ -237,6 +285,32 @@ class AppConfig(LogsMixin, ConfigHandlerMixin, ConfigSectionMixin):
         """
         self.__main._set_data(key=_Keys.DEBUG, value=value, set_default_type=bool)
 
+    @property
+    def dedup_size(self) -> int:
+        """Return the number of message fingerprints kept by the dispatcher.
+
+        ### Returns:
+        int - Main-section `dedup_size`, `4096` when unset.
+        """
+        if self._cfh and self._section:
+            size: Optional[int] = self._cfh.get(self._section, _Keys.MC_DEDUP_SIZE)
+            if size is not None:
+                return int(size)
+        return 4096
+
+    @property
+    def dedup_ttl(self) -> int:
+        """Return the dispatcher duplicate suppression period.
+
+        ### Returns:
+        int - Main-section `dedup_ttl` in seconds, `0` (disabled) when unset.
+        """
+        if self._cfh and self._section:
+            ttl: Optional[int] = self._cfh.get(self._section, _Keys.MC_DEDUP_TTL)
+            if ttl is not None:
+                return int(ttl)
+        return 0
+
     @property
     def fqdn(self) -> str:
         """Return the current host FQDN.
@@ -271,6 +345,121 @@ class AppConfig(LogsMixin, ConfigHandlerMixin, ConfigSectionMixin):
             self.logs.message_error = f"cannot discover plugins: '{ex}'"
             return []
 
+    @property
+    def json_log(self) -> Optional[str]:
+        """Return the structured JSON-lines log file path.
+
+        ### Returns:
+        Optional[str] - File path from the main section, `None` when disabled.
+        """
+        if self._cfh and self._section:
+            path: Optional[str] = self._cfh.get(self._section, _Keys.MC_JSON_LOG)
+            if path:
+                return str(path)
+        return None
+
+    @property
+    def json_log_rotate_count(self) -> int:
+        """Return the number of rotated JSON log files kept on disk.
+
+        ### Returns:
+        int - Main-section `json_log_rotate_count`, `5` when unset.
+        """
+        if self._cfh and self._section:
+            count: Optional[int] = self._cfh.get(
+                self._section, _Keys.MC_JSON_LOG_ROTATE_COUNT
+            )
+            if count is not None:
+                return int(count)
+        return 5
+
+    @property
+    def json_log_rotate_size(self) -> int:
+        """Return the JSON log size in bytes that triggers rotation.
+
+        ### Returns:
+        int - Main-section `json_log_rotate_size`, 10 MiB when unset.
+        """
+        if self._cfh and self._section:
+            size: Optional[int] = self._cfh.get(
+                self._section, _Keys.MC_JSON_LOG_ROTATE_SIZE
+            )
+            if size is not None:
+                return int(size)
+        return 10485760
+
+    @property
+    def last_changes(self) -> ConfigChangeSet:
+        """Return the section change set produced by the last load or reload.
+
+        ### Returns:
+        ConfigChangeSet - Sections added, changed, or removed by the last load.
+        """
+        obj: Optional[ConfigChangeSet] = self.__main._get_data(
+            key=_Keys.CONF_CHANGES, default_value=None
+        )
+        if obj is None:
+            return ConfigChangeSet()
+        return obj
+
+    @property
+    def log_burst(self) -> int:
+        """Return the burst of log lines allowed for one source.
+
+        ### Returns:
+        int - Main-section `log_burst`, `100` when unset.
+        """
+        if self._cfh and self._section:
+            burst: Optional[int] = self._cfh.get(self._section, _Keys.MC_LOG_BURST)
+            if burst is not None:
+                return int(burst)
+        return 100
+
+    @property
+    def log_queue_size(self) -> int:
+        """Return the maximum number of queued log lines.
+
+        ### Returns:
+        int - Main-section `log_queue_size`, `10000` when unset.
+        """
+        if self._cfh and self._section:
+            size: Optional[int] = self._cfh.get(self._section, _Keys.MC_LOG_QUEUE_SIZE)
+            if size is not None:
+                return int(size)
+        return 10000
+
+    @property
+    def log_rate(self) -> float:
+        """Return the sustained log line rate allowed for one source.
+
+        ### Returns:
+        float - Main-section `log_rate` per second, `20` when unset, `0`
+        disables rate limiting.
+        """
+        if self._cfh and self._section:
+            rate: Optional[float] = self._cfh.get(self._section, _Keys.MC_LOG_RATE)
+            if rate is not None:
+                return float(rate)
+        return 20.0
+
+    @property
+    def log_rate_exempt(self) -> Optional[List[str]]:
+        """Return the log levels never rate limited.
+
+        ### Returns:
+        Optional[List[str]] - Upper-cased main-section `log_rate_exempt`
+        levels, `None` when unset so the queue default applies.
+        """
+        if self._cfh and self._section:
+            levels: Any = self._cfh.get(self._section, _Keys.MC_LOG_RATE_EXEMPT)
+            if isinstance(levels, str):
+                levels = [levels]
+            if isinstance(levels, list):
+                return [
+                    str(item).strip().upper() for item in levels if str(item).strip()
+                ]
+        return None
+
     @property
     def password(self) -> bool:
         """Return the one-shot password update flag.
@@ -331,6 +520,47 @@ class AppConfig(LogsMixin, ConfigHandlerMixin, ConfigSectionMixin):
             key=_Keys.MC_PLUGINS_DIR, value=value, set_default_type=str
         )
 
+    @property
+    def profile_dir(self) -> str:
+        """Return the directory receiving sampling profiler output.
+
+        ### Returns:
+        str - Main-section `profile_dir`, the system temp directory when unset.
+        """
+        if self._cfh and self._section:
+            path: Optional[str] = self._cfh.get(self._section, _Keys.MC_PROFILE_DIR)
+            if path:
+                return str(path)
+        return tempfile.gettempdir()
+
+    @property
+    def profile_rate(self) -> int:
+        """Return the sampling profiler rate.
+
+        ### Returns:
+        int - Main-section `profile_rate` in samples per second, `100` when unset.
+        """
+        if self._cfh and self._section:
+            rate: Optional[int] = self._cfh.get(self._section, _Keys.MC_PROFILE_RATE)
+            if rate is not None:
+                return int(rate)
+        return 100
+
+    @property
+    def routes(self) -> List[str]:
+        """Return the content-based routing rules from the main section.
+
+        ### Returns:
+        List[str] - Rules in `conditions -> targets` format, empty when unset.
+        """
+        if self._cfh and self._section:
+            rules: Any = self._cfh.get(self._section, _Keys.MC_ROUTES)
+            if isinstance(rules, str):
+                return [rules] if rules.strip() else []
+            if isinstance(rules, list):
+                return [str(item) for item in rules if str(item).strip()]
+        return []
+
     @property
     def update(self) -> bool:
         """Return the configuration update flag.
@@ -357,6 +587,32 @@ class AppConfig(LogsMixin, ConfigHandlerMixin, ConfigSectionMixin):
         """
         self.__main._set_data(key=_Keys.CONF_UPDATE, value=value, set_default_type=bool)
 
+    @property
+    def usage_interval(self) -> int:
+        """Return the period of plugin usage reports.
+
+        ### Returns:
+        int - Main-section `usage_interval` in seconds, `0` (disabled) when unset.
+        """
+        if self._cfh and self._section:
+            interval: Optional[int] = self._cfh.get(
+                self._section, _Keys.MC_USAGE_INTERVAL
+            )
+            if interval is not None:
+                return int(interval)
+        return 0
+
+    @property
+    def usage_memory(self) -> bool:
+        """Return whether plugin memory usage is traced.
+
+        ### Returns:
+        bool - Main-section `usage_memory`, `False` when unset.
+        """
+        if self._cfh and self._section:
+            return bool(self._cfh.get(self._section, _Keys.MC_USAGE_MEMORY))
+        return False
+
     @property
     def verbose(self) -> bool:
         """Return the effective global verbose flag.
@@ -509,10 +765,12 @@ class AppConfig(LogsMixin, ConfigHandlerMixin, ConfigSectionMixin):
             if out:
                 if self.debug:
                     self.logs.message_debug = "config file loaded successful"
-                discovered_plugins = self.get_plugins
+                with StartupProfiler.span(StartupCategory.PHASE, "plugin discovery"):
+                    discovered_plugins = self.get_plugins
                 if discovered_plugins:
                     self.logs.message_info = f"list of plugin instances to load: {[item.instance_name for item in discovered_plugins]}"
-            config_changed, review_items = self.__check_plugin_config_updates()
+            with StartupProfiler.span(StartupCategory.PHASE, "config defaults"):
+                config_changed, review_items = self.__check_plugin_config_updates()
             if config_changed:
                 if self.debug:
                     self.logs.message_debug = "found new plugin configuration"
@@ -528,7 +786,19 @@ class AppConfig(LogsMixin, ConfigHandlerMixin, ConfigSectionMixin):
                             "environment before starting the daemon again."
                         )
                     )
-            self.__validate_plugin_config_values(discovered_plugins)
+            with StartupProfiler.span(StartupCategory.PHASE, "config digest"):
+                changes: ConfigChangeSet = self.__update_config_changes(
+                    discovered_plugins
+                )
+            with StartupProfiler.span(StartupCategory.PHASE, "config validation"):
+                self.__validate_plugin_config_values(
+                    [
+                        item
+                        for item in discovered_plugins
+                        if item.instance_name in changes.added
+                        or item.instance_name in changes.changed
+                    ]
+                )
             return out
         except Exception as ex:
             self.logs.message_critical = (
@@ -541,6 +811,10 @@ class AppConfig(LogsMixin, ConfigHandlerMixin, ConfigSectionMixin):
     def reload(self) -> bool:
         """Reload the configuration file from disk.
 
+        The file is re-read into a fresh handler and compared section by section
+        with the previous load. The result is published through `last_changes`
+        and plugin config validation is limited to the affected sections.
+
         ### Returns:
         bool - `True` when the configuration was reloaded successfully.
         """
@@ -682,12 +956,115 @@ class AppConfig(LogsMixin, ConfigHandlerMixin, ConfigSectionMixin):
         self._cfh.set(self._section, desc=f"{self._section} configuration file")
         self._cfh.set(self._section, varname=_Keys.MC_DEBUG, value=False)
         self._cfh.set(self._section, varname=_Keys.MC_VERBOSE, value=False)
+        self._cfh.set(
+            self._section,
+            varname=_Keys.MC_AUTO_RELOAD,
+            value=False,
+            desc="[bool] reload automatically when the config file or plugins_dir changes",
+        )
+        self._cfh.set(
+            self._section,
+            varname=_Keys.MC_DEDUP_TTL,
+            value=0,
+            desc="[int] seconds a repeated message stays suppressed, 0 disables",
+        )
+        self._cfh.set(
+            self._section,
+            varname=_Keys.MC_DEDUP_SIZE,
+            value=4096,
+            desc="[int] number of message fingerprints kept for deduplication",
+        )
+        self._cfh.set(
+            self._section,
+            varname=_Keys.MC_JSON_LOG,
+            value="",
+            desc="[str] structured JSON-lines log file, empty disables the sink",
+        )
+        self._cfh.set(
+            self._section,
+            varname=_Keys.MC_JSON_LOG_ROTATE_SIZE,
+            value=10485760,
+            desc="[int] JSON log size in bytes that triggers rotation",
+        )
+        self._cfh.set(
+            self._section,
+            varname=_Keys.MC_JSON_LOG_ROTATE_COUNT,
+            value=5,
+            desc="[int] number of rotated JSON log files to keep",
+        )
+        self._cfh.set(
+            self._section,
+            varname=_Keys.MC_LOG_QUEUE_SIZE,
+            value=10000,
+            desc="[int] maximum number of queued log lines, newer lines are dropped",
+        )
+        self._cfh.set(
+            self._section,
+            varname=_Keys.MC_LOG_RATE,
+            value=20,
+            desc="[int] log lines per second allowed for one source, 0 disables the limit",
+        )
+        self._cfh.set(
+            self._section,
+            varname=_Keys.MC_LOG_BURST,
+            value=100,
+            desc="[int] burst of log lines allowed for one source",
+        )
+        self._cfh.set(
+            self._section,
+            varname=_Keys.MC_LOG_RATE_EXEMPT,
+            value=["EMERGENCY", "ALERT", "CRITICAL", "ERROR"],
+            desc="[list] log levels never rate limited",
+        )
+        self._cfh.set(
+            self._section,
+            varname=_Keys.MC_PROFILE_DIR,
+            value="",
+            desc="[str] directory for SIGUSR1 sampling profiles, empty uses the temp dir",
+        )
+        self._cfh.set(
+            self._section,
+            varname=_Keys.MC_PROFILE_RATE,
+            value=100,
+            desc="[int] sampling profiler rate in samples per second",
+        )
+        self._cfh.set(
+            self._section,
+            varname=_Keys.MC_USAGE_INTERVAL,
+            value=0,
+            desc="[int] seconds between plugin CPU and memory usage reports, 0 disables",
+        )
+        self._cfh.set(
+            self._section,
+            varname=_Keys.MC_USAGE_MEMORY,
+            value=False,
+            desc="[bool] trace allocations to report plugin memory, slows the daemon",
+        )
+        self._cfh.set(
+            self._section,
+            varname=_Keys.MC_CAPTURE_FILE,
+            value="",
+            desc="[str] JSON-lines file recording routed messages, empty disables capture",
+        )
         self._cfh.set(
             self._section,
             varname=_Keys.MC_SALT,
             value=SimpleCrypto.salt_generator(6),
             desc="[int] salt for passwords encode/decode",
         )
+        self._cfh.set(
+            self._section,
+            varname=_Keys.MC_ROUTES,
+            value=[],
+            desc="[list] routing rules 'conditions -> targets', first match wins",
+        )
+        self._cfh.set(
+            self._section,
+            desc=(
+                "example: ['channel=1;origin=ping;priority=critical -> 9', "
+                "'channel=1 -> 2']"
+            ),
+        )
         # default plugins dir is located in the same directory as the project main script
         self._cfh.set(
             self._section,
@@ -739,6 +1116,67 @@ class AppConfig(LogsMixin, ConfigHandlerMixin, ConfigSectionMixin):
             set_default_type=Optional[str],
         )
 
+    def __update_config_changes(
+        self, discovered_plugins: List[PluginDefinition]
+    ) -> ConfigChangeSet:
+        """Compare section digests with the previous load and store the result.
+
+        Plugin instances that appeared in or disappeared from `plugins_dir` are
+        reported as added or removed even when their section text is unchanged.
+
+        ### Arguments:
+        * discovered_plugins: List[PluginDefinition] - Discovered plugin instances.
+
+        ### Returns:
+        ConfigChangeSet - Sections changed since the previous load.
+        """
+        previous_digests: Dict[str, str] = self.__main._get_data(
+            key=_Keys.CONF_DIGESTS, default_value={}
+        )
+        previous_plugins: List[str] = self.__main._get_data(
+            key=_Keys.PLUGIN_INSTANCES, default_value=[]
+        )
+        digests: Dict[str, str] = {}
+        if self.config_file is not None:
+            digests = ConfigDigest.digest(self.config_file, self._section)
+        plugins: List[str] = [item.instance_name for item in discovered_plugins]
+        section_changes: ConfigChangeSet = ConfigDigest.compare(
+            previous_digests, digests
+        )
+        added: List[str] = sorted(
+            set(section_changes.added)
+            | set(name for name in plugins if name not in previous_plugins)
+        )
+        removed: List[str] = sorted(
+            set(section_changes.removed)
+            | set(name for name in previous_plugins if name not in plugins)
+        )
+        changes = ConfigChangeSet(
+            added=added,
+            changed=[
+                name
+                for name in section_changes.changed
+                if name not in added and name not in removed
+            ],
+            removed=[name for name in removed if name not in added],
+        )
+        self.__main._set_data(
+            key=_Keys.CONF_DIGESTS, value=digests, set_default_type=Dict
+        )
+        self.__main._set_data(
+            key=_Keys.PLUGIN_INSTANCES, value=plugins, set_default_type=List
+        )
+        self.__main._set_data(
+            key=_Keys.CONF_CHANGES,
+            value=changes,
+            set_default_type=ConfigChangeSet,
+        )
+        if self.debug:
+            self.logs.message_debug = (
+                f"config sections changed since previous load: {changes.sections}"
+            )
+        return changes
+
     def __validate_plugin_config_values(
         self, discovered_plugins: List[PluginDefinition]
     ) -> None:
@@ -751,12 +1189,15 @@ class AppConfig(LogsMixin, ConfigHandlerMixin, ConfigSectionMixin):
             return None
         for plugin in discovered_plugins:
             try:
-                PluginConfigParser.parse(
-                    self._cfh,
-                    plugin.instance_name,
-                    plugin.spec.config_schema,
-                    logs=self.logs,
-                )
+                with StartupProfiler.span(
+                    StartupCategory.CONFIG, f"[{plugin.instance_name}]"
+                ):
+                    PluginConfigParser.parse(
+                        self._cfh,
+                        plugin.instance_name,
+                        plugin.spec.config_schema,
+                        logs=self.logs,
+                    )
             except Exception as ex:
                 self.logs.message_warning = (
                     f"plugin config validation failed for section "
@@ -21,11 +21,17 @@ class Keys(object, metaclass=ReadOnlyClass):
     CONF: str = "__configuration_object__"
     DEBUG: str = "__debug__"
     HUP: str = "__hup_variable__"
+    JSON_LOG_WRITER: str = "__json_log_writer__"
     LOOP: str = "__loop__"
     PROC_LOGS: str = "__proc_logs__"
+    PROFILE: str = "__profile_toggle__"
     QCOM: str = "__comms_queue__"
+    SAMPLER: str = "__stack_sampler__"
     SECTION: str = "__section_name__"
     VERBOSE: str = "__verbose__"
+    WATCHED_ENTRIES: str = "__watched_entries__"
+    WATCHED_LOCK: str = "__watched_lock__"
+    WATCHER: str = "__file_watcher__"
 
 
 # #[EOF]#######################################################################
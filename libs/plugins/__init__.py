@@ -11,12 +11,14 @@ __all__: List[str] = [
     "PluginHealthSnapshot",
     "PluginCommonKeys",
     "PluginConfigParser",
+    "PluginConfigSnapshot",
     "PluginContext",
     "PluginDefinition",
     "PluginFailure",
     "PluginHostKeys",
     "PluginKind",
     "PluginLoader",
+    "PluginReconfigurable",
     "PluginRuntime",
     "PluginRegistryService",
     "PluginRestartPolicy",
@@ -25,7 +27,10 @@ __all__: List[str] = [
     "PluginState",
     "PluginStateSnapshot",
     "PluginSpec",
+    "PluginUsageMonitor",
+    "PluginUsageSnapshot",
     "ThPluginMixin",
+    "ThWorkerRuntime",
 ]
 
 _EXPORTS: Final[Dict[str, str]] = {
@@ -36,12 +41,14 @@ _EXPORTS: Final[Dict[str, str]] = {
     "PluginHealthSnapshot": "libs.plugins.runtime",
     "PluginCommonKeys": "libs.plugins.keys",
     "PluginConfigParser": "libs.plugins.config",
+    "PluginConfigSnapshot": "libs.plugins.config",
     "PluginContext": "libs.plugins.runtime",
     "PluginDefinition": "libs.plugins.loader",
     "PluginFailure": "libs.plugins.service",
     "PluginHostKeys": "libs.plugins.keys",
     "PluginKind": "libs.plugins.runtime",
     "PluginLoader": "libs.plugins.loader",
+    "PluginReconfigurable": "libs.plugins.runtime",
     "PluginRuntime": "libs.plugins.runtime",
     "PluginRegistryService": "libs.plugins.service",
     "PluginRestartPolicy": "libs.plugins.service",
@@ -50,12 +57,15 @@ _EXPORTS: Final[Dict[str, str]] = {
     "PluginState": "libs.plugins.runtime",
     "PluginStateSnapshot": "libs.plugins.runtime",
     "PluginSpec": "libs.plugins.runtime",
+    "PluginUsageMonitor": "libs.plugins.usage",
+    "PluginUsageSnapshot": "libs.plugins.runtime",
     "ThPluginMixin": "libs.plugins.mixins",
+    "ThWorkerRuntime": "libs.plugins.worker",
 }
 
 if TYPE_CHECKING:
     from libs.com.message import NotificationScheduler
-    from libs.plugins.config import PluginConfigParser
+    from libs.plugins.config import PluginConfigParser, PluginConfigSnapshot
     from libs.plugins.keys import PluginCommonKeys, PluginHostKeys
     from libs.plugins.loader import PluginDefinition, PluginLoader
     from libs.plugins.mixins import ThPluginMixin
@@ -73,11 +83,15 @@ if TYPE_CHECKING:
         PluginHealthSnapshot,
         PluginContext,
         PluginKind,
+        PluginReconfigurable,
         PluginRuntime,
         PluginState,
         PluginStateSnapshot,
         PluginSpec,
+        PluginUsageSnapshot,
     )
+    from libs.plugins.usage import PluginUsageMonitor
+    from libs.plugins.worker import ThWorkerRuntime
 
 
 def __dir__() -> List[str]:
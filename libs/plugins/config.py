@@ -8,23 +8,124 @@ Created: 2026-03-23
 Purpose: Validate and parse plugin configuration values using schema metadata.
 """
 
-from typing import Any, Dict, List, Optional, Union, Tuple, get_args, get_origin
+import keyword
+
+from collections.abc import Mapping
+from dataclasses import make_dataclass
+from types import MappingProxyType
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Union,
+    Tuple,
+    Type,
+    get_args,
+    get_origin,
+)
 
 from inspect import currentframe
 
+from jsktoolbox.attribtool import ReadOnlyClass
 from jsktoolbox.basetool import BClasses
 from jsktoolbox.configtool import Config as ConfigTool
 from jsktoolbox.logstool import LoggerClient
 from jsktoolbox.raisetool import Raise
+from jsktoolbox.stringtool import SimpleCrypto
 
 from libs.plugins.keys import PluginCommonKeys
 from libs.templates import PluginConfigField, PluginConfigSchema
 from libs.tools import MIntervals
 
 
+class _Keys(object, metaclass=ReadOnlyClass):
+    """Main-section keys read by the parser."""
+
+    SALT: str = "salt"
+
+
+class PluginConfigSnapshot(Mapping):
+    """Base class of immutable plugin config snapshots.
+
+    Concrete classes are frozen, slotted dataclasses generated from a
+    `PluginConfigSchema` by `PluginConfigParser.snapshot_type()`, so reading
+    `config.sleep_period` is a slot lookup. List values are stored as tuples.
+    The mapping interface keeps `config.get(name)` and `config[name]` working.
+    Decrypted `secret=True` values are kept outside the dataclass fields, so
+    they never appear in `repr()` or comparisons.
+    """
+
+    __slots__ = ("_secrets",)
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def secrets(self) -> Mapping:
+        """Return decrypted values of the `secret=True` fields.
+
+        ### Returns:
+        Mapping - Read-only plain text values by field name.
+        """
+        return getattr(self, "_secrets", MappingProxyType({}))
+
+    # #[PUBLIC METHODS]###############################################################
+    def __getitem__(self, key: str) -> Any:
+        """Return one config value by field name.
+
+        ### Arguments:
+        * key: str - Field name.
+
+        ### Returns:
+        Any - Field value.
+
+        ### Raises:
+        * KeyError: If the schema does not declare the field.
+        """
+        if key not in self.__dataclass_fields__:  # type: ignore
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over field names in schema order.
+
+        ### Returns:
+        Iterator[str] - Field names.
+        """
+        return iter(self.__dataclass_fields__)  # type: ignore
+
+    def __len__(self) -> int:
+        """Return the number of fields.
+
+        ### Returns:
+        int - Field count.
+        """
+        return len(self.__dataclass_fields__)  # type: ignore
+
+    def changed(self, other: Optional[Mapping]) -> List[str]:
+        """Return names of fields whose value differs in `other`.
+
+        ### Arguments:
+        * other: Optional[Mapping] - Config to compare with.
+
+        ### Returns:
+        List[str] - Changed field names, all fields when `other` is `None`.
+        """
+        if other is None:
+            return list(self)
+        return [
+            name
+            for name in self
+            if PluginConfigParser.freeze_value(other.get(name)) != self[name]
+        ]
+
+
 class PluginConfigParser(BClasses):
     """Parse plugin config sections according to `PluginConfigSchema`."""
 
+    # generated snapshot classes by schema field layout
+    __snapshot_types: Dict[Tuple[Tuple[str, str, bool], ...], Type] = {}
+
     # #[STATIC/CLASS METHODS]#########################################################
     @classmethod
     def parse(
@@ -53,7 +154,169 @@ class PluginConfigParser(BClasses):
             out[field.name] = value
         return out
 
+    @classmethod
+    def freeze(
+        cls,
+        schema: PluginConfigSchema,
+        values: Mapping,
+        secrets: Optional[Mapping] = None,
+    ) -> PluginConfigSnapshot:
+        """Build an immutable snapshot from parsed config values.
+
+        ### Arguments:
+        * schema: PluginConfigSchema - Declared plugin configuration schema.
+        * values: Mapping - Parsed values; missing fields use their defaults.
+        * secrets: Optional[Mapping] - Decrypted values of `secret=True` fields.
+
+        ### Returns:
+        PluginConfigSnapshot - Frozen typed config snapshot.
+        """
+        out: PluginConfigSnapshot = cls.snapshot_type(schema)(
+            **{
+                field.name: cls.freeze_value(values.get(field.name, field.default))
+                for field in schema.fields
+            }
+        )
+        object.__setattr__(out, "_secrets", MappingProxyType(dict(secrets or {})))
+        return out
+
+    @classmethod
+    def freeze_value(cls, value: Any) -> Any:
+        """Return an immutable copy of one config value.
+
+        ### Arguments:
+        * value: Any - Parsed value.
+
+        ### Returns:
+        Any - The value with lists converted to tuples.
+        """
+        if isinstance(value, (list, tuple)):
+            return tuple(cls.freeze_value(item) for item in value)
+        return value
+
+    @classmethod
+    def snapshot(
+        cls,
+        config_handler: ConfigTool,
+        section: str,
+        schema: PluginConfigSchema,
+        logs: Optional[LoggerClient] = None,
+    ) -> PluginConfigSnapshot:
+        """Parse one config section into an immutable snapshot.
+
+        ### Arguments:
+        * config_handler: ConfigTool - Configuration handler bound to the config file.
+        * section: str - Section name to parse.
+        * schema: PluginConfigSchema - Declared plugin configuration schema.
+        * logs: Optional[LoggerClient] - Logger used for non-fatal validation warnings.
+
+        ### Returns:
+        PluginConfigSnapshot - Frozen typed config snapshot with the secrets
+        decrypted once for this config generation.
+        """
+        values: Dict[str, Any] = cls.parse(config_handler, section, schema, logs)
+        return cls.freeze(
+            schema, values, cls.__decrypt_secrets(config_handler, schema, values)
+        )
+
+    @classmethod
+    def snapshot_type(cls, schema: PluginConfigSchema) -> Type[PluginConfigSnapshot]:
+        """Return the snapshot class generated for a schema.
+
+        Classes are cached by field layout, so reloads of the same plugin reuse
+        one class.
+
+        ### Arguments:
+        * schema: PluginConfigSchema - Declared plugin configuration schema.
+
+        ### Returns:
+        Type[PluginConfigSnapshot] - Frozen, slotted dataclass type.
+
+        ### Raises:
+        * ValueError: If a field name is not a valid attribute name.
+        """
+        layout: Tuple[Tuple[str, str, bool], ...] = tuple(
+            (field.name, repr(field.field_type), field.nullable or not field.required)
+            for field in schema.fields
+        )
+        out: Optional[Type] = cls.__snapshot_types.get(layout)
+        if out is not None:
+            return out
+        for field in schema.fields:
+            if (
+                not field.name.isidentifier()
+                or keyword.iskeyword(field.name)
+                or hasattr(PluginConfigSnapshot, field.name)
+            ):
+                raise Raise.error(
+                    f"Config field name '{field.name}' is not a valid attribute name.",
+                    ValueError,
+                    cls.__name__,
+                    currentframe(),
+                )
+        out = make_dataclass(
+            "PluginConfig",
+            [
+                (name, cls.__snapshot_annotation(schema.fields[idx]))
+                for idx, (name, _, _) in enumerate(layout)
+            ],
+            bases=(PluginConfigSnapshot,),
+            frozen=True,
+            slots=True,
+        )
+        cls.__snapshot_types[layout] = out
+        return out
+
     # #[PRIVATE METHODS]##############################################################
+    @classmethod
+    def __decrypt_secrets(
+        cls, config_handler: ConfigTool, schema: PluginConfigSchema, values: Mapping
+    ) -> Dict[str, str]:
+        """Decrypt `secret=True` values with the main-section `salt`.
+
+        ### Arguments:
+        * config_handler: ConfigTool - Configuration handler bound to the config file.
+        * schema: PluginConfigSchema - Declared plugin configuration schema.
+        * values: Mapping - Parsed config values.
+
+        ### Returns:
+        Dict[str, str] - Plain text values of non-empty secret fields; values
+        are kept as configured when no `salt` is set.
+        """
+        out: Dict[str, str] = {}
+        salt: Optional[int] = None
+        for field in schema.fields:
+            value: Any = values.get(field.name)
+            if not field.secret or not value:
+                continue
+            if salt is None:
+                salt = config_handler.get(config_handler.main_section_name, _Keys.SALT)
+                if salt is None:
+                    salt = 0
+            out[field.name] = (
+                SimpleCrypto.multiple_decrypt(salt, str(value)) if salt else str(value)
+            )
+        return out
+
+    @classmethod
+    def __snapshot_annotation(cls, field: PluginConfigField) -> Any:
+        """Return the snapshot attribute type of one field.
+
+        ### Arguments:
+        * field: PluginConfigField - Declared field descriptor.
+
+        ### Returns:
+        Any - Field type with lists mapped to tuples.
+        """
+        declared: Any = field.field_type
+        if declared in (list, List):
+            declared = Tuple[Any, ...]
+        elif get_origin(declared) in (list, List):
+            declared = Tuple[get_args(declared)[0], ...]  # type: ignore
+        if field.nullable or not field.required:
+            declared = Optional[declared]
+        return declared
+
     @classmethod
     def __build_at_channel_warnings(cls, value: Any) -> List[str]:
         """Return non-fatal warnings for `at_channel` values.
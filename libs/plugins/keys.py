@@ -26,6 +26,8 @@ class PluginHostKeys(object, metaclass=ReadOnlyClass):
 
     # #[CONSTANTS]####################################################################
     AUTOSTART: str = "autostart"
+    PUBLISH_BURST: str = "publish_burst"
+    PUBLISH_RATE: str = "publish_rate"
     RESTART_POLICY: str = "restart_policy"
     START_DELAY: str = "start_delay"
 
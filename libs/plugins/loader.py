@@ -23,6 +23,7 @@ from jsktoolbox.raisetool import Raise
 from libs.plugins.keys import PluginHostKeys
 from libs.plugins.runtime import PluginKind, PluginSpec
 from libs.templates import PluginConfigSchema
+from libs.tools.startup import StartupCategory, StartupProfiler
 
 
 @dataclass(slots=True)
@@ -58,7 +59,8 @@ class PluginLoader(BClasses):
             load_file = entry / "load.py"
             if not load_file.exists():
                 continue
-            spec: PluginSpec = cls.__load_spec(entry.name, load_file)
+            with StartupProfiler.span(StartupCategory.SPEC, entry.name):
+                spec: PluginSpec = cls.__load_spec(entry.name, load_file)
             out.append(
                 PluginDefinition(
                     instance_name=entry.name,
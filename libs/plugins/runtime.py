@@ -8,14 +8,30 @@ Created: 2026-03-23
 Purpose: Provide runtime contracts, lifecycle state, and context objects for plugin API v1.
 """
 
+import time
+import uuid
+
+from concurrent.futures import Future
 from dataclasses import dataclass
+from inspect import currentframe
 from queue import Queue
-from typing import Any, Callable, Dict, Optional, Protocol, runtime_checkable
+from threading import Lock
+from typing import (
+    Any,
+    Callable,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Tuple,
+    runtime_checkable,
+)
 
 from jsktoolbox.attribtool import ReadOnlyClass
 from jsktoolbox.basetool import BData
 from jsktoolbox.configtool import Config as ConfigTool
 from jsktoolbox.logstool import LoggerClient, LoggerQueue
+from jsktoolbox.raisetool import Raise
 
 from libs.app import AppName
 from libs.com.message import Message, ThDispatcher
@@ -53,6 +69,20 @@ class PluginHealth(object, metaclass=ReadOnlyClass):
     UNHEALTHY: str = "unhealthy"
 
 
+@dataclass(slots=True, frozen=True)
+class PluginUsageSnapshot:
+    """Describe the CPU and memory attributed to one plugin instance.
+
+    Runtimes never fill it in; the host attaches it to the state and health
+    snapshots it reports.
+    """
+
+    cpu_percent: Optional[float] = None
+    cpu_time: Optional[float] = None
+    memory: Optional[int] = None
+    threads: int = 0
+
+
 @dataclass(slots=True, frozen=True)
 class PluginStateSnapshot:
     """Describe the current lifecycle state of one plugin instance."""
@@ -62,6 +92,7 @@ class PluginStateSnapshot:
     message: Optional[str] = None
     started_at: Optional[int] = None
     stopped_at: Optional[int] = None
+    usage: Optional[PluginUsageSnapshot] = None
 
 
 @dataclass(slots=True, frozen=True)
@@ -72,6 +103,7 @@ class PluginHealthSnapshot:
     last_error_at: Optional[int] = None
     last_ok_at: Optional[int] = None
     message: Optional[str] = None
+    usage: Optional[PluginUsageSnapshot] = None
 
 
 @runtime_checkable
@@ -94,6 +126,18 @@ class PluginRuntime(Protocol):
         """Return the current plugin lifecycle snapshot."""
 
 
+@runtime_checkable
+class PluginReconfigurable(Protocol):
+    """Define the optional contract of runtimes accepting config swaps."""
+
+    def reconfigure(self, config: Mapping[str, Any]) -> bool:
+        """Accept a new config snapshot without a restart.
+
+        The host swaps `PluginContext.config` to `config` only when the
+        runtime returns `True`; otherwise the instance is restarted.
+        """
+
+
 class DispatcherAdapter(BData):
     """Expose a stable plugin-facing adapter for the dispatcher subsystem."""
 
@@ -101,16 +145,37 @@ class DispatcherAdapter(BData):
         """Define internal storage keys used by the plugin runtime helpers."""
 
         # #[CONSTANTS]##########################################################
+        BUCKET: str = "__bucket__"
+        BURST: str = "__burst__"
+        CONSUMERS: str = "__consumers__"
         DISPATCHER: str = "__dispatcher__"
+        INSTANCE_NAME: str = "__instance_name__"
+        LOCK: str = "__lock__"
+        PUBLISHED: str = "__published__"
         QCOM: str = "__qcom__"
+        RATE: str = "__rate__"
+        THROTTLED: str = "__throttled__"
 
     # #[CONSTRUCTOR]############################################################
-    def __init__(self, qcom: Queue, dispatcher: ThDispatcher) -> None:
+    def __init__(
+        self,
+        qcom: Queue,
+        dispatcher: ThDispatcher,
+        instance_name: Optional[str] = None,
+        publish_rate: float = 0.0,
+        publish_burst: int = 0,
+    ) -> None:
         """Initialize the dispatcher adapter.
 
         ### Arguments:
         * qcom: Queue - Shared outbound dispatcher input queue.
         * dispatcher: ThDispatcher - Active dispatcher instance.
+        * instance_name: Optional[str] - Plugin instance stamped as
+          `Message.origin` on published messages.
+        * publish_rate: float - Sustained messages per second allowed for the
+          instance, `0` disables the limit.
+        * publish_burst: int - Token bucket capacity, defaults to one second
+          of `publish_rate` when not positive.
         """
         self._set_data(key=self.__Keys.QCOM, value=qcom, set_default_type=Queue)
         self._set_data(
@@ -118,8 +183,63 @@ class DispatcherAdapter(BData):
             value=dispatcher,
             set_default_type=ThDispatcher,
         )
+        self._set_data(key=self.__Keys.CONSUMERS, value=[], set_default_type=List)
+        self._set_data(
+            key=self.__Keys.INSTANCE_NAME,
+            value=instance_name,
+            set_default_type=Optional[str],
+        )
+        rate: float = max(0.0, float(publish_rate))
+        burst: float = float(publish_burst) if publish_burst > 0 else max(1.0, rate)
+        self._set_data(key=self.__Keys.RATE, value=rate, set_default_type=float)
+        self._set_data(key=self.__Keys.BURST, value=burst, set_default_type=float)
+        self._set_data(
+            key=self.__Keys.BUCKET,
+            value=[burst, time.monotonic()],
+            set_default_type=List,
+        )
+        self._set_data(key=self.__Keys.LOCK, value=Lock())
+        self._set_data(key=self.__Keys.PUBLISHED, value=0, set_default_type=int)
+        self._set_data(key=self.__Keys.THROTTLED, value=0, set_default_type=int)
+
+    # #[PUBLIC PROPERTIES]######################################################
+    @property
+    def publish_rate(self) -> float:
+        """Return the sustained publish rate limit.
+
+        ### Returns:
+        float - Messages per second, `0.0` when publishing is not limited.
+        """
+        return self._get_data(key=self.__Keys.RATE)  # type: ignore
+
+    @property
+    def published(self) -> int:
+        """Return the number of messages put on the dispatcher queue.
+
+        ### Returns:
+        int - Accepted message count.
+        """
+        return self._get_data(key=self.__Keys.PUBLISHED)  # type: ignore
+
+    @property
+    def throttled(self) -> int:
+        """Return the number of messages rejected by the rate limit.
+
+        ### Returns:
+        int - Throttled message count.
+        """
+        return self._get_data(key=self.__Keys.THROTTLED)  # type: ignore
 
     # #[PRIVATE PROPERTIES]#####################################################
+    @property
+    def __consumers(self) -> List[Tuple[int, Queue]]:
+        """Return consumer queues registered through this adapter.
+
+        ### Returns:
+        List[Tuple[int, Queue]] - Registered channel and queue pairs.
+        """
+        return self._get_data(key=self.__Keys.CONSUMERS)  # type: ignore
+
     @property
     def __dispatcher(self) -> ThDispatcher:
         """Return the bound dispatcher instance.
@@ -145,13 +265,26 @@ class DispatcherAdapter(BData):
         return obj
 
     # #[PUBLIC METHODS]#########################################################
-    def publish(self, message: Message) -> None:
+    def publish(self, message: Message) -> bool:
         """Publish a message to the dispatcher input queue.
 
         ### Arguments:
         * message: Message - Message routed by the dispatcher.
+
+        ### Returns:
+        bool - `True` when queued, `False` when the instance exceeded its
+        `publish_rate` and the message was dropped.
         """
+        with self._get_data(key=self.__Keys.LOCK):  # type: ignore
+            if not self.__take_token():
+                self._set_data(key=self.__Keys.THROTTLED, value=self.throttled + 1)
+                return False
+            self._set_data(key=self.__Keys.PUBLISHED, value=self.published + 1)
+        instance_name: Optional[str] = self._get_data(key=self.__Keys.INSTANCE_NAME)
+        if instance_name and message.origin is None:
+            message.origin = instance_name
         self.__qcom.put(message)
+        return True
 
     def register_consumer(self, channel: int) -> Queue:
         """Register a communication consumer queue for the selected channel.
@@ -162,15 +295,108 @@ class DispatcherAdapter(BData):
         ### Returns:
         Queue - Queue receiving messages for the selected channel.
         """
-        return self.__dispatcher.register_queue(channel)
+        queue: Queue = self.__dispatcher.register_queue(channel)
+        self.__consumers.append((channel, queue))
+        return queue
+
+    def release(self) -> None:
+        """Unregister every consumer queue registered through this adapter.
+
+        Used by the supervision service when one plugin instance is restarted
+        while the dispatcher keeps running.
+        """
+        for channel, queue in self.__consumers:
+            self.__dispatcher.unregister_queue(channel, queue)
+        self.__consumers.clear()
+
+    def reply(self, request: Message, message: Message) -> None:
+        """Answer a request received by a communication plugin.
+
+        Replies bypass the publish rate limit and the priority lanes; the
+        dispatcher hands them straight to the waiting `request()` future.
+
+        ### Arguments:
+        * request: Message - Request read from a consumer queue.
+        * message: Message - Reply payload.
+
+        ### Raises:
+        * ValueError: If `request` carries no correlation id.
+        """
+        if request.correlation_id is None:
+            raise Raise.error(
+                "Cannot reply to a message that is not a request.",
+                ValueError,
+                self._c_name,
+                currentframe(),
+            )
+        message.in_reply_to = request.correlation_id
+        instance_name: Optional[str] = self._get_data(key=self.__Keys.INSTANCE_NAME)
+        if instance_name and message.origin is None:
+            message.origin = instance_name
+        self.__qcom.put(message)
+
+    def request(self, message: Message, timeout: float = 5.0) -> Future:
+        """Publish a request and return a future for its reply.
+
+        The message gets a fresh `correlation_id`; the communication plugin
+        answers with `reply()`. Set `priority` to `Priority.HIGH` for
+        interactive commands so they overtake routine notifications.
+
+        ### Arguments:
+        * message: Message - Request routed by the dispatcher.
+        * timeout: float - Seconds to wait for the reply.
+
+        ### Returns:
+        Future - Resolved with the reply `Message`, or failed with
+        `TimeoutError` when no reply arrived, `LookupError` when no consumer
+        serves the channel, or `RuntimeError` when the request was throttled.
+        """
+        correlation_id: str = uuid.uuid4().hex
+        message.correlation_id = correlation_id
+        future: Future = self.__dispatcher.requests.add(correlation_id, timeout)
+        if not self.publish(message):
+            self.__dispatcher.requests.fail(
+                correlation_id,
+                RuntimeError("Request rejected by the publish rate limit."),
+            )
+        return future
+
+    # #[PRIVATE METHODS]########################################################
+    def __take_token(self) -> bool:
+        """Take one token from the instance bucket.
+
+        ### Returns:
+        bool - `True` when the message may be published.
+        """
+        rate: float = self.publish_rate
+        if rate <= 0.0:
+            return True
+        bucket: List[float] = self._get_data(key=self.__Keys.BUCKET)  # type: ignore
+        now: float = time.monotonic()
+        bucket[0] = min(
+            self._get_data(key=self.__Keys.BURST),  # type: ignore
+            bucket[0] + (now - bucket[1]) * rate,
+        )
+        bucket[1] = now
+        if bucket[0] < 1.0:
+            return False
+        bucket[0] -= 1.0
+        return True
 
 
 @dataclass(slots=True)
 class PluginContext:
-    """Store runtime context passed to plugin factories."""
+    """Store runtime context passed to plugin factories.
+
+    The daemon passes `config` as a frozen `PluginConfigSnapshot` and replaces
+    the whole object on reconfiguration, so runtimes should read
+    `context.config` instead of keeping references to its values. Values of
+    `secret=True` fields are decrypted once per config generation and read
+    through `secret()`.
+    """
 
     app_meta: AppName
-    config: Dict[str, Any]
+    config: Mapping[str, Any]
     config_handler: ConfigTool
     debug: bool
     dispatcher: DispatcherAdapter
@@ -181,6 +407,23 @@ class PluginContext:
     qlog: LoggerQueue
     verbose: bool
 
+    # #[PUBLIC METHODS]################################################################
+    def secret(self, name: str) -> Optional[str]:
+        """Return the plain text value of a `secret=True` config field.
+
+        ### Arguments:
+        * name: str - Config field name.
+
+        ### Returns:
+        Optional[str] - Value decrypted by the host, the raw value for plain
+        mapping configs, or `None` when the field is empty.
+        """
+        secrets: Optional[Mapping[str, str]] = getattr(self.config, "secrets", None)
+        if secrets is not None:
+            return secrets.get(name)
+        value: Any = self.config.get(name)
+        return str(value) if value else None
+
 
 @dataclass(slots=True)
 class PluginSpec:
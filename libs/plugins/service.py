@@ -10,10 +10,10 @@ Purpose: Provide discovery, initialization, startup, and shutdown control for pl
 
 import time
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from inspect import currentframe
 from queue import Queue
-from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
+from typing import Any, Dict, List, Mapping, Optional, Tuple, TYPE_CHECKING
 
 from jsktoolbox.attribtool import ReadOnlyClass
 from jsktoolbox.basetool import BClasses
@@ -21,16 +21,26 @@ from jsktoolbox.logstool import LoggerClient
 from jsktoolbox.raisetool import Raise
 
 from libs.app import AppName
+from libs.com.capture import MessageCapture
 from libs.com.message import ThDispatcher
+from libs.com.routing import RoutingTable
 from libs.plugins.config import PluginConfigParser
+from libs.plugins.keys import PluginHostKeys
 from libs.plugins.loader import PluginDefinition
 from libs.plugins.runtime import (
     DispatcherAdapter,
     PluginContext,
+    PluginHealth,
+    PluginHealthSnapshot,
     PluginKind,
+    PluginReconfigurable,
     PluginRuntime,
     PluginState,
+    PluginStateSnapshot,
+    PluginUsageSnapshot,
 )
+from libs.plugins.usage import PluginUsageMonitor
+from libs.tools.startup import StartupCategory, StartupProfiler
 
 if TYPE_CHECKING:
     from libs.conf import AppConfig
@@ -58,14 +68,18 @@ class PluginSkip:
 class PluginServiceReport:
     """Store the result of one plugin supervision start cycle."""
 
+    adapters: Dict[str, DispatcherAdapter] = field(default_factory=dict)
+    contexts: Dict[str, PluginContext] = field(default_factory=dict)
     dispatch: Optional[ThDispatcher] = None
     failed: List[PluginFailure] = field(default_factory=list)
     health_policy: str = "transitions_only"
     initialized: List[str] = field(default_factory=list)
     managed_runtimes: List[PluginRuntime] = field(default_factory=list)
     restart_policy: str = "none"
+    runtimes: Dict[str, PluginRuntime] = field(default_factory=dict)
     started: List[str] = field(default_factory=list)
     skipped: List[PluginSkip] = field(default_factory=list)
+    usage: Optional[PluginUsageMonitor] = None
 
 
 class PluginHealthPolicy(object, metaclass=ReadOnlyClass):
@@ -106,9 +120,11 @@ class PluginRegistryService(BClasses):
         report = PluginServiceReport(
             health_policy=PluginHealthPolicy.TRANSITIONS_ONLY,
             restart_policy=PluginRestartPolicy.NONE,
+            usage=PluginUsageMonitor(memory=conf.usage_memory),
         )
         logs.message_info = "starting..."
-        discovered_plugins: List[PluginDefinition] = list(conf.get_plugins)
+        with StartupProfiler.span(StartupCategory.PHASE, "plugin discovery"):
+            discovered_plugins: List[PluginDefinition] = list(conf.get_plugins)
 
         if logs.logs_queue is None:
             report.failed.append(
@@ -128,16 +144,32 @@ class PluginRegistryService(BClasses):
             return report
 
         qcom: Queue = Queue()
-        dispatch = ThDispatcher(
-            qlog=logs.logs_queue,
-            qcom=qcom,
-            verbose=conf.verbose,
-            debug=conf.debug,
-        )
-        dispatch.start()
-        time.sleep(1.0)
+        routing: Optional[RoutingTable] = None
+        with StartupProfiler.span(StartupCategory.PHASE, "dispatcher start"):
+            if conf.routes:
+                routing = RoutingTable(conf.routes)
+                for error in routing.errors:
+                    logs.message_error = f"skipped routing rule: {error}"
+                logs.message_info = f"loaded {len(routing.rules)} routing rule(s)"
+            capture: Optional[MessageCapture] = None
+            if conf.capture_file:
+                capture = MessageCapture(conf.capture_file)
+                logs.message_notice = (
+                    f"capturing routed messages to: {conf.capture_file}"
+                )
+            dispatch = ThDispatcher(
+                qlog=logs.logs_queue,
+                qcom=qcom,
+                verbose=conf.verbose,
+                debug=conf.debug,
+                dedup_ttl=conf.dedup_ttl,
+                dedup_size=conf.dedup_size,
+                routing=routing,
+                capture=capture,
+            )
+            dispatch.start()
+            time.sleep(1.0)
         report.dispatch = dispatch
-        dispatcher_adapter = DispatcherAdapter(qcom=qcom, dispatcher=dispatch)
 
         if conf.cf is None:
             report.failed.append(
@@ -156,75 +188,93 @@ class PluginRegistryService(BClasses):
             cls.__log_summary(report=report, logs=logs)
             return report
 
-        comm_plugins: List[PluginDefinition] = []
-        worker_plugins: List[PluginDefinition] = []
-        for plugin in discovered_plugins:
-            if plugin.spec.plugin_kind == PluginKind.COMMUNICATION:
-                comm_plugins.append(plugin)
-            else:
-                worker_plugins.append(plugin)
+        cls.__start_plugins(
+            report=report,
+            conf=conf,
+            app_meta=app_meta,
+            logs=logs,
+            plugins=discovered_plugins,
+        )
+        cls.__log_summary(report=report, logs=logs)
+        return report
 
-        initialized_plugins: List[Tuple[PluginDefinition, PluginRuntime]] = []
-        ordered_plugins: List[PluginDefinition] = comm_plugins + worker_plugins
-        for plugin in ordered_plugins:
-            try:
-                parsed_config = PluginConfigParser.parse(
-                    conf.cf, plugin.instance_name, plugin.spec.config_schema
-                )
-                runtime = plugin.spec.runtime_factory(
-                    cls.__build_plugin_context(
-                        app_meta=app_meta,
-                        conf=conf,
-                        config=parsed_config,
-                        dispatcher=dispatcher_adapter,
-                        logs=logs,
-                        plugin=plugin,
-                    )
-                )
-                runtime.initialize()
-                report.managed_runtimes.append(runtime)
-                initialized_plugins.append((plugin, runtime))
-                report.initialized.append(plugin.instance_name)
-                if conf.debug:
-                    logs.message_debug = (
-                        f"initialized plugin instance: '{plugin.instance_name}'"
-                    )
-            except Exception as ex:
-                report.failed.append(
-                    PluginFailure(
-                        error=str(ex),
-                        instance_name=plugin.instance_name,
-                        stage="initialize",
-                    )
-                )
-                logs.message_error = (
-                    f"cannot initialize plugin instance "
-                    f"'{plugin.instance_name}': {ex}"
-                )
+    @classmethod
+    def restart(
+        cls,
+        report: PluginServiceReport,
+        conf: "AppConfig",
+        app_meta: AppName,
+        logs: LoggerClient,
+        instances: List[str],
+        reconfigure: Optional[List[str]] = None,
+    ) -> PluginServiceReport:
+        """Restart selected plugin instances while the dispatcher keeps running.
 
-        for plugin, runtime in initialized_plugins:
-            try:
-                runtime.start()
-                report.started.append(plugin.instance_name)
-                if conf.debug:
-                    logs.message_debug = (
-                        f"started plugin instance: '{plugin.instance_name}'"
-                    )
-            except Exception as ex:
-                report.failed.append(
-                    PluginFailure(
-                        error=str(ex),
-                        instance_name=plugin.instance_name,
-                        stage="start",
-                    )
-                )
-                logs.message_error = (
-                    f"cannot start plugin instance '{plugin.instance_name}': {ex}"
-                )
-                try:
-                    runtime.stop(timeout=2.0)
-                except Exception:
-                    pass
+        Running instances named in `reconfigure` whose runtime implements
+        `PluginReconfigurable` get a new config snapshot swapped in place when
+        no changed field is `restart_required` and the runtime accepts it.
+        The remaining running instances named in `instances` are stopped and
+        their consumer queues are released. Names still discovered in
+        `plugins_dir` are then initialized and started again with the reloaded
+        configuration; names no longer discovered stay stopped.
+
+        ### Arguments:
+        * report: PluginServiceReport - Report of the running supervision cycle.
+        * conf: AppConfig - Reloaded application configuration service.
+        * app_meta: AppName - Application identity metadata.
+        * logs: LoggerClient - Daemon logger used for supervision messages.
+        * instances: List[str] - Plugin instance names affected by the reload.
+        * reconfigure: Optional[List[str]] - Instances whose plugin code is
+          unchanged, so only their config section needs to be applied.
+
+        ### Returns:
+        PluginServiceReport - The same report updated in place.
+        """
+        swapped: List[str] = [
+            name
+            for name in sorted(set(reconfigure or []) & set(instances))
+            if cls.__reconfigure(report=report, conf=conf, logs=logs, name=name)
+        ]
+        affected: List[str] = sorted(set(instances) - set(swapped))
+        if not affected:
+            return report
+        logs.message_info = f"restarting plugin instances: {affected}"
+        for name in reversed(list(report.runtimes.keys())):
+            if name not in affected:
+                continue
+            runtime: PluginRuntime = report.runtimes.pop(name)
+            cls.__stop_runtime(runtime=runtime, logs=logs)
+            adapter: Optional[DispatcherAdapter] = report.adapters.pop(name, None)
+            if adapter is not None:
+                adapter.release()
+            report.contexts.pop(name, None)
+            if report.usage is not None:
+                report.usage.unregister(name)
+            report.managed_runtimes = [
+                item for item in report.managed_runtimes if item is not runtime
+            ]
+        report.initialized = [
+            item for item in report.initialized if item not in affected
+        ]
+        report.started = [item for item in report.started if item not in affected]
+        report.failed = [
+            item for item in report.failed if item.instance_name not in affected
+        ]
+        report.skipped = [
+            item for item in report.skipped if item.instance_name not in affected
+        ]
+        if report.dispatch is None or conf.cf is None:
+            cls.__log_summary(report=report, logs=logs)
+            return report
+        cls.__start_plugins(
+            report=report,
+            conf=conf,
+            app_meta=app_meta,
+            logs=logs,
+            plugins=[
+                item for item in conf.get_plugins if item.instance_name in affected
+            ],
+        )
         cls.__log_summary(report=report, logs=logs)
         return report
 
@@ -237,13 +287,16 @@ class PluginRegistryService(BClasses):
         * logs: LoggerClient - Daemon logger used for supervision messages.
         """
         for runtime in reversed(report.managed_runtimes):
-            try:
-                runtime.stop(timeout=2.0)
-            except TypeError:
-                runtime.stop()
-            except Exception as ex:
-                logs.message_error = f"cannot stop plugin runtime: {ex}"
-            cls.__wait_for_runtime_shutdown(runtime=runtime, logs=logs)
+            cls.__stop_runtime(runtime=runtime, logs=logs)
+        for name, adapter in report.adapters.items():
+            if adapter.throttled:
+                logs.message_warning = (
+                    f"plugin instance '{name}' was throttled: "
+                    f"published={adapter.published}, throttled={adapter.throttled}"
+                )
+
+        if report.usage is not None:
+            report.usage.close()
 
         if report.dispatch is None:
             return None
@@ -253,6 +306,81 @@ class PluginRegistryService(BClasses):
             report.dispatch.join()
             time.sleep(0.1)
         report.dispatch.join()
+        capture: Optional[MessageCapture] = report.dispatch.capture
+        if capture is not None:
+            logs.message_info = (
+                f"captured {capture.recorded} message(s) to: {capture.path}"
+            )
+
+    @classmethod
+    def log_usage(cls, report: PluginServiceReport, logs: LoggerClient) -> None:
+        """Log state, health and resource usage of every running instance.
+
+        Instances are listed from the highest CPU share down.
+
+        ### Arguments:
+        * report: PluginServiceReport - Report of the running supervision cycle.
+        * logs: LoggerClient - Daemon logger used for supervision messages.
+        """
+        snapshots: Dict[str, Tuple[PluginStateSnapshot, PluginHealthSnapshot]] = (
+            cls.snapshots(report)
+        )
+        for name, (state, health) in sorted(
+            snapshots.items(),
+            key=lambda pair: -(
+                (pair[1][0].usage and pair[1][0].usage.cpu_percent) or 0.0
+            ),
+        ):
+            tokens: List[str] = [
+                f"instance={name}",
+                f"state={state.state}",
+                f"health={health.health}",
+            ]
+            usage: Optional[PluginUsageSnapshot] = state.usage
+            if usage is not None:
+                if usage.cpu_time is not None:
+                    tokens.append(f"cpu_time={usage.cpu_time}")
+                if usage.cpu_percent is not None:
+                    tokens.append(f"cpu_percent={usage.cpu_percent}")
+                if usage.memory is not None:
+                    tokens.append(f"memory={usage.memory}")
+                tokens.append(f"threads={usage.threads}")
+            logs.message_info = f"plugin usage: {' '.join(tokens)}"
+
+    @classmethod
+    def snapshots(
+        cls, report: PluginServiceReport
+    ) -> Dict[str, Tuple[PluginStateSnapshot, PluginHealthSnapshot]]:
+        """Return the state and health of every running plugin instance.
+
+        Both snapshots carry the CPU and memory usage sampled by
+        `report.usage` at the time of the call.
+
+        ### Arguments:
+        * report: PluginServiceReport - Report of the running supervision cycle.
+
+        ### Returns:
+        Dict[str, Tuple[PluginStateSnapshot, PluginHealthSnapshot]] - Snapshots
+        keyed by instance name.
+        """
+        usage: Dict[str, PluginUsageSnapshot] = (
+            report.usage.sample() if report.usage is not None else {}
+        )
+        out: Dict[str, Tuple[PluginStateSnapshot, PluginHealthSnapshot]] = {}
+        for name, runtime in report.runtimes.items():
+            try:
+                state: PluginStateSnapshot = runtime.state()
+                health: PluginHealthSnapshot = runtime.health()
+            except Exception as ex:
+                state = PluginStateSnapshot(state=PluginState.FAILED, message=str(ex))
+                health = PluginHealthSnapshot(
+                    health=PluginHealth.UNKNOWN, message=str(ex)
+                )
+            out[name] = (
+                replace(state, usage=usage.get(name)),
+                replace(health, usage=usage.get(name)),
+            )
+        return out
 
     # #[PRIVATE METHODS]############################################################
     @classmethod
@@ -260,7 +388,7 @@ class PluginRegistryService(BClasses):
         cls,
         app_meta: AppName,
         conf: "AppConfig",
-        config: Dict[str, Any],
+        config: Mapping[str, Any],
         dispatcher: DispatcherAdapter,
         logs: LoggerClient,
         plugin: PluginDefinition,
@@ -270,7 +398,7 @@ class PluginRegistryService(BClasses):
         ### Arguments:
         * app_meta: AppName - Application identity metadata.
         * conf: AppConfig - Loaded application configuration service.
-        * config: Dict[str, Any] - Parsed plugin config values.
+        * config: Mapping[str, Any] - Frozen plugin config snapshot.
         * dispatcher: DispatcherAdapter - Plugin-facing dispatcher adapter.
         * logs: LoggerClient - Daemon logger used by the supervision service.
         * plugin: PluginDefinition - Discovered plugin instance definition.
@@ -353,6 +481,226 @@ class PluginRegistryService(BClasses):
                 )
             )
 
+    @classmethod
+    def __publish_limits(
+        cls, conf: "AppConfig", instance_name: str, logs: LoggerClient
+    ) -> Tuple[float, int]:
+        """Return the publish rate limit configured for one plugin instance.
+
+        ### Arguments:
+        * conf: AppConfig - Loaded application configuration service.
+        * instance_name: str - Plugin instance section name.
+        * logs: LoggerClient - Daemon logger used for invalid values.
+
+        ### Returns:
+        Tuple[float, int] - `publish_rate` and `publish_burst`, zeros when unset.
+        """
+        if conf.cf is None or not conf.cf.has_section(instance_name):
+            return (0.0, 0)
+        try:
+            rate: float = float(
+                conf.cf.get(instance_name, PluginHostKeys.PUBLISH_RATE) or 0
+            )
+            burst: int = int(
+                conf.cf.get(instance_name, PluginHostKeys.PUBLISH_BURST) or 0
+            )
+        except (TypeError, ValueError) as ex:
+            logs.message_warning = (
+                f"invalid publish limit for plugin instance '{instance_name}': {ex}"
+            )
+            return (0.0, 0)
+        return (max(0.0, rate), max(0, burst))
+
+    @classmethod
+    def __reconfigure(
+        cls,
+        report: PluginServiceReport,
+        conf: "AppConfig",
+        logs: LoggerClient,
+        name: str,
+    ) -> bool:
+        """Swap a new config snapshot into one running instance.
+
+        ### Arguments:
+        * report: PluginServiceReport - Report of the running supervision cycle.
+        * conf: AppConfig - Reloaded application configuration service.
+        * logs: LoggerClient - Daemon logger used for supervision messages.
+        * name: str - Plugin instance name.
+
+        ### Returns:
+        bool - `True` when the instance keeps running with the new snapshot.
+        """
+        runtime: Optional[PluginRuntime] = report.runtimes.get(name)
+        context: Optional[PluginContext] = report.contexts.get(name)
+        plugins: List[PluginDefinition] = [
+            item for item in conf.get_plugins if item.instance_name == name
+        ]
+        if (
+            conf.cf is None
+            or context is None
+            or len(plugins) != 1
+            or not isinstance(runtime, PluginReconfigurable)
+        ):
+            return False
+        schema = plugins[0].spec.config_schema
+        try:
+            snapshot = PluginConfigParser.snapshot(conf.cf, name, schema)
+        except Exception:
+            # the restart path reports the invalid section
+            return False
+        changed: List[str] = snapshot.changed(context.config)
+        if any(
+            field.restart_required and field.name in changed for field in schema.fields
+        ):
+            return False
+        try:
+            if not runtime.reconfigure(snapshot):
+                return False
+        except Exception as ex:
+            logs.message_warning = (
+                f"plugin instance '{name}' rejected the new config: {ex}"
+            )
+            return False
+        context.config = snapshot
+        logs.message_info = (
+            f"reconfigured plugin instance '{name}' in place, changed fields: "
+            f"{changed}"
+        )
+        return True
+
+    @classmethod
+    def __start_plugins(
+        cls,
+        report: PluginServiceReport,
+        conf: "AppConfig",
+        app_meta: AppName,
+        logs: LoggerClient,
+        plugins: List[PluginDefinition],
+    ) -> None:
+        """Initialize and start plugin instances against a running dispatcher.
+
+        Communication plugins are started before workers. Each instance gets
+        its own dispatcher adapter so that its consumer queues can be released
+        when the instance alone is restarted.
+
+        ### Arguments:
+        * report: PluginServiceReport - Supervision report being updated.
+        * conf: AppConfig - Loaded application configuration service.
+        * app_meta: AppName - Application identity metadata.
+        * logs: LoggerClient - Daemon logger used for supervision messages.
+        * plugins: List[PluginDefinition] - Plugin instances to start.
+        """
+        if report.dispatch is None or conf.cf is None:
+            return None
+        qcom: Optional[Queue] = report.dispatch.qcom
+        if qcom is None:
+            return None
+        comm_plugins: List[PluginDefinition] = []
+        worker_plugins: List[PluginDefinition] = []
+        for plugin in plugins:
+            if plugin.spec.plugin_kind == PluginKind.COMMUNICATION:
+                comm_plugins.append(plugin)
+            else:
+                worker_plugins.append(plugin)
+
+        initialized_plugins: List[Tuple[PluginDefinition, PluginRuntime]] = []
+        ordered_plugins: List[PluginDefinition] = comm_plugins + worker_plugins
+        for plugin in ordered_plugins:
+            publish_rate, publish_burst = cls.__publish_limits(
+                conf=conf, instance_name=plugin.instance_name, logs=logs
+            )
+            dispatcher_adapter = DispatcherAdapter(
+                qcom=qcom,
+                dispatcher=report.dispatch,
+                instance_name=plugin.instance_name,
+                publish_rate=publish_rate,
+                publish_burst=publish_burst,
+            )
+            try:
+                with StartupProfiler.span(
+                    StartupCategory.CONFIG, f"[{plugin.instance_name}]"
+                ):
+                    config: Mapping[str, Any] = PluginConfigParser.snapshot(
+                        conf.cf, plugin.instance_name, plugin.spec.config_schema
+                    )
+                with StartupProfiler.span(StartupCategory.INIT, plugin.instance_name):
+                    context: PluginContext = cls.__build_plugin_context(
+                        app_meta=app_meta,
+                        conf=conf,
+                        config=config,
+                        dispatcher=dispatcher_adapter,
+                        logs=logs,
+                        plugin=plugin,
+                    )
+                    runtime = plugin.spec.runtime_factory(context)
+                    runtime.initialize()
+                report.managed_runtimes.append(runtime)
+                report.runtimes[plugin.instance_name] = runtime
+                report.adapters[plugin.instance_name] = dispatcher_adapter
+                report.contexts[plugin.instance_name] = context
+                if report.usage is not None:
+                    report.usage.register(plugin.instance_name, plugin.plugin_path)
+                initialized_plugins.append((plugin, runtime))
+                report.initialized.append(plugin.instance_name)
+                if conf.debug:
+                    logs.message_debug = (
+                        f"initialized plugin instance: '{plugin.instance_name}'"
+                    )
+            except Exception as ex:
+                dispatcher_adapter.release()
+                report.failed.append(
+                    PluginFailure(
+                        error=str(ex),
+                        instance_name=plugin.instance_name,
+                        stage="initialize",
+                    )
+                )
+                logs.message_error = (
+                    f"cannot initialize plugin instance "
+                    f"'{plugin.instance_name}': {ex}"
+                )
+
+        for plugin, runtime in initialized_plugins:
+            try:
+                with StartupProfiler.span(StartupCategory.START, plugin.instance_name):
+                    runtime.start()
+                report.started.append(plugin.instance_name)
+                if conf.debug:
+                    logs.message_debug = (
+                        f"started plugin instance: '{plugin.instance_name}'"
+                    )
+            except Exception as ex:
+                report.failed.append(
+                    PluginFailure(
+                        error=str(ex),
+                        instance_name=plugin.instance_name,
+                        stage="start",
+                    )
+                )
+                logs.message_error = (
+                    f"cannot start plugin instance '{plugin.instance_name}': {ex}"
+                )
+                try:
+                    runtime.stop(timeout=2.0)
+                except Exception:
+                    pass
+
+    @classmethod
+    def __stop_runtime(cls, runtime: PluginRuntime, logs: LoggerClient) -> None:
+        """Request shutdown of one runtime and wait for a terminal state.
+
+        ### Arguments:
+        * runtime: PluginRuntime - Managed runtime being stopped.
+        * logs: LoggerClient - Daemon logger used for shutdown messages.
+        """
+        try:
+            runtime.stop(timeout=2.0)
+        except TypeError:
+            runtime.stop()
+        except Exception as ex:
+            logs.message_error = f"cannot stop plugin runtime: {ex}"
+        cls.__wait_for_runtime_shutdown(runtime=runtime, logs=logs)
+
     @classmethod
     def __wait_for_runtime_shutdown(
         cls,
@@ -0,0 +1,216 @@
+# -*- coding: UTF-8 -*-
+"""
+Plugin resource accounting.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-14
+
+Purpose: Attribute CPU time and traced memory to plugin instances.
+"""
+
+import os
+import threading
+import time
+import tracemalloc
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock, Thread
+from typing import Dict, List, Optional
+
+from jsktoolbox.attribtool import ReadOnlyClass
+from jsktoolbox.basetool import BData
+
+from libs.plugins.runtime import PluginUsageSnapshot
+
+
+class _Keys(object, metaclass=ReadOnlyClass):
+    """Define internal storage keys for the usage monitor."""
+
+    # #[CONSTANTS]####################################################################
+    ACCOUNTS: str = "__accounts__"
+    LOCK: str = "__lock__"
+    MEMORY: str = "__memory__"
+    TRACING: str = "__tracing__"
+
+
+@dataclass(slots=True)
+class _Account:
+    """Hold the running CPU figures of one plugin instance."""
+
+    path: str
+    last_cpu: float = 0.0
+    last_wall: float = field(default_factory=time.monotonic)
+    threads: Dict[Thread, float] = field(default_factory=dict)
+
+
+class PluginUsageMonitor(BData):
+    """Sample CPU time and memory of registered plugin instances.
+
+    CPU time is read from the per-thread CPU clock of every live thread named
+    after the instance, or `<instance>.<suffix>` for helper threads, and the
+    last reading of finished threads is kept, so the figure only grows.
+    Memory is the size of the blocks still allocated with a frame from the
+    plugin directory, which backs its `aasd_plugin_*` package, anywhere in
+    the allocation traceback. It is available only when the monitor was
+    created with `memory=True`, since `tracemalloc` slows every allocation.
+    """
+
+    # number of frames stored per traced allocation
+    FRAMES: int = 16
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self, memory: bool = False) -> None:
+        """Initialize the monitor.
+
+        ### Arguments:
+        * memory: bool - Trace allocations to report plugin memory.
+        """
+        tracing: bool = False
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start(self.FRAMES)
+            tracing = True
+        self._set_data(key=_Keys.ACCOUNTS, value={}, set_default_type=Dict)
+        self._set_data(key=_Keys.LOCK, value=Lock())
+        self._set_data(key=_Keys.MEMORY, value=bool(memory), set_default_type=bool)
+        self._set_data(key=_Keys.TRACING, value=tracing, set_default_type=bool)
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def instances(self) -> List[str]:
+        """Return the registered instance names.
+
+        ### Returns:
+        List[str] - Sorted instance names.
+        """
+        with self.__lock:
+            return sorted(self.__accounts)
+
+    @property
+    def memory(self) -> bool:
+        """Return whether plugin memory is reported.
+
+        ### Returns:
+        bool - `True` when allocations are traced.
+        """
+        return self._get_data(key=_Keys.MEMORY) and tracemalloc.is_tracing()  # type: ignore
+
+    # #[PUBLIC METHODS]###############################################################
+    def close(self) -> None:
+        """Stop allocation tracing started by this monitor."""
+        if self._get_data(key=_Keys.TRACING):
+            tracemalloc.stop()
+            self._set_data(key=_Keys.TRACING, value=False)
+
+    def register(self, instance_name: str, plugin_path: Path) -> None:
+        """Start accounting for one plugin instance.
+
+        ### Arguments:
+        * instance_name: str - Plugin instance name.
+        * plugin_path: Path - Plugin instance directory.
+        """
+        with self.__lock:
+            self.__accounts[instance_name] = _Account(
+                path=f"{Path(plugin_path).resolve()}{os.sep}*"
+            )
+
+    def sample(self) -> Dict[str, PluginUsageSnapshot]:
+        """Return the current usage of every registered instance.
+
+        `cpu_percent` is the share of one core used since the previous
+        `sample()`, or since registration for the first one.
+
+        ### Returns:
+        Dict[str, PluginUsageSnapshot] - Usage keyed by instance name.
+        """
+        threads: List[Thread] = threading.enumerate()
+        snapshot: Optional[tracemalloc.Snapshot] = None
+        if self.memory:
+            snapshot = tracemalloc.take_snapshot()
+        out: Dict[str, PluginUsageSnapshot] = {}
+        now: float = time.monotonic()
+        with self.__lock:
+            for name, account in self.__accounts.items():
+                alive: int = 0
+                for item in threads:
+                    if item.name != name and not item.name.startswith(f"{name}."):
+                        continue
+                    alive += 1
+                    value: Optional[float] = self.thread_cpu_time(item)
+                    if value is not None:
+                        account.threads[item] = value
+                cpu_time: Optional[float] = None
+                cpu_percent: Optional[float] = None
+                if account.threads:
+                    cpu_time = sum(account.threads.values())
+                    elapsed: float = now - account.last_wall
+                    if elapsed > 0:
+                        cpu_percent = round(
+                            (cpu_time - account.last_cpu) / elapsed * 100, 2
+                        )
+                    account.last_cpu = cpu_time
+                    account.last_wall = now
+                memory: Optional[int] = None
+                if snapshot is not None:
+                    memory = sum(
+                        trace.size
+                        for trace in snapshot.filter_traces(
+                            [tracemalloc.Filter(True, account.path, all_frames=True)]
+                        ).traces
+                    )
+                out[name] = PluginUsageSnapshot(
+                    cpu_percent=cpu_percent,
+                    cpu_time=None if cpu_time is None else round(cpu_time, 3),
+                    memory=memory,
+                    threads=alive,
+                )
+        return out
+
+    @staticmethod
+    def thread_cpu_time(thread: Thread) -> Optional[float]:
+        """Return the CPU time consumed by a live thread.
+
+        ### Arguments:
+        * thread: Thread - Thread to measure.
+
+        ### Returns:
+        Optional[float] - CPU seconds, `None` when the thread is not running
+        or the platform has no per-thread CPU clocks.
+        """
+        if thread.ident is None or not thread.is_alive():
+            return None
+        try:
+            return time.clock_gettime(time.pthread_getcpuclockid(thread.ident))
+        except (AttributeError, OSError):
+            return None
+
+    def unregister(self, instance_name: str) -> None:
+        """Stop accounting for one plugin instance.
+
+        ### Arguments:
+        * instance_name: str - Plugin instance name.
+        """
+        with self.__lock:
+            self.__accounts.pop(instance_name, None)
+
+    # #[PRIVATE PROPERTIES]###########################################################
+    @property
+    def __accounts(self) -> Dict[str, _Account]:
+        """Return the accounts keyed by instance name.
+
+        ### Returns:
+        Dict[str, _Account] - Registered accounts.
+        """
+        return self._get_data(key=_Keys.ACCOUNTS)  # type: ignore
+
+    @property
+    def __lock(self) -> Lock:
+        """Return the lock guarding the accounts.
+
+        ### Returns:
+        Lock - Accounts lock.
+        """
+        return self._get_data(key=_Keys.LOCK)  # type: ignore
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,299 @@
+# -*- coding: UTF-8 -*-
+"""
+Worker plugin runtime base.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-17
+
+Purpose: Provide a thread-based worker runtime driving a `tick()` callback
+from `sleep_period` and the notification schedules.
+"""
+
+import math
+import time
+
+from abc import ABCMeta, abstractmethod
+from threading import Event, Thread
+from typing import List, Optional
+
+from jsktoolbox.attribtool import ReadOnlyClass
+
+from libs.com.message import NotificationScheduler
+from libs.plugins.keys import PluginCommonKeys
+from libs.plugins.mixins import ThPluginMixin
+from libs.plugins.runtime import (
+    PluginContext,
+    PluginHealth,
+    PluginHealthSnapshot,
+    PluginState,
+    PluginStateSnapshot,
+)
+from libs.tools import MIntervals
+
+
+class _Keys(object, metaclass=ReadOnlyClass):
+    """Define internal storage keys for the worker runtime base."""
+
+    # #[CONSTANTS]####################################################################
+    TICKS: str = "__ticks__"
+
+
+class ThWorkerRuntime(Thread, ThPluginMixin, metaclass=ABCMeta):
+    """Call `tick()` on `sleep_period` and when notifications are due.
+
+    The thread ticks once at startup, then sleeps on its stop event until the
+    next `sleep_period` tick or the next due `message_channel` interval or
+    `at_channel` minute, whichever comes first, so an idle worker does not
+    wake up between ticks. Subclasses implement `tick()` and may override
+    `initialize()` and `close()`; a subclass without `tick()` cannot be
+    instantiated. Lifecycle and health snapshots are kept by the base.
+    """
+
+    # shortest pause between periodic ticks when a tick overruns `sleep_period`
+    MIN_PAUSE: float = 1.0
+
+    _notifications: Optional[NotificationScheduler] = None
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self, context: PluginContext) -> None:
+        """Initialize the worker runtime.
+
+        ### Arguments:
+        * context: PluginContext - Plugin runtime context.
+        """
+        Thread.__init__(self, name=context.instance_name)
+        self.daemon = True
+        self._context = context
+        self._health = PluginHealthSnapshot(health=PluginHealth.UNKNOWN)
+        self._notifications = NotificationScheduler.from_config(context.config)
+        self._state = PluginStateSnapshot(state=PluginState.CREATED)
+        self._stop_event = Event()
+        self._set_data(key=_Keys.TICKS, value=0, set_default_type=int)
+
+    def initialize(self) -> None:
+        """Prepare the runtime before startup."""
+        self._state = PluginStateSnapshot(state=PluginState.INITIALIZED)
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def period(self) -> float:
+        """Return the `sleep_period` tick interval.
+
+        Read on every tick, so a `reconfigure()` swap applies from the next one.
+
+        ### Returns:
+        float - Seconds between periodic ticks, `0.0` when `sleep_period` is
+        not configured.
+        """
+        context: Optional[PluginContext] = self._context
+        if context is None:
+            return 0.0
+        value = context.config.get(PluginCommonKeys.SLEEP_PERIOD)
+        if value is None or not str(value).strip():
+            return 0.0
+        return float(MIntervals(self._c_name).convert(str(value)))
+
+    @property
+    def ticks(self) -> int:
+        """Return the number of completed ticks.
+
+        ### Returns:
+        int - `tick()` calls since startup.
+        """
+        return self._get_data(key=_Keys.TICKS)  # type: ignore
+
+    # #[PUBLIC METHODS]################################################################
+    def close(self) -> None:
+        """Release runtime resources on the worker thread after the last tick."""
+
+    def health(self) -> PluginHealthSnapshot:
+        """Return the current health snapshot.
+
+        ### Returns:
+        PluginHealthSnapshot - Current plugin health snapshot.
+        """
+        health: Optional[PluginHealthSnapshot] = self._health
+        if health is None:
+            return PluginHealthSnapshot(
+                health=PluginHealth.UNKNOWN,
+                message="Health snapshot is not initialized.",
+            )
+        return health
+
+    def run(self) -> None:
+        """Run ticks until stopped."""
+        stop_event: Optional[Event] = self._stop_event
+        context: Optional[PluginContext] = self._context
+        if stop_event is None or context is None:
+            reason: str = (
+                "Stop event is not initialized."
+                if stop_event is None
+                else "Plugin context is not initialized."
+            )
+            self._health = PluginHealthSnapshot(
+                health=PluginHealth.UNHEALTHY,
+                last_error_at=int(time.time()),
+                message=reason,
+            )
+            self._state = PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message=reason,
+                stopped_at=int(time.time()),
+            )
+            return None
+        next_tick: float = time.monotonic()
+        # the notification deadline is kept across waits and only recomputed
+        # after a tick, `AtChannel.next_due()` never returns the current minute
+        source: Optional[NotificationScheduler] = None
+        scheduled: Optional[float] = None
+        while not stop_event.is_set():
+            notifications: Optional[NotificationScheduler] = self._notifications
+            if notifications is not source:
+                source = notifications
+                scheduled = (
+                    notifications.next_due() if notifications is not None else None
+                )
+            now: float = time.monotonic()
+            periodic: bool = now >= next_tick
+            if periodic or (scheduled is not None and time.time() >= scheduled):
+                self.__tick(
+                    notifications.due_channels() if notifications is not None else []
+                )
+                scheduled = (
+                    notifications.next_due() if notifications is not None else None
+                )
+                if periodic:
+                    period: float = self.period
+                    next_tick = now + period if period > 0 else math.inf
+                    if next_tick <= time.monotonic():
+                        next_tick = time.monotonic() + self.MIN_PAUSE
+                continue
+            deadline: float = next_tick
+            if scheduled is not None:
+                deadline = min(deadline, now + scheduled - time.time())
+            stop_event.wait(None if math.isinf(deadline) else deadline - now)
+        self.close()
+        self.__finish()
+
+    def start(self) -> None:
+        """Start the runtime thread."""
+        self._state = PluginStateSnapshot(
+            state=PluginState.STARTING,
+            started_at=int(time.time()),
+        )
+        Thread.start(self)
+
+    def state(self) -> PluginStateSnapshot:
+        """Return the current lifecycle snapshot.
+
+        ### Returns:
+        PluginStateSnapshot - Current plugin lifecycle snapshot.
+        """
+        state: Optional[PluginStateSnapshot] = self._state
+        if state is None:
+            return PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Lifecycle snapshot is not initialized.",
+            )
+        if self.is_alive() and state.state == PluginState.STARTING:
+            state = PluginStateSnapshot(
+                state=PluginState.RUNNING,
+                started_at=state.started_at,
+            )
+            self._state = state
+        return state
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Request plugin shutdown.
+
+        ### Arguments:
+        * timeout: Optional[float] - Optional join timeout.
+        """
+        stop_event: Optional[Event] = self._stop_event
+        if stop_event is None:
+            self._health = PluginHealthSnapshot(
+                health=PluginHealth.UNHEALTHY,
+                last_error_at=int(time.time()),
+                message="Stop event is not initialized.",
+            )
+            self._state = PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Stop event is not initialized.",
+                stopped_at=int(time.time()),
+            )
+            return None
+        state: Optional[PluginStateSnapshot] = self._state
+        if state is not None and state.state not in (
+            PluginState.STOPPED,
+            PluginState.FAILED,
+        ):
+            self._state = PluginStateSnapshot(
+                state=PluginState.STOPPING,
+                started_at=state.started_at,
+            )
+        stop_event.set()
+        if self.is_alive():
+            self.join(timeout=timeout)
+        self.__finish()
+
+    @abstractmethod
+    def tick(self, due: List[int]) -> bool:
+        """Do one unit of work.
+
+        Called once at startup, on every `sleep_period` and whenever a
+        scheduled notification channel becomes due. Setting `_health` inside
+        the tick replaces the snapshot the base would record.
+
+        ### Arguments:
+        * due: List[int] - Notification channels due now, as returned by
+          `NotificationScheduler.due_channels()`.
+
+        ### Returns:
+        bool - `True` when the tick succeeded, `False` marks the runtime
+        degraded.
+        """
+
+    # #[PRIVATE METHODS]###############################################################
+    def __finish(self) -> None:
+        """Record the stopped lifecycle state once."""
+        state: Optional[PluginStateSnapshot] = self._state
+        if state is not None and state.state == PluginState.STOPPED:
+            return None
+        self._state = PluginStateSnapshot(
+            state=PluginState.STOPPED,
+            started_at=state.started_at if state is not None else None,
+            stopped_at=int(time.time()),
+        )
+
+    def __tick(self, due: List[int]) -> None:
+        """Call `tick()` and record the resulting health.
+
+        ### Arguments:
+        * due: List[int] - Notification channels due now.
+        """
+        context: PluginContext = self._context  # type: ignore
+        before: Optional[PluginHealthSnapshot] = self._health
+        started: float = time.monotonic()
+        message: str
+        try:
+            ok: bool = bool(self.tick(due))
+            message = f"Tick took {time.monotonic() - started:.2f}s."
+        except Exception as ex:
+            ok = False
+            message = f"Tick failed: {ex}"
+            context.logger.message_error = message
+        self._set_data(key=_Keys.TICKS, value=self.ticks + 1)
+        if self._health is not before:
+            return None
+        self._health = PluginHealthSnapshot(
+            health=PluginHealth.HEALTHY if ok else PluginHealth.DEGRADED,
+            last_error_at=None if ok else int(time.time()),
+            last_ok_at=int(time.time()) if ok else None,
+            message=message,
+        )
+
+
+# #[EOF]#######################################################################
@@ -8,7 +8,7 @@ Created: 2026-03-23
 Purpose: Provide schema-oriented configuration descriptors for plugin API v1.
 """
 
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Union, get_args, get_origin
 
 from jsktoolbox.attribtool import ReadOnlyClass
 from jsktoolbox.basetool import BData, BClasses
@@ -359,9 +359,13 @@ class PluginConfigField(BData):
         """Return a readable name of the declared field type.
 
         ### Returns:
-        str - Human-readable field type name.
+        str - Human-readable field type name, `int|float` for unions.
         """
         field_type: object = self.field_type
+        if get_origin(field_type) is Union:
+            return "|".join(
+                str(getattr(item, "__name__", item)) for item in get_args(field_type)
+            )
         if hasattr(field_type, "__name__"):
             return str(getattr(field_type, "__name__"))
         return str(field_type)
@@ -4,22 +4,57 @@ from importlib import import_module
 from typing import TYPE_CHECKING, Any, Dict, Final, List
 
 __all__: List[str] = [
+    "BoundedLoggerQueue",
+    "ConfigChangeSet",
+    "ConfigDigest",
+    "JsonLinesLogEngine",
     "MDateTime",
     "MIntervals",
     "Pinger",
+    "PollingBackend",
+    "SqlEnginePool",
+    "StartupCategory",
+    "StartupProfiler",
+    "StartupSpan",
+    "ThFileWatcher",
+    "ThJsonLogWriter",
+    "ThLogProcessor",
+    "ThStackSampler",
     "Tracert",
+    "WatchBackend",
 ]
 
 _EXPORTS: Final[Dict[str, str]] = {
+    "BoundedLoggerQueue": "libs.tools.logqueue",
+    "ConfigChangeSet": "libs.tools.confdigest",
+    "ConfigDigest": "libs.tools.confdigest",
+    "JsonLinesLogEngine": "libs.tools.jsonlog",
     "MDateTime": "libs.tools.datetool",
     "MIntervals": "libs.tools.datetool",
     "Pinger": "libs.tools.icmp",
+    "PollingBackend": "libs.tools.fswatch",
+    "SqlEnginePool": "libs.tools.sqlpool",
+    "StartupCategory": "libs.tools.startup",
+    "StartupProfiler": "libs.tools.startup",
+    "StartupSpan": "libs.tools.startup",
+    "ThFileWatcher": "libs.tools.fswatch",
+    "ThJsonLogWriter": "libs.tools.jsonlog",
+    "ThLogProcessor": "libs.tools.logqueue",
+    "ThStackSampler": "libs.tools.sampler",
     "Tracert": "libs.tools.icmp",
+    "WatchBackend": "libs.tools.fswatch",
 }
 
 if TYPE_CHECKING:
+    from libs.tools.confdigest import ConfigChangeSet, ConfigDigest
     from libs.tools.datetool import MDateTime, MIntervals
+    from libs.tools.fswatch import PollingBackend, ThFileWatcher, WatchBackend
     from libs.tools.icmp import Pinger, Tracert
+    from libs.tools.jsonlog import JsonLinesLogEngine, ThJsonLogWriter
+    from libs.tools.logqueue import BoundedLoggerQueue, ThLogProcessor
+    from libs.tools.sampler import ThStackSampler
+    from libs.tools.sqlpool import SqlEnginePool
+    from libs.tools.startup import StartupCategory, StartupProfiler, StartupSpan
 
 
 def __dir__() -> List[str]:
@@ -0,0 +1,136 @@
+# -*- coding: UTF-8 -*-
+"""
+Configuration section digest helpers.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Hash configuration file sections and compare them between reloads.
+"""
+
+import hashlib
+import re
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Pattern
+
+from jsktoolbox.basetool import BClasses
+
+
+@dataclass(slots=True, frozen=True)
+class ConfigChangeSet:
+    """Describe configuration sections changed between two reloads."""
+
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        """Return whether any section was added, changed, or removed.
+
+        ### Returns:
+        bool - `True` when the change set is not empty.
+        """
+        return bool(self.added or self.changed or self.removed)
+
+    @property
+    def sections(self) -> List[str]:
+        """Return all affected section names in sorted order.
+
+        ### Returns:
+        List[str] - Added, changed, and removed section names.
+        """
+        return sorted(set(self.added) | set(self.changed) | set(self.removed))
+
+
+class ConfigDigest(BClasses):
+    """Compute per-section digests of an INI-like configuration file."""
+
+    # #[CONSTANTS]####################################################################
+    __RE_SECTION: Pattern = re.compile(r"^\s*\[(.*)\]\s*$")
+    __RE_VAR: Pattern = re.compile(r"^\s*(\S+?)\s*=(.*)$")
+
+    # #[STATIC/CLASS METHODS]#########################################################
+    @classmethod
+    def compare(
+        cls, previous: Dict[str, str], current: Dict[str, str]
+    ) -> ConfigChangeSet:
+        """Compare two digest maps and return the section change set.
+
+        ### Arguments:
+        * previous: Dict[str, str] - Section digests from the previous load.
+        * current: Dict[str, str] - Section digests from the current load.
+
+        ### Returns:
+        ConfigChangeSet - Added, changed, and removed section names.
+        """
+        return ConfigChangeSet(
+            added=sorted(name for name in current if name not in previous),
+            changed=sorted(
+                name
+                for name in current
+                if name in previous and previous[name] != current[name]
+            ),
+            removed=sorted(name for name in previous if name not in current),
+        )
+
+    @classmethod
+    def digest(cls, config_file: str, main_section: Optional[str]) -> Dict[str, str]:
+        """Return a digest of variable assignments for every file section.
+
+        Only variable lines take part in the digest, so editing comments or
+        blank lines does not mark a section as changed.
+
+        ### Arguments:
+        * config_file: str - Path to the configuration file.
+        * main_section: Optional[str] - Section receiving lines placed before
+          the first section header.
+
+        ### Returns:
+        Dict[str, str] - Mapping of section names to hex digests.
+        """
+        path = Path(config_file)
+        if not path.is_file():
+            return {}
+        with open(path, "r") as file:
+            return cls.digest_lines(file.readlines(), main_section)
+
+    @classmethod
+    def digest_lines(
+        cls, lines: List[str], main_section: Optional[str]
+    ) -> Dict[str, str]:
+        """Return per-section digests for already loaded configuration lines.
+
+        ### Arguments:
+        * lines: List[str] - Raw configuration file lines.
+        * main_section: Optional[str] - Section receiving lines placed before
+          the first section header.
+
+        ### Returns:
+        Dict[str, str] - Mapping of section names to hex digests.
+        """
+        hashes: Dict[str, Any] = {}
+        section: str = main_section or ""
+        for raw_line in lines:
+            line: str = raw_line.strip()
+            if not line or line.startswith("#"):
+                continue
+            match = cls.__RE_SECTION.match(line)
+            if match:
+                section = match.group(1).strip()
+                if section not in hashes:
+                    hashes[section] = hashlib.sha1()
+                continue
+            match = cls.__RE_VAR.match(line)
+            if match is None:
+                continue
+            value: str = match.group(2).split("#", 1)[0].strip()
+            if section not in hashes:
+                hashes[section] = hashlib.sha1()
+            hashes[section].update(f"{match.group(1)}={value}\n".encode("utf-8"))
+        return {name: item.hexdigest() for name, item in hashes.items()}
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,716 @@
+# -*- coding: UTF-8 -*-
+"""
+File system watcher helpers.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Watch the configuration file and plugins directory for hot reload.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+from abc import ABCMeta, abstractmethod
+from inspect import currentframe
+from threading import Event, Thread
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from jsktoolbox.attribtool import ReadOnlyClass
+from jsktoolbox.basetool import BData, ThBaseObject
+from jsktoolbox.logstool import LoggerClient, LoggerQueue
+from jsktoolbox.raisetool import Raise
+
+from libs.base import LogsMixin
+
+
+class _Keys(object, metaclass=ReadOnlyClass):
+    """Define internal storage keys for file system watcher helpers."""
+
+    # #[CONSTANTS]####################################################################
+    BACKEND: str = "__backend__"
+    CALLBACK: str = "__callback__"
+    CONFIG_FILE: str = "__config_file__"
+    DEBOUNCE: str = "__debounce__"
+    FD: str = "__fd__"
+    INTERVAL: str = "__interval__"
+    LIBC: str = "__libc__"
+    MAX_DELAY: str = "__max_delay__"
+    MISSING: str = "__missing__"
+    PLUGINS_DIR: str = "__plugins_dir__"
+    SIGNATURES: str = "__signatures__"
+    WAKE: str = "__wake__"
+    WAKE_EVENT: str = "__wake_event__"
+    WATCHES: str = "__watches__"
+
+
+def path_signature(path: str) -> Tuple:
+    """Return a cheap signature describing the current state of a path.
+
+    Files are described by their `stat` identity, directories by the sorted
+    list of entries together with symlink targets and entry `lstat` times.
+
+    ### Arguments:
+    * path: str - File or directory path.
+
+    ### Returns:
+    Tuple - Comparable signature; an empty tuple for a missing path.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return ()
+    if not os.path.isdir(path):
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    entries: List[Tuple] = []
+    try:
+        names: List[str] = sorted(os.listdir(path))
+    except OSError:
+        return ()
+    for name in names:
+        entry: str = os.path.join(path, name)
+        try:
+            entries.append(
+                (name, os.path.realpath(entry), os.lstat(entry).st_mtime_ns)
+            )
+        except OSError:
+            continue
+    return tuple(entries)
+
+
+class WatchBackend(BData, metaclass=ABCMeta):
+    """Define the notification backend contract used by `ThFileWatcher`.
+
+    Event driven backends block in the kernel until something changes or
+    `wake()` is called, so an idle watcher costs no CPU wakeups.
+    """
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self) -> None:
+        """Initialize the self-pipe used to interrupt a blocking wait."""
+        self._set_data(key=_Keys.WAKE, value=os.pipe(), set_default_type=Tuple)
+        for fd in self._wake_fds:
+            os.set_blocking(fd, False)
+
+    # #[PROTECTED PROPERTIES]#########################################################
+    @property
+    def _wake_fds(self) -> Tuple[int, int]:
+        """Return the read and write ends of the wake pipe.
+
+        ### Returns:
+        Tuple[int, int] - Pipe file descriptors.
+        """
+        return self._get_data(key=_Keys.WAKE)  # type: ignore
+
+    # #[PUBLIC METHODS]###############################################################
+    @abstractmethod
+    def add(self, path: str) -> None:
+        """Start watching a file or directory.
+
+        ### Arguments:
+        * path: str - File or directory path.
+        """
+
+    def close(self) -> None:
+        """Release kernel resources held by the backend."""
+        for fd in self._wake_fds:
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    @abstractmethod
+    def wait(self, timeout: Optional[float] = None) -> List[str]:
+        """Block until watched paths change, `wake()` is called, or timeout.
+
+        ### Arguments:
+        * timeout: Optional[float] - Maximum wait in seconds, `None` blocks.
+
+        ### Returns:
+        List[str] - Paths reported as changed, may be empty.
+        """
+
+    def wake(self) -> None:
+        """Interrupt a blocking `wait()` call."""
+        try:
+            os.write(self._wake_fds[1], b"\0")
+        except OSError:
+            pass
+
+    # #[PROTECTED METHODS]############################################################
+    def _drain_wake(self) -> None:
+        """Consume pending wake-up bytes from the self-pipe."""
+        try:
+            while os.read(self._wake_fds[0], 512):
+                pass
+        except OSError:
+            pass
+
+
+class InotifyBackend(WatchBackend):
+    """Linux `inotify` backend watching directories for entry changes."""
+
+    # #[CONSTANTS]####################################################################
+    IN_ATTRIB: int = 0x00000004
+    IN_CLOSE_WRITE: int = 0x00000008
+    IN_MOVED_FROM: int = 0x00000040
+    IN_MOVED_TO: int = 0x00000080
+    IN_CREATE: int = 0x00000100
+    IN_DELETE: int = 0x00000200
+    IN_DELETE_SELF: int = 0x00000400
+    IN_MOVE_SELF: int = 0x00000800
+    __EVENT: struct.Struct = struct.Struct("iIII")
+    __MASK: int = (
+        IN_ATTRIB
+        | IN_CLOSE_WRITE
+        | IN_MOVED_FROM
+        | IN_MOVED_TO
+        | IN_CREATE
+        | IN_DELETE
+        | IN_DELETE_SELF
+        | IN_MOVE_SELF
+    )
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self) -> None:
+        """Create the inotify instance.
+
+        ### Raises:
+        * OSError: If inotify is not available on this system.
+        """
+        libc: Any = self.__libc()
+        if libc is None:
+            raise Raise.error(
+                "inotify is not available on this system.",
+                OSError,
+                self._c_name,
+                currentframe(),
+            )
+        fd: int = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise Raise.error(
+                f"cannot initialize inotify: {os.strerror(ctypes.get_errno())}",
+                OSError,
+                self._c_name,
+                currentframe(),
+            )
+        WatchBackend.__init__(self)
+        self._set_data(key=_Keys.LIBC, value=libc)
+        self._set_data(key=_Keys.FD, value=fd, set_default_type=int)
+        self._set_data(key=_Keys.WATCHES, value={}, set_default_type=Dict)
+
+    # #[STATIC/CLASS METHODS]#########################################################
+    @classmethod
+    def available(cls) -> bool:
+        """Return whether inotify can be used on this system.
+
+        ### Returns:
+        bool - `True` on Linux with an inotify capable C library.
+        """
+        return cls.__libc() is not None
+
+    @staticmethod
+    def __libc() -> Optional[Any]:
+        """Return the C library handle exposing inotify functions.
+
+        ### Returns:
+        Optional[Any] - `ctypes` library handle or `None`.
+        """
+        if not sys.platform.startswith("linux"):
+            return None
+        name: Optional[str] = ctypes.util.find_library("c")
+        if name is None:
+            return None
+        try:
+            libc = ctypes.CDLL(name, use_errno=True)
+        except OSError:
+            return None
+        if not hasattr(libc, "inotify_init1"):
+            return None
+        return libc
+
+    # #[PUBLIC METHODS]###############################################################
+    def add(self, path: str) -> None:
+        """Watch a directory, or the parent directory of a file.
+
+        ### Arguments:
+        * path: str - File or directory path.
+
+        ### Raises:
+        * OSError: If the kernel refuses the watch.
+        """
+        directory: str = path if os.path.isdir(path) else os.path.dirname(path)
+        directory = os.path.abspath(directory or ".")
+        wd: int = self._get_data(key=_Keys.LIBC).inotify_add_watch(
+            self._get_data(key=_Keys.FD), os.fsencode(directory), self.__MASK
+        )
+        if wd < 0:
+            raise Raise.error(
+                f"cannot watch '{directory}': {os.strerror(ctypes.get_errno())}",
+                OSError,
+                self._c_name,
+                currentframe(),
+            )
+        self._get_data(key=_Keys.WATCHES)[wd] = directory
+
+    def close(self) -> None:
+        """Close the inotify descriptor and the wake pipe."""
+        try:
+            os.close(self._get_data(key=_Keys.FD))
+        except OSError:
+            pass
+        WatchBackend.close(self)
+
+    def wait(self, timeout: Optional[float] = None) -> List[str]:
+        """Block until inotify reports events or the backend is woken up.
+
+        ### Arguments:
+        * timeout: Optional[float] - Maximum wait in seconds, `None` blocks.
+
+        ### Returns:
+        List[str] - Full paths of changed directory entries.
+        """
+        fd: int = self._get_data(key=_Keys.FD)  # type: ignore
+        readable, _, _ = select.select([fd, self._wake_fds[0]], [], [], timeout)
+        if self._wake_fds[0] in readable:
+            self._drain_wake()
+        if fd not in readable:
+            return []
+        try:
+            data: bytes = os.read(fd, 65536)
+        except BlockingIOError:
+            return []
+        watches: Dict[int, str] = self._get_data(key=_Keys.WATCHES)  # type: ignore
+        out: List[str] = []
+        offset: int = 0
+        while offset + self.__EVENT.size <= len(data):
+            wd, _mask, _cookie, length = self.__EVENT.unpack_from(data, offset)
+            offset += self.__EVENT.size
+            name: str = os.fsdecode(data[offset : offset + length].split(b"\0", 1)[0])
+            offset += length
+            directory: Optional[str] = watches.get(wd)
+            if directory is None:
+                continue
+            out.append(os.path.join(directory, name) if name else directory)
+        return out
+
+
+class KqueueBackend(WatchBackend):
+    """BSD `kqueue` backend watching vnodes of files and directories."""
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self) -> None:
+        """Create the kqueue instance.
+
+        ### Raises:
+        * OSError: If kqueue is not available on this system.
+        """
+        if not self.available():
+            raise Raise.error(
+                "kqueue is not available on this system.",
+                OSError,
+                self._c_name,
+                currentframe(),
+            )
+        WatchBackend.__init__(self)
+        kq: Any = select.kqueue()  # type: ignore[attr-defined]
+        self._set_data(key=_Keys.FD, value=kq)
+        self._set_data(key=_Keys.WATCHES, value={}, set_default_type=Dict)
+        self._set_data(key=_Keys.MISSING, value=[], set_default_type=List)
+        kq.control(
+            [
+                select.kevent(  # type: ignore[attr-defined]
+                    self._wake_fds[0],
+                    filter=select.KQ_FILTER_READ,  # type: ignore[attr-defined]
+                    flags=select.KQ_EV_ADD,  # type: ignore[attr-defined]
+                )
+            ],
+            0,
+            0,
+        )
+
+    # #[STATIC/CLASS METHODS]#########################################################
+    @classmethod
+    def available(cls) -> bool:
+        """Return whether kqueue can be used on this system.
+
+        ### Returns:
+        bool - `True` when the `select` module exposes kqueue.
+        """
+        return hasattr(select, "kqueue")
+
+    # #[PUBLIC METHODS]###############################################################
+    def add(self, path: str) -> None:
+        """Watch a path and, for files, its parent directory.
+
+        Watching the parent directory catches editors that replace the file
+        with a rename instead of rewriting it in place.
+
+        ### Arguments:
+        * path: str - File or directory path.
+        """
+        path = os.path.abspath(path)
+        if not os.path.isdir(path):
+            self.__register(os.path.dirname(path))
+        if not self.__register(path):
+            self._get_data(key=_Keys.MISSING).append(path)
+
+    def close(self) -> None:
+        """Close watched descriptors, the kqueue, and the wake pipe."""
+        watches: Dict[int, str] = self._get_data(key=_Keys.WATCHES)  # type: ignore
+        for fd in list(watches):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        watches.clear()
+        self._get_data(key=_Keys.FD).close()
+        WatchBackend.close(self)
+
+    def wait(self, timeout: Optional[float] = None) -> List[str]:
+        """Block until kqueue reports vnode events or the backend is woken up.
+
+        Paths whose vnode was deleted or renamed are re-registered on the next
+        call; while any of them is missing, the wait is capped at one second.
+
+        ### Arguments:
+        * timeout: Optional[float] - Maximum wait in seconds, `None` blocks.
+
+        ### Returns:
+        List[str] - Watched paths reported as changed.
+        """
+        out: List[str] = []
+        missing: List[str] = self._get_data(key=_Keys.MISSING)  # type: ignore
+        for path in list(missing):
+            if self.__register(path):
+                missing.remove(path)
+                out.append(path)
+        if out:
+            return out
+        if missing:
+            timeout = 1.0 if timeout is None else min(timeout, 1.0)
+        watches: Dict[int, str] = self._get_data(key=_Keys.WATCHES)  # type: ignore
+        gone: int = select.KQ_NOTE_DELETE | select.KQ_NOTE_RENAME  # type: ignore[attr-defined]
+        for event in self._get_data(key=_Keys.FD).control(None, 64, timeout):
+            if event.ident == self._wake_fds[0]:
+                self._drain_wake()
+                continue
+            watched: Optional[str] = watches.get(event.ident)
+            if watched is None:
+                continue
+            out.append(watched)
+            if event.fflags & gone:
+                watches.pop(event.ident, None)
+                try:
+                    os.close(event.ident)
+                except OSError:
+                    pass
+                missing.append(watched)
+        return out
+
+    # #[PRIVATE METHODS]##############################################################
+    def __register(self, path: str) -> bool:
+        """Open a path and register a vnode filter for it.
+
+        ### Arguments:
+        * path: str - File or directory path.
+
+        ### Returns:
+        bool - `True` when the path exists and was registered.
+        """
+        try:
+            fd: int = os.open(path, os.O_RDONLY)
+        except OSError:
+            return False
+        self._get_data(key=_Keys.FD).control(
+            [
+                select.kevent(  # type: ignore[attr-defined]
+                    fd,
+                    filter=select.KQ_FILTER_VNODE,  # type: ignore[attr-defined]
+                    flags=select.KQ_EV_ADD | select.KQ_EV_CLEAR,  # type: ignore[attr-defined]
+                    fflags=select.KQ_NOTE_WRITE  # type: ignore[attr-defined]
+                    | select.KQ_NOTE_EXTEND  # type: ignore[attr-defined]
+                    | select.KQ_NOTE_ATTRIB  # type: ignore[attr-defined]
+                    | select.KQ_NOTE_LINK  # type: ignore[attr-defined]
+                    | select.KQ_NOTE_DELETE  # type: ignore[attr-defined]
+                    | select.KQ_NOTE_RENAME,  # type: ignore[attr-defined]
+                )
+            ],
+            0,
+            0,
+        )
+        self._get_data(key=_Keys.WATCHES)[fd] = path
+        return True
+
+
+class PollingBackend(WatchBackend):
+    """Fallback backend comparing path signatures at a long interval."""
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self, interval: float = 30.0) -> None:
+        """Initialize the polling backend.
+
+        ### Arguments:
+        * interval: float - Seconds between two signature checks.
+        """
+        self._set_data(key=_Keys.INTERVAL, value=float(interval), set_default_type=float)
+        self._set_data(key=_Keys.SIGNATURES, value={}, set_default_type=Dict)
+        self._set_data(key=_Keys.WAKE_EVENT, value=Event(), set_default_type=Event)
+
+    # #[PUBLIC METHODS]###############################################################
+    def add(self, path: str) -> None:
+        """Record the current signature of a path.
+
+        ### Arguments:
+        * path: str - File or directory path.
+        """
+        self._get_data(key=_Keys.SIGNATURES)[path] = path_signature(path)
+
+    def close(self) -> None:
+        """Release the backend; polling holds no kernel resources."""
+        self.wake()
+
+    def wait(self, timeout: Optional[float] = None) -> List[str]:
+        """Sleep for the polling interval and return paths with new signatures.
+
+        ### Arguments:
+        * timeout: Optional[float] - Maximum wait in seconds, `None` waits
+          until a change is found or the backend is woken up.
+
+        ### Returns:
+        List[str] - Paths whose signature changed.
+        """
+        wake: Event = self._get_data(key=_Keys.WAKE_EVENT)  # type: ignore
+        interval: float = self._get_data(key=_Keys.INTERVAL)  # type: ignore
+        signatures: Dict[str, Tuple] = self._get_data(key=_Keys.SIGNATURES)  # type: ignore
+        while True:
+            if wake.wait(interval if timeout is None else min(timeout, interval)):
+                wake.clear()
+                return []
+            out: List[str] = []
+            for path, signature in signatures.items():
+                current: Tuple = path_signature(path)
+                if current != signature:
+                    signatures[path] = current
+                    out.append(path)
+            if out or timeout is not None:
+                return out
+
+    def wake(self) -> None:
+        """Interrupt a sleeping `wait()` call."""
+        self._get_data(key=_Keys.WAKE_EVENT).set()
+
+
+class ThFileWatcher(Thread, ThBaseObject, LogsMixin):
+    """Watch the config file and plugins directory and report debounced changes.
+
+    The thread blocks in the selected backend until an event arrives, waits
+    for a quiet period to absorb bursts of editor writes, and then compares
+    path signatures so that only real changes reach the callback.
+    """
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(
+        self,
+        qlog: LoggerQueue,
+        config_file: str,
+        plugins_dir: Optional[str],
+        callback: Callable[[List[str]], None],
+        debounce: float = 1.0,
+        max_delay: float = 10.0,
+        backend: Optional[WatchBackend] = None,
+        debug: bool = False,
+    ) -> None:
+        """Initialize the watcher thread.
+
+        ### Arguments:
+        * qlog: LoggerQueue - Shared logging queue.
+        * config_file: str - Watched configuration file path.
+        * plugins_dir: Optional[str] - Watched plugins directory path.
+        * callback: Callable[[List[str]], None] - Receives changed paths: the
+          config file and/or individual `plugins_dir` entries.
+        * debounce: float - Quiet period in seconds closing an event burst.
+        * max_delay: float - Upper bound in seconds for one debounced burst.
+        * backend: Optional[WatchBackend] - Explicit backend, autodetected
+          when omitted.
+        * debug: bool - Debug logging flag.
+        """
+        Thread.__init__(self, name=self._c_name)
+        self._stop_event = Event()
+        self.daemon = True
+        self._debug = debug
+        self.logs = LoggerClient(queue=qlog, name=self._c_name)
+        self._set_data(
+            key=_Keys.CONFIG_FILE,
+            value=os.path.abspath(config_file),
+            set_default_type=str,
+        )
+        self._set_data(
+            key=_Keys.PLUGINS_DIR,
+            value=os.path.abspath(plugins_dir) if plugins_dir else None,
+            set_default_type=Optional[str],
+        )
+        self._set_data(key=_Keys.CALLBACK, value=callback)
+        self._set_data(key=_Keys.DEBOUNCE, value=float(debounce), set_default_type=float)
+        self._set_data(
+            key=_Keys.MAX_DELAY, value=float(max_delay), set_default_type=float
+        )
+        self._set_data(
+            key=_Keys.BACKEND,
+            value=backend or self.create_backend(),
+            set_default_type=WatchBackend,
+        )
+        self._set_data(key=_Keys.SIGNATURES, value={}, set_default_type=Dict)
+
+    # #[STATIC/CLASS METHODS]#########################################################
+    @staticmethod
+    def create_backend(interval: float = 30.0) -> WatchBackend:
+        """Return the best notification backend available on this system.
+
+        ### Arguments:
+        * interval: float - Polling interval used by the fallback backend.
+
+        ### Returns:
+        WatchBackend - inotify, kqueue, or polling backend.
+        """
+        for backend_class in (InotifyBackend, KqueueBackend):
+            if backend_class.available():
+                try:
+                    return backend_class()
+                except OSError:
+                    continue
+        return PollingBackend(interval=interval)
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def backend(self) -> WatchBackend:
+        """Return the active notification backend.
+
+        ### Returns:
+        WatchBackend - Backend used by the watcher.
+        """
+        return self._get_data(key=_Keys.BACKEND)  # type: ignore
+
+    # #[PUBLIC METHODS]###############################################################
+    def run(self) -> None:
+        """Wait for file system events and report debounced changes."""
+        backend: WatchBackend = self.backend
+        for path in self.__watched_paths:
+            self.__signatures[path] = path_signature(path)
+            try:
+                backend.add(path)
+            except OSError as ex:
+                self.logs.message_warning = f"cannot watch '{path}': {ex}"
+        if self._debug:
+            self.logs.message_debug = (
+                f"watching {self.__watched_paths} with {backend._c_name}"
+            )
+        debounce: float = self._get_data(key=_Keys.DEBOUNCE)  # type: ignore
+        max_delay: float = self._get_data(key=_Keys.MAX_DELAY)  # type: ignore
+        try:
+            while not self.stopped:
+                if not self.__relevant(backend.wait(None)):
+                    continue
+                deadline: float = time.monotonic() + max_delay
+                while not self.stopped:
+                    remaining: float = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    if not self.__relevant(backend.wait(min(debounce, remaining))):
+                        break
+                if self.stopped:
+                    break
+                changed: List[str] = self.scan()
+                if changed:
+                    try:
+                        self._get_data(key=_Keys.CALLBACK)(changed)
+                    except Exception as ex:
+                        self.logs.message_error = f"watcher callback failed: {ex}"
+        finally:
+            backend.close()
+        if self._debug:
+            self.logs.message_debug = "exit from loop"
+
+    def scan(self) -> List[str]:
+        """Compare current signatures with the last seen state.
+
+        ### Returns:
+        List[str] - Changed config file path and/or changed plugin entry paths.
+        """
+        out: List[str] = []
+        config_file: str = self._get_data(key=_Keys.CONFIG_FILE)  # type: ignore
+        signature: Tuple = path_signature(config_file)
+        if signature != self.__signatures.get(config_file):
+            self.__signatures[config_file] = signature
+            out.append(config_file)
+        plugins_dir: Optional[str] = self._get_data(key=_Keys.PLUGINS_DIR)
+        if plugins_dir is not None:
+            previous: Tuple = self.__signatures.get(plugins_dir, ())
+            current: Tuple = path_signature(plugins_dir)
+            self.__signatures[plugins_dir] = current
+            before: Dict[str, Tuple] = {item[0]: item for item in previous}
+            after: Dict[str, Tuple] = {item[0]: item for item in current}
+            for name in sorted(set(before) | set(after)):
+                if before.get(name) != after.get(name):
+                    out.append(os.path.join(plugins_dir, name))
+        return out
+
+    def stop(self) -> None:
+        """Request thread termination and interrupt the backend wait."""
+        ThBaseObject.stop(self)
+        self.backend.wake()
+
+    # #[PRIVATE PROPERTIES]###########################################################
+    @property
+    def __signatures(self) -> Dict[str, Tuple]:
+        """Return the last seen signature of every watched path.
+
+        ### Returns:
+        Dict[str, Tuple] - Signatures keyed by path.
+        """
+        return self._get_data(key=_Keys.SIGNATURES)  # type: ignore
+
+    @property
+    def __watched_paths(self) -> List[str]:
+        """Return the watched config file and plugins directory paths.
+
+        ### Returns:
+        List[str] - Absolute watched paths.
+        """
+        out: List[str] = [self._get_data(key=_Keys.CONFIG_FILE)]  # type: ignore
+        plugins_dir: Optional[str] = self._get_data(key=_Keys.PLUGINS_DIR)
+        if plugins_dir is not None:
+            out.append(plugins_dir)
+        return out
+
+    # #[PRIVATE METHODS]##############################################################
+    def __relevant(self, paths: List[str]) -> bool:
+        """Return whether backend events concern the watched paths.
+
+        Events for unrelated files living next to the config file are ignored
+        without touching the debounce window.
+
+        ### Arguments:
+        * paths: List[str] - Paths reported by the backend.
+
+        ### Returns:
+        bool - `True` when at least one event is relevant.
+        """
+        config_file: str = self._get_data(key=_Keys.CONFIG_FILE)  # type: ignore
+        plugins_dir: Optional[str] = self._get_data(key=_Keys.PLUGINS_DIR)
+        for path in paths:
+            if path == config_file or path == os.path.dirname(config_file):
+                return True
+            if plugins_dir is not None and (
+                path == plugins_dir or os.path.dirname(path) == plugins_dir
+            ):
+                return True
+        return False
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,278 @@
+# -*- coding: UTF-8 -*-
+"""
+Structured JSON-lines log sink.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Write machine-parseable log records through an asynchronous buffered writer.
+"""
+
+import json
+import os
+import re
+import time
+
+from datetime import datetime, timezone
+from threading import Condition, Event, Thread
+from typing import Any, Dict, List, Optional, Pattern
+
+from jsktoolbox.attribtool import ReadOnlyClass
+from jsktoolbox.basetool import BData, ThBaseObject
+from jsktoolbox.libs.interfaces.logger_engine import ILoggerEngine
+
+
+class _Keys(object, metaclass=ReadOnlyClass):
+    """Define internal storage keys for the JSON log sink."""
+
+    # #[CONSTANTS]####################################################################
+    BUFFER: str = "__buffer__"
+    CONDITION: str = "__condition__"
+    FLUSH_INTERVAL: str = "__flush_interval__"
+    FLUSH_RECORDS: str = "__flush_records__"
+    LEVEL: str = "__level__"
+    PATH: str = "__path__"
+    ROTATE_COUNT: str = "__rotate_count__"
+    ROTATE_SIZE: str = "__rotate_size__"
+    WRITER: str = "__writer__"
+    WRITTEN: str = "__written__"
+
+
+class ThJsonLogWriter(Thread, ThBaseObject):
+    """Append JSON records to a file from a background thread.
+
+    Producers only append to an in-memory buffer. The thread writes the buffer
+    in one call when `flush_records` records are pending or `flush_interval`
+    seconds passed since the first pending record, and rotates the file with
+    numbered suffixes once it exceeds `rotate_size` bytes.
+    """
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(
+        self,
+        path: str,
+        flush_records: int = 200,
+        flush_interval: float = 1.0,
+        rotate_size: int = 10485760,
+        rotate_count: int = 5,
+    ) -> None:
+        """Initialize the writer thread.
+
+        ### Arguments:
+        * path: str - Target JSON-lines file.
+        * flush_records: int - Pending records forcing an immediate flush.
+        * flush_interval: float - Maximum seconds a record waits in the buffer.
+        * rotate_size: int - File size in bytes triggering rotation, 0 disables.
+        * rotate_count: int - Number of rotated files kept.
+        """
+        Thread.__init__(self, name=self._c_name)
+        self._stop_event = Event()
+        self.daemon = True
+        self._set_data(key=_Keys.PATH, value=path, set_default_type=str)
+        self._set_data(key=_Keys.BUFFER, value=[], set_default_type=List)
+        self._set_data(key=_Keys.CONDITION, value=Condition())
+        self._set_data(
+            key=_Keys.FLUSH_RECORDS, value=int(flush_records), set_default_type=int
+        )
+        self._set_data(
+            key=_Keys.FLUSH_INTERVAL,
+            value=float(flush_interval),
+            set_default_type=float,
+        )
+        self._set_data(
+            key=_Keys.ROTATE_SIZE, value=int(rotate_size), set_default_type=int
+        )
+        self._set_data(
+            key=_Keys.ROTATE_COUNT, value=int(rotate_count), set_default_type=int
+        )
+        self._set_data(key=_Keys.WRITTEN, value=0, set_default_type=int)
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def path(self) -> str:
+        """Return the target file path.
+
+        ### Returns:
+        str - JSON-lines file path.
+        """
+        return self._get_data(key=_Keys.PATH)  # type: ignore
+
+    @property
+    def written(self) -> int:
+        """Return the number of records written to disk.
+
+        ### Returns:
+        int - Records written since the thread started.
+        """
+        return self._get_data(key=_Keys.WRITTEN)  # type: ignore
+
+    # #[PUBLIC METHODS]###############################################################
+    def run(self) -> None:
+        """Flush buffered records until stopped, then flush the remainder."""
+        condition: Condition = self.__condition
+        flush_records: int = self._get_data(key=_Keys.FLUSH_RECORDS)  # type: ignore
+        flush_interval: float = self._get_data(key=_Keys.FLUSH_INTERVAL)  # type: ignore
+        while not self.stopped:
+            with condition:
+                # checked under the lock, so a `stop()` notify is never missed
+                while not self.__buffer and not self.stopped:
+                    condition.wait()
+                deadline: float = time.monotonic() + flush_interval
+                while (
+                    not self.stopped
+                    and len(self.__buffer) < flush_records
+                    and time.monotonic() < deadline
+                ):
+                    condition.wait(deadline - time.monotonic())
+                lines: List[str] = self.__buffer[:]
+                self.__buffer.clear()
+            self.__flush(lines)
+        with condition:
+            lines = self.__buffer[:]
+            self.__buffer.clear()
+        self.__flush(lines)
+
+    def stop(self) -> None:
+        """Request thread termination and wake it from the buffer wait."""
+        ThBaseObject.stop(self)
+        with self.__condition:
+            self.__condition.notify_all()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        """Serialize one record into the buffer without touching the disk.
+
+        ### Arguments:
+        * record: Dict[str, Any] - JSON-serializable record.
+        """
+        line: str = json.dumps(record, ensure_ascii=False, default=str)
+        with self.__condition:
+            self.__buffer.append(line)
+            # wake the writer only for the first record and at the size bound
+            if len(self.__buffer) == 1 or len(self.__buffer) >= self._get_data(
+                key=_Keys.FLUSH_RECORDS
+            ):
+                self.__condition.notify()
+
+    # #[PRIVATE PROPERTIES]###########################################################
+    @property
+    def __buffer(self) -> List[str]:
+        """Return serialized records waiting for the next flush.
+
+        ### Returns:
+        List[str] - Pending JSON lines.
+        """
+        return self._get_data(key=_Keys.BUFFER)  # type: ignore
+
+    @property
+    def __condition(self) -> Condition:
+        """Return the condition guarding the buffer.
+
+        ### Returns:
+        Condition - Buffer lock and wakeup condition.
+        """
+        return self._get_data(key=_Keys.CONDITION)  # type: ignore
+
+    # #[PRIVATE METHODS]##############################################################
+    def __flush(self, lines: List[str]) -> None:
+        """Append lines to the file and rotate it when it grows too large.
+
+        ### Arguments:
+        * lines: List[str] - Serialized records.
+        """
+        if not lines:
+            return None
+        try:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write("\n".join(lines) + "\n")
+                size: int = file.tell()
+        except OSError:
+            return None
+        self._set_data(key=_Keys.WRITTEN, value=self.written + len(lines))
+        rotate_size: int = self._get_data(key=_Keys.ROTATE_SIZE)  # type: ignore
+        if rotate_size > 0 and size >= rotate_size:
+            self.__rotate()
+
+    def __rotate(self) -> None:
+        """Shift numbered rotated files and move the current file to `.1`."""
+        count: int = self._get_data(key=_Keys.ROTATE_COUNT)  # type: ignore
+        try:
+            if count < 1:
+                os.remove(self.path)
+                return None
+            for idx in range(count - 1, 0, -1):
+                source: str = f"{self.path}.{idx}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{idx + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        except OSError:
+            pass
+
+
+class JsonLinesLogEngine(ILoggerEngine, BData):
+    """Logger engine converting text log lines into structured JSON records.
+
+    One engine is registered per log level. The `[name]` prefix added by
+    `LoggerClient` becomes the `source` field, `key=value` tokens found in the
+    message text are collected into `fields`, and `channel` and `message_id`
+    are promoted to top-level record fields.
+    """
+
+    # #[CONSTANTS]####################################################################
+    __RE_FIELD: Pattern = re.compile(r"\b([a-z_]+)=('[^']*'|\"[^\"]*\"|[^\s,]+)")
+    __RE_SOURCE: Pattern = re.compile(r"^\[([^\]]+)\]\s*")
+    __TOP_LEVEL: List[str] = ["channel", "message_id"]
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self, writer: ThJsonLogWriter, level: str) -> None:
+        """Initialize the engine.
+
+        ### Arguments:
+        * writer: ThJsonLogWriter - Shared asynchronous writer.
+        * level: str - Log level recorded in every record.
+        """
+        self._set_data(key=_Keys.WRITER, value=writer, set_default_type=ThJsonLogWriter)
+        self._set_data(key=_Keys.LEVEL, value=level, set_default_type=str)
+
+    # #[PUBLIC METHODS]###############################################################
+    def build_record(self, message: str) -> Dict[str, Any]:
+        """Return the structured record for one log line.
+
+        ### Arguments:
+        * message: str - Log line as produced by `LoggerClient`.
+
+        ### Returns:
+        Dict[str, Any] - Record with `ts`, `level`, `source`, `message`,
+        optional `channel` and `message_id`, and parsed `fields`.
+        """
+        source: Optional[str] = None
+        text: str = message
+        match = self.__RE_SOURCE.match(message)
+        if match is not None:
+            source = match.group(1)
+            text = message[match.end() :]
+        record: Dict[str, Any] = {
+            "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+            "level": self._get_data(key=_Keys.LEVEL),
+            "source": source,
+            "message": text,
+        }
+        fields: Dict[str, str] = {}
+        for name, value in self.__RE_FIELD.findall(text):
+            fields[name] = value.strip("'\"")
+        for name in self.__TOP_LEVEL:
+            if name in fields:
+                record[name] = fields.pop(name)
+        if fields:
+            record["fields"] = fields
+        return record
+
+    def send(self, message: str) -> None:
+        """Queue one structured record in the asynchronous writer.
+
+        ### Arguments:
+        * message: str - Log line as produced by `LoggerClient`.
+        """
+        self._get_data(key=_Keys.WRITER).write(self.build_record(message))
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,476 @@
+# -*- coding: UTF-8 -*-
+"""
+Bounded logging queue and event-driven log processor.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Keep the logging stage from becoming a bottleneck for the dispatcher.
+"""
+
+import re
+import time
+
+from collections import deque
+from inspect import currentframe
+from threading import Condition
+from typing import Deque, Dict, List, Optional, Pattern, Tuple
+
+from jsktoolbox.attribtool import ReadOnlyClass
+from jsktoolbox.basetool import BData
+from jsktoolbox.logstool import LoggerQueue, LogsLevelKeys, ThLoggerProcessor
+from jsktoolbox.raisetool import Raise
+
+
+class _Keys(object, metaclass=ReadOnlyClass):
+    """Define internal storage keys for the logging queue helpers."""
+
+    # #[CONSTANTS]####################################################################
+    BUCKETS: str = "__buckets__"
+    BURST: str = "__burst__"
+    CONDITION: str = "__condition__"
+    DROPPED: str = "__dropped__"
+    DROPPED_TOTAL: str = "__dropped_total__"
+    EXEMPT: str = "__exempt__"
+    ITEMS: str = "__items__"
+    MAXSIZE: str = "__maxsize__"
+    PENDING_SINCE: str = "__pending_since__"
+    RATE: str = "__rate__"
+    SUMMARY_INTERVAL: str = "__summary_interval__"
+    SUPPRESSED: str = "__suppressed__"
+    SUPPRESSED_TOTAL: str = "__suppressed_total__"
+    WOKEN: str = "__woken__"
+
+
+class BoundedLoggerQueue(LoggerQueue, BData):
+    """Drop-in `LoggerQueue` with a size bound and per-source rate limiting.
+
+    Every source, taken from the `[name]` prefix added by `LoggerClient`, owns
+    a token bucket. Messages above the bucket rate are counted instead of
+    queued and reported later as one summary line. Messages arriving while the
+    queue is full are dropped and counted. Severe levels bypass the rate limit
+    and a `rate` of `0` disables it. The limits may be changed at runtime.
+    """
+
+    # #[CONSTANTS]####################################################################
+    __RE_SOURCE: Pattern = re.compile(r"^\[([^\]]+)\]")
+
+    # levels never rate limited unless `exempt_levels` says otherwise
+    EXEMPT_LEVELS: Tuple[str, ...] = (
+        LogsLevelKeys.EMERGENCY,
+        LogsLevelKeys.ALERT,
+        LogsLevelKeys.CRITICAL,
+        LogsLevelKeys.ERROR,
+    )
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(
+        self,
+        maxsize: int = 10000,
+        rate: float = 20.0,
+        burst: int = 100,
+        summary_interval: float = 5.0,
+        exempt_levels: Optional[List[str]] = None,
+    ) -> None:
+        """Initialize the bounded queue.
+
+        ### Arguments:
+        * maxsize: int - Maximum number of queued entries.
+        * rate: float - Sustained messages per second allowed for one source,
+          `0` disables rate limiting.
+        * burst: int - Bucket capacity, the burst allowed for one source.
+        * summary_interval: float - Seconds between two suppression summaries.
+        * exempt_levels: Optional[List[str]] - Levels never rate limited,
+          defaults to `EXEMPT_LEVELS`.
+        """
+        LoggerQueue.__init__(self)
+        if exempt_levels is None:
+            exempt_levels = list(self.EXEMPT_LEVELS)
+        self._set_data(key=_Keys.ITEMS, value=deque(), set_default_type=Deque)
+        self._set_data(key=_Keys.CONDITION, value=Condition())
+        self._set_data(key=_Keys.MAXSIZE, value=int(maxsize), set_default_type=int)
+        self._set_data(key=_Keys.RATE, value=float(rate), set_default_type=float)
+        self._set_data(key=_Keys.BURST, value=float(burst), set_default_type=float)
+        self._set_data(
+            key=_Keys.SUMMARY_INTERVAL,
+            value=float(summary_interval),
+            set_default_type=float,
+        )
+        self._set_data(key=_Keys.EXEMPT, value=(), set_default_type=Tuple)
+        self.exempt_levels = exempt_levels
+        self._set_data(key=_Keys.BUCKETS, value={}, set_default_type=Dict)
+        self._set_data(key=_Keys.SUPPRESSED, value={}, set_default_type=Dict)
+        self._set_data(key=_Keys.DROPPED, value=0, set_default_type=int)
+        self._set_data(key=_Keys.DROPPED_TOTAL, value=0, set_default_type=int)
+        self._set_data(key=_Keys.SUPPRESSED_TOTAL, value=0, set_default_type=int)
+        self._set_data(
+            key=_Keys.PENDING_SINCE, value=None, set_default_type=Optional[float]
+        )
+        self._set_data(key=_Keys.WOKEN, value=False, set_default_type=bool)
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def burst(self) -> int:
+        """Return the bucket capacity of one source.
+
+        ### Returns:
+        int - Burst of messages allowed for one source.
+        """
+        return int(self._get_data(key=_Keys.BURST))  # type: ignore
+
+    @burst.setter
+    def burst(self, value: int) -> None:
+        """Set the bucket capacity of one source.
+
+        ### Arguments:
+        * value: int - Burst of messages allowed for one source.
+        """
+        with self.__condition:
+            self._set_data(key=_Keys.BURST, value=float(value))
+
+    @property
+    def dropped(self) -> int:
+        """Return the number of entries dropped because the queue was full.
+
+        ### Returns:
+        int - Total dropped entries since creation.
+        """
+        return self._get_data(key=_Keys.DROPPED_TOTAL)  # type: ignore
+
+    @property
+    def exempt_levels(self) -> Tuple[str, ...]:
+        """Return the levels that bypass the rate limit.
+
+        ### Returns:
+        Tuple[str, ...] - Exempt log levels.
+        """
+        return self._get_data(key=_Keys.EXEMPT)  # type: ignore
+
+    @exempt_levels.setter
+    def exempt_levels(self, value: List[str]) -> None:
+        """Set the levels that bypass the rate limit.
+
+        ### Arguments:
+        * value: List[str] - Log levels from `LogsLevelKeys.keys`.
+
+        ### Raises:
+        * KeyError: When a level is not part of `LogsLevelKeys.keys`.
+        """
+        for level in value:
+            if level not in LogsLevelKeys.keys:
+                raise Raise.error(
+                    f"logs_level key not found, '{level}' received.",
+                    KeyError,
+                    self._c_name,
+                    currentframe(),
+                )
+        with self.__condition:
+            self._set_data(key=_Keys.EXEMPT, value=tuple(value))
+
+    @property
+    def maxsize(self) -> int:
+        """Return the queue size bound.
+
+        ### Returns:
+        int - Maximum number of queued entries.
+        """
+        return self._get_data(key=_Keys.MAXSIZE)  # type: ignore
+
+    @maxsize.setter
+    def maxsize(self, value: int) -> None:
+        """Set the queue size bound, entries already queued are kept.
+
+        ### Arguments:
+        * value: int - Maximum number of queued entries.
+        """
+        with self.__condition:
+            self._set_data(key=_Keys.MAXSIZE, value=int(value))
+
+    @property
+    def rate(self) -> float:
+        """Return the sustained message rate of one source.
+
+        ### Returns:
+        float - Messages per second, `0` when rate limiting is disabled.
+        """
+        return self._get_data(key=_Keys.RATE)  # type: ignore
+
+    @rate.setter
+    def rate(self, value: float) -> None:
+        """Set the sustained message rate of one source.
+
+        ### Arguments:
+        * value: float - Messages per second, `0` disables rate limiting.
+        """
+        with self.__condition:
+            self._set_data(key=_Keys.RATE, value=float(value))
+
+    @property
+    def summary_timeout(self) -> Optional[float]:
+        """Return seconds until pending summaries are due.
+
+        ### Returns:
+        Optional[float] - Wait timeout for the processor, `None` when nothing
+        is pending and the processor may block until the next message.
+        """
+        with self.__condition:
+            since: Optional[float] = self._get_data(key=_Keys.PENDING_SINCE)
+            if since is None:
+                return None
+            interval: float = self._get_data(key=_Keys.SUMMARY_INTERVAL)  # type: ignore
+            return max(0.0, since + interval - time.monotonic())
+
+    @property
+    def suppressed(self) -> int:
+        """Return the number of entries suppressed by rate limiting.
+
+        ### Returns:
+        int - Total suppressed entries since creation.
+        """
+        return self._get_data(key=_Keys.SUPPRESSED_TOTAL)  # type: ignore
+
+    # #[PUBLIC METHODS]###############################################################
+    def emit_summaries(self, force: bool = False) -> int:
+        """Queue summary lines for suppressed and dropped entries when due.
+
+        ### Arguments:
+        * force: bool - Emit pending summaries regardless of the interval.
+
+        ### Returns:
+        int - Number of summary lines queued.
+        """
+        with self.__condition:
+            since: Optional[float] = self._get_data(key=_Keys.PENDING_SINCE)
+            if since is None:
+                return 0
+            interval: float = self._get_data(key=_Keys.SUMMARY_INTERVAL)  # type: ignore
+            if not force and time.monotonic() < since + interval:
+                return 0
+            lines: List[Tuple[str, str]] = []
+            suppressed: Dict[str, int] = self._get_data(key=_Keys.SUPPRESSED)  # type: ignore
+            for source in sorted(suppressed):
+                prefix: str = f"[{source}] " if source else ""
+                lines.append(
+                    (
+                        LogsLevelKeys.WARNING,
+                        f"{prefix}{suppressed[source]} messages suppressed "
+                        "by rate limit",
+                    )
+                )
+            suppressed.clear()
+            dropped: int = self._get_data(key=_Keys.DROPPED)  # type: ignore
+            if dropped:
+                lines.append(
+                    (
+                        LogsLevelKeys.WARNING,
+                        f"[{self._c_name}] {dropped} messages dropped, "
+                        f"queue limit {self.maxsize} reached",
+                    )
+                )
+                self._set_data(key=_Keys.DROPPED, value=0)
+            self._set_data(key=_Keys.PENDING_SINCE, value=None)
+            self.__items.extend(lines)
+            if lines:
+                self.__condition.notify_all()
+            return len(lines)
+
+    def get(self) -> Optional[Tuple[str, ...]]:
+        """Return and remove the next queued log entry.
+
+        ### Returns:
+        Optional[Tuple[str, ...]] - Tuple `(level, message)` or `None` when empty.
+        """
+        with self.__condition:
+            if not self.__items:
+                return None
+            return self.__items.popleft()
+
+    def put(self, message: str, log_level: str = LogsLevelKeys.INFO) -> None:
+        """Append a log entry unless it is rate limited or the queue is full.
+
+        ### Arguments:
+        * message: str - Log message payload.
+        * log_level: str - Log severity, defaults to `LogsLevelKeys.INFO`.
+
+        ### Raises:
+        * KeyError: When `log_level` is not part of `LogsLevelKeys.keys`.
+        """
+        if log_level not in LogsLevelKeys.keys:
+            raise Raise.error(
+                f"logs_level key not found, '{log_level}' received.",
+                KeyError,
+                self._c_name,
+                currentframe(),
+            )
+        with self.__condition:
+            now: float = time.monotonic()
+            if self.rate > 0 and log_level not in self.exempt_levels:
+                source: str = self.__source(message)
+                if not self.__take_token(source, now):
+                    suppressed: Dict[str, int] = self._get_data(key=_Keys.SUPPRESSED)  # type: ignore
+                    suppressed[source] = suppressed.get(source, 0) + 1
+                    self.__count(_Keys.SUPPRESSED_TOTAL, now)
+                    return None
+            if len(self.__items) >= self.maxsize:
+                self._set_data(
+                    key=_Keys.DROPPED, value=self._get_data(key=_Keys.DROPPED) + 1
+                )
+                self.__count(_Keys.DROPPED_TOTAL, now)
+                return None
+            self.__items.append((log_level, message))
+            self.__condition.notify()
+
+    def qsize(self) -> int:
+        """Return the number of queued entries.
+
+        ### Returns:
+        int - Current queue length.
+        """
+        with self.__condition:
+            return len(self.__items)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until an entry is queued, `wake()` is called, or timeout.
+
+        ### Arguments:
+        * timeout: Optional[float] - Maximum wait in seconds, `None` blocks.
+
+        ### Returns:
+        bool - `True` when entries are waiting to be processed.
+        """
+        with self.__condition:
+            if not self.__items and not self._get_data(key=_Keys.WOKEN):
+                self.__condition.wait(timeout)
+            self._set_data(key=_Keys.WOKEN, value=False)
+            return bool(self.__items)
+
+    def wake(self) -> None:
+        """Interrupt the thread blocked in `wait()`, or its next call."""
+        with self.__condition:
+            self._set_data(key=_Keys.WOKEN, value=True)
+            self.__condition.notify_all()
+
+    # #[PRIVATE PROPERTIES]###########################################################
+    @property
+    def __condition(self) -> Condition:
+        """Return the condition guarding the queue state.
+
+        ### Returns:
+        Condition - Queue lock and wakeup condition.
+        """
+        return self._get_data(key=_Keys.CONDITION)  # type: ignore
+
+    @property
+    def __items(self) -> Deque[Tuple[str, str]]:
+        """Return queued `(level, message)` entries.
+
+        ### Returns:
+        Deque[Tuple[str, str]] - Queued entries.
+        """
+        return self._get_data(key=_Keys.ITEMS)  # type: ignore
+
+    # #[PRIVATE METHODS]##############################################################
+    def __count(self, key: str, now: float) -> None:
+        """Increment a total counter and open the summary window.
+
+        ### Arguments:
+        * key: str - Total counter storage key.
+        * now: float - Current monotonic time.
+        """
+        self._set_data(key=key, value=self._get_data(key=key) + 1)
+        if self._get_data(key=_Keys.PENDING_SINCE) is None:
+            self._set_data(key=_Keys.PENDING_SINCE, value=now)
+
+    def __source(self, message: str) -> str:
+        """Return the source name taken from the `[name]` message prefix.
+
+        ### Arguments:
+        * message: str - Log message payload.
+
+        ### Returns:
+        str - Source name or an empty string for unnamed messages.
+        """
+        match = self.__RE_SOURCE.match(message)
+        if match is None:
+            return ""
+        return match.group(1)
+
+    def __take_token(self, source: str, now: float) -> bool:
+        """Take one token from the source bucket.
+
+        ### Arguments:
+        * source: str - Source name.
+        * now: float - Current monotonic time.
+
+        ### Returns:
+        bool - `True` when the message may be queued.
+        """
+        buckets: Dict[str, List[float]] = self._get_data(key=_Keys.BUCKETS)  # type: ignore
+        burst: float = self._get_data(key=_Keys.BURST)  # type: ignore
+        bucket: Optional[List[float]] = buckets.get(source)
+        if bucket is None:
+            bucket = [burst, now]
+            buckets[source] = bucket
+        else:
+            rate: float = self._get_data(key=_Keys.RATE)  # type: ignore
+            bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+        if bucket[0] < 1.0:
+            return False
+        bucket[0] -= 1.0
+        return True
+
+
+class ThLogProcessor(ThLoggerProcessor):
+    """Drain the logging queue on wakeups instead of fixed sleep periods.
+
+    With a `BoundedLoggerQueue` the thread blocks until a message arrives or a
+    suppression summary is due, then hands every queued entry to the engines
+    in one pass. Other queue types fall back to the parent polling loop.
+    """
+
+    # #[PUBLIC METHODS]###############################################################
+    def run(self) -> None:
+        """Process the logging queue until stopped.
+
+        ### Raises:
+        * ValueError: When required engine or client references are missing.
+        """
+        if self.logger_engine is None:
+            raise Raise.error(
+                "LoggerEngine not set.",
+                ValueError,
+                self._c_name,
+                currentframe(),
+            )
+        if self.logger_client is None:
+            raise Raise.error(
+                "LoggerClient not set.",
+                ValueError,
+                self._c_name,
+                currentframe(),
+            )
+        queue: Optional[LoggerQueue] = self.logger_engine.logs_queue
+        if not isinstance(queue, BoundedLoggerQueue):
+            return ThLoggerProcessor.run(self)
+        if self._debug:
+            self.logger_client.message_debug = f"[{self._c_name}] starting..."
+        while not self.stopped:
+            queue.wait(queue.summary_timeout)
+            queue.emit_summaries()
+            self.logger_engine.send()
+        if self._debug:
+            self.logger_client.message_debug = f"[{self._c_name}] stopped."
+        queue.emit_summaries(force=True)
+        self.logger_engine.send()
+
+    def stop(self) -> None:
+        """Request the thread to stop and wake it from the queue wait."""
+        ThLoggerProcessor.stop(self)
+        if self.logger_engine is not None and isinstance(
+            self.logger_engine.logs_queue, BoundedLoggerQueue
+        ):
+            self.logger_engine.logs_queue.wake()
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,203 @@
+# -*- coding: UTF-8 -*-
+"""
+Statistical stack sampler.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-13
+
+Purpose: Sample the stacks of all daemon threads on demand and write them in
+the collapsed format read by flamegraph tools.
+"""
+
+import os
+import sys
+import threading
+import time
+
+from threading import Event, Lock, Thread
+from types import CodeType, FrameType
+from typing import Dict, List, Optional
+
+from jsktoolbox.attribtool import ReadOnlyClass
+from jsktoolbox.basetool import ThBaseObject
+
+
+class _Keys(object, metaclass=ReadOnlyClass):
+    """Define internal storage keys for the stack sampler."""
+
+    # #[CONSTANTS]####################################################################
+    LABELS: str = "__labels__"
+    LOCK: str = "__lock__"
+    PATH: str = "__path__"
+    RATE: str = "__rate__"
+    SAMPLES: str = "__samples__"
+    STACKS: str = "__stacks__"
+
+
+class ThStackSampler(Thread, ThBaseObject):
+    """Aggregate periodic snapshots of `sys._current_frames()`.
+
+    The sampler exists only while profiling is switched on, so a disabled
+    profiler costs nothing. Every tick records one wall-clock sample per
+    thread as a collapsed stack rooted at the thread name, which is the plugin
+    instance name for plugin threads. `dump()` writes `root;caller;callee count`
+    lines understood by `flamegraph.pl`, speedscope and similar tools.
+    """
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self, path: str, rate: int = 100) -> None:
+        """Initialize the sampler thread.
+
+        ### Arguments:
+        * path: str - Target file for the collapsed stacks.
+        * rate: int - Samples per second, clamped to 1..1000.
+        """
+        Thread.__init__(self, name=self._c_name)
+        self._stop_event = Event()
+        self.daemon = True
+        self._set_data(key=_Keys.PATH, value=path, set_default_type=str)
+        self._set_data(
+            key=_Keys.RATE,
+            value=min(max(int(rate), 1), 1000),
+            set_default_type=int,
+        )
+        self._set_data(key=_Keys.LABELS, value={}, set_default_type=Dict)
+        self._set_data(key=_Keys.LOCK, value=Lock())
+        self._set_data(key=_Keys.SAMPLES, value=0, set_default_type=int)
+        self._set_data(key=_Keys.STACKS, value={}, set_default_type=Dict)
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def path(self) -> str:
+        """Return the target file path.
+
+        ### Returns:
+        str - Collapsed stacks file path.
+        """
+        return self._get_data(key=_Keys.PATH)  # type: ignore
+
+    @property
+    def rate(self) -> int:
+        """Return the sampling rate.
+
+        ### Returns:
+        int - Samples per second.
+        """
+        return self._get_data(key=_Keys.RATE)  # type: ignore
+
+    @property
+    def samples(self) -> int:
+        """Return the number of sampling ticks taken.
+
+        ### Returns:
+        int - Ticks since the thread started.
+        """
+        return self._get_data(key=_Keys.SAMPLES)  # type: ignore
+
+    # #[PUBLIC METHODS]###############################################################
+    def collapsed(self) -> List[str]:
+        """Return the aggregated stacks in collapsed format.
+
+        ### Returns:
+        List[str] - Sorted `frame;frame;... count` lines.
+        """
+        with self.__lock:
+            return [
+                f"{stack} {count}" for stack, count in sorted(self.__stacks.items())
+            ]
+
+    def dump(self) -> int:
+        """Write the collapsed stacks to `path`.
+
+        ### Returns:
+        int - Number of distinct stacks written.
+
+        ### Raises:
+        * OSError: If the file cannot be written.
+        """
+        lines: List[str] = self.collapsed()
+        directory: str = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write("\n".join(lines) + ("\n" if lines else ""))
+        return len(lines)
+
+    def run(self) -> None:
+        """Take samples at the configured rate until stopped."""
+        interval: float = 1.0 / self.rate
+        deadline: float = time.monotonic()
+        while not self.stopped:
+            self.sample()
+            deadline += interval
+            delay: float = deadline - time.monotonic()
+            if delay < 0:
+                # fell behind, skip the missed ticks instead of bursting
+                deadline = time.monotonic()
+                delay = 0.0
+            self._stop_event.wait(delay)
+
+    def sample(self) -> None:
+        """Record the current stack of every thread except the sampler."""
+        frames: Dict[int, FrameType] = sys._current_frames()
+        names: Dict[int, str] = {
+            item.ident: item.name
+            for item in threading.enumerate()
+            if item.ident is not None
+        }
+        own: Optional[int] = self.ident
+        stacks: Dict[str, int] = self.__stacks
+        with self.__lock:
+            for ident, frame in frames.items():
+                if ident == own:
+                    continue
+                stack: str = self.__collapse(names.get(ident, f"thread-{ident}"), frame)
+                stacks[stack] = stacks.get(stack, 0) + 1
+            self._set_data(key=_Keys.SAMPLES, value=self.samples + 1)
+
+    # #[PRIVATE PROPERTIES]###########################################################
+    @property
+    def __lock(self) -> Lock:
+        """Return the lock guarding the aggregated stacks.
+
+        ### Returns:
+        Lock - Stacks lock.
+        """
+        return self._get_data(key=_Keys.LOCK)  # type: ignore
+
+    @property
+    def __stacks(self) -> Dict[str, int]:
+        """Return sample counts keyed by collapsed stack.
+
+        ### Returns:
+        Dict[str, int] - Aggregated stacks.
+        """
+        return self._get_data(key=_Keys.STACKS)  # type: ignore
+
+    # #[PRIVATE METHODS]##############################################################
+    def __collapse(self, root: str, frame: Optional[FrameType]) -> str:
+        """Return the collapsed stack of `frame`, outermost frame first.
+
+        ### Arguments:
+        * root: str - Thread name used as the root frame.
+        * frame: Optional[FrameType] - Innermost frame of the thread.
+
+        ### Returns:
+        str - Semicolon separated frame labels.
+        """
+        labels: Dict[CodeType, str] = self._get_data(key=_Keys.LABELS)  # type: ignore
+        out: List[str] = []
+        while frame is not None:
+            code: CodeType = frame.f_code
+            label: Optional[str] = labels.get(code)
+            if label is None:
+                module: str = str(frame.f_globals.get("__name__", "?"))
+                label = f"{module}:{code.co_qualname}".replace(";", ":")
+                labels[code] = label
+            out.append(label)
+            frame = frame.f_back
+        out.append(root.replace(";", ":"))
+        return ";".join(reversed(out))
+
+
+# #[EOF]#######################################################################
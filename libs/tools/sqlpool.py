@@ -0,0 +1,214 @@
+# -*- coding: UTF-8 -*-
+"""
+SQL engine pool with server failover.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Share pooled SQLAlchemy engines across plugin cycles and fail over
+between database servers.
+
+SQLAlchemy is an optional dependency; it is required only by plugins that
+import this module.
+"""
+
+from inspect import currentframe
+from typing import Any, Dict, List, Optional, Union
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, Connection, Engine, make_url
+from sqlalchemy.exc import DBAPIError
+
+from jsktoolbox.attribtool import ReadOnlyClass
+from jsktoolbox.basetool import BData
+from jsktoolbox.raisetool import Raise
+
+
+class _Keys(object, metaclass=ReadOnlyClass):
+    """Define internal storage keys for the engine pool."""
+
+    # #[CONSTANTS]####################################################################
+    ACTIVE: str = "__active__"
+    CONNECT_ARGS: str = "__connect_args__"
+    ENGINES: str = "__engines__"
+    ERRORS: str = "__errors__"
+    FAILOVERS: str = "__failovers__"
+    URLS: str = "__urls__"
+
+
+class SqlEnginePool(BData):
+    """Keep one pooled engine per SQL server and fail over between them.
+
+    Engines are created on first use and reused for every cycle, so each
+    query borrows a pooled connection instead of opening a new session.
+    The server that answered last stays active; when it refuses a
+    connection the next one is tried and becomes active.
+    """
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(
+        self,
+        urls: List[Union[str, URL]],
+        connect_args: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Initialize the pool.
+
+        ### Arguments:
+        * urls: List[Union[str, URL]] - Database URLs in failover order.
+        * connect_args: Optional[Dict[str, Any]] - DBAPI connect arguments.
+        """
+        self._set_data(
+            key=_Keys.URLS,
+            value=[make_url(item) for item in urls],
+            set_default_type=List,
+        )
+        self._set_data(
+            key=_Keys.CONNECT_ARGS,
+            value=dict(connect_args or {}),
+            set_default_type=Dict,
+        )
+        self._set_data(key=_Keys.ENGINES, value={}, set_default_type=Dict)
+        self._set_data(key=_Keys.ACTIVE, value=0, set_default_type=int)
+        self._set_data(key=_Keys.FAILOVERS, value=0, set_default_type=int)
+        self._set_data(key=_Keys.ERRORS, value=[], set_default_type=List)
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def active(self) -> int:
+        """Return the index of the server used for new connections.
+
+        ### Returns:
+        int - Index into `urls`.
+        """
+        return self._get_data(key=_Keys.ACTIVE)  # type: ignore
+
+    @property
+    def errors(self) -> List[str]:
+        """Return connection errors collected since the last `clear()`.
+
+        ### Returns:
+        List[str] - Error messages.
+        """
+        return self._get_data(key=_Keys.ERRORS)  # type: ignore
+
+    @property
+    def failovers(self) -> int:
+        """Return how many times the active server was switched.
+
+        ### Returns:
+        int - Failover count.
+        """
+        return self._get_data(key=_Keys.FAILOVERS)  # type: ignore
+
+    @property
+    def urls(self) -> List[URL]:
+        """Return database URLs in failover order.
+
+        ### Returns:
+        List[URL] - Database URLs.
+        """
+        return self._get_data(key=_Keys.URLS)  # type: ignore
+
+    # #[PUBLIC METHODS]###############################################################
+    def connect(self) -> Connection:
+        """Return a pooled connection, starting from the active server.
+
+        ### Returns:
+        Connection - Open connection, use it as a context manager.
+
+        ### Raises:
+        * ValueError: When no server is configured.
+        * DBAPIError: The last connection error when every server failed.
+        """
+        urls: List[URL] = self.urls
+        if not urls:
+            raise Raise.error(
+                "No SQL server configured.", ValueError, self._c_name, currentframe()
+            )
+        active: int = self.active
+        error: Optional[DBAPIError] = None
+        for step in range(len(urls)):
+            idx: int = (active + step) % len(urls)
+            try:
+                connection: Connection = self.__engine(idx).connect()
+            except DBAPIError as ex:
+                self.errors.append(
+                    f"connect to server: {urls[idx].host or urls[idx].database} "
+                    f"error: {ex.orig}"
+                )
+                error = ex
+                continue
+            if idx != active:
+                self._set_data(key=_Keys.ACTIVE, value=idx)
+                self._set_data(key=_Keys.FAILOVERS, value=self.failovers + 1)
+            return connection
+        raise error  # type: ignore
+
+    def dispose(self) -> None:
+        """Close all pooled connections."""
+        engines: Dict[int, Engine] = self._get_data(key=_Keys.ENGINES)  # type: ignore
+        for engine in engines.values():
+            engine.dispose()
+        engines.clear()
+
+    @classmethod
+    def from_servers(
+        cls,
+        servers: List[str],
+        database: str,
+        user: str,
+        password: str,
+        driver: str = "mysql+pymysql",
+        timeout: int = 5,
+    ) -> "SqlEnginePool":
+        """Build a pool for MySQL servers sharing one database and account.
+
+        ### Arguments:
+        * servers: List[str] - Server addresses in failover order.
+        * database: str - Database name.
+        * user: str - User name.
+        * password: str - Plain text password.
+        * driver: str - SQLAlchemy dialect and driver.
+        * timeout: int - Connect timeout in seconds.
+
+        ### Returns:
+        SqlEnginePool - Engine pool.
+        """
+        return cls(
+            [
+                URL.create(
+                    driver,
+                    username=user,
+                    password=password,
+                    host=str(server),
+                    port=3306,
+                    database=database,
+                    query={"charset": "utf8mb4"},
+                )
+                for server in servers
+            ],
+            connect_args={"connect_timeout": timeout},
+        )
+
+    # #[PRIVATE METHODS]##############################################################
+    def __engine(self, index: int) -> Engine:
+        """Return the engine of one server, created on first use.
+
+        ### Arguments:
+        * index: int - Index into `urls`.
+
+        ### Returns:
+        Engine - Pooled engine.
+        """
+        engines: Dict[int, Engine] = self._get_data(key=_Keys.ENGINES)  # type: ignore
+        if index not in engines:
+            engines[index] = create_engine(
+                self.urls[index],
+                connect_args=self._get_data(key=_Keys.CONNECT_ARGS),  # type: ignore
+                pool_pre_ping=True,
+                pool_recycle=3600,
+            )
+        return engines[index]
+
+
+# #[EOF]#######################################################################
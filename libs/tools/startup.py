@@ -0,0 +1,332 @@
+# -*- coding: UTF-8 -*-
+"""
+Startup profiler.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-12
+
+Purpose: Break down daemon boot time into phases, imports, plugin specs,
+config sections and runtime initialization.
+
+The module uses only the standard library, so it can be installed from
+`aasd.py` before the daemon imports `jsktoolbox` and the plugins.
+"""
+
+import sys
+import threading
+import time
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from importlib.abc import MetaPathFinder
+from importlib.machinery import ModuleSpec
+from types import ModuleType
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+
+class StartupCategory(object):
+    """Expose span categories recorded by the startup profiler."""
+
+    # #[CONSTANTS]#####################################################################
+    CONFIG: str = "config"
+    IMPORT: str = "import"
+    INIT: str = "init"
+    PHASE: str = "phase"
+    SPEC: str = "spec"
+    START: str = "start"
+
+
+@dataclass(slots=True)
+class StartupSpan:
+    """Describe one timed step of the daemon startup."""
+
+    category: str
+    depth: int
+    duration: float
+    name: str
+    start: float
+    own: float = 0.0
+
+
+class _TimedLoader(object):
+    """Delegate to a module loader and time `exec_module()`."""
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self, loader: Any, profiler: "StartupProfiler") -> None:
+        """Wrap `loader`.
+
+        ### Arguments:
+        * loader: Any - Original loader of the module spec.
+        * profiler: StartupProfiler - Profiler receiving the import spans.
+        """
+        self.__loader = loader
+        self.__profiler = profiler
+
+    # #[PUBLIC METHODS]################################################################
+    def __getattr__(self, name: str) -> Any:
+        """Forward other loader attributes to the original loader."""
+        return getattr(self.__loader, name)
+
+    def create_module(self, spec: ModuleSpec) -> Optional[ModuleType]:
+        """Create the module with the original loader."""
+        return self.__loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        """Execute the module and record its cumulative and own import time.
+
+        ### Arguments:
+        * module: ModuleType - Module being imported.
+        """
+        # the module keeps the original loader once it is imported
+        module.__loader__ = self.__loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self.__loader
+        with self.__profiler.timed(StartupCategory.IMPORT, module.__name__):
+            self.__loader.exec_module(module)
+
+
+class _ImportTimer(MetaPathFinder):
+    """Wrap loaders found by the other meta path finders."""
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self, profiler: "StartupProfiler") -> None:
+        """Bind the finder to a profiler.
+
+        ### Arguments:
+        * profiler: StartupProfiler - Profiler receiving the import spans.
+        """
+        self.__profiler = profiler
+
+    # #[PUBLIC METHODS]################################################################
+    def find_spec(
+        self,
+        fullname: str,
+        path: Optional[Sequence[str]],
+        target: Optional[ModuleType] = None,
+    ) -> Optional[ModuleSpec]:
+        """Return the spec of the next finder with a timed loader.
+
+        ### Arguments:
+        * fullname: str - Module name.
+        * path: Optional[Sequence[str]] - Parent package path.
+        * target: Optional[ModuleType] - Module being reloaded.
+
+        ### Returns:
+        Optional[ModuleSpec] - Spec found by the remaining finders.
+        """
+        for finder in list(sys.meta_path):
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec: Optional[ModuleSpec] = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self.__profiler)  # type: ignore
+            return spec
+        return None
+
+
+class StartupProfiler(object):
+    """Collect a timeline of the daemon startup.
+
+    One profiler is active per process. Call sites use the class-level
+    `span()` context manager, which does nothing until `install()` activated a
+    profiler, so the instrumentation costs one attribute check on normal runs.
+    """
+
+    # command line option enabling the profiler
+    OPTION: str = "--profile-startup"
+
+    # number of modules listed in the import section of the report
+    TOP_IMPORTS: int = 20
+
+    __active: Optional["StartupProfiler"] = None
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self) -> None:
+        """Start the profiler clock."""
+        self.__finder: Optional[_ImportTimer] = None
+        self.__local = threading.local()
+        self.__lock = threading.Lock()
+        self.__origin: float = time.perf_counter()
+        self.__spans: List[StartupSpan] = []
+
+    # #[PUBLIC PROPERTIES]#############################################################
+    @property
+    def spans(self) -> List[StartupSpan]:
+        """Return recorded spans in completion order.
+
+        ### Returns:
+        List[StartupSpan] - Recorded spans.
+        """
+        with self.__lock:
+            return list(self.__spans)
+
+    # #[PUBLIC METHODS]################################################################
+    @classmethod
+    def active(cls) -> Optional["StartupProfiler"]:
+        """Return the active profiler.
+
+        ### Returns:
+        Optional[StartupProfiler] - Active profiler or `None`.
+        """
+        return cls.__active
+
+    def finish(self) -> str:
+        """Deactivate the profiler and return its report.
+
+        ### Returns:
+        str - Text report, see `report()`.
+        """
+        if self.__finder is not None and self.__finder in sys.meta_path:
+            sys.meta_path.remove(self.__finder)
+        self.__finder = None
+        if StartupProfiler.__active is self:
+            StartupProfiler.__active = None
+        return self.report()
+
+    @classmethod
+    def install(
+        cls, argv: Optional[List[str]] = None, imports: bool = True
+    ) -> Optional["StartupProfiler"]:
+        """Activate a profiler when `argv` contains `--profile-startup`.
+
+        ### Arguments:
+        * argv: Optional[List[str]] - Command line, `sys.argv` by default.
+        * imports: bool - Time module imports from now on.
+
+        ### Returns:
+        Optional[StartupProfiler] - Active profiler or `None` when disabled.
+        """
+        if cls.OPTION not in (sys.argv if argv is None else argv):
+            return cls.__active
+        if cls.__active is None:
+            profiler = cls()
+            if imports:
+                profiler.__finder = _ImportTimer(profiler)
+                sys.meta_path.insert(0, profiler.__finder)
+            cls.__active = profiler
+        return cls.__active
+
+    def report(self) -> str:
+        """Return a text timeline of the recorded spans.
+
+        Non-import spans are listed in start order and indented by nesting.
+        Imports are summarized by own time, excluding nested imports.
+
+        ### Returns:
+        str - Multi-line report.
+        """
+        spans: List[StartupSpan] = self.spans
+        steps: List[StartupSpan] = sorted(
+            (item for item in spans if item.category != StartupCategory.IMPORT),
+            key=lambda item: (item.start, item.depth),
+        )
+        imports: List[StartupSpan] = [
+            item for item in spans if item.category == StartupCategory.IMPORT
+        ]
+        total: float = max(
+            [item.start + item.duration for item in spans]
+            or [time.perf_counter() - self.__origin]
+        )
+        lines: List[str] = [
+            f"startup profile: {total * 1000:.1f} ms",
+            f"{'at ms':>10} {'took ms':>10}  {'category':<8} step",
+        ]
+        for item in steps:
+            lines.append(
+                f"{item.start * 1000:>10.1f} {item.duration * 1000:>10.1f}  "
+                f"{item.category:<8} {'  ' * item.depth}{item.name}"
+            )
+        if imports:
+            totals: Dict[str, float] = {}
+            for item in imports:
+                root: str = item.name.split(".")[0]
+                totals[root] = totals.get(root, 0.0) + item.own
+            lines.append(
+                f"imports: {len(imports)} modules, "
+                f"{sum(totals.values()) * 1000:.1f} ms; by package: "
+                + ", ".join(
+                    f"{name} {value * 1000:.1f} ms"
+                    for name, value in sorted(
+                        totals.items(), key=lambda pair: pair[1], reverse=True
+                    )[: self.TOP_IMPORTS]
+                )
+            )
+            lines.append(f"{'own ms':>10} {'total ms':>10}  module")
+            for item in sorted(imports, key=lambda span: span.own, reverse=True)[
+                : self.TOP_IMPORTS
+            ]:
+                lines.append(
+                    f"{item.own * 1000:>10.1f} {item.duration * 1000:>10.1f}  "
+                    f"{item.name}"
+                )
+        return "\n".join(lines)
+
+    @classmethod
+    @contextmanager
+    def span(cls, category: str, name: str) -> Iterator[None]:
+        """Time the enclosed block on the active profiler, if any.
+
+        ### Arguments:
+        * category: str - One of `StartupCategory` values.
+        * name: str - Step name shown in the report.
+        """
+        profiler: Optional[StartupProfiler] = cls.__active
+        if profiler is None:
+            yield
+            return
+        with profiler.timed(category, name):
+            yield
+
+    @contextmanager
+    def timed(self, category: str, name: str) -> Iterator[None]:
+        """Time the enclosed block on this profiler.
+
+        ### Arguments:
+        * category: str - One of `StartupCategory` values.
+        * name: str - Step name shown in the report.
+        """
+        stack: List[List[float]] = self.__stack(category)
+        frame: List[float] = [time.perf_counter(), 0.0]
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            stack.pop()
+            duration: float = time.perf_counter() - frame[0]
+            if stack:
+                stack[-1][1] += duration
+            with self.__lock:
+                self.__spans.append(
+                    StartupSpan(
+                        category=category,
+                        depth=len(stack),
+                        duration=duration,
+                        name=name,
+                        start=frame[0] - self.__origin,
+                        own=duration - frame[1],
+                    )
+                )
+
+    # #[PRIVATE METHODS]###############################################################
+    def __stack(self, category: str) -> List[List[float]]:
+        """Return the open span stack of the current thread.
+
+        Imports and startup steps nest independently.
+
+        ### Arguments:
+        * category: str - Span category.
+
+        ### Returns:
+        List[List[float]] - `[start, nested time]` of the open spans.
+        """
+        name: str = "imports" if category == StartupCategory.IMPORT else "steps"
+        stack: Optional[List[List[float]]] = getattr(self.__local, name, None)
+        if stack is None:
+            stack = []
+            setattr(self.__local, name, stack)
+        return stack
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1 @@
+"""AASd worker plugin package."""
@@ -0,0 +1,733 @@
+# -*- coding: UTF-8 -*-
+"""
+ICMP reachability worker plugin.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Probe configured IPv4 hosts concurrently and report state changes.
+"""
+
+import time
+
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Event, Thread
+from typing import Any, Callable, List, Mapping, Optional, Tuple
+
+from jsktoolbox.attribtool import ReadOnlyClass
+from jsktoolbox.basetool import BData
+from jsktoolbox.netaddresstool import Address
+
+from libs.com.message import Channel, Message, Priority
+from libs.plugins import (
+    NotificationScheduler,
+    PluginCommonKeys,
+    PluginConfigSnapshot,
+    PluginContext,
+    PluginHealth,
+    PluginHealthSnapshot,
+    PluginKind,
+    PluginSpec,
+    PluginState,
+    PluginStateSnapshot,
+    ThPluginMixin,
+)
+from libs.templates import PluginConfigField, PluginConfigSchema
+from libs.tools import MDateTime, MIntervals, Pinger
+
+
+class _Keys(object, metaclass=ReadOnlyClass):
+    """Plugin configuration and internal storage keys."""
+
+    # config keys
+    FAIL_THRESHOLD: str = "fail_threshold"
+    HOSTS: str = "hosts"
+    PROBE_SPREAD: str = "probe_spread"
+    PROBE_TIMEOUT: str = "probe_timeout"
+    PROBE_WORKERS: str = "probe_workers"
+
+    # internal keys
+    ADDRESSES: str = "__addresses__"
+    CHANGED: str = "__changed__"
+    CYCLE_TIME: str = "__cycle_time__"
+    DOWN: str = "__down__"
+    ERRORS: str = "__errors__"
+    EXECUTOR: str = "__executor__"
+    FAILURES: str = "__failures__"
+    LAST_DOWN: str = "__last_down__"
+    LAST_UP: str = "__last_up__"
+    MONITOR: str = "__monitor__"
+    PROBE: str = "__probe__"
+    SPREAD: str = "__spread__"
+    STATES: str = "__states__"
+    THRESHOLD: str = "__threshold__"
+    WORKERS: str = "__workers__"
+
+
+class HostStates(BData):
+    """Keep the reachability state of all monitored hosts in flat arrays.
+
+    Hosts are addressed by their index in `addresses`. Timestamps live in
+    `array('d')` and counters and flags in `bytearray`, so a list of thousands
+    of hosts costs a few bytes per host instead of one object each. A host is
+    declared down after `threshold` consecutive failed probes and up again
+    after the first successful one; `last_down` holds the first failed probe
+    of the streak, so reports do not lag by the threshold.
+    """
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self, addresses: List[str], now: Optional[float] = None) -> None:
+        """Initialize all hosts as reachable.
+
+        ### Arguments:
+        * addresses: List[str] - Monitored IPv4 addresses.
+        * now: Optional[float] - Start timestamp, current time when `None`.
+        """
+        if now is None:
+            now = time.time()
+        size: int = len(addresses)
+        self._set_data(key=_Keys.ADDRESSES, value=list(addresses), set_default_type=List)
+        self._set_data(key=_Keys.LAST_UP, value=array("d", [now] * size))
+        self._set_data(key=_Keys.LAST_DOWN, value=array("d", [0.0] * size))
+        self._set_data(key=_Keys.FAILURES, value=bytearray(size))
+        self._set_data(key=_Keys.DOWN, value=bytearray(size))
+        self._set_data(key=_Keys.CHANGED, value=bytearray(size))
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def addresses(self) -> List[str]:
+        """Return monitored addresses in index order.
+
+        ### Returns:
+        List[str] - IPv4 addresses.
+        """
+        return self._get_data(key=_Keys.ADDRESSES)  # type: ignore
+
+    @property
+    def down(self) -> List[int]:
+        """Return indexes of hosts currently declared down.
+
+        ### Returns:
+        List[int] - Host indexes.
+        """
+        flags: bytearray = self._get_data(key=_Keys.DOWN)  # type: ignore
+        return [idx for idx, flag in enumerate(flags) if flag]
+
+    # #[PUBLIC METHODS]###############################################################
+    def is_down(self, index: int) -> bool:
+        """Return whether a host is declared down.
+
+        ### Arguments:
+        * index: int - Host index.
+
+        ### Returns:
+        bool - `True` for a host that is down.
+        """
+        return bool(self._get_data(key=_Keys.DOWN)[index])  # type: ignore
+
+    def last_down(self, index: int) -> float:
+        """Return the time of the first failed probe of the last failure streak.
+
+        ### Arguments:
+        * index: int - Host index.
+
+        ### Returns:
+        float - Unix timestamp, `0.0` when it was never down.
+        """
+        return self._get_data(key=_Keys.LAST_DOWN)[index]  # type: ignore
+
+    def last_up(self, index: int) -> float:
+        """Return the time a host last answered a probe.
+
+        ### Arguments:
+        * index: int - Host index.
+
+        ### Returns:
+        float - Unix timestamp.
+        """
+        return self._get_data(key=_Keys.LAST_UP)[index]  # type: ignore
+
+    def pop_changes(self) -> List[int]:
+        """Return and clear indexes of hosts whose state changed.
+
+        ### Returns:
+        List[int] - Host indexes in address order.
+        """
+        changed: bytearray = self._get_data(key=_Keys.CHANGED)  # type: ignore
+        out: List[int] = [idx for idx, flag in enumerate(changed) if flag]
+        for idx in out:
+            changed[idx] = 0
+        return out
+
+    def record(
+        self, index: int, alive: bool, threshold: int, now: Optional[float] = None
+    ) -> bool:
+        """Apply one probe result.
+
+        ### Arguments:
+        * index: int - Host index.
+        * alive: bool - Probe result.
+        * threshold: int - Consecutive failures that declare the host down.
+        * now: Optional[float] - Probe timestamp, current time when `None`.
+
+        ### Returns:
+        bool - `True` when the host changed its state.
+        """
+        if now is None:
+            now = time.time()
+        failures: bytearray = self._get_data(key=_Keys.FAILURES)  # type: ignore
+        down: bytearray = self._get_data(key=_Keys.DOWN)  # type: ignore
+        changed: bool = False
+        if alive:
+            failures[index] = 0
+            self._get_data(key=_Keys.LAST_UP)[index] = now  # type: ignore
+            if down[index]:
+                down[index] = 0
+                changed = True
+        else:
+            if failures[index] == 0:
+                self._get_data(key=_Keys.LAST_DOWN)[index] = now  # type: ignore
+            failures[index] = min(255, failures[index] + 1)
+            if not down[index] and failures[index] >= threshold:
+                down[index] = 1
+                changed = True
+        if changed:
+            self._get_data(key=_Keys.CHANGED)[index] = 1  # type: ignore
+        return changed
+
+
+class ReachabilityMonitor(BData):
+    """Probe all hosts once per cycle with a bounded pool of probe threads.
+
+    Probe starts are spread evenly over `spread` seconds, so a long host list
+    does not send a burst of echo requests at the start of every cycle, and at
+    most `workers` probes run at the same time.
+    """
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(
+        self,
+        addresses: List[str],
+        probe: Callable[[str], bool],
+        workers: int = 32,
+        threshold: int = 3,
+        spread: float = 0.0,
+    ) -> None:
+        """Initialize the monitor.
+
+        ### Arguments:
+        * addresses: List[str] - Monitored IPv4 addresses.
+        * probe: Callable[[str], bool] - Probe returning `True` for an answer.
+        * workers: int - Maximum number of concurrent probes.
+        * threshold: int - Consecutive failures that declare a host down.
+        * spread: float - Seconds over which probe starts are spread.
+        """
+        self._set_data(
+            key=_Keys.STATES, value=HostStates(addresses), set_default_type=HostStates
+        )
+        self._set_data(key=_Keys.PROBE, value=probe)
+        self._set_data(
+            key=_Keys.WORKERS, value=max(1, int(workers)), set_default_type=int
+        )
+        self._set_data(
+            key=_Keys.THRESHOLD, value=max(1, int(threshold)), set_default_type=int
+        )
+        self._set_data(
+            key=_Keys.SPREAD, value=max(0.0, float(spread)), set_default_type=float
+        )
+        self._set_data(key=_Keys.CYCLE_TIME, value=0.0, set_default_type=float)
+        self._set_data(key=_Keys.ERRORS, value=[], set_default_type=List)
+        self._set_data(
+            key=_Keys.EXECUTOR,
+            value=None,
+            set_default_type=Optional[ThreadPoolExecutor],
+        )
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def cycle_time(self) -> float:
+        """Return the duration of the last completed cycle.
+
+        ### Returns:
+        float - Seconds, including the probe spread.
+        """
+        return self._get_data(key=_Keys.CYCLE_TIME)  # type: ignore
+
+    @property
+    def errors(self) -> List[str]:
+        """Return probe errors collected by the last cycle.
+
+        ### Returns:
+        List[str] - Error messages; hosts with errors keep their state.
+        """
+        return self._get_data(key=_Keys.ERRORS)  # type: ignore
+
+    @property
+    def states(self) -> HostStates:
+        """Return the per-host state arrays.
+
+        ### Returns:
+        HostStates - Host states.
+        """
+        return self._get_data(key=_Keys.STATES)  # type: ignore
+
+    # #[PUBLIC METHODS]###############################################################
+    def close(self) -> None:
+        """Stop the probe threads."""
+        executor: Optional[ThreadPoolExecutor] = self._get_data(key=_Keys.EXECUTOR)
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._set_data(key=_Keys.EXECUTOR, value=None)
+
+    def cycle(self, stop_event: Optional[Event] = None) -> List[int]:
+        """Probe every host once and apply the results.
+
+        ### Arguments:
+        * stop_event: Optional[Event] - Event that interrupts the cycle.
+
+        ### Returns:
+        List[int] - Indexes of hosts that changed their state.
+        """
+        states: HostStates = self.states
+        addresses: List[str] = states.addresses
+        probe: Callable[[str], bool] = self._get_data(key=_Keys.PROBE)  # type: ignore
+        threshold: int = self._get_data(key=_Keys.THRESHOLD)  # type: ignore
+        step: float = (
+            self._get_data(key=_Keys.SPREAD) / len(addresses)  # type: ignore
+            if addresses
+            else 0.0
+        )
+        executor: ThreadPoolExecutor = self.__executor
+        self.errors.clear()
+        started: float = time.monotonic()
+        pending: List[Tuple[int, Future]] = []
+        for idx, address in enumerate(addresses):
+            delay: float = started + idx * step - time.monotonic()
+            if delay > 0.0 and stop_event is not None and stop_event.wait(delay):
+                break
+            if delay > 0.0 and stop_event is None:
+                time.sleep(delay)
+            if stop_event is not None and stop_event.is_set():
+                break
+            pending.append((idx, executor.submit(probe, address)))
+        for idx, future in pending:
+            if stop_event is not None and stop_event.is_set():
+                future.cancel()
+                continue
+            try:
+                alive: bool = bool(future.result())
+            except Exception as ex:
+                self.errors.append(f"probe of '{addresses[idx]}' failed: {ex}")
+                continue
+            states.record(idx, alive, threshold)
+        self._set_data(key=_Keys.CYCLE_TIME, value=time.monotonic() - started)
+        return states.pop_changes()
+
+    # #[PRIVATE PROPERTIES]###########################################################
+    @property
+    def __executor(self) -> ThreadPoolExecutor:
+        """Return the probe thread pool, created on first use.
+
+        ### Returns:
+        ThreadPoolExecutor - Bounded probe pool.
+        """
+        executor: Optional[ThreadPoolExecutor] = self._get_data(key=_Keys.EXECUTOR)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=min(
+                    self._get_data(key=_Keys.WORKERS),  # type: ignore
+                    max(1, len(self.states.addresses)),
+                ),
+                thread_name_prefix="icmp-probe",
+            )
+            self._set_data(key=_Keys.EXECUTOR, value=executor)
+        return executor
+
+
+class _Runtime(Thread, ThPluginMixin):
+    """Monitor host reachability and publish up and down transitions."""
+
+    _notifications: Optional[NotificationScheduler] = None
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self, context: PluginContext) -> None:
+        """Initialize the reachability worker runtime.
+
+        ### Arguments:
+        * context: PluginContext - Plugin runtime context.
+        """
+        Thread.__init__(self, name=context.instance_name)
+        self.daemon = True
+        self._context: PluginContext = context
+        self._health = PluginHealthSnapshot(health=PluginHealth.UNKNOWN)
+        # only channels with an interval repeat hosts that stay down
+        self._notifications = NotificationScheduler(
+            message_channel=[
+                item
+                for item in context.config.get(PluginCommonKeys.MESSAGE_CHANNEL) or []
+                if ":" in str(item)
+            ],
+            at_channel=context.config.get(PluginCommonKeys.AT_CHANNEL),
+        )
+        self._stop_event = Event()
+        self._state = PluginStateSnapshot(state=PluginState.CREATED)
+        self._set_data(
+            key=_Keys.MONITOR,
+            value=None,
+            set_default_type=Optional[ReachabilityMonitor],
+        )
+
+    def initialize(self) -> None:
+        """Validate the host list and prepare the probe pool."""
+        context: PluginContext = self._context  # type: ignore
+        config = context.config
+        addresses: List[str] = []
+        for item in config.get(_Keys.HOSTS) or []:
+            if not str(item).strip():
+                continue
+            try:
+                addresses.append(str(Address(str(item))))
+            except Exception as ex:
+                context.logger.message_error = f"invalid host '{item}': {ex}"
+        pinger = Pinger(timeout=int(config.get(_Keys.PROBE_TIMEOUT) or 1))
+        self._set_data(
+            key=_Keys.MONITOR,
+            value=ReachabilityMonitor(
+                addresses,
+                pinger.is_alive,
+                workers=int(config.get(_Keys.PROBE_WORKERS) or 32),
+                threshold=int(config.get(_Keys.FAIL_THRESHOLD) or 3),
+                spread=float(config.get(_Keys.PROBE_SPREAD) or 0),
+            ),
+        )
+        self._state = PluginStateSnapshot(state=PluginState.INITIALIZED)
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def monitor(self) -> Optional[ReachabilityMonitor]:
+        """Return the concurrent probe monitor.
+
+        ### Returns:
+        Optional[ReachabilityMonitor] - Monitor or `None` before `initialize()`.
+        """
+        return self._get_data(key=_Keys.MONITOR)
+
+    # #[PUBLIC METHODS]################################################################
+    def cycle(self) -> bool:
+        """Probe all hosts once and publish transitions and reminders.
+
+        Hosts that changed state are reported at once to every configured
+        channel; hosts that stay down are repeated on channels with an interval
+        or an `at_channel` schedule when they are due.
+
+        ### Returns:
+        bool - `True` when every probe completed without errors.
+        """
+        context: PluginContext = self._context  # type: ignore
+        monitor: Optional[ReachabilityMonitor] = self.monitor
+        if monitor is None:
+            return False
+        states: HostStates = monitor.states
+        changed: List[int] = monitor.cycle(self._stop_event)
+        for item in monitor.errors:
+            context.logger.message_error = item
+        now: float = time.time()
+        transitions: List[str] = []
+        for idx in changed:
+            address: str = states.addresses[idx]
+            if states.is_down(idx):
+                line: str = (
+                    f"{address} is down at "
+                    f"{MDateTime.datetime_from_timestamp(int(states.last_down(idx)))}"
+                )
+            else:
+                outage: float = states.last_up(idx) - states.last_down(idx)
+                line = (
+                    f"{address} is up now after "
+                    f"{MDateTime.elapsed_time_from_seconds(int(outage))}"
+                )
+            context.logger.message_notice = line
+            transitions.append(line)
+        notifications: Optional[NotificationScheduler] = self._notifications
+        if transitions:
+            self.__publish(self.__channels(), transitions, Priority.HIGH)
+            if notifications is not None:
+                # a fresh report restarts the reminder intervals
+                notifications.due_channels()
+        down: List[int] = [idx for idx in states.down if idx not in changed]
+        if down and notifications is not None:
+            due: List[int] = notifications.due_channels()
+            if due:
+                self.__publish(
+                    due,
+                    [
+                        f"{states.addresses[idx]} is down since "
+                        f"{MDateTime.elapsed_time_from_seconds(int(now - states.last_down(idx)))}"
+                        for idx in down
+                    ],
+                    Priority.NORMAL,
+                )
+        return not monitor.errors
+
+    def health(self) -> PluginHealthSnapshot:
+        """Return the current health snapshot.
+
+        ### Returns:
+        PluginHealthSnapshot - Current plugin health snapshot.
+        """
+        health: Optional[PluginHealthSnapshot] = self._health
+        if health is None:
+            return PluginHealthSnapshot(
+                health=PluginHealth.UNKNOWN,
+                message="Health snapshot is not initialized.",
+            )
+        return health
+
+    def reconfigure(self, config: Mapping[str, Any]) -> bool:
+        """Accept a new config snapshot when only `sleep_period` changed.
+
+        ### Arguments:
+        * config: Mapping[str, Any] - New config snapshot.
+
+        ### Returns:
+        bool - `True` when the running monitor can keep its hosts and probes.
+        """
+        context: Optional[PluginContext] = self._context
+        if context is None or not isinstance(config, PluginConfigSnapshot):
+            return False
+        return set(config.changed(context.config)) <= {PluginCommonKeys.SLEEP_PERIOD}
+
+    def run(self) -> None:
+        """Run probe cycles every `sleep_period` until stopped."""
+        stop_event: Optional[Event] = self._stop_event
+        context: Optional[PluginContext] = self._context
+        monitor: Optional[ReachabilityMonitor] = self.monitor
+        if stop_event is None or context is None or monitor is None:
+            self._health = PluginHealthSnapshot(
+                health=PluginHealth.UNHEALTHY,
+                last_error_at=int(time.time()),
+                message="Runtime is not initialized.",
+            )
+            self._state = PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Runtime is not initialized.",
+                stopped_at=int(time.time()),
+            )
+            return None
+        intervals = MIntervals(self._c_name)
+        while not stop_event.is_set():
+            started: float = time.monotonic()
+            # read per cycle, `reconfigure()` may swap the snapshot
+            interval: int = intervals.convert(
+                str(context.config.get(PluginCommonKeys.SLEEP_PERIOD) or "60")
+            )
+            ok: bool = self.cycle()
+            if stop_event.is_set():
+                break
+            report: str = (
+                f"Probed {len(monitor.states.addresses)} hosts in "
+                f"{monitor.cycle_time:.2f}s, {len(monitor.states.down)} down."
+            )
+            if context.debug:
+                context.logger.message_debug = report
+            if monitor.cycle_time > interval:
+                context.logger.message_warning = (
+                    f"probe cycle took {monitor.cycle_time:.2f}s, longer than "
+                    f"sleep_period {interval}s; raise probe_workers or shorten "
+                    "the host list"
+                )
+            self._health = PluginHealthSnapshot(
+                health=PluginHealth.HEALTHY if ok else PluginHealth.DEGRADED,
+                last_error_at=None if ok else int(time.time()),
+                last_ok_at=int(time.time()) if ok else None,
+                message=report,
+            )
+            stop_event.wait(max(1.0, interval - (time.monotonic() - started)))
+
+    def start(self) -> None:
+        """Start the runtime thread."""
+        self._state = PluginStateSnapshot(
+            state=PluginState.STARTING,
+            started_at=int(time.time()),
+        )
+        Thread.start(self)
+
+    def state(self) -> PluginStateSnapshot:
+        """Return the current lifecycle snapshot.
+
+        ### Returns:
+        PluginStateSnapshot - Current plugin lifecycle snapshot.
+        """
+        state: Optional[PluginStateSnapshot] = self._state
+        if state is None:
+            return PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Lifecycle snapshot is not initialized.",
+            )
+        if self.is_alive() and state.state == PluginState.STARTING:
+            state = PluginStateSnapshot(
+                state=PluginState.RUNNING,
+                started_at=state.started_at,
+            )
+            self._state = state
+        return state
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Request plugin shutdown.
+
+        ### Arguments:
+        * timeout: Optional[float] - Optional join timeout.
+        """
+        stop_event: Optional[Event] = self._stop_event
+        state: Optional[PluginStateSnapshot] = self._state
+        if stop_event is None:
+            self._state = PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Stop event is not initialized.",
+                stopped_at=int(time.time()),
+            )
+            return None
+        if state is not None and state.state not in (
+            PluginState.STOPPED,
+            PluginState.FAILED,
+        ):
+            self._state = PluginStateSnapshot(
+                state=PluginState.STOPPING,
+                started_at=state.started_at,
+            )
+        stop_event.set()
+        if self.is_alive():
+            self.join(timeout=timeout)
+        monitor: Optional[ReachabilityMonitor] = self.monitor
+        if monitor is not None:
+            monitor.close()
+        self._state = PluginStateSnapshot(
+            state=PluginState.STOPPED,
+            started_at=state.started_at if state is not None else None,
+            stopped_at=int(time.time()),
+        )
+
+    # #[PRIVATE METHODS]###############################################################
+    def __channels(self) -> List[int]:
+        """Return every configured `message_channel` target.
+
+        ### Returns:
+        List[int] - Channel identifiers without their interval suffixes.
+        """
+        context: PluginContext = self._context  # type: ignore
+        channels: List = context.config.get(PluginCommonKeys.MESSAGE_CHANNEL) or []
+        if not channels:
+            return []
+        return [int(item) for item in Channel([str(item) for item in channels]).channels]
+
+    def __publish(self, channels: List[int], lines: List[str], priority: int) -> None:
+        """Publish one reachability report per channel.
+
+        ### Arguments:
+        * channels: List[int] - Target channels.
+        * lines: List[str] - Report lines.
+        * priority: int - Dispatcher priority.
+        """
+        context: PluginContext = self._context  # type: ignore
+        app = context.app_meta
+        for channel in channels:
+            message = Message()
+            message.channel = int(channel)
+            message.diagnostic_source = self._c_name
+            message.priority = priority
+            message.subject = (
+                f"[{app.app_name}:{context.instance_name}] host reachability "
+                f"report from {app.app_host_name}."
+            )
+            message.footer = f"{app.app_name} {app.app_version} on {app.app_host_name}"
+            message.messages = list(lines)
+            context.dispatcher.publish(message)
+
+
+def get_plugin_spec() -> PluginSpec:
+    """Return the plugin spec for `icmp`.
+
+    ### Returns:
+    PluginSpec - Plugin manifest.
+    """
+    schema = PluginConfigSchema(
+        title="ICMP reachability worker plugin.",
+        description=(
+            "Probes IPv4 hosts with a bounded pool of concurrent ICMP probes and "
+            "reports hosts going down or coming back up."
+        ),
+        fields=[
+            PluginConfigField(
+                name=PluginCommonKeys.MESSAGE_CHANNEL,
+                field_type=list,
+                default=[1],
+                required=True,
+                description=(
+                    "Targets for state changes; the optional interval, for "
+                    "example `[1, '2:1h']`, repeats hosts that stay down."
+                ),
+            ),
+            PluginConfigField(
+                name=PluginCommonKeys.SLEEP_PERIOD,
+                field_type=str,
+                default="60",
+                required=True,
+                description="Time between probe cycles, seconds or `s|m|h|d|w`.",
+            ),
+            PluginConfigField(
+                name=_Keys.HOSTS,
+                field_type=list,
+                default=[],
+                required=True,
+                description="IPv4 addresses to monitor.",
+                example=["192.168.1.1", "10.0.0.1"],
+            ),
+            PluginConfigField(
+                name=_Keys.FAIL_THRESHOLD,
+                field_type=int,
+                default=3,
+                required=False,
+                description="Consecutive failed probes that declare a host down.",
+            ),
+            PluginConfigField(
+                name=_Keys.PROBE_WORKERS,
+                field_type=int,
+                default=32,
+                required=False,
+                description="Maximum number of probes running at the same time.",
+            ),
+            PluginConfigField(
+                name=_Keys.PROBE_SPREAD,
+                field_type=int,
+                default=10,
+                required=False,
+                description=(
+                    "Seconds over which probe starts are spread in one cycle, "
+                    "`0` starts them as fast as workers allow."
+                ),
+            ),
+            PluginConfigField(
+                name=_Keys.PROBE_TIMEOUT,
+                field_type=int,
+                default=1,
+                required=False,
+                description="Probe timeout in seconds.",
+            ),
+        ],
+    )
+    return PluginSpec(
+        api_version=1,
+        config_schema=schema,
+        plugin_id="aasd.icmp",
+        plugin_kind=PluginKind.WORKER,
+        plugin_name="icmp",
+        runtime_factory=_Runtime,
+        description="ICMP reachability worker with a concurrent probe pool.",
+    )
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,1423 @@
+# -*- coding: UTF-8 -*-
+"""
+LMS payment reminder worker plugin.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Send overdue payment reminders and diagnostic reports from LMS data.
+
+WWW: https://lms.org.pl/
+"""
+
+import time
+
+from dataclasses import dataclass, field
+from threading import Event, Thread
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Set, Tuple
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    Numeric,
+    Select,
+    String,
+    Table,
+    func,
+    select,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SQLAlchemyError
+
+from jsktoolbox.attribtool import ReadOnlyClass
+from jsktoolbox.basetool import BData
+
+from libs.com.message import Message, Multipart
+from libs.plugins import (
+    NotificationScheduler,
+    PluginCommonKeys,
+    PluginContext,
+    PluginHealth,
+    PluginHealthSnapshot,
+    PluginKind,
+    PluginSpec,
+    PluginState,
+    PluginStateSnapshot,
+    ThPluginMixin,
+)
+from libs.templates import PluginConfigField, PluginConfigSchema
+from libs.tools import MDateTime, MIntervals, SqlEnginePool
+
+
+class _Keys(object, metaclass=ReadOnlyClass):
+    """Plugin configuration, contact flag, and internal storage keys."""
+
+    # config keys
+    BALANCE_REBUILD: str = "balance_rebuild"
+    BATCH_SIZE: str = "batch_size"
+    CUTOFF: str = "cutoff_time"
+    DEF_PAY_TIME: str = "default_paytime"
+    DIAG_CHANNEL: str = "diagnostic_channel"
+    LMS_URL: str = "lms_url"
+    MSG_FOOTER: str = "message_footer"
+    MSG_NOTIFY: str = "payment_message"
+    SKIP_GROUPS: str = "skip_group_id"
+    SQL_DATABASE: str = "sql_database"
+    SQL_PASS: str = "sql_password"
+    SQL_SERVER: str = "sql_server"
+    SQL_USER: str = "sql_user"
+    SUBJECT_PREFIX: str = "subject_prefix"
+    USER_URL: str = "user_url"
+
+    # contact types
+    # email notification: 8|32=40, type&40==40 and type&16384==0
+    # mobile notification: 1|32=33, type&33==33 and type&16384==0
+    CONTACT_DISABLED: int = 16384
+    CONTACT_EMAIL: int = 8
+    CONTACT_MOBILE: int = 1
+    CONTACT_NOTIFICATIONS: int = 32
+
+    # internal keys
+    BALANCES: str = "__balances__"
+    BATCH: str = "__batch__"
+    CONTACT: str = "__contact__"
+    DEBT: str = "__debt__"
+    INDEX: str = "__index__"
+    LAST_ID: str = "__last_id__"
+    PERIOD: str = "__period__"
+    POOL: str = "__pool__"
+    REBUILT_AT: str = "__rebuilt_at__"
+    SCANNER: str = "__scanner__"
+    SKIP: str = "__skip__"
+    TARIFF: str = "__tariff__"
+    URL: str = "__url__"
+
+
+DAY: int = 24 * 60 * 60
+
+# Only the LMS columns used by the plugin; the schema itself belongs to LMS.
+LMS_METADATA = MetaData()
+
+_ASSIGNMENTS = Table(
+    "assignments",
+    LMS_METADATA,
+    Column("id", Integer, primary_key=True),
+    Column("customerid", Integer, nullable=False),
+    Column("tariffid", Integer),
+)
+_CASH = Table(
+    "cash",
+    LMS_METADATA,
+    Column("id", Integer, primary_key=True),
+    Column("customerid", Integer),
+    Column("docid", Integer),
+    Column("time", Integer, nullable=False, default=0),
+    Column("value", Numeric(9, 2, asdecimal=False), nullable=False, default=0),
+)
+_CUSTOMER_ASSIGNMENTS = Table(
+    "customerassignments",
+    LMS_METADATA,
+    Column("id", Integer, primary_key=True),
+    Column("customergroupid", Integer, nullable=False),
+    Column("customerid", Integer, nullable=False),
+)
+_CUSTOMER_CONTACTS = Table(
+    "customercontacts",
+    LMS_METADATA,
+    Column("id", Integer, primary_key=True),
+    Column("customerid", Integer, nullable=False),
+    Column("contact", String(255), nullable=False, default=""),
+    Column("type", Integer),
+)
+_CUSTOMERS = Table(
+    "customers",
+    LMS_METADATA,
+    Column("id", Integer, primary_key=True),
+    Column("lastname", String(128), nullable=False, default=""),
+    Column("name", String(128), nullable=False, default=""),
+    Column("deleted", Integer, nullable=False, default=0),
+    Column("pin", String(255), nullable=False, default="0"),
+    Column("mailingnotice", Integer),
+    Column("paytime", Integer, nullable=False, default=-1),
+)
+_DOCUMENTS = Table(
+    "documents",
+    LMS_METADATA,
+    Column("id", Integer, primary_key=True),
+    Column("cdate", Integer, nullable=False, default=0),
+    Column("paytime", Integer, nullable=False, default=0),
+)
+_NODES = Table(
+    "nodes",
+    LMS_METADATA,
+    Column("id", Integer, primary_key=True),
+    Column("ownerid", Integer),
+    Column("access", Integer, nullable=False, default=1),
+)
+_TARIFFS = Table(
+    "tariffs",
+    LMS_METADATA,
+    Column("id", Integer, primary_key=True),
+)
+
+
+@dataclass(slots=True)
+class CustomerBalance:
+    """Store the running balance of one customer ledger."""
+
+    balance: float = 0.0
+    debt_time: int = 0
+    doc_paytime: int = 0
+    last_time: int = 0
+
+    # #[PUBLIC METHODS]###############################################################
+    def add(
+        self,
+        value: float,
+        time_: int,
+        doc_cdate: Optional[int],
+        doc_paytime: Optional[int],
+    ) -> bool:
+        """Apply one cash operation in time order.
+
+        The debt starts at the creation date of the document whose charge
+        turned a non-negative balance negative, and ends when the balance is
+        settled again.
+
+        ### Arguments:
+        * value: float - Operation value, negative for charges.
+        * time_: int - Operation time.
+        * doc_cdate: Optional[int] - Creation date of the related document.
+        * doc_paytime: Optional[int] - Payment term of the related document.
+
+        ### Returns:
+        bool - `False` when the operation is older than the last applied one
+        and the ledger must be replayed instead.
+        """
+        if time_ < self.last_time:
+            return False
+        self.last_time = int(time_)
+        before: float = self.balance
+        self.balance = round(before + float(value), 2)
+        if doc_cdate is not None and before >= 0 and self.balance < 0:
+            self.debt_time = int(doc_cdate)
+            self.doc_paytime = int(doc_paytime or 0)
+        if self.balance >= 0:
+            self.debt_time = 0
+        return True
+
+
+class BalanceIndex(BData):
+    """Keep customer balances up to date from new `cash` rows.
+
+    The first refresh replays the whole ledger once; later refreshes read
+    only rows with an id above the last seen one, so reading a balance is a
+    dictionary lookup instead of a `SUM` over the customer history. A row
+    dated before the last applied operation of its customer replays that
+    customer's ledger. Edited and deleted rows are picked up by the full
+    replay repeated every `rebuild_period` seconds.
+    """
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self, rebuild_period: int = DAY) -> None:
+        """Initialize an empty index.
+
+        ### Arguments:
+        * rebuild_period: int - Seconds between full ledger replays.
+        """
+        self._set_data(key=_Keys.BALANCES, value={}, set_default_type=Dict)
+        self._set_data(key=_Keys.LAST_ID, value=0, set_default_type=int)
+        self._set_data(
+            key=_Keys.PERIOD, value=max(0, int(rebuild_period)), set_default_type=int
+        )
+        self._set_data(key=_Keys.REBUILT_AT, value=0.0, set_default_type=float)
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def last_id(self) -> int:
+        """Return the highest applied `cash` id.
+
+        ### Returns:
+        int - Row id, `0` before the first refresh.
+        """
+        return self._get_data(key=_Keys.LAST_ID)  # type: ignore
+
+    @property
+    def rebuilt_at(self) -> float:
+        """Return the time of the last full ledger replay.
+
+        ### Returns:
+        float - Unix timestamp, `0.0` before the first refresh.
+        """
+        return self._get_data(key=_Keys.REBUILT_AT)  # type: ignore
+
+    @property
+    def size(self) -> int:
+        """Return the number of indexed customers.
+
+        ### Returns:
+        int - Customers with at least one cash operation.
+        """
+        return len(self.__balances)
+
+    # #[PUBLIC METHODS]###############################################################
+    def get(self, customer_id: int) -> CustomerBalance:
+        """Return the balance of one customer.
+
+        ### Arguments:
+        * customer_id: int - LMS customer id.
+
+        ### Returns:
+        CustomerBalance - Indexed balance, an empty one for unknown customers.
+        """
+        return self.__balances.get(customer_id) or CustomerBalance()
+
+    def rebuild(self, connection: Connection, now: Optional[float] = None) -> int:
+        """Replay the whole ledger.
+
+        ### Arguments:
+        * connection: Connection - Database connection.
+        * now: Optional[float] - Current Unix timestamp, for tests.
+
+        ### Returns:
+        int - Applied rows.
+        """
+        last_id: int = connection.execute(select(func.max(_CASH.c.id))).scalar() or 0
+        balances: Dict[int, CustomerBalance] = self.__balances
+        balances.clear()
+        count: int = self.__replay(connection, _CASH.c.id <= last_id)
+        self._set_data(key=_Keys.LAST_ID, value=int(last_id))
+        self._set_data(
+            key=_Keys.REBUILT_AT, value=float(time.time() if now is None else now)
+        )
+        return count
+
+    def refresh(self, connection: Connection, now: Optional[float] = None) -> int:
+        """Apply `cash` rows added since the last refresh.
+
+        ### Arguments:
+        * connection: Connection - Database connection.
+        * now: Optional[float] - Current Unix timestamp, for tests.
+
+        ### Returns:
+        int - Applied rows.
+        """
+        if now is None:
+            now = time.time()
+        if not self.rebuilt_at or now - self.rebuilt_at >= self._get_data(
+            key=_Keys.PERIOD
+        ):
+            return self.rebuild(connection, now)
+        balances: Dict[int, CustomerBalance] = self.__balances
+        last_id: int = self.last_id
+        dirty: Set[int] = set()
+        count: int = 0
+        for row in connection.execute(
+            self.__select()
+            .where(_CASH.c.id > last_id)
+            .order_by(_CASH.c.id)
+            .execution_options(stream_results=True, yield_per=1000)
+        ):
+            count += 1
+            last_id = max(last_id, row.id)
+            if row.customerid in dirty:
+                continue
+            account: CustomerBalance = balances.setdefault(
+                row.customerid, CustomerBalance()
+            )
+            if not account.add(row.value, row.time, row.cdate, row.paytime):
+                dirty.add(row.customerid)
+        # backdated rows change the debt history, replay those ledgers
+        ids: List[int] = sorted(dirty)
+        for start in range(0, len(ids), 1000):
+            chunk: List[int] = ids[start : start + 1000]
+            for customer_id in chunk:
+                balances.pop(customer_id, None)
+            self.__replay(
+                connection, _CASH.c.customerid.in_(chunk), _CASH.c.id <= last_id
+            )
+        self._set_data(key=_Keys.LAST_ID, value=int(last_id))
+        return count
+
+    # #[PRIVATE PROPERTIES]###########################################################
+    @property
+    def __balances(self) -> Dict[int, CustomerBalance]:
+        """Return balances by customer id.
+
+        ### Returns:
+        Dict[int, CustomerBalance] - Indexed balances.
+        """
+        return self._get_data(key=_Keys.BALANCES)  # type: ignore
+
+    # #[PRIVATE METHODS]##############################################################
+    def __replay(self, connection: Connection, *conditions: Any) -> int:
+        """Apply the selected rows in ledger order.
+
+        ### Arguments:
+        * connection: Connection - Database connection.
+        * conditions: Any - Row filters.
+
+        ### Returns:
+        int - Applied rows.
+        """
+        balances: Dict[int, CustomerBalance] = self.__balances
+        count: int = 0
+        for row in connection.execute(
+            self.__select()
+            .where(*conditions)
+            .order_by(_CASH.c.customerid, _CASH.c.time, _CASH.c.id)
+            .execution_options(stream_results=True, yield_per=1000)
+        ):
+            count += 1
+            balances.setdefault(row.customerid, CustomerBalance()).add(
+                row.value, row.time, row.cdate, row.paytime
+            )
+        return count
+
+    def __select(self) -> Select:
+        """Return the base query of customer cash operations.
+
+        ### Returns:
+        Select - Cash query joined with the related documents.
+        """
+        return (
+            select(
+                _CASH.c.id,
+                _CASH.c.customerid,
+                _CASH.c.value,
+                _CASH.c.time,
+                _DOCUMENTS.c.cdate,
+                _DOCUMENTS.c.paytime,
+            )
+            .select_from(_CASH.outerjoin(_DOCUMENTS, _CASH.c.docid == _DOCUMENTS.c.id))
+            .where(_CASH.c.customerid.is_not(None))
+        )
+
+
+@dataclass(slots=True)
+class LmsCustomer:
+    """Store one customer with the related rows loaded for its batch."""
+
+    id: int
+    name: str
+    lastname: str
+    pin: str
+    paytime: int
+    account: CustomerBalance = field(default_factory=CustomerBalance)
+    active_nodes: int = 0
+    contacts: List[Tuple[str, int]] = field(default_factory=list)
+    nodes: int = 0
+    tariffs: int = 0
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def balance(self) -> float:
+        """Return the current balance.
+
+        ### Returns:
+        float - Balance, negative for a debt.
+        """
+        return self.account.balance
+
+    @property
+    def debt_time(self) -> int:
+        """Return the creation date of the document that opened the debt.
+
+        ### Returns:
+        int - Unix timestamp, `0` without a debt.
+        """
+        return self.account.debt_time
+
+    @property
+    def full_name(self) -> str:
+        """Return the customer name followed by the last name.
+
+        ### Returns:
+        str - Display name.
+        """
+        return f"{self.name} {self.lastname}" if self.lastname else f"{self.name}"
+
+    @property
+    def has_active_node(self) -> Optional[bool]:
+        """Check whether the customer has at least one active node.
+
+        ### Returns:
+        Optional[bool] - `None` when the customer has no nodes.
+        """
+        if self.nodes == 0:
+            return None
+        return self.active_nodes > 0
+
+    @property
+    def pay_time(self) -> int:
+        """Return the payment term of the document that opened the debt.
+
+        ### Returns:
+        int - Days, the customer `paytime` when the document has none.
+        """
+        if self.account.doc_paytime > 0:
+            return self.account.doc_paytime
+        return self.paytime
+
+    # #[PUBLIC METHODS]###############################################################
+    def contacts_with(self, flags: int) -> List[str]:
+        """Return enabled contacts having all the given type flags.
+
+        ### Arguments:
+        * flags: int - Contact type mask, for example `EMAIL | NOTIFICATIONS`.
+
+        ### Returns:
+        List[str] - Contact values.
+        """
+        return [
+            contact
+            for contact, ctype in self.contacts
+            if ctype & flags == flags and ctype & _Keys.CONTACT_DISABLED == 0
+        ]
+
+    def cutoff_days(self, now: float, default_paytime: int, cutoff_time: int) -> int:
+        """Return the number of days left until the service is blocked.
+
+        ### Arguments:
+        * now: float - Current Unix timestamp.
+        * default_paytime: int - Payment term used when none is set.
+        * cutoff_time: int - Days after the payment term to the cutoff.
+
+        ### Returns:
+        int - Days left.
+        """
+        deadline: int = self.deadline(default_paytime)
+        return int(((deadline + cutoff_time + 1) * DAY - (now - self.debt_time)) // DAY)
+
+    def deadline(self, default_paytime: int) -> int:
+        """Return the payment term in days.
+
+        ### Arguments:
+        * default_paytime: int - Payment term used when none is set.
+
+        ### Returns:
+        int - Days from the document creation to the payment deadline.
+        """
+        return self.pay_time if self.pay_time > -1 else default_paytime
+
+    def reminder_day(
+        self, now: float, default_paytime: int, cutoff_time: int
+    ) -> Optional[int]:
+        """Return the day of the reminder window the customer is in.
+
+        ### Arguments:
+        * now: float - Current Unix timestamp.
+        * default_paytime: int - Payment term used when none is set.
+        * cutoff_time: int - Days after the payment term to the cutoff.
+
+        ### Returns:
+        Optional[int] - Days since the payment deadline, `None` for customers
+        without debt, before the deadline, or after the cutoff.
+        """
+        if self.balance >= 0 or self.debt_time == 0:
+            return None
+        elapsed: float = now - self.debt_time
+        deadline: int = self.deadline(default_paytime) * DAY
+        if elapsed < deadline or elapsed > deadline + cutoff_time * DAY:
+            return None
+        return int((elapsed - deadline) // DAY)
+
+
+class LmsPaymentScanner(BData):
+    """Stream LMS customers in batches with their related rows.
+
+    Customers are read from one server-side cursor in `batch_size` partitions.
+    Balances come from the incrementally refreshed `BalanceIndex`; for every
+    partition the contacts, nodes, and tariff assignments are loaded with one
+    `IN` query each over a second pooled connection, instead of lazy loading
+    them per customer.
+    """
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(
+        self,
+        pool: SqlEnginePool,
+        batch_size: int = 500,
+        skip_groups: Optional[List[int]] = None,
+        index: Optional[BalanceIndex] = None,
+    ) -> None:
+        """Initialize the scanner.
+
+        ### Arguments:
+        * pool: SqlEnginePool - Database engine pool.
+        * batch_size: int - Customers fetched and completed at a time.
+        * skip_groups: Optional[List[int]] - LMS customer groups to skip.
+        * index: Optional[BalanceIndex] - Balance index, a new one when `None`.
+        """
+        self._set_data(key=_Keys.POOL, value=pool, set_default_type=SqlEnginePool)
+        self._set_data(
+            key=_Keys.INDEX,
+            value=index if index is not None else BalanceIndex(),
+            set_default_type=BalanceIndex,
+        )
+        self._set_data(
+            key=_Keys.BATCH, value=max(1, int(batch_size)), set_default_type=int
+        )
+        self._set_data(
+            key=_Keys.SKIP,
+            value=[int(item) for item in skip_groups or [] if str(item).strip()],
+            set_default_type=List,
+        )
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def index(self) -> BalanceIndex:
+        """Return the customer balance index.
+
+        ### Returns:
+        BalanceIndex - Balance index.
+        """
+        return self._get_data(key=_Keys.INDEX)  # type: ignore
+
+    @property
+    def pool(self) -> SqlEnginePool:
+        """Return the database engine pool.
+
+        ### Returns:
+        SqlEnginePool - Engine pool.
+        """
+        return self._get_data(key=_Keys.POOL)  # type: ignore
+
+    # #[PUBLIC METHODS]###############################################################
+    def customers(self) -> Iterator[List[LmsCustomer]]:
+        """Stream all active customers outside the skipped groups.
+
+        ### Returns:
+        Iterator[List[LmsCustomer]] - Customer batches in id order.
+        """
+        return self.__batches(self.__select())
+
+    def indebted(self) -> Iterator[List[LmsCustomer]]:
+        """Stream customers with a negative balance who accept mailings.
+
+        ### Returns:
+        Iterator[List[LmsCustomer]] - Customer batches in id order.
+        """
+        return self.__batches(
+            self.__select().where(_CUSTOMERS.c.mailingnotice == 1), debtors=True
+        )
+
+    # #[PRIVATE METHODS]##############################################################
+    def __batches(
+        self, query: Select, debtors: bool = False
+    ) -> Iterator[List[LmsCustomer]]:
+        """Stream a customer query and complete every partition.
+
+        ### Arguments:
+        * query: Select - Customer query.
+        * debtors: bool - Keep only customers with a negative balance.
+
+        ### Returns:
+        Iterator[List[LmsCustomer]] - Non-empty customer batches.
+        """
+        size: int = self._get_data(key=_Keys.BATCH)  # type: ignore
+        index: BalanceIndex = self.index
+        # the streaming cursor occupies its connection until it is exhausted
+        with self.pool.connect() as stream, self.pool.connect() as lookup:
+            index.refresh(lookup)
+            result = stream.execute(
+                query.order_by(_CUSTOMERS.c.id).execution_options(
+                    stream_results=True, yield_per=size
+                )
+            )
+            for rows in result.partitions():
+                batch: Dict[int, LmsCustomer] = {}
+                for row in rows:
+                    account: CustomerBalance = index.get(row.id)
+                    if debtors and account.balance >= 0:
+                        continue
+                    batch[row.id] = LmsCustomer(
+                        id=row.id,
+                        name=row.name,
+                        lastname=row.lastname,
+                        pin=row.pin,
+                        paytime=row.paytime,
+                        account=account,
+                    )
+                if not batch:
+                    continue
+                self.__load(lookup, batch)
+                yield list(batch.values())
+
+    def __load(self, connection: Connection, batch: Dict[int, LmsCustomer]) -> None:
+        """Load related rows of one batch with one query per table.
+
+        ### Arguments:
+        * connection: Connection - Lookup connection.
+        * batch: Dict[int, LmsCustomer] - Customers by id.
+        """
+        ids: List[int] = list(batch)
+        for row in connection.execute(
+            select(
+                _CUSTOMER_CONTACTS.c.customerid,
+                _CUSTOMER_CONTACTS.c.contact,
+                _CUSTOMER_CONTACTS.c.type,
+            ).where(_CUSTOMER_CONTACTS.c.customerid.in_(ids))
+        ):
+            batch[row.customerid].contacts.append((row.contact, int(row.type or 0)))
+        for row in connection.execute(
+            select(_NODES.c.ownerid, func.count(), func.sum(_NODES.c.access))
+            .where(_NODES.c.ownerid.in_(ids))
+            .group_by(_NODES.c.ownerid)
+        ):
+            batch[row[0]].nodes = int(row[1])
+            batch[row[0]].active_nodes = int(row[2] or 0)
+        for row in connection.execute(
+            select(_ASSIGNMENTS.c.customerid, func.count())
+            .select_from(
+                _ASSIGNMENTS.join(_TARIFFS, _ASSIGNMENTS.c.tariffid == _TARIFFS.c.id)
+            )
+            .where(_ASSIGNMENTS.c.customerid.in_(ids))
+            .group_by(_ASSIGNMENTS.c.customerid)
+        ):
+            batch[row[0]].tariffs = int(row[1])
+
+    def __select(self) -> Select:
+        """Return the base query of active customers outside skipped groups.
+
+        ### Returns:
+        Select - Customer query.
+        """
+        query: Select = select(
+            _CUSTOMERS.c.id,
+            _CUSTOMERS.c.name,
+            _CUSTOMERS.c.lastname,
+            _CUSTOMERS.c.pin,
+            _CUSTOMERS.c.paytime,
+        ).where(_CUSTOMERS.c.deleted == 0)
+        skip: List[int] = self._get_data(key=_Keys.SKIP)  # type: ignore
+        if skip:
+            query = query.where(
+                _CUSTOMERS.c.id.not_in(
+                    select(_CUSTOMER_ASSIGNMENTS.c.customerid).where(
+                        _CUSTOMER_ASSIGNMENTS.c.customergroupid.in_(skip)
+                    )
+                )
+            )
+        return query
+
+
+class DiagnosticReport(BData):
+    """Collect diagnostic table rows while customers are streamed."""
+
+    STYLE: str = """<style>
+body { font-size: 8pt; font-family: Tahoma, Verdana, Arial, Helvetica; background-color: #EBE4D6; margin: 0; padding: 0; vertical-align: middle; }
+h1 { font-size: 14pt; font-family: Tahoma, Verdana, Arial, Helvetica; }
+table { border-collapse: collapse; border-color: #000000 }
+td { font-size: 8pt; font-family: Tahoma, Verdana, Arial, Helvetica; vertical-align: middle; border-color: black; }
+th { background-color: black; color: white; }
+th, td { text-align: left; padding: 2px; }
+tr:nth-child(even){background-color: #DFD5BD}
+a { text-decoration: none; vertical-align: baseline; }
+a:link { color: #800000; }
+a:visited { color: #800000; }
+a:hover { text-decoration: underline; color: #336600; }
+div.centered { text-align: center; }
+div.centered table { margin: 0 auto; text-align: left; }
+</style>"""
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self, lms_url: str = "") -> None:
+        """Initialize empty report tables.
+
+        ### Arguments:
+        * lms_url: str - Customer panel URL prefix, the id is appended.
+        """
+        self._set_data(key=_Keys.URL, value=lms_url or "", set_default_type=str)
+        self._set_data(key=_Keys.DEBT, value=[], set_default_type=List)
+        self._set_data(key=_Keys.CONTACT, value=[], set_default_type=List)
+        self._set_data(key=_Keys.TARIFF, value=[], set_default_type=List)
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def size(self) -> int:
+        """Return the number of collected rows.
+
+        ### Returns:
+        int - Rows in all tables.
+        """
+        return sum(
+            len(self._get_data(key=key))  # type: ignore
+            for key in (_Keys.DEBT, _Keys.CONTACT, _Keys.TARIFF)
+        )
+
+    # #[PUBLIC METHODS]###############################################################
+    def add_contact(self, customer: LmsCustomer) -> None:
+        """Add a customer with services but without a usable contact.
+
+        ### Arguments:
+        * customer: LmsCustomer - Customer.
+        """
+        self.__add(_Keys.CONTACT, customer, [""])
+
+    def add_debt(self, customer: LmsCustomer, now: float) -> None:
+        """Add a customer with an outdated debt.
+
+        ### Arguments:
+        * customer: LmsCustomer - Customer.
+        * now: float - Current Unix timestamp.
+        """
+        info: List[str] = []
+        if not customer.contacts_with(_Keys.CONTACT_EMAIL):
+            info.append("brak email")
+        elif not customer.contacts_with(
+            _Keys.CONTACT_EMAIL | _Keys.CONTACT_NOTIFICATIONS
+        ):
+            info.append("brak zgody email")
+        if not customer.has_active_node:
+            info.append("blokada")
+        if not customer.tariffs:
+            info.append("brak taryf")
+        elapsed: int = int(now - customer.debt_time)
+        self.__add(
+            _Keys.DEBT,
+            customer,
+            [
+                f"{customer.balance:.2f}",
+                f"{elapsed // DAY} dni, "
+                f"{MDateTime.elapsed_time_from_seconds(elapsed % DAY)}",
+                ", ".join(info),
+            ],
+        )
+
+    def add_tariff(self, customer: LmsCustomer) -> None:
+        """Add a customer without tariffs.
+
+        ### Arguments:
+        * customer: LmsCustomer - Customer.
+        """
+        self.__add(
+            _Keys.TARIFF,
+            customer,
+            ["aktywna usługa" if customer.has_active_node else ""],
+        )
+
+    def messages(self, channel: int, prefix: str) -> List[Message]:
+        """Return one HTML message per non-empty table.
+
+        ### Arguments:
+        * channel: int - Diagnostic channel.
+        * prefix: str - Subject prefix.
+
+        ### Returns:
+        List[Message] - Report messages.
+        """
+        out: List[Message] = []
+        for key, subject, title, columns in (
+            (
+                _Keys.DEBT,
+                "Klienci zadłużeni powyżej 30 dni.",
+                "Wykaz klientów z przedawnionym zadłużeniem.",
+                ["bilans", "od", "uwagi"],
+            ),
+            (
+                _Keys.CONTACT,
+                "Klienci bez zgody na kontakt.",
+                "Wykaz klientów do sprawdzenia zgód kontaktowych.",
+                ["uwagi"],
+            ),
+            (
+                _Keys.TARIFF,
+                "Klienci bez taryf.",
+                "Wykaz klientów bez przypisanych taryf.",
+                ["uwagi"],
+            ),
+        ):
+            rows: List[str] = self._get_data(key=key)  # type: ignore
+            if not rows:
+                continue
+            header: str = "".join(
+                f"<th>{item}:</th>" for item in ["nr", "cid", "nazwa"] + columns
+            )
+            message = Message()
+            message.channel = int(channel)
+            message.subject = f"{prefix} {subject}".strip()
+            message.mmessages = {
+                Multipart.HTML: [
+                    "<html>",
+                    "<head></head>",
+                    "<body>",
+                    self.STYLE,
+                    f"<div class='centered'><h1>{title}</h1></div>",
+                    "<div class='centered'>",
+                    "<table>",
+                    f"<tr>{header}</tr>",
+                    *rows,
+                    f"<tr><td colspan='{len(columns) + 3}'><hr></td></tr>",
+                    "</table>",
+                    "</div>",
+                    "</body>",
+                    "</html>",
+                ]
+            }
+            out.append(message)
+        return out
+
+    # #[PRIVATE METHODS]##############################################################
+    def __add(self, key: str, customer: LmsCustomer, cells: List[str]) -> None:
+        """Append one table row.
+
+        ### Arguments:
+        * key: str - Table key.
+        * customer: LmsCustomer - Customer.
+        * cells: List[str] - Cells following the number, id, and name.
+        """
+        rows: List[str] = self._get_data(key=key)  # type: ignore
+        url: str = self._get_data(key=_Keys.URL)  # type: ignore
+        rows.append(
+            f"<tr><td>{len(rows) + 1}</td>"
+            f"<td><a href='{url}{customer.id}'>{customer.id}</a></td>"
+            f"<td>{customer.name} {customer.lastname}</td>"
+            + "".join(f"<td>{item}</td>" for item in cells)
+            + "</tr>"
+        )
+
+
+class _Runtime(Thread, ThPluginMixin):
+    """Send payment reminders and diagnostic reports on `at_channel` times."""
+
+    TEMPLATE: str = """Szanowni Państwo,
+
+saldo na koncie na dzień {current_date} wynosi: {debt} PLN.
+Prosimy o pilną weryfikację salda oraz uregulowanie należności.
+
+Informujemy, że w przypadku nieuregulowania należności lub braku
+kontaktu z biurem obsługi klienta w sprawie przedłużenia terminu
+płatności, usługa dostępu do internetu zostanie zablokowana
+automatycznie za {cutoff} {cutoff_suffix}.
+
+Późniejsze odblokowani usługi będzie możliwe po zaksięgowaniu
+środków na naszym koncie bankowym.
+
+Adres panelu użytkownika:
+{user_url}
+
+Dane do zalogowania dla '{customer_name}':
+ID klienta: {customer_id}
+PIN: {customer_pin}
+
+{footer}
+"""
+
+    _notifications: Optional[NotificationScheduler] = None
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self, context: PluginContext) -> None:
+        """Initialize the payment reminder worker runtime.
+
+        ### Arguments:
+        * context: PluginContext - Plugin runtime context.
+        """
+        Thread.__init__(self, name=context.instance_name)
+        self.daemon = True
+        self._context: PluginContext = context
+        self._health = PluginHealthSnapshot(health=PluginHealth.UNKNOWN)
+        self._notifications = NotificationScheduler(
+            at_channel=list(context.config.get(PluginCommonKeys.AT_CHANNEL) or [])
+        )
+        self._stop_event = Event()
+        self._state = PluginStateSnapshot(state=PluginState.CREATED)
+        self._set_data(
+            key=_Keys.SCANNER,
+            value=None,
+            set_default_type=Optional[LmsPaymentScanner],
+        )
+
+    def initialize(self) -> None:
+        """Prepare the engine pool; connections are opened on first use."""
+        config: Mapping[str, Any] = self._context.config  # type: ignore
+        pool: SqlEnginePool = SqlEnginePool.from_servers(
+            [str(item) for item in config.get(_Keys.SQL_SERVER) or []],
+            str(config.get(_Keys.SQL_DATABASE) or ""),
+            str(config.get(_Keys.SQL_USER) or ""),
+            self.__password(),
+        )
+        self._set_data(
+            key=_Keys.SCANNER,
+            value=LmsPaymentScanner(
+                pool,
+                batch_size=int(config.get(_Keys.BATCH_SIZE) or 500),
+                skip_groups=config.get(_Keys.SKIP_GROUPS),
+                index=BalanceIndex(
+                    rebuild_period=MIntervals(self._c_name).convert(
+                        str(config.get(_Keys.BALANCE_REBUILD) or "1d")
+                    )
+                ),
+            ),
+        )
+        self._state = PluginStateSnapshot(state=PluginState.INITIALIZED)
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def scanner(self) -> Optional[LmsPaymentScanner]:
+        """Return the customer scanner.
+
+        ### Returns:
+        Optional[LmsPaymentScanner] - Scanner or `None` before `initialize()`.
+        """
+        return self._get_data(key=_Keys.SCANNER)
+
+    # #[PUBLIC METHODS]################################################################
+    def cycle(
+        self, channels: Optional[List[int]] = None, now: Optional[float] = None
+    ) -> bool:
+        """Run the reports and reminders of the due channels.
+
+        ### Arguments:
+        * channels: Optional[List[int]] - Channels to serve, the channels due
+          by `at_channel` when `None`.
+        * now: Optional[float] - Current Unix timestamp, for tests.
+
+        ### Returns:
+        bool - `True` when every query completed.
+        """
+        context: PluginContext = self._context  # type: ignore
+        scanner: Optional[LmsPaymentScanner] = self.scanner
+        if scanner is None:
+            return False
+        if channels is None:
+            channels = (
+                self._notifications.due_channels() if self._notifications else []
+            )
+        if now is None:
+            now = time.time()
+        ok: bool = True
+        for channel in channels:
+            try:
+                if channel in self.__channels(_Keys.DIAG_CHANNEL):
+                    self.__verify(scanner, channel, now)
+                if channel in self.__channels(PluginCommonKeys.MESSAGE_CHANNEL):
+                    self.__remind(scanner, channel, now)
+            except SQLAlchemyError as ex:
+                context.logger.message_error = (
+                    f"LMS query for channel {channel} failed: {ex}"
+                )
+                ok = False
+        for item in scanner.pool.errors:
+            context.logger.message_warning = item
+        scanner.pool.errors.clear()
+        if channels and context.debug:
+            context.logger.message_debug = (
+                f"active SQL server index: {scanner.pool.active}, "
+                f"failovers: {scanner.pool.failovers}, indexed balances: "
+                f"{scanner.index.size} up to cash id {scanner.index.last_id}"
+            )
+        return ok
+
+    def health(self) -> PluginHealthSnapshot:
+        """Return the current health snapshot.
+
+        ### Returns:
+        PluginHealthSnapshot - Current plugin health snapshot.
+        """
+        health: Optional[PluginHealthSnapshot] = self._health
+        if health is None:
+            return PluginHealthSnapshot(
+                health=PluginHealth.UNKNOWN,
+                message="Health snapshot is not initialized.",
+            )
+        return health
+
+    def run(self) -> None:
+        """Check the `at_channel` schedule once a minute until stopped."""
+        stop_event: Optional[Event] = self._stop_event
+        if stop_event is None or self.scanner is None:
+            self._health = PluginHealthSnapshot(
+                health=PluginHealth.UNHEALTHY,
+                last_error_at=int(time.time()),
+                message="Runtime is not initialized.",
+            )
+            self._state = PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Runtime is not initialized.",
+                stopped_at=int(time.time()),
+            )
+            return None
+        while not stop_event.is_set():
+            channels: List[int] = (
+                self._notifications.due_channels() if self._notifications else []
+            )
+            if channels:
+                started: float = time.monotonic()
+                ok: bool = self.cycle(channels)
+                self._health = PluginHealthSnapshot(
+                    health=PluginHealth.HEALTHY if ok else PluginHealth.DEGRADED,
+                    last_error_at=None if ok else int(time.time()),
+                    last_ok_at=int(time.time()) if ok else None,
+                    message=(
+                        f"Served channels {channels} in "
+                        f"{time.monotonic() - started:.2f}s."
+                    ),
+                )
+            # wake up once in every minute matched by `at_channel`
+            stop_event.wait(61.0 - time.time() % 60)
+
+    def start(self) -> None:
+        """Start the runtime thread."""
+        self._state = PluginStateSnapshot(
+            state=PluginState.STARTING,
+            started_at=int(time.time()),
+        )
+        Thread.start(self)
+
+    def state(self) -> PluginStateSnapshot:
+        """Return the current lifecycle snapshot.
+
+        ### Returns:
+        PluginStateSnapshot - Current plugin lifecycle snapshot.
+        """
+        state: Optional[PluginStateSnapshot] = self._state
+        if state is None:
+            return PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Lifecycle snapshot is not initialized.",
+            )
+        if self.is_alive() and state.state == PluginState.STARTING:
+            state = PluginStateSnapshot(
+                state=PluginState.RUNNING,
+                started_at=state.started_at,
+            )
+            self._state = state
+        return state
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Request plugin shutdown.
+
+        ### Arguments:
+        * timeout: Optional[float] - Optional join timeout.
+        """
+        stop_event: Optional[Event] = self._stop_event
+        state: Optional[PluginStateSnapshot] = self._state
+        if stop_event is None:
+            self._state = PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Stop event is not initialized.",
+                stopped_at=int(time.time()),
+            )
+            return None
+        if state is not None and state.state not in (
+            PluginState.STOPPED,
+            PluginState.FAILED,
+        ):
+            self._state = PluginStateSnapshot(
+                state=PluginState.STOPPING,
+                started_at=state.started_at,
+            )
+        stop_event.set()
+        if self.is_alive():
+            self.join(timeout=timeout)
+        scanner: Optional[LmsPaymentScanner] = self.scanner
+        if scanner is not None:
+            scanner.pool.dispose()
+        self._state = PluginStateSnapshot(
+            state=PluginState.STOPPED,
+            started_at=state.started_at if state is not None else None,
+            stopped_at=int(time.time()),
+        )
+
+    # #[PRIVATE METHODS]###############################################################
+    def __channels(self, key: str) -> List[int]:
+        """Return channel identifiers configured under `key`.
+
+        ### Arguments:
+        * key: str - Config key with a channel list.
+
+        ### Returns:
+        List[int] - Channel identifiers.
+        """
+        context: PluginContext = self._context  # type: ignore
+        return [
+            int(item) for item in context.config.get(key) or [] if str(item).strip()
+        ]
+
+    def __footer(self) -> str:
+        """Return `message_footer` as plain text.
+
+        ### Returns:
+        str - Footer lines.
+        """
+        context: PluginContext = self._context  # type: ignore
+        footer: Any = context.config.get(_Keys.MSG_FOOTER)
+        if isinstance(footer, (list, tuple)):
+            return "\n".join(str(item) for item in footer)
+        return str(footer).replace("<br>", "\n") if footer else ""
+
+    def __password(self) -> str:
+        """Return `sql_password` decrypted by the host.
+
+        ### Returns:
+        str - Plain text password.
+        """
+        context: PluginContext = self._context  # type: ignore
+        return context.secret(_Keys.SQL_PASS) or ""
+
+    def __remind(self, scanner: LmsPaymentScanner, channel: int, now: float) -> None:
+        """Publish reminders batch by batch while customers are streamed.
+
+        ### Arguments:
+        * scanner: LmsPaymentScanner - Customer scanner.
+        * channel: int - Customer message channel.
+        * now: float - Current Unix timestamp.
+        """
+        context: PluginContext = self._context  # type: ignore
+        config: Mapping[str, Any] = context.config
+        default_paytime: int = int(config.get(_Keys.DEF_PAY_TIME) or 0)
+        cutoff_time: int = int(config.get(_Keys.CUTOFF) or 0)
+        days: List[int] = [
+            int(item)
+            for item in config.get(_Keys.MSG_NOTIFY) or []
+            if str(item).strip()
+        ]
+        if not days:
+            return None
+        footer: str = self.__footer()
+        sent: int = 0
+        dropped: int = 0
+        for batch in scanner.indebted():
+            for customer in batch:
+                if (
+                    customer.reminder_day(now, default_paytime, cutoff_time)
+                    not in days
+                    or not customer.tariffs
+                    or customer.has_active_node is None
+                ):
+                    continue
+                emails: List[str] = customer.contacts_with(
+                    _Keys.CONTACT_EMAIL | _Keys.CONTACT_NOTIFICATIONS
+                )
+                if not emails:
+                    continue
+                cutoff: int = customer.cutoff_days(now, default_paytime, cutoff_time)
+                message = Message()
+                message.channel = int(channel)
+                message.subject = (
+                    f"{config.get(_Keys.SUBJECT_PREFIX) or ''} "
+                    "Informacja o zaległej płatności."
+                ).strip()
+                message.messages = self.TEMPLATE.format(
+                    current_date=MDateTime.date_now(),
+                    debt=f"{customer.balance:.2f}",
+                    cutoff=cutoff,
+                    cutoff_suffix="dzień" if cutoff == 1 else "dni",
+                    user_url=config.get(_Keys.USER_URL) or "",
+                    customer_name=customer.full_name,
+                    customer_id=customer.id,
+                    customer_pin=customer.pin,
+                    footer=footer,
+                )
+                message.to = emails
+                if context.dispatcher.publish(message):
+                    sent += 1
+                    context.logger.message_notice = (
+                        f"add message for customer: {customer.id} about balance: "
+                        f"{customer.balance:.2f}"
+                    )
+                else:
+                    dropped += 1
+        if dropped:
+            context.logger.message_warning = (
+                f"{dropped} payment reminders dropped by the publish rate limit"
+            )
+        if context.debug:
+            context.logger.message_debug = (
+                f"sent {sent} payment reminders to channel {channel}"
+            )
+
+    def __verify(self, scanner: LmsPaymentScanner, channel: int, now: float) -> None:
+        """Publish the diagnostic report of all customers.
+
+        ### Arguments:
+        * scanner: LmsPaymentScanner - Customer scanner.
+        * channel: int - Diagnostic channel.
+        * now: float - Current Unix timestamp.
+        """
+        context: PluginContext = self._context  # type: ignore
+        config: Mapping[str, Any] = context.config
+        report = DiagnosticReport(str(config.get(_Keys.LMS_URL) or ""))
+        for batch in scanner.customers():
+            for customer in batch:
+                if (
+                    customer.balance < 0
+                    and customer.debt_time > 0
+                    and now - customer.debt_time > 30 * DAY
+                ):
+                    report.add_debt(customer, now)
+                if customer.tariffs and customer.has_active_node is not None:
+                    if not customer.contacts_with(
+                        _Keys.CONTACT_EMAIL | _Keys.CONTACT_NOTIFICATIONS
+                    ) and not customer.contacts_with(
+                        _Keys.CONTACT_MOBILE | _Keys.CONTACT_NOTIFICATIONS
+                    ):
+                        report.add_contact(customer)
+                elif not customer.tariffs:
+                    report.add_tariff(customer)
+        for message in report.messages(
+            channel, str(config.get(_Keys.SUBJECT_PREFIX) or "")
+        ):
+            message.diagnostic_source = self._c_name
+            context.dispatcher.publish(message)
+
+
+def get_plugin_spec() -> PluginSpec:
+    """Return the plugin spec for `lmspayment`.
+
+    ### Returns:
+    PluginSpec - Plugin manifest.
+    """
+    schema = PluginConfigSchema(
+        title="LMS payment reminder worker plugin.",
+        description=(
+            "Sends overdue payment reminders to LMS customers and diagnostic "
+            "reports for the customer service office. Requires the packages "
+            "listed in the plugin `requirements.txt`."
+        ),
+        fields=[
+            PluginConfigField(
+                name=PluginCommonKeys.AT_CHANNEL,
+                field_type=list,
+                default=["1:0;0;7|10|12|13;*;*", "1:0;8|12|16|21;14;*;*"],
+                required=True,
+                description=(
+                    "Schedules in `channel:minute;hour;day-month;month;day-week` "
+                    "format; `*`, ranges `a-b`, and `|` lists are allowed."
+                ),
+            ),
+            PluginConfigField(
+                name=_Keys.DIAG_CHANNEL,
+                field_type=list,
+                default=[],
+                required=False,
+                description="Channels receiving the diagnostic reports.",
+            ),
+            PluginConfigField(
+                name=PluginCommonKeys.MESSAGE_CHANNEL,
+                field_type=list,
+                default=[1],
+                required=True,
+                description="Channels receiving the customer reminders.",
+            ),
+            PluginConfigField(
+                name=_Keys.MSG_NOTIFY,
+                field_type=list,
+                default=[],
+                required=True,
+                description="Days after the payment deadline on which reminders are sent.",
+            ),
+            PluginConfigField(
+                name=_Keys.DEF_PAY_TIME,
+                field_type=int,
+                default=7,
+                required=True,
+                description="Default payment term in days from the invoice date.",
+            ),
+            PluginConfigField(
+                name=_Keys.CUTOFF,
+                field_type=int,
+                default=14,
+                required=True,
+                description="Days after the payment term after which the service is blocked.",
+            ),
+            PluginConfigField(
+                name=_Keys.SKIP_GROUPS,
+                field_type=list,
+                default=[],
+                required=False,
+                description="LMS customer group ids to skip.",
+            ),
+            PluginConfigField(
+                name=_Keys.SQL_SERVER,
+                field_type=list,
+                default=[],
+                required=True,
+                description="LMS database servers in failover order.",
+            ),
+            PluginConfigField(
+                name=_Keys.SQL_DATABASE,
+                field_type=str,
+                default="",
+                required=True,
+                description="LMS database name.",
+            ),
+            PluginConfigField(
+                name=_Keys.SQL_USER,
+                field_type=str,
+                default="",
+                required=True,
+                description="Database user name.",
+            ),
+            PluginConfigField(
+                name=_Keys.SQL_PASS,
+                field_type=str,
+                default="",
+                required=True,
+                secret=True,
+                description="Database password encrypted with `aasd.py -p`.",
+            ),
+            PluginConfigField(
+                name=_Keys.BATCH_SIZE,
+                field_type=int,
+                default=500,
+                required=False,
+                description="Customers fetched from the server-side cursor at a time.",
+            ),
+            PluginConfigField(
+                name=_Keys.BALANCE_REBUILD,
+                field_type=str,
+                default="1d",
+                required=False,
+                description=(
+                    "Time between full balance replays, seconds or `s|m|h|d|w`; "
+                    "new `cash` rows are applied incrementally in between."
+                ),
+            ),
+            PluginConfigField(
+                name=_Keys.LMS_URL,
+                field_type=str,
+                default="",
+                required=False,
+                description="Customer information URL, usually `https://domain/?m=customerinfo&id=`.",
+            ),
+            PluginConfigField(
+                name=_Keys.USER_URL,
+                field_type=str,
+                default="",
+                required=False,
+                description="Customer panel URL included in reminders.",
+            ),
+            PluginConfigField(
+                name=_Keys.SUBJECT_PREFIX,
+                field_type=str,
+                default="[AIR-NET]",
+                required=False,
+                description="Prefix of reminder and report subjects.",
+            ),
+            PluginConfigField(
+                name=_Keys.MSG_FOOTER,
+                field_type=list,
+                default=[],
+                required=False,
+                description="Footer lines added to reminders.",
+            ),
+        ],
+    )
+    return PluginSpec(
+        api_version=1,
+        config_schema=schema,
+        plugin_id="aasd.lmspayment",
+        plugin_kind=PluginKind.WORKER,
+        plugin_name="lmspayment",
+        runtime_factory=_Runtime,
+        description="LMS payment reminder worker with streamed batch queries.",
+    )
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,1003 @@
+# -*- coding: UTF-8 -*-
+"""
+LMS tariff verification worker plugin.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Report nodes whose tariff assignment state changed in LMS.
+
+WWW: https://lms.org.pl/
+"""
+
+import heapq
+import time
+
+from dataclasses import dataclass
+from threading import Event, Thread
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    Select,
+    String,
+    Subquery,
+    Table,
+    func,
+    select,
+)
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SQLAlchemyError
+
+from jsktoolbox.attribtool import ReadOnlyClass
+from jsktoolbox.basetool import BData
+
+from libs.com.message import Message
+from libs.plugins import (
+    NotificationScheduler,
+    PluginCommonKeys,
+    PluginContext,
+    PluginHealth,
+    PluginHealthSnapshot,
+    PluginKind,
+    PluginSpec,
+    PluginState,
+    PluginStateSnapshot,
+    ThPluginMixin,
+)
+from libs.templates import PluginConfigField, PluginConfigSchema
+from libs.tools import SqlEnginePool
+
+
+class _Keys(object, metaclass=ReadOnlyClass):
+    """Plugin configuration and internal storage keys."""
+
+    # config keys
+    SQL_DATABASE: str = "sql_database"
+    SQL_PASS: str = "sql_password"
+    SQL_SERVER: str = "sql_server"
+    SQL_USER: str = "sql_user"
+    SUBJECT_PREFIX: str = "subject_prefix"
+
+    # internal keys
+    ASSIGNMENT_NODES: str = "__assignment_nodes__"
+    ASSIGNMENTS: str = "__assignments__"
+    BOUNDARIES: str = "__boundaries__"
+    CHANGES: str = "__changes__"
+    CUSTOMER_ASSIGNMENTS: str = "__customer_assignments__"
+    CUSTOMER_NODES: str = "__customer_nodes__"
+    FINGERPRINTS: str = "__fingerprints__"
+    INDEX: str = "__index__"
+    MARKS: str = "__marks__"
+    NODE_ASSIGNMENTS: str = "__node_assignments__"
+    NODES: str = "__nodes__"
+    POOL: str = "__pool__"
+    RESYNCS: str = "__resyncs__"
+    SYNCED: str = "__synced__"
+
+
+class TariffState(object, metaclass=ReadOnlyClass):
+    """Tariff state codes of a node."""
+
+    ACTIVE: int = 0
+    SUSPENDED: int = 1
+    INACTIVE: int = 2
+    NONE: int = 3
+
+    NAMES: Tuple[str, ...] = ("active", "suspended", "inactive", "no tariff")
+
+
+# Only the LMS columns used by the plugin; the schema itself belongs to LMS.
+LMS_METADATA = MetaData()
+
+_ASSIGNMENTS = Table(
+    "assignments",
+    LMS_METADATA,
+    Column("id", Integer, primary_key=True),
+    Column("customerid", Integer, nullable=False),
+    Column("tariffid", Integer),
+    Column("liabilityid", Integer),
+    Column("period", Integer, nullable=False, default=3),
+    Column("datefrom", Integer, nullable=False, default=0),
+    Column("dateto", Integer, nullable=False, default=0),
+    Column("suspended", Integer, nullable=False, default=0),
+    Column("commited", Integer, nullable=False, default=1),
+)
+_NODE_ASSIGNMENTS = Table(
+    "nodeassignments",
+    LMS_METADATA,
+    Column("id", Integer, primary_key=True),
+    Column("nodeid", Integer, nullable=False),
+    Column("assignmentid", Integer, nullable=False),
+)
+_NODES = Table(
+    "nodes",
+    LMS_METADATA,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(32), nullable=False, default=""),
+    Column("ownerid", Integer),
+    Column("access", Integer, nullable=False, default=1),
+    Column("moddate", Integer, nullable=False, default=0),
+)
+
+
+@dataclass(slots=True)
+class NodeRow:
+    """Store the indexed columns and the last evaluated state of a node."""
+
+    name: str
+    owner: int
+    access: int
+    state: Optional[int] = None
+
+
+@dataclass(slots=True)
+class AssignmentRow:
+    """Store the indexed columns of a recurring tariff assignment."""
+
+    customer: int
+    datefrom: int
+    dateto: int
+    suspended: int
+
+    # #[PUBLIC METHODS]###############################################################
+    def valid(self, now: float) -> bool:
+        """Check whether the assignment period covers `now`.
+
+        ### Arguments:
+        * now: float - Unix timestamp.
+
+        ### Returns:
+        bool - `True` when the assignment is in force.
+        """
+        return self.datefrom <= now and (self.dateto == 0 or self.dateto > now)
+
+
+@dataclass(frozen=True, slots=True)
+class TariffTransition:
+    """Describe one node changing its tariff state."""
+
+    node_id: int
+    name: str
+    customer_id: int
+    access: int
+    old: Optional[int]
+    new: int
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def text(self) -> str:
+        """Return the transition as one report line.
+
+        ### Returns:
+        str - Human-readable transition.
+        """
+        old: str = "new node" if self.old is None else TariffState.NAMES[self.old]
+        return (
+            f"node {self.name} (#{self.node_id}, customer #{self.customer_id}, "
+            f"access {'on' if self.access else 'off'}): "
+            f"{old} -> {TariffState.NAMES[self.new]}"
+        )
+
+
+class TariffIndex(BData):
+    """Keep the tariff state of LMS nodes up to date from changed rows.
+
+    The first sync loads nodes, recurring assignments, and node links once.
+    Later syncs read only rows above the high-water marks: new ids of the
+    three tables and nodes with a newer `moddate`. LMS does not stamp edits
+    and deletions of assignments and links, so every sync compares cheap
+    per-table count/sum fingerprints with the index and reloads only when
+    they differ. Assignment start and end dates are kept in a heap, so only
+    nodes whose assignment period boundary passed are evaluated again.
+    """
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._set_data(key=_Keys.ASSIGNMENT_NODES, value={}, set_default_type=Dict)
+        self._set_data(key=_Keys.ASSIGNMENTS, value={}, set_default_type=Dict)
+        self._set_data(key=_Keys.BOUNDARIES, value=[], set_default_type=List)
+        self._set_data(key=_Keys.CHANGES, value=0, set_default_type=int)
+        self._set_data(key=_Keys.CUSTOMER_ASSIGNMENTS, value={}, set_default_type=Dict)
+        self._set_data(key=_Keys.CUSTOMER_NODES, value={}, set_default_type=Dict)
+        self._set_data(key=_Keys.FINGERPRINTS, value={}, set_default_type=Dict)
+        self._set_data(key=_Keys.MARKS, value={}, set_default_type=Dict)
+        self._set_data(key=_Keys.NODE_ASSIGNMENTS, value={}, set_default_type=Dict)
+        self._set_data(key=_Keys.NODES, value={}, set_default_type=Dict)
+        self._set_data(key=_Keys.RESYNCS, value=0, set_default_type=int)
+        self._set_data(key=_Keys.SYNCED, value=False, set_default_type=bool)
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def changes(self) -> int:
+        """Return the number of rows read by the last sync.
+
+        ### Returns:
+        int - Changed rows, or all rows after a full load.
+        """
+        return self._get_data(key=_Keys.CHANGES)  # type: ignore
+
+    @property
+    def resyncs(self) -> int:
+        """Return the number of full reloads forced by fingerprint mismatches.
+
+        ### Returns:
+        int - Reload count.
+        """
+        return self._get_data(key=_Keys.RESYNCS)  # type: ignore
+
+    @property
+    def size(self) -> int:
+        """Return the number of indexed nodes.
+
+        ### Returns:
+        int - Node count.
+        """
+        return len(self.__nodes)
+
+    # #[PUBLIC METHODS]###############################################################
+    def state(self, node_id: int) -> Optional[int]:
+        """Return the last evaluated state of a node.
+
+        ### Arguments:
+        * node_id: int - LMS node id.
+
+        ### Returns:
+        Optional[int] - `TariffState` code, `None` for unknown nodes.
+        """
+        node: Optional[NodeRow] = self.__nodes.get(node_id)
+        return node.state if node else None
+
+    def sync(
+        self, connection: Connection, now: Optional[float] = None
+    ) -> List[TariffTransition]:
+        """Apply changed rows and return the resulting state transitions.
+
+        The first sync only records the baseline and returns no transitions.
+
+        ### Arguments:
+        * connection: Connection - Database connection.
+        * now: Optional[float] - Current Unix timestamp, for tests.
+
+        ### Returns:
+        List[TariffTransition] - Transitions ordered by node id.
+        """
+        if now is None:
+            now = time.time()
+        baseline: bool = not self._get_data(key=_Keys.SYNCED)
+        dirty: Set[int] = set()
+        if baseline:
+            self.__load(connection, now, dirty)
+        else:
+            self.__apply(connection, now, dirty)
+            if self.__fingerprints(connection) != self._get_data(
+                key=_Keys.FINGERPRINTS
+            ):
+                self._set_data(key=_Keys.RESYNCS, value=self.resyncs + 1)
+                self.__load(connection, now, dirty)
+        self.__expire(now, dirty)
+        self._set_data(key=_Keys.SYNCED, value=True)
+
+        out: List[TariffTransition] = []
+        nodes: Dict[int, NodeRow] = self.__nodes
+        for node_id in sorted(dirty):
+            node: Optional[NodeRow] = nodes.get(node_id)
+            if node is None:
+                continue
+            old: Optional[int] = node.state
+            node.state = self.__evaluate(node_id, node, now)
+            if baseline or old == node.state:
+                continue
+            if old is None and node.state == TariffState.ACTIVE:
+                continue
+            out.append(
+                TariffTransition(
+                    node_id=node_id,
+                    name=node.name,
+                    customer_id=node.owner,
+                    access=node.access,
+                    old=old,
+                    new=node.state,
+                )
+            )
+        return out
+
+    # #[PRIVATE PROPERTIES]###########################################################
+    @property
+    def __assignments(self) -> Dict[int, AssignmentRow]:
+        """Return recurring assignments by id.
+
+        ### Returns:
+        Dict[int, AssignmentRow] - Indexed assignments.
+        """
+        return self._get_data(key=_Keys.ASSIGNMENTS)  # type: ignore
+
+    @property
+    def __nodes(self) -> Dict[int, NodeRow]:
+        """Return nodes by id.
+
+        ### Returns:
+        Dict[int, NodeRow] - Indexed nodes.
+        """
+        return self._get_data(key=_Keys.NODES)  # type: ignore
+
+    # #[PRIVATE METHODS]##############################################################
+    def __add_assignment(self, row: Any, now: float, dirty: Set[int]) -> None:
+        """Index a new assignment row.
+
+        ### Arguments:
+        * row: Any - `assignments` row.
+        * now: float - Current Unix timestamp.
+        * dirty: Set[int] - Nodes to evaluate again, updated in place.
+        """
+        item = AssignmentRow(
+            customer=int(row.customerid),
+            datefrom=int(row.datefrom or 0),
+            dateto=int(row.dateto or 0),
+            suspended=int(row.suspended or 0),
+        )
+        self.__assignments[row.id] = item
+        self._get_data(key=_Keys.CUSTOMER_ASSIGNMENTS).setdefault(
+            item.customer, set()
+        ).add(row.id)
+        boundaries: List[Tuple[int, int]] = self._get_data(key=_Keys.BOUNDARIES)
+        for stamp in (item.datefrom, item.dateto):
+            if stamp > now:
+                heapq.heappush(boundaries, (stamp, row.id))
+        self.__count("assignments", 1, item.suspended, item.datefrom, item.dateto)
+        dirty.update(self.__nodes_of(row.id))
+
+    def __add_link(self, row: Any, dirty: Set[int]) -> None:
+        """Index a new node to assignment link.
+
+        ### Arguments:
+        * row: Any - `nodeassignments` row.
+        * dirty: Set[int] - Nodes to evaluate again, updated in place.
+        """
+        # a bound assignment stops covering the other nodes of the customer
+        dirty.update(self.__nodes_of(row.assignmentid))
+        self._get_data(key=_Keys.NODE_ASSIGNMENTS).setdefault(row.nodeid, set()).add(
+            row.assignmentid
+        )
+        self._get_data(key=_Keys.ASSIGNMENT_NODES).setdefault(
+            row.assignmentid, set()
+        ).add(row.nodeid)
+        self.__count("nodeassignments", 1, row.id)
+        dirty.add(row.nodeid)
+
+    def __add_node(self, row: Any, dirty: Set[int]) -> bool:
+        """Index a new or modified node row.
+
+        ### Arguments:
+        * row: Any - `nodes` row.
+        * dirty: Set[int] - Nodes to evaluate again, updated in place.
+
+        ### Returns:
+        bool - `False` when the row matches the indexed node.
+        """
+        nodes: Dict[int, NodeRow] = self.__nodes
+        customers: Dict[int, Set[int]] = self._get_data(key=_Keys.CUSTOMER_NODES)
+        owner: int = int(row.ownerid or 0)
+        node: Optional[NodeRow] = nodes.get(row.id)
+        if node is None:
+            nodes[row.id] = NodeRow(
+                name=str(row.name), owner=owner, access=int(row.access)
+            )
+            self.__count("nodes", 1, row.id)
+        elif (node.name, node.owner, node.access) == (
+            str(row.name),
+            owner,
+            int(row.access),
+        ):
+            return False
+        else:
+            if node.owner != owner:
+                customers.get(node.owner, set()).discard(row.id)
+            node.name = str(row.name)
+            node.owner = owner
+            node.access = int(row.access)
+        customers.setdefault(owner, set()).add(row.id)
+        dirty.add(row.id)
+        return True
+
+    def __apply(self, connection: Connection, now: float, dirty: Set[int]) -> None:
+        """Apply rows above the high-water marks.
+
+        ### Arguments:
+        * connection: Connection - Database connection.
+        * now: float - Current Unix timestamp.
+        * dirty: Set[int] - Nodes to evaluate again, updated in place.
+        """
+        marks: Dict[str, int] = self._get_data(key=_Keys.MARKS)
+        count: int = 0
+        # `>=` re-reads nodes stamped in the same second as the last change
+        for row in self.__stream(
+            connection,
+            self.__select_nodes().where(
+                (_NODES.c.id > marks["nodes"]) | (_NODES.c.moddate >= marks["moddate"])
+            ),
+        ):
+            self.__mark(row)
+            if self.__add_node(row, dirty):
+                count += 1
+        for row in self.__stream(
+            connection,
+            self.__select_assignments().where(_ASSIGNMENTS.c.id > marks["assignments"]),
+        ):
+            count += 1
+            marks["assignments"] = max(marks["assignments"], row.id)
+            self.__add_assignment(row, now, dirty)
+        for row in self.__stream(
+            connection,
+            self.__select_links().where(
+                _NODE_ASSIGNMENTS.c.id > marks["nodeassignments"]
+            ),
+        ):
+            count += 1
+            marks["nodeassignments"] = max(marks["nodeassignments"], row.id)
+            self.__add_link(row, dirty)
+        self._set_data(key=_Keys.CHANGES, value=count)
+
+    def __count(self, table: str, *values: int) -> None:
+        """Add a new row to the expected fingerprint of `table`.
+
+        ### Arguments:
+        * table: str - Table name.
+        * values: int - Row count increment followed by the summed columns.
+        """
+        fingerprint: Tuple[int, ...] = self._get_data(key=_Keys.FINGERPRINTS)[table]
+        self._get_data(key=_Keys.FINGERPRINTS)[table] = tuple(
+            a + b for a, b in zip(fingerprint, values)
+        )
+
+    def __evaluate(self, node_id: int, node: NodeRow, now: float) -> int:
+        """Evaluate the tariff state of one node.
+
+        Assignments linked to the node apply; a node without links is covered
+        by the assignments of its owner that are not linked to any node.
+
+        ### Arguments:
+        * node_id: int - LMS node id.
+        * node: NodeRow - Indexed node.
+        * now: float - Current Unix timestamp.
+
+        ### Returns:
+        int - `TariffState` code.
+        """
+        assignments: Dict[int, AssignmentRow] = self.__assignments
+        links: Dict[int, Set[int]] = self._get_data(key=_Keys.ASSIGNMENT_NODES)
+        ids: Set[int] = {
+            item
+            for item in self._get_data(key=_Keys.NODE_ASSIGNMENTS).get(node_id, ())
+            if item in assignments
+        }
+        if not ids:
+            ids = {
+                item
+                for item in self._get_data(key=_Keys.CUSTOMER_ASSIGNMENTS).get(
+                    node.owner, ()
+                )
+                if not links.get(item)
+            }
+        if not ids:
+            return TariffState.NONE
+        current: List[AssignmentRow] = [
+            assignments[item] for item in ids if assignments[item].valid(now)
+        ]
+        if not current:
+            return TariffState.INACTIVE
+        if all(item.suspended for item in current):
+            return TariffState.SUSPENDED
+        return TariffState.ACTIVE
+
+    def __expire(self, now: float, dirty: Set[int]) -> None:
+        """Mark nodes whose assignment period started or ended.
+
+        ### Arguments:
+        * now: float - Current Unix timestamp.
+        * dirty: Set[int] - Nodes to evaluate again, updated in place.
+        """
+        boundaries: List[Tuple[int, int]] = self._get_data(key=_Keys.BOUNDARIES)
+        while boundaries and boundaries[0][0] <= now:
+            dirty.update(self.__nodes_of(heapq.heappop(boundaries)[1]))
+
+    def __fingerprints(self, connection: Connection) -> Dict[str, Tuple[int, ...]]:
+        """Return count/sum fingerprints of the indexed tables.
+
+        Edits and deletions change the row count or one of the summed
+        columns, so a match means no reload is needed.
+
+        ### Arguments:
+        * connection: Connection - Database connection.
+
+        ### Returns:
+        Dict[str, Tuple[int, ...]] - Fingerprints by table name.
+        """
+        recurring: Subquery = self.__select_assignments().subquery()
+        queries: Dict[str, Select] = {
+            "assignments": select(
+                func.count(),
+                func.coalesce(func.sum(recurring.c.suspended), 0),
+                func.coalesce(func.sum(recurring.c.datefrom), 0),
+                func.coalesce(func.sum(recurring.c.dateto), 0),
+            ).select_from(recurring),
+            "nodeassignments": select(
+                func.count(), func.coalesce(func.sum(_NODE_ASSIGNMENTS.c.id), 0)
+            ),
+            "nodes": select(func.count(), func.coalesce(func.sum(_NODES.c.id), 0)),
+        }
+        return {
+            table: tuple(int(value) for value in connection.execute(query).one())
+            for table, query in queries.items()
+        }
+
+    def __load(self, connection: Connection, now: float, dirty: Set[int]) -> None:
+        """Reload all indexed rows, keeping the evaluated node states.
+
+        ### Arguments:
+        * connection: Connection - Database connection.
+        * now: float - Current Unix timestamp.
+        * dirty: Set[int] - Nodes to evaluate again, updated in place.
+        """
+        states: Dict[int, Optional[int]] = {
+            node_id: node.state for node_id, node in self.__nodes.items()
+        }
+        for key in (
+            _Keys.ASSIGNMENT_NODES,
+            _Keys.ASSIGNMENTS,
+            _Keys.CUSTOMER_ASSIGNMENTS,
+            _Keys.CUSTOMER_NODES,
+            _Keys.NODE_ASSIGNMENTS,
+            _Keys.NODES,
+        ):
+            self._get_data(key=key).clear()
+        self._get_data(key=_Keys.BOUNDARIES).clear()
+        self._set_data(
+            key=_Keys.FINGERPRINTS,
+            value={
+                "assignments": (0, 0, 0, 0),
+                "nodeassignments": (0, 0),
+                "nodes": (0, 0),
+            },
+        )
+        self._set_data(
+            key=_Keys.MARKS,
+            value={"assignments": 0, "moddate": 0, "nodeassignments": 0, "nodes": 0},
+        )
+        self.__apply(connection, now, dirty)
+        nodes: Dict[int, NodeRow] = self.__nodes
+        for node_id, node in nodes.items():
+            node.state = states.get(node_id)
+        dirty.clear()
+        dirty.update(nodes)
+
+    def __mark(self, row: Any) -> None:
+        """Move the node high-water marks past `row`.
+
+        ### Arguments:
+        * row: Any - `nodes` row.
+        """
+        marks: Dict[str, int] = self._get_data(key=_Keys.MARKS)
+        marks["nodes"] = max(marks["nodes"], row.id)
+        marks["moddate"] = max(marks["moddate"], int(row.moddate or 0))
+
+    def __nodes_of(self, assignment_id: int) -> Set[int]:
+        """Return nodes covered by an assignment.
+
+        ### Arguments:
+        * assignment_id: int - LMS assignment id.
+
+        ### Returns:
+        Set[int] - Linked nodes, or all nodes of the owner when unlinked.
+        """
+        linked: Set[int] = self._get_data(key=_Keys.ASSIGNMENT_NODES).get(
+            assignment_id, set()
+        )
+        if linked:
+            return linked
+        item: Optional[AssignmentRow] = self.__assignments.get(assignment_id)
+        if item is None:
+            return set()
+        return self._get_data(key=_Keys.CUSTOMER_NODES).get(item.customer, set())
+
+    def __select_assignments(self) -> Select:
+        """Return the query of committed recurring tariff assignments.
+
+        ### Returns:
+        Select - Assignment query; one-time charges are skipped.
+        """
+        return select(
+            _ASSIGNMENTS.c.id,
+            _ASSIGNMENTS.c.customerid,
+            _ASSIGNMENTS.c.datefrom,
+            _ASSIGNMENTS.c.dateto,
+            _ASSIGNMENTS.c.suspended,
+        ).where(
+            _ASSIGNMENTS.c.commited == 1,
+            _ASSIGNMENTS.c.period != 0,
+            (_ASSIGNMENTS.c.tariffid.is_not(None))
+            | (_ASSIGNMENTS.c.liabilityid.is_not(None)),
+        )
+
+    def __select_links(self) -> Select:
+        """Return the query of node to assignment links.
+
+        ### Returns:
+        Select - Link query.
+        """
+        return select(
+            _NODE_ASSIGNMENTS.c.id,
+            _NODE_ASSIGNMENTS.c.nodeid,
+            _NODE_ASSIGNMENTS.c.assignmentid,
+        )
+
+    def __select_nodes(self) -> Select:
+        """Return the query of indexed node columns.
+
+        ### Returns:
+        Select - Node query.
+        """
+        return select(
+            _NODES.c.id,
+            _NODES.c.name,
+            _NODES.c.ownerid,
+            _NODES.c.access,
+            _NODES.c.moddate,
+        )
+
+    def __stream(self, connection: Connection, query: Select) -> Any:
+        """Execute `query` on a server-side cursor.
+
+        ### Arguments:
+        * connection: Connection - Database connection.
+        * query: Select - Query to run.
+
+        ### Returns:
+        Any - Result rows in id order.
+        """
+        return connection.execute(
+            query.order_by("id").execution_options(stream_results=True, yield_per=1000)
+        )
+
+
+class _Runtime(Thread, ThPluginMixin):
+    """Report node tariff transitions on `at_channel` times."""
+
+    _notifications: Optional[NotificationScheduler] = None
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self, context: PluginContext) -> None:
+        """Initialize the tariff verification worker runtime.
+
+        ### Arguments:
+        * context: PluginContext - Plugin runtime context.
+        """
+        Thread.__init__(self, name=context.instance_name)
+        self.daemon = True
+        self._context: PluginContext = context
+        self._health = PluginHealthSnapshot(health=PluginHealth.UNKNOWN)
+        self._notifications = NotificationScheduler(
+            at_channel=list(context.config.get(PluginCommonKeys.AT_CHANNEL) or [])
+        )
+        self._stop_event = Event()
+        self._state = PluginStateSnapshot(state=PluginState.CREATED)
+        self._set_data(
+            key=_Keys.INDEX, value=TariffIndex(), set_default_type=TariffIndex
+        )
+        self._set_data(
+            key=_Keys.POOL, value=None, set_default_type=Optional[SqlEnginePool]
+        )
+
+    def initialize(self) -> None:
+        """Prepare the engine pool; connections are opened on first use."""
+        config: Mapping[str, Any] = self._context.config  # type: ignore
+        self._set_data(
+            key=_Keys.POOL,
+            value=SqlEnginePool.from_servers(
+                [str(item) for item in config.get(_Keys.SQL_SERVER) or []],
+                str(config.get(_Keys.SQL_DATABASE) or ""),
+                str(config.get(_Keys.SQL_USER) or ""),
+                self.__password(),
+            ),
+        )
+        self._state = PluginStateSnapshot(state=PluginState.INITIALIZED)
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def index(self) -> TariffIndex:
+        """Return the node tariff index.
+
+        ### Returns:
+        TariffIndex - Index kept for the plugin lifetime.
+        """
+        return self._get_data(key=_Keys.INDEX)  # type: ignore
+
+    @property
+    def pool(self) -> Optional[SqlEnginePool]:
+        """Return the engine pool.
+
+        ### Returns:
+        Optional[SqlEnginePool] - Pool or `None` before `initialize()`.
+        """
+        return self._get_data(key=_Keys.POOL)
+
+    # #[PUBLIC METHODS]################################################################
+    def cycle(
+        self, channels: Optional[List[int]] = None, now: Optional[float] = None
+    ) -> bool:
+        """Sync the index and report transitions to the due message channels.
+
+        ### Arguments:
+        * channels: Optional[List[int]] - Channels to serve, the channels due
+          by `at_channel` when `None`.
+        * now: Optional[float] - Current Unix timestamp, for tests.
+
+        ### Returns:
+        bool - `True` when the sync completed.
+        """
+        context: PluginContext = self._context  # type: ignore
+        pool: Optional[SqlEnginePool] = self.pool
+        if pool is None:
+            return False
+        if channels is None:
+            channels = self._notifications.due_channels() if self._notifications else []
+        targets: List[int] = [
+            int(item)
+            for item in context.config.get(PluginCommonKeys.MESSAGE_CHANNEL) or []
+            if str(item).strip() and int(item) in channels
+        ]
+        if not targets:
+            return True
+        ok: bool = True
+        try:
+            with pool.connect() as connection:
+                transitions: List[TariffTransition] = self.index.sync(connection, now)
+        except SQLAlchemyError as ex:
+            context.logger.message_error = f"LMS tariff sync failed: {ex}"
+            transitions = []
+            ok = False
+        for item in pool.errors:
+            context.logger.message_warning = item
+        pool.errors.clear()
+        if context.debug:
+            context.logger.message_debug = (
+                f"indexed nodes: {self.index.size}, changed rows: "
+                f"{self.index.changes}, reloads: {self.index.resyncs}, "
+                f"transitions: {len(transitions)}"
+            )
+        if transitions:
+            for channel in targets:
+                self.__publish(channel, transitions)
+        return ok
+
+    def health(self) -> PluginHealthSnapshot:
+        """Return the current health snapshot.
+
+        ### Returns:
+        PluginHealthSnapshot - Current plugin health snapshot.
+        """
+        health: Optional[PluginHealthSnapshot] = self._health
+        if health is None:
+            return PluginHealthSnapshot(
+                health=PluginHealth.UNKNOWN,
+                message="Health snapshot is not initialized.",
+            )
+        return health
+
+    def run(self) -> None:
+        """Check the `at_channel` schedule once a minute until stopped."""
+        stop_event: Optional[Event] = self._stop_event
+        if stop_event is None or self.pool is None:
+            self._health = PluginHealthSnapshot(
+                health=PluginHealth.UNHEALTHY,
+                last_error_at=int(time.time()),
+                message="Runtime is not initialized.",
+            )
+            self._state = PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Runtime is not initialized.",
+                stopped_at=int(time.time()),
+            )
+            return None
+        while not stop_event.is_set():
+            channels: List[int] = (
+                self._notifications.due_channels() if self._notifications else []
+            )
+            if channels:
+                started: float = time.monotonic()
+                ok: bool = self.cycle(channels)
+                self._health = PluginHealthSnapshot(
+                    health=PluginHealth.HEALTHY if ok else PluginHealth.DEGRADED,
+                    last_error_at=None if ok else int(time.time()),
+                    last_ok_at=int(time.time()) if ok else None,
+                    message=(
+                        f"Synced {self.index.size} nodes from "
+                        f"{self.index.changes} rows in "
+                        f"{time.monotonic() - started:.2f}s."
+                    ),
+                )
+            # wake up once in every minute matched by `at_channel`
+            stop_event.wait(61.0 - time.time() % 60)
+
+    def start(self) -> None:
+        """Start the runtime thread."""
+        self._state = PluginStateSnapshot(
+            state=PluginState.STARTING,
+            started_at=int(time.time()),
+        )
+        Thread.start(self)
+
+    def state(self) -> PluginStateSnapshot:
+        """Return the current lifecycle snapshot.
+
+        ### Returns:
+        PluginStateSnapshot - Current plugin lifecycle snapshot.
+        """
+        state: Optional[PluginStateSnapshot] = self._state
+        if state is None:
+            return PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Lifecycle snapshot is not initialized.",
+            )
+        if self.is_alive() and state.state == PluginState.STARTING:
+            state = PluginStateSnapshot(
+                state=PluginState.RUNNING,
+                started_at=state.started_at,
+            )
+            self._state = state
+        return state
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Request plugin shutdown.
+
+        ### Arguments:
+        * timeout: Optional[float] - Optional join timeout.
+        """
+        stop_event: Optional[Event] = self._stop_event
+        state: Optional[PluginStateSnapshot] = self._state
+        if stop_event is None:
+            self._state = PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Stop event is not initialized.",
+                stopped_at=int(time.time()),
+            )
+            return None
+        if state is not None and state.state not in (
+            PluginState.STOPPED,
+            PluginState.FAILED,
+        ):
+            self._state = PluginStateSnapshot(
+                state=PluginState.STOPPING,
+                started_at=state.started_at,
+            )
+        stop_event.set()
+        if self.is_alive():
+            self.join(timeout=timeout)
+        pool: Optional[SqlEnginePool] = self.pool
+        if pool is not None:
+            pool.dispose()
+        self._state = PluginStateSnapshot(
+            state=PluginState.STOPPED,
+            started_at=state.started_at if state is not None else None,
+            stopped_at=int(time.time()),
+        )
+
+    # #[PRIVATE METHODS]###############################################################
+    def __password(self) -> str:
+        """Return `sql_password` decrypted by the host.
+
+        ### Returns:
+        str - Plain text password.
+        """
+        context: PluginContext = self._context  # type: ignore
+        return context.secret(_Keys.SQL_PASS) or ""
+
+    def __publish(self, channel: int, transitions: List[TariffTransition]) -> None:
+        """Publish one report of the transitions.
+
+        ### Arguments:
+        * channel: int - Message channel.
+        * transitions: List[TariffTransition] - Transitions to report.
+        """
+        context: PluginContext = self._context  # type: ignore
+        message = Message()
+        message.channel = int(channel)
+        message.subject = (
+            f"{context.config.get(_Keys.SUBJECT_PREFIX) or ''} "
+            f"Node tariff changes: {len(transitions)}"
+        ).strip()
+        message.messages = [item.text for item in transitions]
+        if not context.dispatcher.publish(message):
+            context.logger.message_warning = (
+                f"tariff report for channel {channel} dropped by the publish "
+                "rate limit"
+            )
+
+
+def get_plugin_spec() -> PluginSpec:
+    """Return the plugin spec for `lmstariff`.
+
+    ### Returns:
+    PluginSpec - Plugin manifest.
+    """
+    schema = PluginConfigSchema(
+        title="LMS tariff verification worker plugin.",
+        description=(
+            "Reports LMS nodes whose tariff assignment became active, "
+            "suspended, inactive, or missing. Requires the packages listed in "
+            "the plugin `requirements.txt`."
+        ),
+        fields=[
+            PluginConfigField(
+                name=PluginCommonKeys.AT_CHANNEL,
+                field_type=list,
+                default=["1:0;0;7|10|12|13;*;*", "1:0;8|12|16|21;14;*;*"],
+                required=True,
+                description=(
+                    "Schedules in `channel:minute;hour;day-month;month;day-week` "
+                    "format; `*`, ranges `a-b`, and `|` lists are allowed."
+                ),
+            ),
+            PluginConfigField(
+                name=PluginCommonKeys.MESSAGE_CHANNEL,
+                field_type=list,
+                default=[1],
+                required=True,
+                description="Channels receiving the transition reports.",
+            ),
+            PluginConfigField(
+                name=_Keys.SQL_SERVER,
+                field_type=list,
+                default=[],
+                required=True,
+                description="LMS database servers in failover order.",
+            ),
+            PluginConfigField(
+                name=_Keys.SQL_DATABASE,
+                field_type=str,
+                default="",
+                required=True,
+                description="LMS database name.",
+            ),
+            PluginConfigField(
+                name=_Keys.SQL_USER,
+                field_type=str,
+                default="",
+                required=True,
+                description="Database user name.",
+            ),
+            PluginConfigField(
+                name=_Keys.SQL_PASS,
+                field_type=str,
+                default="",
+                required=True,
+                secret=True,
+                description="Database password encrypted with `aasd.py -p`.",
+            ),
+            PluginConfigField(
+                name=_Keys.SUBJECT_PREFIX,
+                field_type=str,
+                default="[AIR-NET]",
+                required=False,
+                description="Prefix of report subjects.",
+            ),
+        ],
+    )
+    return PluginSpec(
+        api_version=1,
+        config_schema=schema,
+        plugin_id="aasd.lmstariff",
+        plugin_kind=PluginKind.WORKER,
+        plugin_name="lmstariff",
+        runtime_factory=_Runtime,
+        description="LMS tariff verification worker with change tracking.",
+    )
+
+
+# #[EOF]#######################################################################
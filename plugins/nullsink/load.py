@@ -0,0 +1,324 @@
+# -*- coding: UTF-8 -*-
+"""
+Null sink communication plugin.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-15
+
+Purpose: Consume and discard dispatcher messages while measuring throughput
+and delivery latency.
+"""
+
+import re
+import time
+
+from queue import Empty, Queue
+from threading import Event, Thread
+from typing import List, Optional, Pattern
+
+from libs.com.message import Message
+from libs.plugins import (
+    PluginCommonKeys,
+    PluginContext,
+    PluginHealth,
+    PluginHealthSnapshot,
+    PluginKind,
+    PluginSpec,
+    PluginState,
+    PluginStateSnapshot,
+    ThPluginMixin,
+)
+from libs.templates import PluginConfigField, PluginConfigSchema
+
+from jsktoolbox.attribtool import ReadOnlyClass
+
+
+class _Keys(object, metaclass=ReadOnlyClass):
+    """Plugin configuration keys."""
+
+    REPORT_INTERVAL: str = "report_interval"
+
+
+# `time.monotonic()` stamp put in the subject by the `stress` plugin
+RE_SENT: Pattern = re.compile(r"\bsent=(\d+(?:\.\d+)?)")
+
+
+def percentile(values: List[float], share: float) -> float:
+    """Return the `share` percentile of sorted `values`.
+
+    ### Arguments:
+    * values: List[float] - Values sorted ascending.
+    * share: float - Percentile between 0 and 1.
+
+    ### Returns:
+    float - Nearest-rank percentile, `0.0` for no values.
+    """
+    if not values:
+        return 0.0
+    return values[min(int(share * len(values)), len(values) - 1)]
+
+
+class _Runtime(Thread, ThPluginMixin):
+    """Count messages from one channel and log throughput and latency."""
+
+    # delivery latencies in seconds since the last report
+    latencies: List[float] = []
+    # messages consumed since startup
+    received: int = 0
+    __window_at: float = 0.0
+    __window_count: int = 0
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self, context: PluginContext) -> None:
+        """Initialize the null sink runtime.
+
+        ### Arguments:
+        * context: PluginContext - Plugin runtime context.
+        """
+        Thread.__init__(self, name=context.instance_name)
+        self.daemon = True
+        self._context: PluginContext = context
+        self._health = PluginHealthSnapshot(health=PluginHealth.UNKNOWN)
+        self._stop_event = Event()
+        self._queue: Optional[Queue] = None
+        self._state = PluginStateSnapshot(state=PluginState.CREATED)
+        self.latencies = []
+        self.received = 0
+        self.__window_at = time.monotonic()
+        self.__window_count = 0
+
+    def initialize(self) -> None:
+        """Register the consumer queue before startup."""
+        context: Optional[PluginContext] = self._context
+        if context is None:
+            self._health = PluginHealthSnapshot(
+                health=PluginHealth.UNHEALTHY,
+                last_error_at=int(time.time()),
+                message="Plugin context is not initialized.",
+            )
+            self._state = PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Plugin context is not initialized.",
+                stopped_at=int(time.time()),
+            )
+            return None
+        self._queue = context.dispatcher.register_consumer(
+            int(context.config[PluginCommonKeys.CHANNEL])
+        )
+        self._state = PluginStateSnapshot(state=PluginState.INITIALIZED)
+
+    # #[PUBLIC METHODS]################################################################
+    def health(self) -> PluginHealthSnapshot:
+        """Return the current health snapshot.
+
+        ### Returns:
+        PluginHealthSnapshot - Current plugin health snapshot.
+        """
+        health: Optional[PluginHealthSnapshot] = self._health
+        if health is None:
+            return PluginHealthSnapshot(
+                health=PluginHealth.UNKNOWN,
+                message="Health snapshot is not initialized.",
+            )
+        return health
+
+    def run(self) -> None:
+        """Drain the consumer queue until stopped."""
+        stop_event: Optional[Event] = self._stop_event
+        queue: Optional[Queue] = self._queue
+        context: Optional[PluginContext] = self._context
+        if stop_event is None or queue is None or context is None:
+            reason: str = "Plugin context is not initialized."
+            if stop_event is None:
+                reason = "Stop event is not initialized."
+            elif queue is None:
+                reason = "Consumer queue is not initialized."
+            self._health = PluginHealthSnapshot(
+                health=PluginHealth.UNHEALTHY,
+                last_error_at=int(time.time()),
+                message=reason,
+            )
+            self._state = PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message=reason,
+                stopped_at=int(time.time()),
+            )
+            return None
+        interval: int = int(context.config.get(_Keys.REPORT_INTERVAL) or 0)
+        report_at: float = time.monotonic() + interval
+        self.__window_at = time.monotonic()
+        while not stop_event.is_set():
+            try:
+                message: Message = queue.get(block=True, timeout=0.1)
+            except Empty:
+                pass
+            else:
+                self.__consume(message, time.monotonic())
+                queue.task_done()
+            now: float = time.monotonic()
+            if interval > 0 and now >= report_at:
+                report_at = now + interval
+                if self.__window_count:
+                    self.__report(now)
+                else:
+                    self.__window_at = now
+        if self.__window_count:
+            self.__report(time.monotonic())
+        self.__finish()
+
+    def start(self) -> None:
+        """Start the runtime thread."""
+        self._state = PluginStateSnapshot(
+            state=PluginState.STARTING,
+            started_at=int(time.time()),
+        )
+        Thread.start(self)
+
+    def state(self) -> PluginStateSnapshot:
+        """Return the current lifecycle snapshot.
+
+        ### Returns:
+        PluginStateSnapshot - Current plugin lifecycle snapshot.
+        """
+        state: Optional[PluginStateSnapshot] = self._state
+        if state is None:
+            return PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Lifecycle snapshot is not initialized.",
+            )
+        if self.is_alive() and state.state == PluginState.STARTING:
+            state = PluginStateSnapshot(
+                state=PluginState.RUNNING,
+                started_at=state.started_at,
+            )
+            self._state = state
+        return state
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Request plugin shutdown.
+
+        ### Arguments:
+        * timeout: Optional[float] - Optional join timeout.
+        """
+        stop_event: Optional[Event] = self._stop_event
+        if stop_event is None:
+            self._health = PluginHealthSnapshot(
+                health=PluginHealth.UNHEALTHY,
+                last_error_at=int(time.time()),
+                message="Stop event is not initialized.",
+            )
+            self._state = PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Stop event is not initialized.",
+                stopped_at=int(time.time()),
+            )
+            return None
+        state: Optional[PluginStateSnapshot] = self._state
+        if state is not None and state.state not in (
+            PluginState.STOPPED,
+            PluginState.FAILED,
+        ):
+            self._state = PluginStateSnapshot(
+                state=PluginState.STOPPING,
+                started_at=state.started_at,
+            )
+        stop_event.set()
+        if self.is_alive():
+            self.join(timeout=timeout)
+        self.__finish()
+
+    # #[PRIVATE METHODS]###############################################################
+    def __consume(self, message: Message, now: float) -> None:
+        """Count one message and record its latency when it is stamped.
+
+        ### Arguments:
+        * message: Message - Consumed message.
+        * now: float - `time.monotonic()` at consumption.
+        """
+        self.received += 1
+        self.__window_count += 1
+        match = RE_SENT.search(message.subject or "")
+        if match is not None:
+            self.latencies.append(now - float(match.group(1)))
+
+    def __finish(self) -> None:
+        """Record the stopped lifecycle state."""
+        state: Optional[PluginStateSnapshot] = self._state
+        self._state = PluginStateSnapshot(
+            state=PluginState.STOPPED,
+            started_at=state.started_at if state is not None else None,
+            stopped_at=int(time.time()),
+        )
+
+    def __report(self, now: float) -> None:
+        """Log throughput and latency of the messages since the last report.
+
+        ### Arguments:
+        * now: float - `time.monotonic()` at report time.
+        """
+        elapsed: float = max(now - self.__window_at, 1e-9)
+        latencies: List[float] = sorted(self.latencies)
+        summary: str = (
+            f"received={self.__window_count} total={self.received} "
+            f"rate={self.__window_count / elapsed:.1f}/s "
+            f"latency_p50_ms={percentile(latencies, 0.5) * 1000:.3f} "
+            f"latency_p99_ms={percentile(latencies, 0.99) * 1000:.3f} "
+            f"latency_max_ms={(latencies[-1] if latencies else 0.0) * 1000:.3f}"
+        )
+        self.latencies.clear()
+        self.__window_at = now
+        self.__window_count = 0
+        if self._context is not None:
+            self._context.logger.message_info = f"null sink: {summary}"
+        self._health = PluginHealthSnapshot(
+            health=PluginHealth.HEALTHY,
+            last_ok_at=int(time.time()),
+            message=summary,
+        )
+
+
+def get_plugin_spec() -> PluginSpec:
+    """Return the plugin spec for `nullsink`.
+
+    ### Returns:
+    PluginSpec - Plugin manifest.
+    """
+    schema = PluginConfigSchema(
+        title="Null sink communication plugin.",
+        description=(
+            "Discards messages from a dispatcher channel and logs throughput "
+            "and the latency of messages stamped by `stress`."
+        ),
+        fields=[
+            PluginConfigField(
+                name=PluginCommonKeys.CHANNEL,
+                field_type=int,
+                default=900,
+                required=True,
+                description="Dispatcher channel consumed by the plugin.",
+            ),
+            PluginConfigField(
+                name=_Keys.REPORT_INTERVAL,
+                field_type=int,
+                default=10,
+                required=True,
+                description="Seconds between throughput reports, 0 reports on stop only.",
+            ),
+        ],
+    )
+    return PluginSpec(
+        api_version=1,
+        config_schema=schema,
+        plugin_id="example.null_sink",
+        plugin_kind=PluginKind.COMMUNICATION,
+        plugin_name="nullsink",
+        runtime_factory=_Runtime,
+        description="Example communication plugin measuring delivery throughput.",
+    )
+
+
+# #[EOF]#######################################################################
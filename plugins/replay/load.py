@@ -0,0 +1,295 @@
+# -*- coding: UTF-8 -*-
+"""
+Capture replay worker plugin.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-16
+
+Purpose: Publish messages recorded by the dispatcher capture with their
+original spacing, scaled by a speed factor, or as fast as possible.
+"""
+
+import time
+
+from threading import Event, Thread
+from typing import Iterator, Optional, Union
+
+from libs.com.capture import CapturedMessage, ReplayStats, read_capture, replay_capture
+from libs.plugins import (
+    PluginContext,
+    PluginHealth,
+    PluginHealthSnapshot,
+    PluginKind,
+    PluginSpec,
+    PluginState,
+    PluginStateSnapshot,
+    ThPluginMixin,
+)
+from libs.templates import PluginConfigField, PluginConfigSchema
+
+from jsktoolbox.attribtool import ReadOnlyClass
+
+
+class _Keys(object, metaclass=ReadOnlyClass):
+    """Plugin configuration keys."""
+
+    CAPTURE_FILE: str = "capture_file"
+    SPEED: str = "speed"
+    TARGET_CHANNEL: str = "target_channel"
+
+
+def retarget(
+    messages: Iterator[CapturedMessage], channel: int
+) -> Iterator[CapturedMessage]:
+    """Yield captured messages moved to another channel.
+
+    ### Arguments:
+    * messages: Iterator[CapturedMessage] - Messages from `read_capture()`.
+    * channel: int - Channel set on every message.
+
+    ### Returns:
+    Iterator[CapturedMessage] - The same messages with `channel` replaced.
+    """
+    for item in messages:
+        item.message.channel = channel
+        yield item
+
+
+class _Runtime(Thread, ThPluginMixin):
+    """Replay one capture file once, then stay idle until stopped."""
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self, context: PluginContext) -> None:
+        """Initialize the replay runtime.
+
+        ### Arguments:
+        * context: PluginContext - Plugin runtime context.
+        """
+        Thread.__init__(self, name=context.instance_name)
+        self.daemon = True
+        self._context: PluginContext = context
+        self._health = PluginHealthSnapshot(health=PluginHealth.UNKNOWN)
+        self._stop_event = Event()
+        self._state = PluginStateSnapshot(state=PluginState.CREATED)
+
+    def initialize(self) -> None:
+        """Prepare the runtime before startup."""
+        self._state = PluginStateSnapshot(state=PluginState.INITIALIZED)
+
+    # #[PUBLIC METHODS]################################################################
+    def health(self) -> PluginHealthSnapshot:
+        """Return the current health snapshot.
+
+        ### Returns:
+        PluginHealthSnapshot - Current plugin health snapshot.
+        """
+        health: Optional[PluginHealthSnapshot] = self._health
+        if health is None:
+            return PluginHealthSnapshot(
+                health=PluginHealth.UNKNOWN,
+                message="Health snapshot is not initialized.",
+            )
+        return health
+
+    def run(self) -> None:
+        """Publish the configured capture, then stop."""
+        stop_event: Optional[Event] = self._stop_event
+        context: Optional[PluginContext] = self._context
+        if stop_event is None or context is None:
+            reason: str = (
+                "Stop event is not initialized."
+                if stop_event is None
+                else "Plugin context is not initialized."
+            )
+            self._health = PluginHealthSnapshot(
+                health=PluginHealth.UNHEALTHY,
+                last_error_at=int(time.time()),
+                message=reason,
+            )
+            self._state = PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message=reason,
+                stopped_at=int(time.time()),
+            )
+            return None
+        config = context.config
+        path: str = str(config.get(_Keys.CAPTURE_FILE) or "").strip()
+        if not path:
+            self._health = PluginHealthSnapshot(
+                health=PluginHealth.HEALTHY,
+                last_ok_at=int(time.time()),
+                message="No capture file configured, replay is idle.",
+            )
+            stop_event.wait()
+            self.__finish()
+            return None
+
+        speed: float = float(config.get(_Keys.SPEED) or 0)
+        channel: int = int(config.get(_Keys.TARGET_CHANNEL) or 0)
+        context.logger.message_info = (
+            f"replaying capture={path} speed={speed or 'max'} "
+            f"channel={channel or 'captured'}"
+        )
+        messages: Iterator[CapturedMessage] = read_capture(path)
+        if channel:
+            messages = retarget(messages, channel)
+        try:
+            stats: ReplayStats = replay_capture(
+                messages=messages,
+                publish=context.dispatcher.publish,
+                speed=speed,
+                stop_event=stop_event,
+            )
+        except OSError as ex:
+            message: str = f"Cannot read capture file: {ex}"
+            context.logger.message_error = message
+            self._health = PluginHealthSnapshot(
+                health=PluginHealth.UNHEALTHY,
+                last_error_at=int(time.time()),
+                message=message,
+            )
+            self.__finish()
+            return None
+        summary: str = (
+            f"replay finished: published={stats.published} "
+            f"throttled={stats.throttled} elapsed={stats.elapsed:.3f}s"
+        )
+        context.logger.message_info = summary
+        self._health = PluginHealthSnapshot(
+            health=PluginHealth.HEALTHY,
+            last_ok_at=int(time.time()),
+            message=summary,
+        )
+        self.__finish()
+
+    def start(self) -> None:
+        """Start the runtime thread."""
+        self._state = PluginStateSnapshot(
+            state=PluginState.STARTING,
+            started_at=int(time.time()),
+        )
+        Thread.start(self)
+
+    def state(self) -> PluginStateSnapshot:
+        """Return the current lifecycle snapshot.
+
+        ### Returns:
+        PluginStateSnapshot - Current plugin lifecycle snapshot.
+        """
+        state: Optional[PluginStateSnapshot] = self._state
+        if state is None:
+            return PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Lifecycle snapshot is not initialized.",
+            )
+        if self.is_alive() and state.state == PluginState.STARTING:
+            state = PluginStateSnapshot(
+                state=PluginState.RUNNING,
+                started_at=state.started_at,
+            )
+            self._state = state
+        return state
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Request plugin shutdown.
+
+        ### Arguments:
+        * timeout: Optional[float] - Optional join timeout.
+        """
+        stop_event: Optional[Event] = self._stop_event
+        if stop_event is None:
+            self._health = PluginHealthSnapshot(
+                health=PluginHealth.UNHEALTHY,
+                last_error_at=int(time.time()),
+                message="Stop event is not initialized.",
+            )
+            self._state = PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Stop event is not initialized.",
+                stopped_at=int(time.time()),
+            )
+            return None
+        state: Optional[PluginStateSnapshot] = self._state
+        if state is not None and state.state not in (
+            PluginState.STOPPED,
+            PluginState.FAILED,
+        ):
+            self._state = PluginStateSnapshot(
+                state=PluginState.STOPPING,
+                started_at=state.started_at,
+            )
+        stop_event.set()
+        if self.is_alive():
+            self.join(timeout=timeout)
+        self.__finish()
+
+    # #[PRIVATE METHODS]###############################################################
+    def __finish(self) -> None:
+        """Record the stopped lifecycle state."""
+        state: Optional[PluginStateSnapshot] = self._state
+        self._state = PluginStateSnapshot(
+            state=PluginState.STOPPED,
+            started_at=state.started_at if state is not None else None,
+            stopped_at=int(time.time()),
+        )
+
+
+def get_plugin_spec() -> PluginSpec:
+    """Return the plugin spec for `replay`.
+
+    ### Returns:
+    PluginSpec - Plugin manifest.
+    """
+    schema = PluginConfigSchema(
+        title="Capture replay worker plugin.",
+        description=(
+            "Publishes messages recorded by the main-section `capture_file` "
+            "option with their recorded timing, to reproduce production "
+            "traffic against communication plugins."
+        ),
+        fields=[
+            PluginConfigField(
+                name=_Keys.CAPTURE_FILE,
+                field_type=str,
+                default="",
+                required=False,
+                description=(
+                    "Capture file to replay, `.gz` files are decompressed, "
+                    "empty keeps the plugin idle."
+                ),
+                example="/var/tmp/aasd-capture.jsonl",
+            ),
+            PluginConfigField(
+                name=_Keys.SPEED,
+                field_type=Union[int, float],
+                default=1,
+                required=True,
+                description=(
+                    "Time scale, 1 keeps the recorded timing, 10 replays ten "
+                    "times faster, 0 publishes as fast as possible."
+                ),
+            ),
+            PluginConfigField(
+                name=_Keys.TARGET_CHANNEL,
+                field_type=int,
+                default=0,
+                required=True,
+                description="Channel receiving every message, 0 keeps the captured channels.",
+            ),
+        ],
+    )
+    return PluginSpec(
+        api_version=1,
+        config_schema=schema,
+        plugin_id="example.replay",
+        plugin_kind=PluginKind.WORKER,
+        plugin_name="replay",
+        runtime_factory=_Runtime,
+        description="Example worker plugin replaying captured dispatcher traffic.",
+    )
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1 @@
+"""AASd communication plugin package."""
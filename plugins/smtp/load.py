@@ -0,0 +1,1077 @@
+# -*- coding: UTF-8 -*-
+"""
+SMTP communication plugin.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Deliver dispatcher messages as e-mail over pooled SMTP sessions.
+"""
+
+import smtplib
+import ssl
+import time
+
+from collections import deque
+from email.message import EmailMessage
+from email.utils import make_msgid
+from queue import Empty, Queue
+from threading import Condition, Event, Thread
+from typing import Any, Deque, Dict, List, Mapping, Optional, Tuple, Union
+
+from libs.com.coalesce import MessageCoalescer
+from libs.com.message import Message, Multipart
+from libs.plugins import (
+    PluginCommonKeys,
+    PluginContext,
+    PluginHealth,
+    PluginHealthSnapshot,
+    PluginKind,
+    PluginSpec,
+    PluginState,
+    PluginStateSnapshot,
+    ThPluginMixin,
+)
+from libs.templates import PluginConfigField, PluginConfigSchema
+from libs.tools import MDateTime
+
+from jsktoolbox.attribtool import ReadOnlyClass
+from jsktoolbox.basetool import BData
+
+
+class _Keys(object, metaclass=ReadOnlyClass):
+    """Plugin configuration and internal storage keys."""
+
+    # config keys
+    ADDRESS_FROM: str = "address_from"
+    ADDRESS_TO: str = "address_to"
+    BATCH_SIZE: str = "batch_size"
+    COALESCE_WINDOW: str = "coalesce_window"
+    DEBUG_BCC: str = "debug_bcc"
+    DIGEST_WINDOW: str = "digest_window"
+    SMTP_IDLE_TIMEOUT: str = "smtp_idle_timeout"
+    SMTP_PASS: str = "smtp_pass"
+    SMTP_SERVER: str = "smtp_server"
+    SMTP_USER: str = "smtp_user"
+
+    # internal keys
+    ATTEMPTS: str = "__attempts__"
+    COALESCER: str = "__coalescer__"
+    CONDITION: str = "__condition__"
+    CONNECTS: str = "__connects__"
+    DEFERRED: str = "__deferred__"
+    DIGESTS: str = "__digests__"
+    HOST: str = "__host__"
+    IDLE: str = "__idle__"
+    IDLE_TIMEOUT: str = "__idle_timeout__"
+    OPEN: str = "__open__"
+    PASSWORD: str = "__password__"
+    POOL: str = "__pool__"
+    PORT: str = "__port__"
+    REUSES: str = "__reuses__"
+    SIZE: str = "__size__"
+    TIMEOUT: str = "__timeout__"
+    USER: str = "__user__"
+    WINDOW: str = "__window__"
+
+
+class SmtpConnectionPool(BData):
+    """Keep authenticated SMTP sessions open between deliveries.
+
+    Sessions are handed out by `acquire()` and returned with `release()`. A
+    returned session that stayed idle longer than `idle_timeout` is closed
+    instead of reused; any other idle session is probed with `NOOP` before it
+    is handed out again, so a session dropped by the server is replaced
+    transparently.
+    """
+
+    # #[CONSTANTS]####################################################################
+    DEFAULT_PORTS: List[int] = [587, 465, 25]
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(
+        self,
+        server: str,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        size: int = 1,
+        idle_timeout: float = 60.0,
+        timeout: float = 30.0,
+    ) -> None:
+        """Initialize the pool.
+
+        ### Arguments:
+        * server: str - SMTP host with optional `:port`.
+        * user: Optional[str] - Login name, no authentication when empty.
+        * password: Optional[str] - Plain text password.
+        * size: int - Maximum number of open sessions.
+        * idle_timeout: float - Seconds after which an idle session is closed.
+        * timeout: float - Socket timeout for SMTP operations.
+        """
+        host, _, port = server.partition(":")
+        self._set_data(key=_Keys.HOST, value=host, set_default_type=str)
+        self._set_data(
+            key=_Keys.PORT,
+            value=int(port) if port.isdigit() else None,
+            set_default_type=Optional[int],
+        )
+        self._set_data(key=_Keys.USER, value=user or None, set_default_type=Optional[str])
+        self._set_data(
+            key=_Keys.PASSWORD, value=password or None, set_default_type=Optional[str]
+        )
+        self._set_data(key=_Keys.SIZE, value=max(1, int(size)), set_default_type=int)
+        self._set_data(
+            key=_Keys.IDLE_TIMEOUT, value=float(idle_timeout), set_default_type=float
+        )
+        self._set_data(key=_Keys.TIMEOUT, value=float(timeout), set_default_type=float)
+        self._set_data(key=_Keys.CONDITION, value=Condition())
+        self._set_data(key=_Keys.IDLE, value=[], set_default_type=List)
+        self._set_data(key=_Keys.OPEN, value=0, set_default_type=int)
+        self._set_data(key=_Keys.CONNECTS, value=0, set_default_type=int)
+        self._set_data(key=_Keys.REUSES, value=0, set_default_type=int)
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def connects(self) -> int:
+        """Return the number of sessions opened so far.
+
+        ### Returns:
+        int - Opened sessions.
+        """
+        return self._get_data(key=_Keys.CONNECTS)  # type: ignore
+
+    @property
+    def reuses(self) -> int:
+        """Return the number of times an idle session was handed out again.
+
+        ### Returns:
+        int - Reused sessions.
+        """
+        return self._get_data(key=_Keys.REUSES)  # type: ignore
+
+    # #[PUBLIC METHODS]###############################################################
+    def acquire(self, timeout: Optional[float] = None) -> Optional[smtplib.SMTP]:
+        """Return a healthy session, opening a new one when needed.
+
+        ### Arguments:
+        * timeout: Optional[float] - Seconds to wait for a free pool slot.
+
+        ### Returns:
+        Optional[smtplib.SMTP] - Ready session or `None` when none could be
+        opened or no slot became free in time.
+        """
+        condition: Condition = self._get_data(key=_Keys.CONDITION)  # type: ignore
+        idle_timeout: float = self._get_data(key=_Keys.IDLE_TIMEOUT)  # type: ignore
+        while True:
+            with condition:
+                idle: List[Tuple[smtplib.SMTP, float]] = self._get_data(
+                    key=_Keys.IDLE
+                )  # type: ignore
+                if not idle and self.__open >= self._get_data(key=_Keys.SIZE):
+                    if not condition.wait_for(
+                        lambda: bool(idle)
+                        or self.__open < self._get_data(key=_Keys.SIZE),
+                        timeout=timeout,
+                    ):
+                        return None
+                if idle:
+                    smtp, last_used = idle.pop()
+                else:
+                    self.__open += 1
+                    smtp, last_used = None, 0.0
+            if smtp is None:
+                smtp = self.__connect()
+                if smtp is None:
+                    with condition:
+                        self.__open -= 1
+                        condition.notify()
+                return smtp
+            if time.monotonic() - last_used < idle_timeout and self.__healthy(smtp):
+                self._set_data(key=_Keys.REUSES, value=self.reuses + 1)
+                return smtp
+            # expired or dropped by the server, replace it
+            self.__quit(smtp)
+            with condition:
+                self.__open -= 1
+
+    def close(self) -> None:
+        """Quit every idle session."""
+        condition: Condition = self._get_data(key=_Keys.CONDITION)  # type: ignore
+        with condition:
+            idle: List[Tuple[smtplib.SMTP, float]] = list(self._get_data(key=_Keys.IDLE))
+            self._get_data(key=_Keys.IDLE).clear()
+            self.__open -= len(idle)
+            condition.notify_all()
+        for smtp, _ in idle:
+            self.__quit(smtp)
+
+    def prune(self) -> int:
+        """Quit idle sessions older than `idle_timeout`.
+
+        ### Returns:
+        int - Number of closed sessions.
+        """
+        condition: Condition = self._get_data(key=_Keys.CONDITION)  # type: ignore
+        limit: float = time.monotonic() - self._get_data(key=_Keys.IDLE_TIMEOUT)
+        with condition:
+            idle: List[Tuple[smtplib.SMTP, float]] = self._get_data(
+                key=_Keys.IDLE
+            )  # type: ignore
+            expired = [item for item in idle if item[1] < limit]
+            idle[:] = [item for item in idle if item[1] >= limit]
+            self.__open -= len(expired)
+            condition.notify_all()
+        for smtp, _ in expired:
+            self.__quit(smtp)
+        return len(expired)
+
+    def release(self, smtp: smtplib.SMTP, broken: bool = False) -> None:
+        """Return a session to the pool.
+
+        ### Arguments:
+        * smtp: smtplib.SMTP - Session obtained from `acquire()`.
+        * broken: bool - Close the session instead of keeping it.
+        """
+        condition: Condition = self._get_data(key=_Keys.CONDITION)  # type: ignore
+        if broken:
+            self.__quit(smtp)
+            with condition:
+                self.__open -= 1
+                condition.notify()
+            return None
+        with condition:
+            self._get_data(key=_Keys.IDLE).append((smtp, time.monotonic()))
+            condition.notify()
+
+    # #[PRIVATE PROPERTIES]###########################################################
+    @property
+    def __open(self) -> int:
+        """Return the number of sessions owned by the pool.
+
+        ### Returns:
+        int - Sessions handed out plus idle sessions.
+        """
+        return self._get_data(key=_Keys.OPEN)  # type: ignore
+
+    @__open.setter
+    def __open(self, value: int) -> None:
+        """Store the number of sessions owned by the pool.
+
+        ### Arguments:
+        * value: int - Session count.
+        """
+        self._set_data(key=_Keys.OPEN, value=value)
+
+    # #[PRIVATE METHODS]##############################################################
+    def __connect(self) -> Optional[smtplib.SMTP]:
+        """Open, secure, and authenticate one session with port failover.
+
+        ### Returns:
+        Optional[smtplib.SMTP] - Ready session or `None`.
+        """
+        host: str = self._get_data(key=_Keys.HOST)  # type: ignore
+        port: Optional[int] = self._get_data(key=_Keys.PORT)
+        timeout: float = self._get_data(key=_Keys.TIMEOUT)  # type: ignore
+        ports: List[int] = [port] if port is not None else self.DEFAULT_PORTS
+        for item in ports:
+            smtp: Optional[smtplib.SMTP] = None
+            try:
+                if item == 465:
+                    smtp = smtplib.SMTP_SSL(
+                        host=host,
+                        port=item,
+                        timeout=timeout,
+                        context=ssl.create_default_context(),
+                    )
+                else:
+                    smtp = smtplib.SMTP(host=host, port=item, timeout=timeout)
+                smtp.ehlo()
+                if item != 465 and smtp.has_extn("starttls"):
+                    smtp.starttls(context=ssl.create_default_context())
+                    smtp.ehlo()
+                user: Optional[str] = self._get_data(key=_Keys.USER)
+                if user and smtp.has_extn("auth"):
+                    smtp.login(user, self._get_data(key=_Keys.PASSWORD) or "")
+            except (OSError, smtplib.SMTPException):
+                if smtp is not None:
+                    self.__quit(smtp)
+                continue
+            # remember the working port for the process lifetime
+            self._set_data(key=_Keys.PORT, value=item)
+            self._set_data(key=_Keys.CONNECTS, value=self.connects + 1)
+            return smtp
+        return None
+
+    def __healthy(self, smtp: smtplib.SMTP) -> bool:
+        """Probe an idle session with `NOOP`.
+
+        ### Arguments:
+        * smtp: smtplib.SMTP - Idle session.
+
+        ### Returns:
+        bool - `True` when the server answered with 250.
+        """
+        try:
+            return smtp.noop()[0] == 250
+        except (OSError, smtplib.SMTPException):
+            return False
+
+    def __quit(self, smtp: smtplib.SMTP) -> None:
+        """Close a session, ignoring errors from a dead connection.
+
+        ### Arguments:
+        * smtp: smtplib.SMTP - Session to close.
+        """
+        try:
+            smtp.quit()
+        except (OSError, smtplib.SMTPException):
+            try:
+                smtp.close()
+            except OSError:
+                pass
+
+
+class MessageDigest(BData):
+    """Collect digestible messages per recipient for a short window."""
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self, window: float) -> None:
+        """Initialize the digest buffer.
+
+        ### Arguments:
+        * window: float - Seconds between the first buffered message of a
+          recipient and the digest delivery.
+        """
+        self._set_data(key=_Keys.WINDOW, value=float(window), set_default_type=float)
+        self._set_data(key=_Keys.DIGESTS, value={}, set_default_type=Dict)
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def next_deadline(self) -> Optional[float]:
+        """Return the earliest digest deadline.
+
+        ### Returns:
+        Optional[float] - Monotonic deadline or `None` when empty.
+        """
+        digests: Dict[str, Tuple[float, List[Message]]] = self._get_data(
+            key=_Keys.DIGESTS
+        )  # type: ignore
+        if not digests:
+            return None
+        return min(item[0] for item in digests.values())
+
+    # #[PUBLIC METHODS]###############################################################
+    def add(self, recipient: str, message: Message) -> None:
+        """Buffer a message for one recipient.
+
+        ### Arguments:
+        * recipient: str - Recipient address.
+        * message: Message - Message to include in the digest.
+        """
+        digests: Dict[str, Tuple[float, List[Message]]] = self._get_data(
+            key=_Keys.DIGESTS
+        )  # type: ignore
+        if recipient not in digests:
+            digests[recipient] = (
+                time.monotonic() + self._get_data(key=_Keys.WINDOW),
+                [],
+            )
+        digests[recipient][1].append(message)
+
+    def pop_due(self, force: bool = False) -> List[Tuple[str, List[Message]]]:
+        """Remove and return digests whose window elapsed.
+
+        ### Arguments:
+        * force: bool - Return all digests regardless of their deadline.
+
+        ### Returns:
+        List[Tuple[str, List[Message]]] - Recipient and buffered messages.
+        """
+        digests: Dict[str, Tuple[float, List[Message]]] = self._get_data(
+            key=_Keys.DIGESTS
+        )  # type: ignore
+        now: float = time.monotonic()
+        due: List[str] = [
+            name for name, item in digests.items() if force or item[0] <= now
+        ]
+        return [(name, digests.pop(name)[1]) for name in due]
+
+
+class _Runtime(Thread, ThPluginMixin):
+    """Send messages from one dispatcher channel over a reused SMTP session."""
+
+    # #[CONSTANTS]####################################################################
+    # failed e-mails are retried after this delay up to `RETRY_ATTEMPTS` times,
+    # the oldest ones are dropped when more than `RETRY_LIMIT` are waiting
+    RETRY_ATTEMPTS: int = 4
+    RETRY_DELAY: float = 900.0
+    RETRY_LIMIT: int = 1500
+    # dispatcher message ids of an e-mail, logged as `message_id=`
+    TRACE_HEADER: str = "X-AASd-Message-Id"
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self, context: PluginContext) -> None:
+        """Initialize the SMTP communication runtime.
+
+        ### Arguments:
+        * context: PluginContext - Plugin runtime context.
+        """
+        Thread.__init__(self, name=context.instance_name)
+        self.daemon = True
+        self._context: PluginContext = context
+        self._health = PluginHealthSnapshot(health=PluginHealth.UNKNOWN)
+        self._stop_event = Event()
+        self._queue: Optional[Queue] = None
+        self._state = PluginStateSnapshot(state=PluginState.CREATED)
+        config: Mapping[str, Any] = context.config
+        self._set_data(
+            key=_Keys.POOL,
+            value=SmtpConnectionPool(
+                server=str(config.get(_Keys.SMTP_SERVER) or "localhost"),
+                user=config.get(_Keys.SMTP_USER),
+                password=self.__password(),
+                idle_timeout=float(config.get(_Keys.SMTP_IDLE_TIMEOUT) or 60),
+            ),
+            set_default_type=SmtpConnectionPool,
+        )
+        self._set_data(
+            key=_Keys.DIGESTS,
+            value=MessageDigest(float(config.get(_Keys.DIGEST_WINDOW) or 0)),
+            set_default_type=MessageDigest,
+        )
+        self._set_data(key=_Keys.DEFERRED, value=deque(maxlen=self.RETRY_LIMIT))
+        self._set_data(key=_Keys.ATTEMPTS, value={}, set_default_type=Dict)
+
+    def initialize(self) -> None:
+        """Register the consumer queue before startup."""
+        context: Optional[PluginContext] = self._context
+        if context is None:
+            self._state = PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Plugin context is not initialized.",
+                stopped_at=int(time.time()),
+            )
+            return None
+        self._queue = context.dispatcher.register_consumer(
+            int(context.config[PluginCommonKeys.CHANNEL])
+        )
+        window: float = float(context.config.get(_Keys.COALESCE_WINDOW) or 0)
+        if window > 0:
+            self._set_data(
+                key=_Keys.COALESCER,
+                value=MessageCoalescer(
+                    self._queue,
+                    window=window,
+                    max_size=int(context.config.get(_Keys.BATCH_SIZE) or 100),
+                ),
+                set_default_type=Optional[MessageCoalescer],
+            )
+        self._state = PluginStateSnapshot(state=PluginState.INITIALIZED)
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def deferred(self) -> int:
+        """Return the number of e-mails waiting for a retry.
+
+        ### Returns:
+        int - Deferred e-mails.
+        """
+        return len(self._get_data(key=_Keys.DEFERRED))  # type: ignore
+
+    @property
+    def pool(self) -> SmtpConnectionPool:
+        """Return the SMTP session pool.
+
+        ### Returns:
+        SmtpConnectionPool - Pool used for every delivery.
+        """
+        return self._get_data(key=_Keys.POOL)  # type: ignore
+
+    # #[PUBLIC METHODS]################################################################
+    def build_email(
+        self, message: Message, recipients: List[str]
+    ) -> Optional[EmailMessage]:
+        """Build one e-mail from a dispatcher message.
+
+        ### Arguments:
+        * message: Message - Dispatcher message.
+        * recipients: List[str] - Visible recipients, the first one is `To`.
+
+        ### Returns:
+        Optional[EmailMessage] - E-mail or `None` for unsupported payloads.
+        """
+        msg: EmailMessage = self.__headers(message.subject, message, recipients)
+        footer: str = f"\n-- \n{message.footer}\n" if message.footer else ""
+        mmessages: Optional[Dict[str, Any]] = message.mmessages
+        if mmessages is None:
+            msg.set_content(
+                self.__text(message.messages) + footer, subtype="plain", charset="utf-8"
+            )
+            return msg
+        if Multipart.PLAIN not in mmessages and Multipart.HTML not in mmessages:
+            return None
+        if Multipart.PLAIN in mmessages:
+            msg.set_content(
+                self.__text(mmessages[Multipart.PLAIN]) + footer,
+                subtype="plain",
+                charset="utf-8",
+            )
+        if Multipart.HTML in mmessages:
+            html: str = self.__text(mmessages[Multipart.HTML])
+            if Multipart.PLAIN in mmessages:
+                msg.add_alternative(html, subtype="html", charset="utf-8")
+            else:
+                msg.set_content(html, subtype="html", charset="utf-8")
+        return msg
+
+    def build_digest(
+        self, recipient: str, messages: List[Message]
+    ) -> Optional[EmailMessage]:
+        """Build one e-mail summarizing several messages for one recipient.
+
+        ### Arguments:
+        * recipient: str - Recipient address.
+        * messages: List[Message] - Buffered plain-text messages.
+
+        ### Returns:
+        Optional[EmailMessage] - Digest e-mail.
+        """
+        if len(messages) == 1:
+            return self.build_email(messages[0], [recipient])
+        lines: List[str] = []
+        for message in messages:
+            lines.append(f"== {message.subject or '(no subject)'} ==")
+            body = message.mmessages.get(Multipart.PLAIN) if message.mmessages else None
+            lines.append(self.__text(body if body is not None else message.messages))
+        subject: str = f"[{len(messages)} messages] {messages[0].subject or ''}".strip()
+        msg: EmailMessage = self.__headers(subject, messages[0], [recipient])
+        msg.replace_header(
+            self.TRACE_HEADER, "|".join(message.message_id for message in messages)
+        )
+        footer: Optional[str] = messages[-1].footer
+        msg.set_content(
+            "\n".join(lines) + (f"\n-- \n{footer}\n" if footer else ""),
+            subtype="plain",
+            charset="utf-8",
+        )
+        return msg
+
+    def deliver(self, emails: List[EmailMessage]) -> int:
+        """Send e-mails over one pooled session, reconnecting once on failure.
+
+        E-mails rejected with a permanent `5xx` reply are dropped without
+        closing the session. Transient failures defer the remaining e-mails,
+        each one at most `RETRY_ATTEMPTS` times.
+
+        ### Arguments:
+        * emails: List[EmailMessage] - E-mails to send.
+
+        ### Returns:
+        int - Number of e-mails sent; the others are deferred for retry.
+        """
+        context: PluginContext = self._context  # type: ignore
+        pending: List[EmailMessage] = list(emails)
+        sent: int = 0
+        for _ in range(2):
+            if not pending:
+                break
+            smtp: Optional[smtplib.SMTP] = self.pool.acquire(timeout=30.0)
+            if smtp is None:
+                context.logger.message_error = "cannot open smtp session"
+                break
+            broken: bool = False
+            while pending:
+                msg: EmailMessage = pending[0]
+                try:
+                    smtp.send_message(msg)
+                except smtplib.SMTPRecipientsRefused as ex:
+                    context.logger.message_error = (
+                        f"recipients refused: {ex} {self.__log_fields(msg)}"
+                    )
+                    self.__forget(pending.pop(0))
+                    continue
+                except smtplib.SMTPResponseException as ex:
+                    if ex.smtp_code >= 500:
+                        context.logger.message_error = (
+                            f"message to: {msg['To']} rejected: {ex} "
+                            f"{self.__log_fields(msg)}"
+                        )
+                        self.__forget(pending.pop(0))
+                        continue
+                    context.logger.message_warning = f"smtp session failed: {ex}"
+                    broken = True
+                    break
+                except (OSError, smtplib.SMTPException) as ex:
+                    context.logger.message_warning = f"smtp session failed: {ex}"
+                    broken = True
+                    break
+                self.__forget(pending.pop(0))
+                sent += 1
+                context.logger.message_notice = (
+                    f"message was send to: {msg['To']} {self.__log_fields(msg)}"
+                )
+            self.pool.release(smtp, broken=broken)
+        if pending:
+            self.__defer(pending)
+        return sent
+
+    def health(self) -> PluginHealthSnapshot:
+        """Return the current health snapshot.
+
+        ### Returns:
+        PluginHealthSnapshot - Current plugin health snapshot.
+        """
+        health: Optional[PluginHealthSnapshot] = self._health
+        if health is None:
+            return PluginHealthSnapshot(
+                health=PluginHealth.UNKNOWN,
+                message="Health snapshot is not initialized.",
+            )
+        return health
+
+    def process(self, messages: List[Message], force: bool = False) -> int:
+        """Convert messages to e-mails, apply digesting, and deliver them.
+
+        ### Arguments:
+        * messages: List[Message] - Messages pulled from the consumer queue.
+        * force: bool - Flush all buffered digests immediately.
+
+        ### Returns:
+        int - Number of e-mails sent.
+        """
+        context: PluginContext = self._context  # type: ignore
+        digest: MessageDigest = self._get_data(key=_Keys.DIGESTS)  # type: ignore
+        window: float = float(context.config.get(_Keys.DIGEST_WINDOW) or 0)
+        emails: List[EmailMessage] = []
+        for message in messages:
+            recipients: List[str] = self.__recipients(message)
+            if not recipients:
+                context.logger.message_error = (
+                    f"message has no recipients {message.log_fields}"
+                )
+                continue
+            if window > 0 and not (
+                message.mmessages and Multipart.HTML in message.mmessages
+            ):
+                for recipient in recipients:
+                    digest.add(recipient, message)
+                continue
+            msg: Optional[EmailMessage] = self.build_email(message, recipients)
+            if msg is None:
+                context.logger.message_error = (
+                    f"the message format cannot be recognized {message.log_fields}"
+                )
+                continue
+            emails.append(msg)
+        for recipient, items in digest.pop_due(force=force):
+            msg = self.build_digest(recipient, items)
+            if msg is not None:
+                emails.append(msg)
+        emails.extend(self.__pop_retries(force))
+        if not emails:
+            return 0
+        sent: int = self.deliver(emails)
+        if sent == len(emails):
+            self._health = PluginHealthSnapshot(
+                health=PluginHealth.HEALTHY,
+                last_ok_at=int(time.time()),
+                message=f"{sent} message(s) sent.",
+            )
+        else:
+            self._health = PluginHealthSnapshot(
+                health=PluginHealth.DEGRADED,
+                last_error_at=int(time.time()),
+                message=f"{len(emails) - sent} message(s) deferred.",
+            )
+        return sent
+
+    def run(self) -> None:
+        """Consume messages in batches until stopped."""
+        stop_event: Optional[Event] = self._stop_event
+        queue: Optional[Queue] = self._queue
+        context: Optional[PluginContext] = self._context
+        if stop_event is None or queue is None or context is None:
+            self._health = PluginHealthSnapshot(
+                health=PluginHealth.UNHEALTHY,
+                last_error_at=int(time.time()),
+                message="Runtime is not initialized.",
+            )
+            self._state = PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Runtime is not initialized.",
+                stopped_at=int(time.time()),
+            )
+            return None
+        digest: MessageDigest = self._get_data(key=_Keys.DIGESTS)  # type: ignore
+        batch_size: int = int(context.config.get(_Keys.BATCH_SIZE) or 100)
+        coalescer: Optional[MessageCoalescer] = self._get_data(
+            key=_Keys.COALESCER, default_value=None
+        )
+        source: Union[Queue, MessageCoalescer] = coalescer or queue
+        while not stop_event.is_set():
+            timeout: float = 1.0
+            deadline: Optional[float] = digest.next_deadline
+            if deadline is not None:
+                timeout = min(timeout, max(0.0, deadline - time.monotonic()))
+            batch: List[Message] = []
+            try:
+                batch.append(source.get(block=True, timeout=timeout))
+                while len(batch) < batch_size:
+                    batch.append(source.get_nowait())
+            except Empty:
+                pass
+            self.process(batch)
+            for _ in batch:
+                source.task_done()
+            self.pool.prune()
+        # flush buffered digests and anything queued before the stop request
+        batch = coalescer.flush() if coalescer is not None else []
+        try:
+            while True:
+                batch.append(queue.get_nowait())
+        except Empty:
+            pass
+        self.process(batch, force=True)
+        self.pool.close()
+        state: Optional[PluginStateSnapshot] = self._state
+        self._state = PluginStateSnapshot(
+            state=PluginState.STOPPED,
+            started_at=state.started_at if state is not None else None,
+            stopped_at=int(time.time()),
+        )
+
+    def start(self) -> None:
+        """Start the runtime thread."""
+        self._state = PluginStateSnapshot(
+            state=PluginState.STARTING,
+            started_at=int(time.time()),
+        )
+        Thread.start(self)
+
+    def state(self) -> PluginStateSnapshot:
+        """Return the current lifecycle snapshot.
+
+        ### Returns:
+        PluginStateSnapshot - Current plugin lifecycle snapshot.
+        """
+        state: Optional[PluginStateSnapshot] = self._state
+        if state is None:
+            return PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Lifecycle snapshot is not initialized.",
+            )
+        if self.is_alive() and state.state == PluginState.STARTING:
+            state = PluginStateSnapshot(
+                state=PluginState.RUNNING,
+                started_at=state.started_at,
+            )
+            self._state = state
+        return state
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Request plugin shutdown.
+
+        ### Arguments:
+        * timeout: Optional[float] - Optional join timeout.
+        """
+        stop_event: Optional[Event] = self._stop_event
+        state: Optional[PluginStateSnapshot] = self._state
+        if stop_event is None:
+            self._state = PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Stop event is not initialized.",
+                stopped_at=int(time.time()),
+            )
+            return None
+        if state is not None and state.state not in (
+            PluginState.STOPPED,
+            PluginState.FAILED,
+        ):
+            self._state = PluginStateSnapshot(
+                state=PluginState.STOPPING,
+                started_at=state.started_at,
+            )
+        stop_event.set()
+        if self.is_alive():
+            self.join(timeout=timeout)
+        state = self._state
+        self._state = PluginStateSnapshot(
+            state=PluginState.STOPPED,
+            started_at=state.started_at if state is not None else None,
+            stopped_at=int(time.time()),
+        )
+
+    # #[PRIVATE METHODS]###############################################################
+    def __defer(self, emails: List[EmailMessage]) -> None:
+        """Queue failed e-mails for a retry, dropping exhausted ones.
+
+        ### Arguments:
+        * emails: List[EmailMessage] - E-mails that could not be sent.
+        """
+        context: PluginContext = self._context  # type: ignore
+        deferred: Deque[Tuple[float, EmailMessage]] = self._get_data(
+            key=_Keys.DEFERRED
+        )  # type: ignore
+        attempts: Dict[str, int] = self._get_data(key=_Keys.ATTEMPTS)  # type: ignore
+        retry_at: float = time.monotonic() + self.RETRY_DELAY
+        count: int = 0
+        for msg in emails:
+            attempt: int = attempts.get(str(msg["Message-Id"]), 0) + 1
+            if attempt > self.RETRY_ATTEMPTS:
+                context.logger.message_error = (
+                    f"message to: {msg['To']} dropped after {attempt - 1} retries "
+                    f"{self.__log_fields(msg)}"
+                )
+                self.__forget(msg)
+                continue
+            if len(deferred) == deferred.maxlen:
+                self.__forget(deferred.popleft()[1])
+            attempts[str(msg["Message-Id"])] = attempt
+            deferred.append((retry_at, msg))
+            count += 1
+        if count:
+            context.logger.message_error = f"{count} message(s) deferred for retry"
+
+    def __forget(self, msg: EmailMessage) -> None:
+        """Drop the retry counter of an e-mail that left the retry cycle.
+
+        ### Arguments:
+        * msg: EmailMessage - Sent, rejected, or dropped e-mail.
+        """
+        attempts: Dict[str, int] = self._get_data(key=_Keys.ATTEMPTS)  # type: ignore
+        attempts.pop(str(msg["Message-Id"]), None)
+
+    def __headers(
+        self, subject: Optional[str], message: Message, recipients: List[str]
+    ) -> EmailMessage:
+        """Return an e-mail with envelope headers set.
+
+        ### Arguments:
+        * subject: Optional[str] - Subject header.
+        * message: Message - Source message for sender and reply-to.
+        * recipients: List[str] - Visible recipients, the first one is `To`.
+
+        ### Returns:
+        EmailMessage - E-mail without content.
+        """
+        config: Mapping[str, Any] = self._context.config  # type: ignore
+        msg = EmailMessage()
+        if subject:
+            msg["Subject"] = subject
+        msg["From"] = message.sender or str(config.get(_Keys.ADDRESS_FROM) or "")
+        if message.reply_to:
+            msg["Reply-To"] = message.reply_to
+        msg["To"] = recipients[0]
+        if len(recipients) > 1:
+            msg["Cc"] = ", ".join(recipients[1:])
+        bcc: List[str] = self.__as_list(config.get(_Keys.DEBUG_BCC))
+        if bcc:
+            msg["Bcc"] = ", ".join(bcc)
+        msg["Message-Id"] = make_msgid()
+        msg["Date"] = MDateTime.email_date()
+        msg[self.TRACE_HEADER] = message.message_id
+        return msg
+
+    def __as_list(self, value: Optional[Union[str, List[str]]]) -> List[str]:
+        """Normalize an address or address list.
+
+        ### Arguments:
+        * value: Optional[Union[str, List[str]]] - Address configuration.
+
+        ### Returns:
+        List[str] - Non-empty addresses.
+        """
+        if not value:
+            return []
+        if isinstance(value, str):
+            return [value]
+        return [str(item) for item in value if item]
+
+    def __log_fields(self, msg: EmailMessage) -> str:
+        """Return `channel=` and `message_id=` tokens for an e-mail log line.
+
+        ### Arguments:
+        * msg: EmailMessage - E-mail built by this runtime.
+
+        ### Returns:
+        str - Consumed channel and dispatcher message ids of the e-mail.
+        """
+        context: PluginContext = self._context  # type: ignore
+        return (
+            f"channel={context.config.get(PluginCommonKeys.CHANNEL)} "
+            f"message_id={msg[self.TRACE_HEADER]}"
+        )
+
+    def __password(self) -> Optional[str]:
+        """Return `smtp_pass` decrypted by the host.
+
+        ### Returns:
+        Optional[str] - Plain text password or `None`.
+        """
+        context: PluginContext = self._context  # type: ignore
+        return context.secret(_Keys.SMTP_PASS)
+
+    def __pop_retries(self, force: bool) -> List[EmailMessage]:
+        """Return deferred e-mails whose retry delay elapsed.
+
+        ### Arguments:
+        * force: bool - Return every deferred e-mail.
+
+        ### Returns:
+        List[EmailMessage] - E-mails to send again.
+        """
+        deferred: Deque[Tuple[float, EmailMessage]] = self._get_data(
+            key=_Keys.DEFERRED
+        )  # type: ignore
+        out: List[EmailMessage] = []
+        now: float = time.monotonic()
+        while deferred and (force or deferred[0][0] <= now):
+            out.append(deferred.popleft()[1])
+        return out
+
+    def __recipients(self, message: Message) -> List[str]:
+        """Return message recipients or the configured default recipients.
+
+        ### Arguments:
+        * message: Message - Dispatcher message.
+
+        ### Returns:
+        List[str] - Recipient addresses.
+        """
+        recipients: List[str] = self.__as_list(message.to)
+        if recipients:
+            return recipients
+        return self.__as_list(self._context.config.get(_Keys.ADDRESS_TO))  # type: ignore
+
+    def __text(self, value: Any) -> str:
+        """Join message fragments into one text block.
+
+        ### Arguments:
+        * value: Any - Fragment list or string.
+
+        ### Returns:
+        str - Text with one fragment per line.
+        """
+        if isinstance(value, str):
+            return f"{value}\n"
+        return "".join(f"{line}\n" for line in value or [])
+
+
+def get_plugin_spec() -> PluginSpec:
+    """Return the plugin spec for `smtp`.
+
+    ### Returns:
+    PluginSpec - Plugin manifest.
+    """
+    schema = PluginConfigSchema(
+        title="SMTP communication plugin.",
+        description=(
+            "Delivers dispatcher messages as e-mail over persistent SMTP "
+            "sessions with optional per-recipient digests."
+        ),
+        fields=[
+            PluginConfigField(
+                name=PluginCommonKeys.CHANNEL,
+                field_type=int,
+                default=1,
+                required=True,
+                description="Dispatcher channel consumed by this plugin instance.",
+            ),
+            PluginConfigField(
+                name=_Keys.SMTP_SERVER,
+                field_type=str,
+                default="localhost",
+                required=True,
+                description=(
+                    "SMTP host with optional `:port`; without a port 587, 465, "
+                    "and 25 are tried in order."
+                ),
+            ),
+            PluginConfigField(
+                name=_Keys.SMTP_USER,
+                field_type=str,
+                default="",
+                required=False,
+                description="SMTP login, authentication is skipped when empty.",
+            ),
+            PluginConfigField(
+                name=_Keys.SMTP_PASS,
+                field_type=str,
+                default="",
+                required=False,
+                secret=True,
+                description="SMTP password encrypted with `aasd.py -p`.",
+            ),
+            PluginConfigField(
+                name=_Keys.ADDRESS_FROM,
+                field_type=str,
+                default="root@localhost",
+                required=True,
+                description="Default sender address.",
+            ),
+            PluginConfigField(
+                name=_Keys.ADDRESS_TO,
+                field_type=list,
+                default=["root@localhost"],
+                required=True,
+                description="Default recipients for messages without `to`.",
+            ),
+            PluginConfigField(
+                name=_Keys.DEBUG_BCC,
+                field_type=list,
+                default=[],
+                required=False,
+                description="Addresses receiving a blind copy of every e-mail.",
+            ),
+            PluginConfigField(
+                name=_Keys.SMTP_IDLE_TIMEOUT,
+                field_type=int,
+                default=60,
+                required=False,
+                description="Seconds after which an idle SMTP session is closed.",
+            ),
+            PluginConfigField(
+                name=_Keys.BATCH_SIZE,
+                field_type=int,
+                default=100,
+                required=False,
+                description="Maximum number of queued messages sent per session.",
+            ),
+            PluginConfigField(
+                name=_Keys.DIGEST_WINDOW,
+                field_type=int,
+                default=0,
+                required=False,
+                description=(
+                    "Seconds to collect plain-text messages per recipient into "
+                    "one digest e-mail, 0 disables digests."
+                ),
+            ),
+            PluginConfigField(
+                name=_Keys.COALESCE_WINDOW,
+                field_type=int,
+                default=0,
+                required=False,
+                description=(
+                    "Seconds to merge messages with the same subject and "
+                    "recipients into one e-mail, 0 disables coalescing."
+                ),
+            ),
+        ],
+    )
+    return PluginSpec(
+        api_version=1,
+        config_schema=schema,
+        plugin_id="aasd.smtp",
+        plugin_kind=PluginKind.COMMUNICATION,
+        plugin_name="smtp",
+        runtime_factory=_Runtime,
+        description="SMTP communication plugin with pooled sessions.",
+    )
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,396 @@
+# -*- coding: UTF-8 -*-
+"""
+Load generator worker plugin.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-15
+
+Purpose: Publish synthetic messages of configurable shape at a fixed rate or
+as fast as possible, to measure dispatcher and communication plugin throughput.
+"""
+
+import time
+
+from threading import Event, Thread
+from typing import List, Optional
+
+from libs.com.message import Message, Multipart
+from libs.plugins import (
+    PluginContext,
+    PluginHealth,
+    PluginHealthSnapshot,
+    PluginKind,
+    PluginSpec,
+    PluginState,
+    PluginStateSnapshot,
+    ThPluginMixin,
+)
+from libs.templates import PluginConfigField, PluginConfigSchema
+
+from jsktoolbox.attribtool import ReadOnlyClass
+
+
+class _Keys(object, metaclass=ReadOnlyClass):
+    """Plugin configuration keys."""
+
+    COUNT: str = "count"
+    FRAGMENTS: str = "fragments"
+    LINE_SIZE: str = "line_size"
+    RATE: str = "rate"
+    RECIPIENTS: str = "recipients"
+    SHAPE: str = "shape"
+    TARGET_CHANNELS: str = "target_channels"
+
+
+class Shape(object, metaclass=ReadOnlyClass):
+    """Expose generated message shapes."""
+
+    # #[CONSTANTS]####################################################################
+    FRAGMENTS: str = "fragments"
+    LINE: str = "line"
+    MIXED: str = "mixed"
+    MULTIPART: str = "multipart"
+    RECIPIENTS: str = "recipients"
+
+
+# shapes cycled by `Shape.MIXED`
+MIXED_SHAPES: List[str] = [
+    Shape.LINE,
+    Shape.FRAGMENTS,
+    Shape.MULTIPART,
+    Shape.RECIPIENTS,
+]
+
+
+def build_message(
+    shape: str,
+    seq: int,
+    origin: str,
+    fragments: int = 20,
+    recipients: int = 50,
+    line_size: int = 80,
+) -> Message:
+    """Return one generated message.
+
+    The subject carries `seq=` and `sent=` tokens, the latter with the
+    `time.monotonic()` value at build time, so a consumer in the same process
+    can measure the delivery latency.
+
+    ### Arguments:
+    * shape: str - One of `Shape` values; `Shape.MIXED` cycles by `seq`.
+    * seq: int - Message sequence number.
+    * origin: str - Publishing instance name.
+    * fragments: int - Body lines of multi-fragment and multipart messages.
+    * recipients: int - Recipients of `Shape.RECIPIENTS` messages.
+    * line_size: int - Characters per body line.
+
+    ### Returns:
+    Message - Message without a channel.
+    """
+    if shape == Shape.MIXED:
+        shape = MIXED_SHAPES[seq % len(MIXED_SHAPES)]
+    line: str = (f"{origin} {seq} " * (line_size // 8 + 1))[:line_size]
+    message = Message()
+    message.subject = f"[{origin}] {shape} seq={seq} sent={time.monotonic():.6f}"
+    if shape == Shape.FRAGMENTS:
+        message.messages = [line] * max(fragments, 1)
+    elif shape == Shape.MULTIPART:
+        message.mmessages = {
+            Multipart.PLAIN: [line] * max(fragments, 1),
+            Multipart.HTML: [f"<p>{line}</p>"] * max(fragments, 1),
+        }
+    elif shape == Shape.RECIPIENTS:
+        message.messages = [line]
+        message.to = [f"user{idx}@example.com" for idx in range(max(recipients, 1))]
+    else:
+        message.messages = [line]
+    return message
+
+
+class _Runtime(Thread, ThPluginMixin):
+    """Publish generated messages round-robin to the target channels."""
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self, context: PluginContext) -> None:
+        """Initialize the load generator runtime.
+
+        ### Arguments:
+        * context: PluginContext - Plugin runtime context.
+        """
+        Thread.__init__(self, name=context.instance_name)
+        self.daemon = True
+        self._context: PluginContext = context
+        self._health = PluginHealthSnapshot(health=PluginHealth.UNKNOWN)
+        self._stop_event = Event()
+        self._state = PluginStateSnapshot(state=PluginState.CREATED)
+
+    def initialize(self) -> None:
+        """Prepare the runtime before startup."""
+        self._state = PluginStateSnapshot(state=PluginState.INITIALIZED)
+
+    # #[PUBLIC METHODS]################################################################
+    def health(self) -> PluginHealthSnapshot:
+        """Return the current health snapshot.
+
+        ### Returns:
+        PluginHealthSnapshot - Current plugin health snapshot.
+        """
+        health: Optional[PluginHealthSnapshot] = self._health
+        if health is None:
+            return PluginHealthSnapshot(
+                health=PluginHealth.UNKNOWN,
+                message="Health snapshot is not initialized.",
+            )
+        return health
+
+    def run(self) -> None:
+        """Publish `count` messages at `rate` per second, then stop."""
+        stop_event: Optional[Event] = self._stop_event
+        context: Optional[PluginContext] = self._context
+        if stop_event is None or context is None:
+            reason: str = (
+                "Stop event is not initialized."
+                if stop_event is None
+                else "Plugin context is not initialized."
+            )
+            self._health = PluginHealthSnapshot(
+                health=PluginHealth.UNHEALTHY,
+                last_error_at=int(time.time()),
+                message=reason,
+            )
+            self._state = PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message=reason,
+                stopped_at=int(time.time()),
+            )
+            return None
+        config = context.config
+        targets: List[int] = [
+            int(item)
+            for item in config.get(_Keys.TARGET_CHANNELS) or []
+            if str(item).strip()
+        ]
+        if not targets:
+            self._health = PluginHealthSnapshot(
+                health=PluginHealth.HEALTHY,
+                last_ok_at=int(time.time()),
+                message="No target channels configured, generator is idle.",
+            )
+            stop_event.wait()
+            self.__finish()
+            return None
+
+        rate: int = int(config.get(_Keys.RATE) or 0)
+        count: int = int(config.get(_Keys.COUNT) or 0)
+        shape: str = str(config.get(_Keys.SHAPE) or Shape.LINE)
+        fragments: int = int(config.get(_Keys.FRAGMENTS) or 1)
+        recipients: int = int(config.get(_Keys.RECIPIENTS) or 1)
+        line_size: int = int(config.get(_Keys.LINE_SIZE) or 1)
+        interval: float = 1.0 / rate if rate > 0 else 0.0
+        published: int = 0
+        throttled: int = 0
+        seq: int = 0
+        started: float = time.monotonic()
+        deadline: float = started
+        context.logger.message_info = (
+            f"generating shape={shape} rate={rate or 'max'} "
+            f"count={count or 'unlimited'} targets={targets}"
+        )
+        while not stop_event.is_set() and (count == 0 or seq < count):
+            message: Message = build_message(
+                shape=shape,
+                seq=seq,
+                origin=context.instance_name,
+                fragments=fragments,
+                recipients=recipients,
+                line_size=line_size,
+            )
+            message.channel = targets[seq % len(targets)]
+            if context.dispatcher.publish(message):
+                published += 1
+            else:
+                throttled += 1
+            seq += 1
+            if interval:
+                deadline += interval
+                delay: float = deadline - time.monotonic()
+                if delay > 0:
+                    stop_event.wait(delay)
+                elif delay < -1.0:
+                    # more than a second behind, do not burst to catch up
+                    deadline = time.monotonic()
+        elapsed: float = max(time.monotonic() - started, 1e-9)
+        summary: str = (
+            f"generator finished: published={published} throttled={throttled} "
+            f"elapsed={elapsed:.3f}s rate={published / elapsed:.1f}/s"
+        )
+        context.logger.message_info = summary
+        self._health = PluginHealthSnapshot(
+            health=PluginHealth.HEALTHY,
+            last_ok_at=int(time.time()),
+            message=summary,
+        )
+        self.__finish()
+
+    def start(self) -> None:
+        """Start the runtime thread."""
+        self._state = PluginStateSnapshot(
+            state=PluginState.STARTING,
+            started_at=int(time.time()),
+        )
+        Thread.start(self)
+
+    def state(self) -> PluginStateSnapshot:
+        """Return the current lifecycle snapshot.
+
+        ### Returns:
+        PluginStateSnapshot - Current plugin lifecycle snapshot.
+        """
+        state: Optional[PluginStateSnapshot] = self._state
+        if state is None:
+            return PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Lifecycle snapshot is not initialized.",
+            )
+        if self.is_alive() and state.state == PluginState.STARTING:
+            state = PluginStateSnapshot(
+                state=PluginState.RUNNING,
+                started_at=state.started_at,
+            )
+            self._state = state
+        return state
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Request plugin shutdown.
+
+        ### Arguments:
+        * timeout: Optional[float] - Optional join timeout.
+        """
+        stop_event: Optional[Event] = self._stop_event
+        if stop_event is None:
+            self._health = PluginHealthSnapshot(
+                health=PluginHealth.UNHEALTHY,
+                last_error_at=int(time.time()),
+                message="Stop event is not initialized.",
+            )
+            self._state = PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Stop event is not initialized.",
+                stopped_at=int(time.time()),
+            )
+            return None
+        state: Optional[PluginStateSnapshot] = self._state
+        if state is not None and state.state not in (
+            PluginState.STOPPED,
+            PluginState.FAILED,
+        ):
+            self._state = PluginStateSnapshot(
+                state=PluginState.STOPPING,
+                started_at=state.started_at,
+            )
+        stop_event.set()
+        if self.is_alive():
+            self.join(timeout=timeout)
+        self.__finish()
+
+    # #[PRIVATE METHODS]###############################################################
+    def __finish(self) -> None:
+        """Record the stopped lifecycle state."""
+        state: Optional[PluginStateSnapshot] = self._state
+        self._state = PluginStateSnapshot(
+            state=PluginState.STOPPED,
+            started_at=state.started_at if state is not None else None,
+            stopped_at=int(time.time()),
+        )
+
+
+def get_plugin_spec() -> PluginSpec:
+    """Return the plugin spec for `stress`.
+
+    ### Returns:
+    PluginSpec - Plugin manifest.
+    """
+    schema = PluginConfigSchema(
+        title="Load generator worker plugin.",
+        description=(
+            "Publishes synthetic messages to measure dispatcher and "
+            "communication plugin throughput; pair it with `nullsink`."
+        ),
+        fields=[
+            PluginConfigField(
+                name=_Keys.TARGET_CHANNELS,
+                field_type=list,
+                default=[],
+                required=False,
+                description=(
+                    "Channels receiving generated messages round-robin, "
+                    "empty keeps the generator idle."
+                ),
+                example=[900],
+            ),
+            PluginConfigField(
+                name=_Keys.RATE,
+                field_type=int,
+                default=100,
+                required=True,
+                description="Messages per second, 0 publishes as fast as possible.",
+            ),
+            PluginConfigField(
+                name=_Keys.COUNT,
+                field_type=int,
+                default=1000,
+                required=True,
+                description="Messages to publish before stopping, 0 is unlimited.",
+            ),
+            PluginConfigField(
+                name=_Keys.SHAPE,
+                field_type=str,
+                default=Shape.LINE,
+                required=True,
+                description="Generated message shape.",
+                choices=[
+                    Shape.LINE,
+                    Shape.FRAGMENTS,
+                    Shape.MULTIPART,
+                    Shape.RECIPIENTS,
+                    Shape.MIXED,
+                ],
+            ),
+            PluginConfigField(
+                name=_Keys.FRAGMENTS,
+                field_type=int,
+                default=20,
+                required=True,
+                description="Body lines of `fragments` and `multipart` messages.",
+            ),
+            PluginConfigField(
+                name=_Keys.RECIPIENTS,
+                field_type=int,
+                default=50,
+                required=True,
+                description="Recipients of `recipients` messages.",
+            ),
+            PluginConfigField(
+                name=_Keys.LINE_SIZE,
+                field_type=int,
+                default=80,
+                required=True,
+                description="Characters per body line.",
+            ),
+        ],
+    )
+    return PluginSpec(
+        api_version=1,
+        config_schema=schema,
+        plugin_id="example.stress",
+        plugin_kind=PluginKind.WORKER,
+        plugin_name="stress",
+        runtime_factory=_Runtime,
+        description="Example worker plugin generating synthetic message load.",
+    )
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,804 @@
+# -*- coding: UTF-8 -*-
+"""
+ZFS snapshot worker plugin.
+
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Create and rotate ZFS snapshots with batched `zfs` invocations.
+"""
+
+import re
+import subprocess
+
+from dataclasses import dataclass
+from time import time
+from threading import Event, Thread
+from typing import Dict, Iterable, List, Optional, Pattern, Set, Tuple
+
+from libs.com.message import Message
+from libs.plugins import (
+    NotificationScheduler,
+    PluginCommonKeys,
+    PluginContext,
+    PluginHealth,
+    PluginHealthSnapshot,
+    PluginKind,
+    PluginSpec,
+    PluginState,
+    PluginStateSnapshot,
+    ThPluginMixin,
+)
+from libs.templates import PluginConfigField, PluginConfigSchema
+from libs.tools import MDateTime, MIntervals
+
+from jsktoolbox.attribtool import ReadOnlyClass
+from jsktoolbox.basetool import BData
+
+
+class _Keys(object, metaclass=ReadOnlyClass):
+    """Plugin configuration and internal storage keys."""
+
+    # config keys
+    MAX_COUNT: str = "max_snapshot_count"
+    MIN_FREE_SPACE: str = "min_free_space"
+    RECURSIVE: str = "recursive"
+    SNAPSHOT_INTERVAL: str = "snapshot_interval"
+    VOLUMES: str = "volumes"
+    ZFS_COMMAND: str = "zfs_command"
+
+    # internal keys
+    CLIENT: str = "__zfs_client__"
+    COMMAND: str = "__zfs_command__"
+    DATASETS: str = "__datasets__"
+    ERRORS: str = "__errors__"
+    MOUNTPOINTS: str = "__mountpoints__"
+    SNAPSHOTS: str = "__snapshots__"
+
+
+@dataclass(slots=True, frozen=True)
+class ZfsEntry:
+    """Describe one line of `zfs list -Hp` output."""
+
+    name: str
+    used: Optional[int]
+    available: Optional[int]
+    mountpoint: Optional[str]
+    createtxg: int
+
+    @property
+    def dataset(self) -> str:
+        """Return the dataset part of the entry name.
+
+        ### Returns:
+        str - Dataset name without the snapshot suffix.
+        """
+        return self.name.split("@", 1)[0]
+
+    @property
+    def pool(self) -> str:
+        """Return the pool name of the entry.
+
+        ### Returns:
+        str - First component of the dataset name.
+        """
+        return self.dataset.split("/", 1)[0]
+
+    @property
+    def snapshot(self) -> Optional[str]:
+        """Return the snapshot name for snapshot entries.
+
+        ### Returns:
+        Optional[str] - Part after `@`, `None` for datasets.
+        """
+        if "@" in self.name:
+            return self.name.split("@", 1)[1]
+        return None
+
+
+class ZfsInventory(BData):
+    """Hold the datasets and snapshots relevant for one snapshot cycle.
+
+    The inventory is built from a single streamed `zfs list` call. Only pool
+    roots, configured volumes, and (in recursive mode) their descendants are
+    kept, so memory stays proportional to the managed datasets rather than to
+    the whole host.
+    """
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self) -> None:
+        """Initialize an empty inventory."""
+        self._set_data(key=_Keys.DATASETS, value={}, set_default_type=Dict)
+        self._set_data(key=_Keys.MOUNTPOINTS, value={}, set_default_type=Dict)
+        self._set_data(key=_Keys.SNAPSHOTS, value={}, set_default_type=Dict)
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def datasets(self) -> Dict[str, ZfsEntry]:
+        """Return kept datasets by name.
+
+        ### Returns:
+        Dict[str, ZfsEntry] - Dataset entries.
+        """
+        return self._get_data(key=_Keys.DATASETS)  # type: ignore
+
+    @property
+    def snapshots(self) -> Dict[str, List[ZfsEntry]]:
+        """Return kept snapshots grouped by dataset in creation order.
+
+        ### Returns:
+        Dict[str, List[ZfsEntry]] - Snapshot entries per dataset.
+        """
+        return self._get_data(key=_Keys.SNAPSHOTS)  # type: ignore
+
+    # #[PUBLIC METHODS]###############################################################
+    @classmethod
+    def parse_line(cls, line: str) -> Optional[ZfsEntry]:
+        """Parse one tab-separated `name,used,avail,mountpoint,createtxg` line.
+
+        ### Arguments:
+        * line: str - Raw output line.
+
+        ### Returns:
+        Optional[ZfsEntry] - Parsed entry or `None` for malformed lines.
+        """
+        fields: List[str] = line.rstrip("\n").split("\t")
+        if len(fields) != 5 or not fields[4].isdigit():
+            return None
+
+        def number(value: str) -> Optional[int]:
+            return int(value) if value.isdigit() else None
+
+        return ZfsEntry(
+            name=fields[0],
+            used=number(fields[1]),
+            available=number(fields[2]),
+            mountpoint=fields[3] if fields[3] not in ("-", "none", "legacy") else None,
+            createtxg=int(fields[4]),
+        )
+
+    def feed(self, lines: Iterable[str], volumes: List[str], recursive: bool) -> int:
+        """Consume listing lines, keeping only entries relevant for `volumes`.
+
+        ### Arguments:
+        * lines: Iterable[str] - Streamed `zfs list` output lines.
+        * volumes: List[str] - Configured dataset names or mount points.
+        * recursive: bool - Keep descendants of configured volumes as well.
+
+        ### Returns:
+        int - Number of parsed lines.
+        """
+        wanted: Set[str] = set(volumes)
+        prefixes: Tuple[str, ...] = tuple(f"{name}/" for name in volumes)
+        count: int = 0
+        for line in lines:
+            entry: Optional[ZfsEntry] = self.parse_line(line)
+            if entry is None:
+                continue
+            count += 1
+            dataset: str = entry.dataset
+            if entry.snapshot is None and entry.mountpoint in wanted:
+                # volumes may be configured by their mount point, datasets are
+                # listed before their snapshots so later lines match by name
+                self._get_data(key=_Keys.MOUNTPOINTS)[entry.mountpoint] = dataset
+                wanted.add(dataset)
+                prefixes += (f"{dataset}/",)
+            elif not (
+                dataset in wanted
+                or (recursive and dataset.startswith(prefixes))
+                # pool roots carry the free space figures
+                or (entry.snapshot is None and "/" not in dataset)
+            ):
+                continue
+            if entry.snapshot is None:
+                self.datasets[dataset] = entry
+            else:
+                self.snapshots.setdefault(dataset, []).append(entry)
+        # `-s createtxg` already sorts, keep the order stable for other sources
+        for items in self.snapshots.values():
+            items.sort(key=lambda item: item.createtxg)
+        return count
+
+    def free_space(self, dataset: str) -> Optional[int]:
+        """Return the free space of the dataset pool in percent.
+
+        ### Arguments:
+        * dataset: str - Dataset name.
+
+        ### Returns:
+        Optional[int] - Free space percentage or `None` when unknown.
+        """
+        root: Optional[ZfsEntry] = self.datasets.get(dataset.split("/", 1)[0])
+        if root is None or root.available is None or root.used is None:
+            return None
+        total: int = root.available + root.used
+        if total == 0:
+            return None
+        return int(root.available * 100 / total)
+
+    def resolve(self, volume: str) -> Optional[str]:
+        """Return the dataset name for a configured volume or mount point.
+
+        ### Arguments:
+        * volume: str - Configured dataset name or mount point.
+
+        ### Returns:
+        Optional[str] - Existing dataset name or `None`.
+        """
+        if volume in self.datasets:
+            return volume
+        mountpoints: Dict[str, str] = self._get_data(key=_Keys.MOUNTPOINTS)  # type: ignore
+        return mountpoints.get(volume)
+
+
+class ZfsClient(BData):
+    """Run batched `zfs` commands for the snapshot worker."""
+
+    # #[CONSTANTS]####################################################################
+    LIST_FIELDS: str = "name,used,avail,mountpoint,createtxg"
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self, command: str = "/sbin/zfs") -> None:
+        """Initialize the client.
+
+        ### Arguments:
+        * command: str - Path to the `zfs` binary.
+        """
+        self._set_data(key=_Keys.COMMAND, value=command, set_default_type=str)
+        self._set_data(key=_Keys.ERRORS, value=[], set_default_type=List)
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def errors(self) -> List[str]:
+        """Return error lines collected since the last `clear()`.
+
+        ### Returns:
+        List[str] - Error messages.
+        """
+        return self._get_data(key=_Keys.ERRORS)  # type: ignore
+
+    # #[PUBLIC METHODS]###############################################################
+    def clear(self) -> None:
+        """Drop collected error messages."""
+        self.errors.clear()
+
+    def destroy(self, dataset: str, names: List[str], recursive: bool) -> bool:
+        """Destroy snapshots of one dataset with a single `zfs destroy` call.
+
+        ### Arguments:
+        * dataset: str - Dataset owning the snapshots.
+        * names: List[str] - Range or snapshot specs, e.g. `a%c` or `d`.
+        * recursive: bool - Destroy same-named snapshots of descendants.
+
+        ### Returns:
+        bool - `True` on success.
+        """
+        if not names:
+            return True
+        args: List[str] = ["destroy"]
+        if recursive:
+            args.append("-r")
+        args.append(f"{dataset}@{','.join(names)}")
+        return self.__run(args)
+
+    def list_all(
+        self, volumes: List[str], recursive: bool
+    ) -> Optional[ZfsInventory]:
+        """Stream all datasets and snapshots from one `zfs list -t all` call.
+
+        ### Arguments:
+        * volumes: List[str] - Configured dataset names or mount points.
+        * recursive: bool - Keep descendants of configured volumes.
+
+        ### Returns:
+        Optional[ZfsInventory] - Inventory or `None` when the call failed.
+        """
+        inventory = ZfsInventory()
+        try:
+            with subprocess.Popen(
+                [
+                    self._get_data(key=_Keys.COMMAND),
+                    "list",
+                    "-Hp",
+                    "-o",
+                    self.LIST_FIELDS,
+                    "-s",
+                    "createtxg",
+                    "-t",
+                    "all",
+                ],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+            ) as proc:
+                if proc.stdout is not None:
+                    inventory.feed(proc.stdout, volumes, recursive)
+                stderr: str = proc.stderr.read() if proc.stderr is not None else ""
+                returncode: int = proc.wait()
+        except OSError as ex:
+            self.errors.append(f"cannot run zfs: {ex}")
+            return None
+        if returncode != 0:
+            self.errors.append(stderr.strip() or f"zfs list exited with {returncode}")
+            return None
+        return inventory
+
+    def snapshot(self, names: List[str], recursive: bool) -> bool:
+        """Create snapshots atomically with one multi-argument `zfs snapshot`.
+
+        ### Arguments:
+        * names: List[str] - Full `dataset@name` snapshot names of one pool.
+        * recursive: bool - Snapshot descendants in the same transaction.
+
+        ### Returns:
+        bool - `True` on success.
+        """
+        if not names:
+            return True
+        args: List[str] = ["snapshot"]
+        if recursive:
+            args.append("-r")
+        args.extend(names)
+        return self.__run(args)
+
+    # #[PRIVATE METHODS]##############################################################
+    def __run(self, args: List[str]) -> bool:
+        """Run one `zfs` subcommand and collect its error output.
+
+        ### Arguments:
+        * args: List[str] - Subcommand and arguments.
+
+        ### Returns:
+        bool - `True` when the command exited with status 0.
+        """
+        try:
+            result = subprocess.run(
+                [self._get_data(key=_Keys.COMMAND)] + args,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+            )
+        except OSError as ex:
+            self.errors.append(f"cannot run zfs: {ex}")
+            return False
+        if result.returncode != 0:
+            self.errors.append(
+                result.stderr.strip() or f"zfs {args[0]} exited with {result.returncode}"
+            )
+            return False
+        return True
+
+
+class _Runtime(Thread, ThPluginMixin):
+    """Create and rotate snapshots of configured volumes on a fixed interval."""
+
+    # #[CONSTANTS]####################################################################
+    # names created by this plugin and by the archived module
+    _RE_MANAGED: Pattern = re.compile(r"^\d{8}-?\d{6}$")
+
+    _notifications: Optional[NotificationScheduler] = None
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self, context: PluginContext) -> None:
+        """Initialize the snapshot worker runtime.
+
+        ### Arguments:
+        * context: PluginContext - Plugin runtime context.
+        """
+        Thread.__init__(self, name=context.instance_name)
+        self.daemon = True
+        self._context: PluginContext = context
+        self._health = PluginHealthSnapshot(health=PluginHealth.UNKNOWN)
+        self._notifications = NotificationScheduler.from_config(context.config)
+        self._stop_event = Event()
+        self._state = PluginStateSnapshot(state=PluginState.CREATED)
+        self._set_data(
+            key=_Keys.CLIENT,
+            value=ZfsClient(
+                str(context.config.get(_Keys.ZFS_COMMAND) or "/sbin/zfs")
+            ),
+            set_default_type=ZfsClient,
+        )
+
+    def initialize(self) -> None:
+        """Prepare the runtime before startup."""
+        self._state = PluginStateSnapshot(state=PluginState.INITIALIZED)
+
+    # #[PUBLIC PROPERTIES]############################################################
+    @property
+    def client(self) -> ZfsClient:
+        """Return the batched `zfs` command client.
+
+        ### Returns:
+        ZfsClient - Client used by `cycle()`.
+        """
+        return self._get_data(key=_Keys.CLIENT)  # type: ignore
+
+    # #[PUBLIC METHODS]################################################################
+    def cycle(self, snapshot_name: Optional[str] = None) -> bool:
+        """Run one snapshot and rotation pass over all configured volumes.
+
+        One `zfs list` call feeds the whole pass, snapshots are created with one
+        `zfs snapshot` call per pool, and expired snapshots with one
+        `zfs destroy` call per volume.
+
+        ### Arguments:
+        * snapshot_name: Optional[str] - Snapshot name, timestamp by default.
+
+        ### Returns:
+        bool - `True` when every `zfs` call succeeded.
+        """
+        context: PluginContext = self._context  # type: ignore
+        config = context.config
+        volumes: List[str] = [
+            str(item) for item in config.get(_Keys.VOLUMES) or [] if str(item).strip()
+        ]
+        recursive: bool = bool(config.get(_Keys.RECURSIVE))
+        max_count: int = int(config.get(_Keys.MAX_COUNT) or 24)
+        min_free: int = int(config.get(_Keys.MIN_FREE_SPACE) or 0)
+        name: str = snapshot_name or MDateTime.zfs_snapshot_date()
+        if not volumes:
+            return True
+        client: ZfsClient = self.client
+        client.clear()
+
+        inventory: Optional[ZfsInventory] = client.list_all(volumes, recursive)
+        if inventory is None:
+            self.__log_errors()
+            return False
+
+        # snapshot batches per pool, zfs takes one pool per atomic call
+        batches: Dict[str, List[str]] = {}
+        managed: List[str] = []
+        low_space: List[Tuple[str, int]] = []
+        for volume in volumes:
+            dataset: Optional[str] = inventory.resolve(volume)
+            if dataset is None:
+                context.logger.message_error = f"unknown zfs volume: '{volume}'"
+                continue
+            free: Optional[int] = inventory.free_space(dataset)
+            if free is not None and free <= min_free:
+                # snapshotting and rotation are suspended until space is freed
+                low_space.append((dataset, free))
+                continue
+            managed.append(dataset)
+            existing: Set[str] = {
+                str(item.snapshot) for item in inventory.snapshots.get(dataset, [])
+            }
+            if name in existing:
+                context.logger.message_warning = (
+                    f"snapshot already exists: '{dataset}@{name}'"
+                )
+                continue
+            pool: str = dataset.split("/", 1)[0]
+            batches.setdefault(pool, []).append(f"{dataset}@{name}")
+
+        success: bool = True
+        created: Dict[str, bool] = {}
+        for pool, names in batches.items():
+            ok: bool = client.snapshot(names, recursive)
+            success = success and ok
+            for item in names:
+                created[item.split("@", 1)[0]] = ok
+            if ok:
+                context.logger.message_info = (
+                    f"created {len(names)} snapshot(s) in pool '{pool}'"
+                )
+
+        for dataset in managed:
+            snapshots: List[ZfsEntry] = list(inventory.snapshots.get(dataset, []))
+            if created.get(dataset):
+                snapshots.append(
+                    ZfsEntry(
+                        name=f"{dataset}@{name}",
+                        used=None,
+                        available=None,
+                        mountpoint=None,
+                        createtxg=(snapshots[-1].createtxg + 1 if snapshots else 0),
+                    )
+                )
+            # `zfs destroy -r` applies each range to the descendants as well
+            descendants: List[ZfsEntry] = (
+                [
+                    item
+                    for child, items in inventory.snapshots.items()
+                    if child.startswith(f"{dataset}/")
+                    for item in items
+                ]
+                if recursive
+                else []
+            )
+            specs: List[str] = self.expired_ranges(snapshots, max_count, descendants)
+            if specs and not client.destroy(dataset, specs, recursive):
+                success = False
+            elif specs and context.debug:
+                context.logger.message_debug = (
+                    f"destroyed '{dataset}@{','.join(specs)}'"
+                )
+
+        self.__log_errors()
+        if low_space:
+            self.__notify_low_space(low_space, min_free)
+        return success
+
+    @classmethod
+    def expired_ranges(
+        cls,
+        snapshots: List[ZfsEntry],
+        max_count: int,
+        descendants: Optional[List[ZfsEntry]] = None,
+    ) -> List[str]:
+        """Return `%` range specs for managed snapshots above `max_count`.
+
+        Ranges never span snapshots that were not created by this plugin, since
+        `zfs destroy a%b` removes everything between `a` and `b`. With
+        `descendants` the ranges are built over the merged snapshot list, so a
+        recursive destroy does not reach snapshots kept on a child dataset.
+
+        ### Arguments:
+        * snapshots: List[ZfsEntry] - Snapshots of one dataset in creation order.
+        * max_count: int - Number of managed snapshots to keep.
+        * descendants: Optional[List[ZfsEntry]] - Snapshots of descendant
+          datasets covered by `zfs destroy -r`.
+
+        ### Returns:
+        List[str] - Snapshot names or `first%last` ranges to destroy.
+        """
+        managed: List[str] = [
+            str(item.snapshot)
+            for item in snapshots
+            if cls._RE_MANAGED.match(str(item.snapshot))
+        ]
+        expired: Set[str] = set(managed[: max(0, len(managed) - max_count)])
+        merged: List[ZfsEntry] = sorted(
+            snapshots + list(descendants or []), key=lambda item: item.createtxg
+        )
+        specs: List[str] = []
+        run: List[str] = []
+        for item in merged:
+            name: str = str(item.snapshot)
+            if name in expired:
+                # recursive snapshots share one name across the datasets
+                if not run or run[-1] != name:
+                    run.append(name)
+                continue
+            if run:
+                specs.append(run[0] if len(run) == 1 else f"{run[0]}%{run[-1]}")
+                run = []
+        if run:
+            specs.append(run[0] if len(run) == 1 else f"{run[0]}%{run[-1]}")
+        return specs
+
+    def health(self) -> PluginHealthSnapshot:
+        """Return the current health snapshot.
+
+        ### Returns:
+        PluginHealthSnapshot - Current plugin health snapshot.
+        """
+        health: Optional[PluginHealthSnapshot] = self._health
+        if health is None:
+            return PluginHealthSnapshot(
+                health=PluginHealth.UNKNOWN,
+                message="Health snapshot is not initialized.",
+            )
+        return health
+
+    def run(self) -> None:
+        """Run snapshot cycles every `snapshot_interval` until stopped."""
+        stop_event: Optional[Event] = self._stop_event
+        context: Optional[PluginContext] = self._context
+        if stop_event is None or context is None:
+            self._health = PluginHealthSnapshot(
+                health=PluginHealth.UNHEALTHY,
+                last_error_at=int(time()),
+                message="Runtime is not initialized.",
+            )
+            self._state = PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Runtime is not initialized.",
+                stopped_at=int(time()),
+            )
+            return None
+        interval: int = MIntervals(self._c_name).convert(
+            str(context.config.get(_Keys.SNAPSHOT_INTERVAL) or "1h")
+        )
+        while not stop_event.is_set():
+            started: float = time()
+            if self.cycle():
+                self._health = PluginHealthSnapshot(
+                    health=PluginHealth.HEALTHY,
+                    last_ok_at=int(time()),
+                    message=f"Snapshot cycle took {time() - started:.2f}s.",
+                )
+            else:
+                self._health = PluginHealthSnapshot(
+                    health=PluginHealth.DEGRADED,
+                    last_error_at=int(time()),
+                    message="Snapshot cycle reported zfs errors.",
+                )
+            stop_event.wait(max(1.0, interval - (time() - started)))
+
+    def start(self) -> None:
+        """Start the runtime thread."""
+        self._state = PluginStateSnapshot(
+            state=PluginState.STARTING,
+            started_at=int(time()),
+        )
+        Thread.start(self)
+
+    def state(self) -> PluginStateSnapshot:
+        """Return the current lifecycle snapshot.
+
+        ### Returns:
+        PluginStateSnapshot - Current plugin lifecycle snapshot.
+        """
+        state: Optional[PluginStateSnapshot] = self._state
+        if state is None:
+            return PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Lifecycle snapshot is not initialized.",
+            )
+        if self.is_alive() and state.state == PluginState.STARTING:
+            state = PluginStateSnapshot(
+                state=PluginState.RUNNING,
+                started_at=state.started_at,
+            )
+            self._state = state
+        return state
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Request plugin shutdown.
+
+        ### Arguments:
+        * timeout: Optional[float] - Optional join timeout.
+        """
+        stop_event: Optional[Event] = self._stop_event
+        state: Optional[PluginStateSnapshot] = self._state
+        if stop_event is None:
+            self._state = PluginStateSnapshot(
+                state=PluginState.FAILED,
+                failure_count=1,
+                message="Stop event is not initialized.",
+                stopped_at=int(time()),
+            )
+            return None
+        if state is not None and state.state not in (
+            PluginState.STOPPED,
+            PluginState.FAILED,
+        ):
+            self._state = PluginStateSnapshot(
+                state=PluginState.STOPPING,
+                started_at=state.started_at,
+            )
+        stop_event.set()
+        if self.is_alive():
+            self.join(timeout=timeout)
+        self._state = PluginStateSnapshot(
+            state=PluginState.STOPPED,
+            started_at=state.started_at if state is not None else None,
+            stopped_at=int(time()),
+        )
+
+    # #[PRIVATE METHODS]###############################################################
+    def __log_errors(self) -> None:
+        """Forward collected `zfs` error messages to the plugin logger."""
+        context: PluginContext = self._context  # type: ignore
+        for item in self.client.errors:
+            context.logger.message_error = item
+        self.client.clear()
+
+    def __notify_low_space(self, volumes: List[Tuple[str, int]], limit: int) -> None:
+        """Log and publish a warning for volumes skipped due to low free space.
+
+        ### Arguments:
+        * volumes: List[Tuple[str, int]] - Dataset names with free space percent.
+        * limit: int - Configured minimum free space percent.
+        """
+        context: PluginContext = self._context  # type: ignore
+        lines: List[str] = [
+            f"Free space on volume '{dataset}' is {free}%, "
+            f"the configured minimum is {limit}%."
+            for dataset, free in volumes
+        ]
+        for line in lines:
+            context.logger.message_critical = line
+        notifications: Optional[NotificationScheduler] = self._notifications
+        if notifications is None:
+            return None
+        for channel in notifications.due_channels():
+            message = Message()
+            message.channel = int(channel)
+            message.diagnostic_source = self._c_name
+            message.subject = (
+                f"[{context.app_meta.app_name}:{context.instance_name}] "
+                f"Free space WARNING on {context.app_meta.app_host_name}."
+            )
+            message.messages = lines + ["Snapshotting has been suspended."]
+            context.dispatcher.publish(message)
+
+
+def get_plugin_spec() -> PluginSpec:
+    """Return the plugin spec for `zfssnapshot`.
+
+    ### Returns:
+    PluginSpec - Plugin manifest.
+    """
+    schema = PluginConfigSchema(
+        title="ZFS snapshot worker plugin.",
+        description=(
+            "Creates and rotates ZFS snapshots using one `zfs list` call per "
+            "cycle and batched `zfs snapshot` and `zfs destroy` calls."
+        ),
+        fields=[
+            PluginConfigField(
+                name=PluginCommonKeys.MESSAGE_CHANNEL,
+                field_type=list,
+                default=[1],
+                required=True,
+                description=(
+                    "Interval-based notification targets for free space "
+                    "warnings, for example `[1, '2:6h']`."
+                ),
+            ),
+            PluginConfigField(
+                name=_Keys.VOLUMES,
+                field_type=list,
+                default=[],
+                required=True,
+                description="ZFS datasets or mount points to snapshot.",
+                example=["tank/volume1", "tank/volume2"],
+            ),
+            PluginConfigField(
+                name=_Keys.SNAPSHOT_INTERVAL,
+                field_type=str,
+                default="1h",
+                required=True,
+                description="Time between snapshot cycles, seconds or `s|m|h|d|w`.",
+            ),
+            PluginConfigField(
+                name=_Keys.MAX_COUNT,
+                field_type=int,
+                default=24,
+                required=True,
+                description="Number of plugin-created snapshots kept per volume.",
+            ),
+            PluginConfigField(
+                name=_Keys.MIN_FREE_SPACE,
+                field_type=int,
+                default=20,
+                required=True,
+                description=(
+                    "Minimum percentage of free pool space needed to take a "
+                    "snapshot."
+                ),
+            ),
+            PluginConfigField(
+                name=_Keys.RECURSIVE,
+                field_type=bool,
+                default=False,
+                required=False,
+                description="Snapshot and rotate descendant datasets with `-r`.",
+            ),
+            PluginConfigField(
+                name=_Keys.ZFS_COMMAND,
+                field_type=str,
+                default="/sbin/zfs",
+                required=False,
+                description="Path to the `zfs` binary.",
+            ),
+        ],
+    )
+    return PluginSpec(
+        api_version=1,
+        config_schema=schema,
+        plugin_id="aasd.zfs_snapshot",
+        plugin_kind=PluginKind.WORKER,
+        plugin_name="zfssnapshot",
+        runtime_factory=_Runtime,
+        description="ZFS snapshot worker with batched zfs queries.",
+    )
+
+
+# #[EOF]#######################################################################
@@ -8,12 +8,15 @@ Created: 2023-11-06
 Purpose: Provide the main daemon class responsible for runtime orchestration.
 """
 
+import os
 import signal
 import sys
 import time
 import gc
 import setproctitle
 
+from threading import Lock
+
 from typing import Any, Dict, List, Optional
 
 from jsktoolbox.logstool import (
@@ -37,6 +40,15 @@ from jsktoolbox.stringtool import SimpleCrypto
 
 from libs import AppConfig, AppName, Keys
 from libs.base import ProjectClassMixin
+from libs.tools import (
+    BoundedLoggerQueue,
+    JsonLinesLogEngine,
+    ThFileWatcher,
+    ThJsonLogWriter,
+    ThLogProcessor,
+    ThStackSampler,
+)
+from libs.tools.startup import StartupCategory, StartupProfiler
 from libs.plugins import (
     PluginRegistryService,
     PluginServiceReport,
@@ -66,14 +78,14 @@ class AASd(ProjectClassMixin):
         # loop flag init
         self.loop = True
 
+        # guards plugin entries shared by the file watcher and the main loop
+        self._set_data(key=Keys.WATCHED_LOCK, value=Lock())
+
         # logger engines configuration
+        # bounded queue with per-source rate limiting, drained on wakeups
         logger_engine = LoggerEngine()
-        existing_queue: Optional[LoggerQueue] = logger_engine.logs_queue
-        if existing_queue is None:
-            logger_queue = LoggerQueue()
-            logger_engine.logs_queue = logger_queue
-        else:
-            logger_queue = existing_queue
+        logger_queue: LoggerQueue = BoundedLoggerQueue()
+        logger_engine.logs_queue = logger_queue
 
         # logger levels
         self.__init_log_levels(logger_engine)
@@ -82,8 +94,7 @@ class AASd(ProjectClassMixin):
         self.logs = LoggerClient()
 
         # logger processor
-        thl = ThLoggerProcessor()
-        thl.sleep_period = 1.5
+        thl = ThLogProcessor()
         thl.logger_engine = logger_engine
         thl.logger_client = self.logs
         self.logs_processor = thl
@@ -104,7 +115,9 @@ class AASd(ProjectClassMixin):
         self.__init_command_line()
 
         # config file
-        if not self.conf.load():
+        with StartupProfiler.span(StartupCategory.PHASE, "config load"):
+            loaded: bool = self.conf.load()
+        if not loaded:
             self.logs.message_critical = "cannot load config file"
             self.loop = False
         elif self.conf.config_review_required:
@@ -121,6 +134,14 @@ class AASd(ProjectClassMixin):
         # update debug
         thl._debug = self.conf.debug
 
+        # logging queue limits
+        if loaded:
+            self.__init_log_queue()
+
+        # structured JSON-lines sink
+        if self.loop:
+            self.__init_json_log(logger_engine)
+
         # update config file
         if self.loop and self.conf.update:
             self.logs.message_notice = "trying to update config file"
@@ -130,6 +151,8 @@ class AASd(ProjectClassMixin):
         # signal handling
         signal.signal(signal.SIGTERM, self.__sig_exit)
         signal.signal(signal.SIGHUP, self.__sig_hup)
+        # sampling profiler on/off switch
+        signal.signal(signal.SIGUSR1, self.__sig_usr1)
         # interrupt [ctrl-c], the real processor should be set in the constructor
         signal.signal(signal.SIGINT, self.__sig_exit)
 
@@ -215,6 +238,27 @@ class AASd(ProjectClassMixin):
         """
         self._set_data(key=Keys.LOOP, value=value, set_default_type=bool)
 
+    @property
+    def profile(self) -> bool:
+        """Return the sampling profiler toggle request flag.
+
+        ### Returns:
+        bool - `True` when the profiler should be switched on or off.
+        """
+        obj: Optional[bool] = self._get_data(key=Keys.PROFILE, default_value=False)
+        if obj is None:
+            return False
+        return obj
+
+    @profile.setter
+    def profile(self, value: bool) -> None:
+        """Store the sampling profiler toggle request flag.
+
+        ### Arguments:
+        * value: bool - Toggle request flag.
+        """
+        self._set_data(key=Keys.PROFILE, value=value, set_default_type=bool)
+
     # #[PUBLIC METHODS]################################################################
     def run(self) -> None:
         """Run the daemon main loop until shutdown is requested."""
@@ -222,46 +266,117 @@ class AASd(ProjectClassMixin):
         if self.conf is None:
             sys.exit(0)
         # logger processor
+        self.__start_json_log()
         self.logs_processor.start()
         self.logs.message_info = f"started, version {self.application.app_version}"
 
         if self.loop:
-            report = self.__start_subsystem()
+            with StartupProfiler.span(StartupCategory.PHASE, "subsystem start"):
+                report = self.__start_subsystem()
+            self.__start_watcher()
+        self.__report_startup()
 
         # main loop
         if self.loop:
             self.logs.message_info = "entering to the main loop"
+            usage_at: float = time.monotonic()
             while self.loop:
                 if self.hup:
-                    # reload configuration and restart subsystems
-                    self.__stop_subsystem(report)
+                    # reload configuration and restart subsystems on changes
                     self.hup = False
-                    if not self.conf.load():
+                    entries: List[str] = self.__pop_watched_entries()
+                    if not self.conf.reload():
                         # critical message
                         self.logs.message_critical = "cannot reload config file"
                         self.loop = False
                     elif self.conf.config_review_required:
                         self.__notify_config_review_required()
                         self.loop = False
-                    if self.loop:
-                        report = self.__start_subsystem()
                     else:
-                        report = PluginServiceReport()
+                        self.__init_log_queue()
+                        report = self.__apply_changes(report, entries)
+                if self.profile:
+                    self.profile = False
+                    self.__toggle_sampler()
+                # periodic plugin CPU and memory report
+                interval: int = self.conf.usage_interval
+                if interval > 0 and time.monotonic() - usage_at >= interval:
+                    usage_at = time.monotonic()
+                    PluginRegistryService.log_usage(report=report, logs=self.logs)
                 time.sleep(0.5)
 
+        self.__stop_sampler()
+        self.__stop_watcher()
         if report.managed_runtimes or report.started or report.failed or report.skipped:
             self.__stop_subsystem(report)
 
         # logger processor
         self.logs_processor.stop()
-        time.sleep(2.0)
         while self.logs_processor._is_stopped != True:
             self.logs_processor.join()
             time.sleep(0.1)
+        self.__stop_json_log()
 
         sys.exit(0)
 
+    # #[PRIVATE PROPERTIES]###########################################################
+    @property
+    def __watched_lock(self) -> Lock:
+        """Return the lock guarding collected `plugins_dir` entry names.
+
+        ### Returns:
+        Lock - Lock shared by the file watcher callback and the main loop.
+        """
+        lock: Optional[Lock] = self._get_data(key=Keys.WATCHED_LOCK, default_value=None)
+        if lock is None:
+            lock = Lock()
+            self._set_data(key=Keys.WATCHED_LOCK, value=lock)
+        return lock
+
     # #[PRIVATE METHODS]###############################################################
+    def __apply_changes(
+        self, report: PluginServiceReport, entries: List[str]
+    ) -> PluginServiceReport:
+        """Restart only the subsystems affected by the last reload.
+
+        Changes of the main section restart the dispatcher and every plugin
+        instance. Changes limited to plugin sections or `plugins_dir` entries
+        restart just those instances; instances with only a changed section
+        may take the new config snapshot in place.
+
+        ### Arguments:
+        * report: PluginServiceReport - Report of the running subsystems.
+        * entries: List[str] - Plugin entry names changed on disk.
+
+        ### Returns:
+        PluginServiceReport - Report of the subsystems running after the reload.
+        """
+        if self.conf is None:
+            return report
+        affected: List[str] = sorted(
+            set(self.conf.last_changes.sections) | set(entries)
+        )
+        if not affected:
+            self.logs.message_info = (
+                "configuration unchanged, keeping running subsystems"
+            )
+            return report
+        self.logs.message_info = f"configuration changed in sections: {affected}"
+        if self.conf._section in affected or report.dispatch is None:
+            self.__stop_watcher()
+            self.__stop_subsystem(report)
+            report = self.__start_subsystem()
+            self.__start_watcher()
+            return report
+        return PluginRegistryService.restart(
+            report=report,
+            conf=self.conf,
+            app_meta=self.application,
+            logs=self.logs,
+            instances=affected,
+            reconfigure=sorted(set(self.conf.last_changes.sections) - set(entries)),
+        )
+
     def __check_plugins_dir(self) -> None:
         """Check if the plugins directory exists and is accessible."""
         if self.conf is None:
@@ -356,6 +471,11 @@ class AASd(ProjectClassMixin):
         parser.configure_argument("v", "verbose", "verbose logging level")
         parser.configure_argument("d", "debug", "debug logging level")
         parser.configure_argument("U", "updateconf", "update configuration file")
+        parser.configure_argument(
+            "",
+            "profile-startup",
+            "print a timeline of the daemon startup phases to stderr",
+        )
         parser.configure_argument(
             "P",
             "plugins_dir",
@@ -400,6 +520,9 @@ class AASd(ProjectClassMixin):
             self.conf.verbose = True
         if parser.get_option("updateconf") is not None:
             self.conf.update = True
+        if parser.get_option("profile-startup") is not None:
+            # no-op when 'aasd.py' already installed it before the imports
+            StartupProfiler.install(imports=False)
         if parser.get_option("plugins_dir") is not None:
             self.conf.plugins_dir = parser.get_option("plugins_dir")  # type: ignore
         if parser.get_option("file") is not None:
@@ -419,6 +542,32 @@ class AASd(ProjectClassMixin):
             self.conf._password_section = parser.get_option("section")  # type: ignore
             self.conf._password_varname = parser.get_option("varname")  # type: ignore
 
+    def __init_json_log(self, engine: LoggerEngine) -> None:
+        """Register the structured JSON-lines sink for all log levels.
+
+        ### Arguments:
+        * engine: LoggerEngine - Logger engine to configure.
+        """
+        if self.conf is None or not self.conf.json_log:
+            return None
+        writer = ThJsonLogWriter(
+            path=self.conf.json_log,
+            rotate_size=self.conf.json_log_rotate_size,
+            rotate_count=self.conf.json_log_rotate_count,
+        )
+        for level in (
+            LogsLevelKeys.ALERT,
+            LogsLevelKeys.CRITICAL,
+            LogsLevelKeys.DEBUG,
+            LogsLevelKeys.EMERGENCY,
+            LogsLevelKeys.ERROR,
+            LogsLevelKeys.INFO,
+            LogsLevelKeys.NOTICE,
+            LogsLevelKeys.WARNING,
+        ):
+            engine.add_engine(level, JsonLinesLogEngine(writer=writer, level=level))
+        self._set_data(key=Keys.JSON_LOG_WRITER, value=writer)
+
     def __init_log_levels(self, engine: LoggerEngine) -> None:
         """Register logger engines for all log levels used by the daemon.
 
@@ -498,6 +647,25 @@ class AASd(ProjectClassMixin):
             ),
         )
 
+    def __init_log_queue(self) -> None:
+        """Apply the main-section limits to the bounded logging queue."""
+        engine: Optional[LoggerEngine] = self.logs_processor.logger_engine
+        queue: Optional[LoggerQueue] = engine.logs_queue if engine else None
+        if self.conf is None or not isinstance(queue, BoundedLoggerQueue):
+            return None
+        queue.maxsize = self.conf.log_queue_size
+        queue.rate = self.conf.log_rate
+        queue.burst = self.conf.log_burst
+        levels: Optional[List[str]] = self.conf.log_rate_exempt
+        if levels is None:
+            levels = list(BoundedLoggerQueue.EXEMPT_LEVELS)
+        unknown: List[str] = [item for item in levels if item not in LogsLevelKeys.keys]
+        if unknown:
+            self.logs.message_warning = (
+                f"ignoring unknown log_rate_exempt levels: {', '.join(unknown)}"
+            )
+        queue.exempt_levels = [item for item in levels if item in LogsLevelKeys.keys]
+
     def __password_encoding(self) -> None:
         """Encrypt a password entered on stdin and store it in the config file."""
         if self.conf is None or self.conf.cf is None or self.conf._section is None:
@@ -566,6 +734,52 @@ class AASd(ProjectClassMixin):
             )
         self.logs.message_notice = message
 
+    def __on_watched_change(self, paths: List[str]) -> None:
+        """Request a reload after the file watcher reported changed paths.
+
+        ### Arguments:
+        * paths: List[str] - Changed config file and `plugins_dir` entry paths.
+        """
+        if self.conf is None:
+            return None
+        plugins_dir: Optional[str] = self.conf.plugins_dir
+        names: List[str] = [
+            os.path.basename(path)
+            for path in paths
+            if plugins_dir and os.path.dirname(path) == os.path.abspath(plugins_dir)
+        ]
+        with self.__watched_lock:
+            # store a new list, `_set_data` clears the stored one in place
+            entries: List[str] = list(
+                self._get_data(key=Keys.WATCHED_ENTRIES, default_value=[])
+            )
+            self._set_data(key=Keys.WATCHED_ENTRIES, value=entries + names)
+        if self.conf.debug:
+            self.logs.message_debug = f"watched paths changed: {paths}"
+        self.hup = True
+
+    def __pop_watched_entries(self) -> List[str]:
+        """Return and clear plugin entry names collected by the file watcher.
+
+        ### Returns:
+        List[str] - Changed `plugins_dir` entry names.
+        """
+        with self.__watched_lock:
+            entries: List[str] = list(
+                self._get_data(key=Keys.WATCHED_ENTRIES, default_value=[])
+            )
+            self._set_data(key=Keys.WATCHED_ENTRIES, value=[])
+        return entries
+
+    def __report_startup(self) -> None:
+        """Print the startup timeline when `--profile-startup` is enabled."""
+        profiler: Optional[StartupProfiler] = StartupProfiler.active()
+        if profiler is None:
+            return None
+        text: str = profiler.finish()
+        print(text, file=sys.stderr, flush=True)
+        self.logs.message_notice = text.splitlines()[0]
+
     def __sig_exit(self, signum: int, frame: Any) -> None:
         """Handle `SIGTERM` and `SIGINT` by requesting daemon shutdown.
 
@@ -588,6 +802,17 @@ class AASd(ProjectClassMixin):
             self.logs.message_debug = "HUP signal received."
         self.hup = True
 
+    def __sig_usr1(self, signum: int, frame: Any) -> None:
+        """Handle `SIGUSR1` by requesting a sampling profiler toggle.
+
+        ### Arguments:
+        * signum: int - Received signal number.
+        * frame: Any - Current frame passed by the signal handler.
+        """
+        if self.conf and self.conf.debug:
+            self.logs.message_debug = "USR1 signal received."
+        self.profile = True
+
     def __start_subsystem(self) -> PluginServiceReport:
         """Start dispatcher and plugin instances through the registry service.
 
@@ -602,6 +827,74 @@ class AASd(ProjectClassMixin):
             logs=self.logs,
         )
 
+    def __start_json_log(self) -> None:
+        """Start the JSON-lines writer thread if the sink is configured."""
+        writer: Optional[ThJsonLogWriter] = self._get_data(
+            key=Keys.JSON_LOG_WRITER, default_value=None
+        )
+        if writer is not None and not writer.is_alive():
+            writer.start()
+
+    def __start_watcher(self) -> None:
+        """Start the config file watcher when `auto_reload` is enabled."""
+        if self.conf is None or self.conf.config_file is None:
+            return None
+        if not self.conf.auto_reload or self.logs.logs_queue is None:
+            return None
+        watcher = ThFileWatcher(
+            qlog=self.logs.logs_queue,
+            config_file=self.conf.config_file,
+            plugins_dir=self.conf.plugins_dir,
+            callback=self.__on_watched_change,
+            debug=self.conf.debug,
+        )
+        watcher.start()
+        self._set_data(key=Keys.WATCHER, value=watcher)
+        self.logs.message_info = f"automatic reload enabled ({watcher.backend._c_name})"
+
+    def __stop_watcher(self) -> None:
+        """Stop the config file watcher if it is running."""
+        watcher: Optional[ThFileWatcher] = self._get_data(
+            key=Keys.WATCHER, default_value=None
+        )
+        if watcher is None:
+            return None
+        watcher.stop()
+        watcher.join(timeout=2.0)
+        self._set_data(key=Keys.WATCHER, value=None)
+
+    def __stop_json_log(self) -> None:
+        """Flush and stop the JSON-lines writer after the last log drain."""
+        writer: Optional[ThJsonLogWriter] = self._get_data(
+            key=Keys.JSON_LOG_WRITER, default_value=None
+        )
+        if writer is None:
+            return None
+        writer.stop()
+        if writer.is_alive():
+            writer.join(timeout=5.0)
+        self._set_data(key=Keys.JSON_LOG_WRITER, value=None)
+
+    def __stop_sampler(self) -> None:
+        """Stop the sampling profiler if it is running and write its stacks."""
+        sampler: Optional[ThStackSampler] = self._get_data(
+            key=Keys.SAMPLER, default_value=None
+        )
+        if sampler is None:
+            return None
+        self._set_data(key=Keys.SAMPLER, value=None)
+        sampler.stop()
+        sampler.join(timeout=2.0)
+        try:
+            stacks: int = sampler.dump()
+        except OSError as ex:
+            self.logs.message_error = f"cannot write sampling profile: '{ex}'"
+            return None
+        self.logs.message_notice = (
+            f"sampling profiler stopped, {sampler.samples} samples, "
+            f"{stacks} stacks written to '{sampler.path}'"
+        )
+
     def __stop_subsystem(self, report: PluginServiceReport) -> None:
         """Stop all started plugin subsystems through the registry service.
 
@@ -610,5 +903,26 @@ class AASd(ProjectClassMixin):
         """
         PluginRegistryService.stop(report=report, logs=self.logs)
 
+    def __toggle_sampler(self) -> None:
+        """Start the sampling profiler, or stop it and write its output."""
+        if self._get_data(key=Keys.SAMPLER, default_value=None) is not None:
+            self.__stop_sampler()
+            return None
+        if self.conf is None:
+            return None
+        sampler = ThStackSampler(
+            path=os.path.join(
+                self.conf.profile_dir,
+                f"aasd-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.folded",
+            ),
+            rate=self.conf.profile_rate,
+        )
+        sampler.start()
+        self._set_data(key=Keys.SAMPLER, value=sampler)
+        self.logs.message_notice = (
+            f"sampling profiler started at {sampler.rate} Hz, "
+            "send SIGUSR1 again to stop"
+        )
+
 
 # #[EOF]#######################################################################
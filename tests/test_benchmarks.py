@@ -0,0 +1,70 @@
+# -*- coding: UTF-8 -*-
+"""
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-11
+
+Purpose: Keep the benchmark suite runnable and its output comparable.
+"""
+
+import io
+import json
+import tempfile
+import unittest
+
+from pathlib import Path
+from unittest.mock import patch
+
+from benchmarks import bench_dispatcher
+from benchmarks.__main__ import compare, main
+from benchmarks.fixtures import build_schema, write_config
+from libs.plugins import PluginConfigParser
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Smoke-test the runner, fixtures and comparison."""
+
+    def test_01_fixture_config_should_match_generated_schema(self) -> None:
+        """Parse generated config sections without validation errors."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cfg = write_config(Path(tmp_dir) / "aasd.conf", sections=2, fields=9)
+            values = PluginConfigParser.parse(cfg, "plugin_001", build_schema(9))
+        self.assertEqual(len(values), 9)
+        self.assertIsInstance(values["field_002"], list)
+
+    def test_02_runner_should_emit_json_document(self) -> None:
+        """Run quick scenarios and write a machine-readable document."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output = Path(tmp_dir) / "bench.json"
+            with patch("sys.stdout", new_callable=io.StringIO), patch(
+                "sys.stderr", new_callable=io.StringIO
+            ):
+                code = main(
+                    ["--quick", "--only", "message,loader", "--output", str(output)]
+                )
+            document = json.loads(output.read_text(encoding="utf-8"))
+        self.assertEqual(code, 0)
+        self.assertEqual(document["meta"]["profile"], "quick")
+        self.assertEqual(
+            [item["benchmark"] for item in document["results"]], ["message", "loader"]
+        )
+
+    def test_02a_dispatcher_should_report_lane_wait_times(self) -> None:
+        """Report per-lane wait metrics including the critical probe."""
+        result = bench_dispatcher.run(channels=2, messages=400, rate=400, duration=0.2)
+        self.assertEqual(result["burst_critical_dispatched"], 4)
+        for lane in ("critical", "high", "normal", "low"):
+            self.assertIn(f"burst_{lane}_wait_avg_ms", result)
+            self.assertIn(f"burst_{lane}_wait_max_ms", result)
+
+    def test_03_compare_should_flag_slower_metrics(self) -> None:
+        """Report slowdowns above the threshold as regressions."""
+        baseline = [{"benchmark": "x", "a_ms": 10.0, "b_per_s": 100.0, "count": 5}]
+        current = [{"benchmark": "x", "a_ms": 12.0, "b_per_s": 105.0, "count": 9}]
+        out = compare(current, baseline, threshold=0.1)
+        self.assertEqual(
+            [(item["metric"], item["regression"]) for item in out],
+            [("a_ms", True), ("b_per_s", False)],
+        )
+
+
+# #[EOF]#######################################################################
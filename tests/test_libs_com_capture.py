@@ -0,0 +1,144 @@
+# -*- coding: UTF-8 -*-
+"""
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-16
+
+Purpose: Provide regression coverage for dispatcher message capture and replay.
+"""
+
+import gzip
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from queue import Queue
+from threading import Event
+from typing import List
+
+from jsktoolbox.logstool import LoggerQueue
+
+from libs.com.capture import (
+    CapturedMessage,
+    CaptureField,
+    MessageCapture,
+    read_capture,
+    replay_capture,
+)
+from libs.com.message import Message, Multipart, Priority, ThDispatcher
+from libs.com.routing import RoutingTable
+
+
+class TestMessageCapture(unittest.TestCase):
+    """Cover capture records, reading captures back, and replay timing."""
+
+    # #[PRIVATE METHODS]###############################################################
+    def __captured(self, timestamp: float, subject: str) -> CapturedMessage:
+        """Build one captured message."""
+        message = Message()
+        message.channel = 1
+        message.subject = subject
+        return CapturedMessage(message=message, routed=(1,), timestamp=timestamp)
+
+    # #[PUBLIC METHODS]################################################################
+    def test_01_dispatcher_should_record_routed_messages(self) -> None:
+        """Write compact records and read back equivalent messages."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "capture.jsonl")
+            qcom: Queue = Queue()
+            dispatcher = ThDispatcher(
+                qlog=LoggerQueue(),
+                qcom=qcom,
+                routing=RoutingTable(["channel=1;priority=critical -> 9|2"]),
+                capture=MessageCapture(path),
+            )
+            dispatcher.register_queue(1)
+            dispatcher.register_queue(2)
+            plain = Message()
+            plain.channel = 1
+            plain.origin = "ping_core"
+            plain.subject = "host down"
+            plain.messages = ["line 1", "line 2"]
+            plain.to = ["ops@example.com"]
+            critical = Message()
+            critical.channel = 1
+            critical.priority = Priority.CRITICAL
+            critical.diagnostic_source = "MIcmp"
+            critical.mmessages = {Multipart.PLAIN: ["text"], Multipart.HTML: ["<p/>"]}
+            qcom.put(plain)
+            qcom.put(critical)
+            dispatcher.start()
+            qcom.join()
+            dispatcher.stop()
+            dispatcher.join(timeout=2.0)
+
+            with open(path, "r", encoding="utf-8") as file:
+                records = [json.loads(line) for line in file]
+            with open(path, "a", encoding="utf-8") as file:
+                file.write("not json\n")
+            captured = list(read_capture(path))
+            self.assertEqual(dispatcher.capture.recorded, 2)  # type: ignore[union-attr]
+
+        # the critical message leaves its priority lane first
+        self.assertEqual(
+            sorted(records[1].keys()),
+            sorted(["ch", "m", "o", "s", "to", "ts"]),
+        )
+        self.assertNotIn(CaptureField.ROUTED, records[1])
+        self.assertEqual(records[0][CaptureField.ROUTED], [9, 2])
+        self.assertEqual(records[0][CaptureField.PRIORITY], Priority.CRITICAL)
+        self.assertEqual(len(captured), 2)
+        self.assertEqual(captured[0].message.priority, Priority.CRITICAL)
+        self.assertEqual(captured[0].message.diagnostic_source, "MIcmp")
+        self.assertEqual(captured[0].message.mmessages[Multipart.HTML], ["<p/>"])  # type: ignore[index]
+        self.assertEqual(captured[0].routed, (9, 2))
+        self.assertEqual(captured[1].message.subject, "host down")
+        self.assertEqual(captured[1].message.messages, ["line 1", "line 2"])
+        self.assertEqual(captured[1].message.to, ["ops@example.com"])
+        self.assertEqual(captured[1].message.origin, "ping_core")
+        self.assertEqual(captured[1].routed, (1,))
+        self.assertLessEqual(captured[0].timestamp, captured[1].timestamp)
+
+    def test_02_read_capture_should_decompress_gzip_files(self) -> None:
+        """Read `.gz` captures transparently."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "capture.jsonl.gz")
+            with gzip.open(path, "wt", encoding="utf-8") as file:
+                file.write('{"ts": 1.5, "ch": 3, "s": "a"}\n{"ch": 3}\n')
+            captured = list(read_capture(path))
+
+        self.assertEqual(len(captured), 1)
+        self.assertEqual(captured[0].timestamp, 1.5)
+        self.assertEqual(captured[0].message.channel, 3)
+
+    def test_03_replay_should_keep_scaled_spacing(self) -> None:
+        """Publish at recorded offsets divided by speed, or at once with speed 0."""
+        records = [
+            self.__captured(100.0, "a"),
+            self.__captured(100.2, "b"),
+            self.__captured(100.4, "c"),
+        ]
+        stamps: List[float] = []
+
+        def publish(message: Message) -> bool:
+            stamps.append(time.monotonic())
+            return message.subject != "c"
+
+        stats = replay_capture(iter(records), publish, speed=2.0)
+
+        self.assertEqual((stats.published, stats.throttled), (2, 1))
+        self.assertAlmostEqual(stamps[1] - stamps[0], 0.1, delta=0.05)
+        self.assertAlmostEqual(stamps[2] - stamps[0], 0.2, delta=0.05)
+
+        stamps.clear()
+        stats = replay_capture(iter(records), publish, speed=0)
+        self.assertLess(stamps[2] - stamps[0], 0.05)
+
+        stop = Event()
+        stop.set()
+        stats = replay_capture(iter(records), publish, stop_event=stop)
+        self.assertEqual(stats.published + stats.throttled, 0)
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,134 @@
+# -*- coding: UTF-8 -*-
+"""
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Provide regression coverage for the message coalescing stage.
+"""
+
+import time
+import unittest
+
+from queue import Empty, Queue
+from typing import Any, Optional
+
+from libs.com.coalesce import MessageCoalescer
+from libs.com.message import Message, Multipart, Priority
+
+
+class TestMessageCoalescer(unittest.TestCase):
+    """Cover grouping windows, size limits, and multipart merging."""
+
+    # #[PRIVATE METHODS]###############################################################
+    def __message(
+        self, subject: str, body: str, to: Any = None, html: Optional[str] = None
+    ) -> Message:
+        """Build one dispatcher message."""
+        message = Message()
+        message.channel = 1
+        message.subject = subject
+        if to is not None:
+            message.to = to
+        if html is None:
+            message.messages = [body]
+        else:
+            message.mmessages = {Multipart.PLAIN: [body], Multipart.HTML: [html]}
+        return message
+
+    # #[PUBLIC METHODS]################################################################
+    def test_01_should_merge_messages_within_window(self) -> None:
+        """Return one message for a burst with the same key."""
+        queue: Queue = Queue()
+        stage = MessageCoalescer(queue, window=0.1)
+        for idx in range(5):
+            queue.put(self.__message("disk full", f"line {idx}"))
+
+        start = time.monotonic()
+        message = stage.get(timeout=1.0)
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+        self.assertEqual(message.subject, "disk full")
+        self.assertEqual(message.messages, [f"line {idx}" for idx in range(5)])
+        self.assertEqual(stage.merged, 4)
+        self.assertEqual(stage.pending, 0)
+
+    def test_02_should_close_group_at_max_size(self) -> None:
+        """Release a group immediately once it reaches `max_size`."""
+        queue: Queue = Queue()
+        stage = MessageCoalescer(queue, window=60.0, max_size=3)
+        for idx in range(4):
+            queue.put(self.__message("disk full", f"line {idx}"))
+
+        message = stage.get(timeout=1.0)
+
+        self.assertEqual(len(message.messages), 3)
+        self.assertEqual(stage.pending, 1)
+        self.assertEqual(stage.flush()[0].messages, ["line 3"])
+
+    def test_02a_should_keep_highest_priority_and_shared_origin(self) -> None:
+        """Carry the most urgent priority and a common origin into the merge."""
+        stage = MessageCoalescer(Queue(), window=60.0)
+        messages = [self.__message("disk full", f"line {idx}") for idx in range(3)]
+        for message in messages:
+            message.origin = "zfs"
+        messages[1].priority = Priority.CRITICAL
+        messages[2].priority = Priority.LOW
+
+        merged = stage.merge(messages)
+        self.assertEqual(merged.priority, Priority.CRITICAL)
+        self.assertEqual(merged.origin, "zfs")
+
+        messages[2].origin = "icmp"
+        self.assertIsNone(stage.merge(messages).origin)
+
+    def test_03_should_keep_different_keys_apart(self) -> None:
+        """Group only messages with equal subject and recipients."""
+        queue: Queue = Queue()
+        stage = MessageCoalescer(queue, window=0.05)
+        queue.put(self.__message("disk full", "a", to="a@localhost"))
+        queue.put(self.__message("disk full", "b", to="b@localhost"))
+        queue.put(self.__message("load high", "c", to="a@localhost"))
+        queue.put(self.__message("disk full", "d", to="a@localhost"))
+
+        out = [stage.get(timeout=1.0) for _ in range(3)]
+
+        self.assertEqual(
+            sorted((item.subject, tuple(item.messages)) for item in out),
+            [("disk full", ("a", "d")), ("disk full", ("b",)), ("load high", ("c",))],
+        )
+
+    def test_04_should_merge_multipart_parts_separately(self) -> None:
+        """Concatenate plain and HTML parts and escape plain-only members."""
+        queue: Queue = Queue()
+        stage = MessageCoalescer(queue, window=0.01)
+        queue.put(self.__message("report", "first", html="<b>first</b>"))
+        second = Message()
+        second.channel = 1
+        second.subject = "report"
+        second.mmessages = {Multipart.PLAIN: ["a < b"]}
+        queue.put(second)
+
+        message = stage.get(timeout=1.0)
+
+        self.assertEqual(message.mmessages[Multipart.PLAIN], ["first", "a < b"])
+        self.assertEqual(
+            message.mmessages[Multipart.HTML], ["<b>first</b>", "<pre>a &lt; b</pre>"]
+        )
+
+    def test_05_get_should_raise_empty_and_acknowledge_source(self) -> None:
+        """Mimic `Queue.get()` timeouts and call `task_done()` on the source."""
+        queue: Queue = Queue()
+        stage = MessageCoalescer(queue, window=60.0)
+
+        with self.assertRaises(Empty):
+            stage.get(timeout=0.05)
+        queue.put(self.__message("disk full", "a"))
+        with self.assertRaises(Empty):
+            stage.get_nowait()
+
+        queue.join()
+        self.assertEqual(stage.pending, 1)
+        stage.task_done()
+
+
+# #[EOF]#######################################################################
@@ -20,10 +20,16 @@ from libs.com.message import (
     AtChannel,
     Channel,
     Message,
+    MessageDeduplicator,
+    MessageScheduler,
     Multipart,
     NotificationScheduler,
+    PendingRequests,
+    Priority,
     ThDispatcher,
 )
+from libs.plugins import PluginCommonKeys, PluginConfigParser
+from libs.templates import PluginConfigField, PluginConfigSchema
 
 
 class _FullQueue(Queue):
@@ -302,6 +308,36 @@ class TestNotificationScheduler(unittest.TestCase):
             with self.assertRaises(ValueError):
                 obj.due_channels()
 
+    def test_04_should_accept_frozen_config_snapshot(self) -> None:
+        """Build schedulers from snapshot values stored as tuples."""
+        config = PluginConfigParser.freeze(
+            PluginConfigSchema(
+                title="Scheduler snapshot test.",
+                fields=[
+                    PluginConfigField(
+                        name=name,
+                        field_type=list,
+                        default=[],
+                        required=False,
+                        description="Channels.",
+                    )
+                    for name in (
+                        PluginCommonKeys.AT_CHANNEL,
+                        PluginCommonKeys.MESSAGE_CHANNEL,
+                    )
+                ],
+            ),
+            {"at_channel": ["3:0;8;*;*;*"], "message_channel": [1, "2:6h"]},
+        )
+
+        self.assertIsInstance(config.get("at_channel"), tuple)
+        self.assertTrue(NotificationScheduler.from_config(config).has_schedule)
+        self.assertTrue(
+            NotificationScheduler.from_config(
+                config, message_channel_key="missing"
+            ).has_schedule
+        )
+
 
 class TestMessage(unittest.TestCase):
     """Cover message container accessors and validation."""
@@ -371,6 +407,212 @@ class TestMessage(unittest.TestCase):
             _ = obj.messages
 
 
+class TestMessageDeduplicator(unittest.TestCase):
+    """Cover fingerprinting, TTL expiry, and LRU eviction."""
+
+    # #[PRIVATE METHODS]###############################################################
+    def __message(self, body: str, subject: str = "host down") -> Message:
+        """Build one message from a reachability-style worker."""
+        message = Message()
+        message.channel = 1
+        message.diagnostic_source = "ping"
+        message.subject = subject
+        message.to = "ops@localhost"
+        message.messages = [body]
+        return message
+
+    # #[PUBLIC METHODS]################################################################
+    def test_01_should_suppress_repeats_and_summarize_on_expiry(self) -> None:
+        """Drop repeats while flapping and report their count after `ttl`."""
+        dedup = MessageDeduplicator(ttl=10.0)
+
+        self.assertTrue(dedup.check(self.__message("10.0.0.1 down"), now=0.0))
+        self.assertTrue(dedup.check(self.__message("10.0.0.1 up"), now=1.0))
+        for idx in range(3):
+            self.assertFalse(dedup.check(self.__message("10.0.0.1 down"), now=2.0 + idx))
+            self.assertFalse(dedup.check(self.__message("10.0.0.1 up"), now=2.5 + idx))
+
+        self.assertEqual(dedup.expire(now=9.0), [])
+        summaries = dedup.expire(now=11.0)
+
+        self.assertEqual(dedup.passed, 2)
+        self.assertEqual(dedup.suppressed, 6)
+        self.assertEqual(dedup.size, 0)
+        self.assertEqual(
+            [item.subject for item in summaries],
+            ["[suppressed 3 duplicates] host down"] * 2,
+        )
+        self.assertEqual(summaries[0].messages[1], "10.0.0.1 down")
+        self.assertEqual(summaries[0].to, ["ops@localhost"])
+
+    def test_01a_should_summarize_a_steady_repeat_once_per_ttl(self) -> None:
+        """Announce a message repeating faster than `ttl` at least once per `ttl`."""
+        dedup = MessageDeduplicator(ttl=10.0)
+        passed = [
+            dedup.check(self.__message("10.0.0.1 down"), now=float(second))
+            for second in range(25)
+        ]
+        summaries = dedup.expire(now=25.0)
+
+        self.assertEqual([idx for idx, item in enumerate(passed) if item], [0, 10, 20])
+        self.assertEqual(
+            [item.subject for item in summaries],
+            ["[suppressed 9 duplicates] host down"] * 2,
+        )
+
+    def test_02_should_distinguish_subject_body_and_source(self) -> None:
+        """Treat every fingerprint component as significant."""
+        other = self.__message("a")
+        other.diagnostic_source = "other"
+        keys = {
+            MessageDeduplicator.fingerprint(item)
+            for item in (
+                self.__message("a"),
+                self.__message("b"),
+                self.__message("a", subject="host up"),
+                other,
+            )
+        }
+
+        self.assertEqual(len(keys), 4)
+        self.assertEqual(
+            MessageDeduplicator.fingerprint(self.__message("a")),
+            MessageDeduplicator.fingerprint(self.__message("a")),
+        )
+
+    def test_03_should_evict_oldest_entries(self) -> None:
+        """Bound memory and still report counts of evicted entries."""
+        dedup = MessageDeduplicator(ttl=100.0, max_size=2)
+        dedup.check(self.__message("a"), now=0.0)
+        dedup.check(self.__message("a"), now=1.0)
+        dedup.check(self.__message("b"), now=2.0)
+        dedup.check(self.__message("c"), now=3.0)
+
+        self.assertEqual(dedup.size, 2)
+        self.assertEqual(
+            [item.messages for item in dedup.expire(now=4.0)],
+            [["suppressed 1 duplicate of:", "a"]],
+        )
+        self.assertTrue(dedup.check(self.__message("a"), now=5.0))
+
+
+class TestMessageScheduler(unittest.TestCase):
+    """Cover strict priority, fair queuing, and lane metrics."""
+
+    # #[PRIVATE METHODS]###############################################################
+    def __message(self, origin: str, priority: int = Priority.NORMAL) -> Message:
+        """Build one message published by the selected plugin instance."""
+        message = Message()
+        message.channel = 1
+        message.origin = origin
+        message.priority = priority
+        return message
+
+    # #[PUBLIC METHODS]################################################################
+    def test_01_should_serve_critical_messages_first(self) -> None:
+        """Take critical messages ahead of any queued flood."""
+        scheduler = MessageScheduler()
+        for _ in range(100):
+            scheduler.put(self.__message("flood", Priority.LOW), now=0.0)
+        critical = self.__message("ping", Priority.CRITICAL)
+        scheduler.put(critical, now=1.0)
+
+        self.assertIs(scheduler.get(now=1.5), critical)
+        self.assertEqual(scheduler.depth, 100)
+        metrics = scheduler.metrics
+        self.assertEqual(metrics["critical"]["wait_max"], 0.5)
+        self.assertEqual(metrics["low"]["depth"], 100)
+
+    def test_02_should_share_lanes_fairly_between_sources(self) -> None:
+        """Interleave a quiet source with a flooding one."""
+        scheduler = MessageScheduler()
+        for _ in range(50):
+            scheduler.put(self.__message("flood"))
+        for _ in range(5):
+            scheduler.put(self.__message("quiet"))
+
+        first = [scheduler.get().origin for _ in range(10)]  # type: ignore
+
+        self.assertEqual(first.count("quiet"), 5)
+        self.assertEqual(scheduler.depth, 45)
+
+    def test_03_should_weight_lanes(self) -> None:
+        """Serve the high lane four times as often as the low lane."""
+        scheduler = MessageScheduler()
+        for _ in range(20):
+            scheduler.put(self.__message("a", Priority.LOW))
+            scheduler.put(self.__message("a", Priority.HIGH))
+
+        served = [scheduler.get().priority for _ in range(10)]  # type: ignore
+
+        self.assertEqual(served.count(Priority.HIGH), 8)
+        self.assertEqual(scheduler.metrics["high"]["dispatched"], 8)
+        while scheduler.get() is not None:
+            pass
+        self.assertEqual(scheduler.depth, 0)
+
+    def test_04_should_reject_unknown_priority(self) -> None:
+        """Validate `Message.priority` values."""
+        message = Message()
+        self.assertEqual(message.priority, Priority.NORMAL)
+        with self.assertRaises(ValueError):
+            message.priority = 7
+
+
+class TestPendingRequests(unittest.TestCase):
+    """Cover request futures, reply matching, and timer-driven expiry."""
+
+    # #[PRIVATE METHODS]###############################################################
+    def __reply(self, correlation_id: str) -> Message:
+        """Build one reply to the selected request."""
+        message = Message()
+        message.in_reply_to = correlation_id
+        message.messages = ["pong"]
+        return message
+
+    # #[PUBLIC METHODS]################################################################
+    def test_01_should_resolve_future_with_reply(self) -> None:
+        """Complete the matching future and ignore unknown replies."""
+        table = PendingRequests()
+        future = table.add("a", timeout=5.0)
+
+        self.assertFalse(table.resolve(self.__reply("b")))
+        self.assertTrue(table.resolve(self.__reply("a")))
+
+        self.assertEqual(future.result(timeout=0).messages, ["pong"])
+        self.assertFalse(table.resolve(self.__reply("a")))
+        self.assertEqual((table.size, table.resolved), (0, 1))
+        table.add("c", timeout=1.0)
+        with self.assertRaises(KeyError):
+            table.add("c", timeout=1.0)
+
+    def test_02_should_expire_only_due_requests(self) -> None:
+        """Fail requests whose deadline passed with `TimeoutError`."""
+        table = PendingRequests()
+        early = table.add("early", timeout=1.0, now=0.0)
+        answered = table.add("answered", timeout=1.0, now=0.0)
+        late = table.add("late", timeout=10.0, now=0.0)
+        table.resolve(self.__reply("answered"))
+
+        self.assertEqual(table.expire(now=2.0), 1)
+
+        with self.assertRaises(TimeoutError):
+            early.result(timeout=0)
+        self.assertEqual(answered.result(timeout=0).in_reply_to, "answered")
+        self.assertFalse(late.done())
+        self.assertEqual(table.expire(now=3.0, force=True), 1)
+        self.assertEqual((table.size, table.expired), (0, 2))
+
+    def test_03_should_skip_cancelled_futures(self) -> None:
+        """Drop replies for requests the caller cancelled."""
+        table = PendingRequests()
+        future = table.add("a", timeout=5.0)
+        future.cancel()
+
+        self.assertTrue(table.resolve(self.__reply("a")))
+        self.assertTrue(future.cancelled())
+
+
 class TestThDispatcher(unittest.TestCase):
     """Cover queue registration and dispatch behaviour."""
 
@@ -432,6 +674,24 @@ class TestThDispatcher(unittest.TestCase):
         self.assertIn("Source: '_RuntimeProbe'", log_message)
         self.assertIn("subject='test subject'", log_message)
 
+    def test_02b_should_unregister_queue_without_touching_others(self) -> None:
+        """Remove one consumer queue and keep the rest of the channel intact."""
+        dispatcher = self.__build_dispatcher(debug=True)
+        queue_one = dispatcher.register_queue(1)
+        queue_two = dispatcher.register_queue(1)
+
+        self.assertTrue(dispatcher.unregister_queue(1, queue_one))
+        self.assertFalse(dispatcher.unregister_queue(1, queue_one))
+
+        message = Message()
+        message.channel = 1
+        dispatcher._ThDispatcher__dispatch_message(message)
+
+        self.assertTrue(queue_one.empty())
+        self.assertIs(queue_two.get_nowait(), message)
+        self.assertTrue(dispatcher.unregister_queue("1", queue_two))
+        self.assertNotIn("1", dispatcher._ThDispatcher__get_comm_queues)
+
     def test_03_should_ignore_full_target_queue(self) -> None:
         """Swallow `Full` and continue dispatching as implemented."""
         dispatcher = self.__build_dispatcher()
@@ -474,5 +734,82 @@ class TestThDispatcher(unittest.TestCase):
         dispatcher.run()
         self.assertTrue(dispatcher.stopped)
 
+    def test_06_should_suppress_duplicates_when_enabled(self) -> None:
+        """Deliver one copy and a summary on shutdown."""
+        qcom: Queue = Queue()
+        dispatcher = ThDispatcher(qlog=LoggerQueue(), qcom=qcom, dedup_ttl=60.0)
+        target_queue = dispatcher.register_queue(3)
+        for _ in range(4):
+            message = Message()
+            message.channel = 3
+            message.subject = "host down"
+            qcom.put(message)
+
+        dispatcher.start()
+        qcom.join()
+        dispatcher.stop()
+        dispatcher.join(timeout=1.0)
+
+        delivered = [target_queue.get_nowait() for _ in range(target_queue.qsize())]
+        self.assertEqual(
+            [item.subject for item in delivered],
+            ["host down", "[suppressed 3 duplicates] host down"],
+        )
+        self.assertIsNone(self.__build_dispatcher().dedup)
+
+    def test_07_should_route_critical_messages_ahead_of_a_flood(self) -> None:
+        """Keep critical latency flat while one worker floods the queue."""
+        qcom: Queue = Queue()
+        dispatcher = self.__build_dispatcher(qcom=qcom)
+        target_queue = dispatcher.register_queue(1)
+        for idx in range(2000):
+            message = Message()
+            message.channel = 1
+            message.origin = "flood"
+            message.subject = f"info {idx}"
+            qcom.put(message)
+        critical = Message()
+        critical.channel = 1
+        critical.priority = Priority.CRITICAL
+        critical.subject = "critical"
+        qcom.put(critical)
+
+        dispatcher.start()
+        qcom.join()
+        dispatcher.stop()
+        dispatcher.join(timeout=1.0)
+
+        subjects = [target_queue.get_nowait().subject for _ in range(2001)]
+        self.assertLess(subjects.index("critical"), 1001)
+        metrics = dispatcher.lane_metrics
+        self.assertEqual(metrics["critical"]["dispatched"], 1)
+        self.assertEqual(metrics["normal"]["dispatched"], 2000)
+        self.assertLessEqual(
+            metrics["critical"]["wait_max"], metrics["normal"]["wait_max"]
+        )
+
+    def test_08_should_leave_a_flood_in_qcom_above_the_lane_limit(self) -> None:
+        """Stop ingesting once the lanes hold `LANE_LIMIT` messages."""
+        qcom: Queue = Queue()
+        dispatcher = self.__build_dispatcher(qcom=qcom)
+        dispatcher.LANE_LIMIT = 10  # type: ignore[misc]
+        dispatcher.register_queue(1)
+        for idx in range(50):
+            message = Message()
+            message.channel = 1
+            message.subject = f"info {idx}"
+            qcom.put(message)
+
+        dispatcher._ThDispatcher__ingest_messages()  # type: ignore[attr-defined]
+        self.assertEqual(dispatcher.scheduler.depth, 10)
+        self.assertEqual(qcom.qsize(), 40)
+        dispatcher._ThDispatcher__ingest_messages()  # type: ignore[attr-defined]
+        self.assertEqual(qcom.qsize(), 40)
+
+        dispatcher._ThDispatcher__dispatch_next()  # type: ignore[attr-defined]
+        dispatcher._ThDispatcher__ingest_messages()  # type: ignore[attr-defined]
+        self.assertEqual(dispatcher.scheduler.depth, 10)
+        self.assertEqual(qcom.qsize(), 39)
+
 
 # #[EOF]#######################################################################
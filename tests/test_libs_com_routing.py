@@ -0,0 +1,111 @@
+# -*- coding: UTF-8 -*-
+"""
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Provide regression coverage for content-based message routing.
+"""
+
+import unittest
+
+from queue import Queue
+from typing import Optional
+
+from jsktoolbox.logstool import LoggerQueue
+
+from libs.com.message import Message, Priority, ThDispatcher
+from libs.com.routing import RoutingTable
+
+
+class TestRoutingTable(unittest.TestCase):
+    """Cover rule parsing, first-match ordering, and dispatcher integration."""
+
+    # #[PRIVATE METHODS]###############################################################
+    def __message(
+        self,
+        channel: int = 1,
+        origin: Optional[str] = None,
+        subject: str = "",
+        priority: int = Priority.NORMAL,
+    ) -> Message:
+        """Build one routed message."""
+        message = Message()
+        message.channel = channel
+        if origin is not None:
+            message.origin = origin
+        message.subject = subject
+        message.priority = priority
+        return message
+
+    # #[PUBLIC METHODS]################################################################
+    def test_01_should_parse_rule_conditions(self) -> None:
+        """Compile alternatives, priority names, and a subject containing `;`."""
+        rule = RoutingTable.parse_rule(
+            "channel=1|2;origin=ping;priority=critical|1;subject=^DOWN;x -> 9|10"
+        )
+
+        self.assertEqual(rule.channels, (1, 2))
+        self.assertEqual(rule.origins, ("ping",))
+        self.assertEqual(rule.priorities, frozenset({Priority.CRITICAL, Priority.HIGH}))
+        self.assertEqual(rule.subject.pattern, "^DOWN;x")  # type: ignore
+        self.assertEqual(rule.targets, (9, 10))
+        self.assertEqual(RoutingTable.parse_rule("* -> 3").channels, ())
+
+    def test_02_should_report_invalid_rules(self) -> None:
+        """Skip rules that cannot be compiled and keep the others."""
+        table = RoutingTable(
+            [
+                "channel=1",
+                "host=x -> 2",
+                "channel=a -> 2",
+                "priority=urgent -> 2",
+                "subject=( -> 2",
+                "channel=1 -> ",
+                "channel=1 -> 2",
+            ]
+        )
+
+        self.assertEqual(len(table.errors), 6)
+        self.assertEqual([rule.text for rule in table.rules], ["channel=1 -> 2"])
+
+    def test_03_should_route_by_first_matching_rule(self) -> None:
+        """Send critical messages from one host to the pager, the rest to e-mail."""
+        table = RoutingTable(
+            [
+                "channel=1;origin=ping_core;priority=critical -> 9",
+                "channel=1;subject=^backup -> 7",
+                "channel=1 -> 2",
+                "origin=zfs -> 5",
+            ]
+        )
+
+        self.assertEqual(
+            table.route(self.__message(origin="ping_core", priority=Priority.CRITICAL)),
+            [9],
+        )
+        self.assertEqual(table.route(self.__message(origin="ping_core")), [2])
+        self.assertEqual(table.route(self.__message(subject="backup done")), [7])
+        self.assertEqual(table.route(self.__message(channel=3, origin="zfs")), [5])
+        self.assertEqual(table.route(self.__message(channel=1, origin="zfs")), [2])
+        self.assertIsNone(table.route(self.__message(channel=3)))
+
+    def test_04_dispatcher_should_apply_routing_table(self) -> None:
+        """Deliver to routed channels and fall back to the message channel."""
+        dispatcher = ThDispatcher(
+            qlog=LoggerQueue(),
+            qcom=Queue(),
+            routing=RoutingTable(["channel=1;priority=critical -> 9|2"]),
+        )
+        email = dispatcher.register_queue(2)
+        pager = dispatcher.register_queue(9)
+        original = dispatcher.register_queue(1)
+
+        dispatcher._ThDispatcher__dispatch_message(
+            self.__message(priority=Priority.CRITICAL)
+        )
+        dispatcher._ThDispatcher__dispatch_message(self.__message())
+
+        self.assertEqual((email.qsize(), pager.qsize(), original.qsize()), (1, 1, 1))
+
+
+# #[EOF]#######################################################################
@@ -421,6 +421,37 @@ class TestAppConfig(unittest.TestCase):
             self.assertTrue(obj.debug)
             self.assertTrue(obj.verbose)
 
+    def test_09a_should_read_logging_queue_limits(self) -> None:
+        """Read logging queue limits and exempt levels from the main section."""
+        obj = self.__build_config(Path("/tmp/unused.conf"))
+        self.assertEqual(obj.log_queue_size, 10000)
+        self.assertEqual(obj.log_rate, 20.0)
+        self.assertEqual(obj.log_burst, 100)
+        self.assertIsNone(obj.log_rate_exempt)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config_file = Path(tmp_dir) / "aasd.conf"
+            cfg = ConfigTool(str(config_file), "AASd", auto_create=True)
+            cfg.set("aasd", varname="log_queue_size", value=500)
+            cfg.set("aasd", varname="log_rate", value=0)
+            cfg.set("aasd", varname="log_burst", value=10)
+            cfg.set("aasd", varname="log_rate_exempt", value=["critical", "ERROR"])
+            self.assertTrue(cfg.save())
+            self.assertTrue(cfg.load())
+
+            obj = self.__build_config(config_file)
+            obj._cfh = cfg
+
+            self.assertEqual(obj.log_queue_size, 500)
+            self.assertEqual(obj.log_rate, 0.0)
+            self.assertEqual(obj.log_burst, 10)
+            self.assertEqual(obj.log_rate_exempt, ["CRITICAL", "ERROR"])
+
+            cfg.set("aasd", varname="log_rate_exempt", value=[])
+            self.assertTrue(cfg.save())
+            self.assertTrue(cfg.load())
+            self.assertEqual(obj.log_rate_exempt, [])
+
     def test_10_should_log_plugin_config_warnings_during_load(self) -> None:
         """Emit semantic plugin-config warnings during `load()`."""
         with tempfile.TemporaryDirectory() as tmp_dir:
@@ -460,5 +491,88 @@ class TestAppConfig(unittest.TestCase):
                 any("at_channel" in item and "full wildcard" in item for item in logs.warnings)
             )
 
+    def test_11_reload_should_report_only_changed_sections(self) -> None:
+        """Expose the changed plugin section after `reload()`."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config_file = Path(tmp_dir) / "aasd.conf"
+            plugins_dir = Path(tmp_dir) / "plugins"
+            plugins_dir.mkdir()
+            self.__prepare_existing_file(config_file, with_plugins_dir=True)
+            self.__write_test_plugin(plugins_dir / "sample_plugin")
+            self.__write_test_plugin(plugins_dir / "other_plugin")
+
+            cfg = ConfigTool(str(config_file), "AASd", auto_create=True)
+            cfg.set("sample_plugin", varname="channel", value=3)
+            cfg.set("other_plugin", varname="channel", value=4)
+            self.assertTrue(cfg.save())
+
+            obj = self.__build_config(config_file)
+            obj.plugins_dir = str(plugins_dir)
+            self.assertTrue(obj.load())
+            self.assertIn("other_plugin", obj.last_changes.added)
+            self.assertIn("sample_plugin", obj.last_changes.added)
+
+            self.assertTrue(obj.reload())
+            self.assertFalse(obj.last_changes.has_changes)
+
+            cfg = ConfigTool(str(config_file), "AASd")
+            self.assertTrue(cfg.load())
+            cfg.set("sample_plugin", varname="channel", value=5)
+            self.assertTrue(cfg.save())
+
+            self.assertTrue(obj.reload())
+            self.assertEqual(obj.last_changes.changed, ["sample_plugin"])
+            self.assertEqual(obj.last_changes.added, [])
+            self.assertEqual(obj.last_changes.removed, [])
+            self.assertEqual(obj.cf.get("sample_plugin", "channel"), 5)  # type: ignore
+
+    def test_12_reload_should_validate_only_changed_plugin_sections(self) -> None:
+        """Skip plugin config validation for unchanged sections on reload."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config_file = Path(tmp_dir) / "aasd.conf"
+            plugins_dir = Path(tmp_dir) / "plugins"
+            plugins_dir.mkdir()
+            self.__prepare_existing_file(config_file, with_plugins_dir=True)
+            self.__write_validation_test_plugin(plugins_dir / "sample_plugin")
+
+            cfg = ConfigTool(str(config_file), "AASd", auto_create=True)
+            cfg.set("sample_plugin", varname="message_channel", value=["mail"])
+            cfg.set("sample_plugin", varname="at_channel", value=[])
+            self.assertTrue(cfg.save())
+
+            obj = self.__build_config(config_file)
+            obj.plugins_dir = str(plugins_dir)
+            logs = _CollectingLogger()
+
+            with patch.object(AppConfig, "logs", new_callable=PropertyMock) as logs_mock:
+                logs_mock.return_value = logs
+                self.assertTrue(obj.load())
+                load_warnings: int = len(logs.warnings)
+                self.assertTrue(obj.reload())
+
+            self.assertGreaterEqual(load_warnings, 1)
+            self.assertEqual(len(logs.warnings), load_warnings)
+
+    def test_13_reload_should_report_removed_plugin_instances(self) -> None:
+        """Report plugin instances removed from `plugins_dir` since last load."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config_file = Path(tmp_dir) / "aasd.conf"
+            plugins_dir = Path(tmp_dir) / "plugins"
+            plugins_dir.mkdir()
+            self.__prepare_existing_file(config_file, with_plugins_dir=True)
+            self.__write_test_plugin(plugins_dir / "sample_plugin")
+
+            cfg = ConfigTool(str(config_file), "AASd", auto_create=True)
+            cfg.set("sample_plugin", varname="channel", value=3)
+            self.assertTrue(cfg.save())
+
+            obj = self.__build_config(config_file)
+            obj.plugins_dir = str(plugins_dir)
+            self.assertTrue(obj.load())
+
+            (plugins_dir / "sample_plugin" / "load.py").unlink()
+            self.assertTrue(obj.reload())
+            self.assertEqual(obj.last_changes.removed, ["sample_plugin"])
+
 
 # #[EOF]#######################################################################
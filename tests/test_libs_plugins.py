@@ -9,6 +9,7 @@ Purpose: Provide regression coverage for plugin discovery and config parsing.
 import io
 import os
 import tempfile
+import time
 import unittest
 
 from pathlib import Path
@@ -18,6 +19,7 @@ from unittest.mock import patch
 
 from jsktoolbox.configtool import Config as ConfigTool
 from jsktoolbox.logstool import LoggerClient, LoggerQueue
+from jsktoolbox.stringtool import SimpleCrypto
 
 from libs import AppName
 from libs.com.message import Message, ThDispatcher
@@ -25,6 +27,7 @@ from libs.plugins import (
     DispatcherAdapter,
     PluginCommonKeys,
     PluginConfigParser,
+    PluginConfigSnapshot,
     PluginContext,
     PluginHealth,
     PluginHealthPolicy,
@@ -278,6 +281,81 @@ class TestLibsPlugins(unittest.TestCase):
         self.assertIs(qcom.get_nowait(), message)
         self.assertIsInstance(consumer_queue, Queue)
 
+    def test_01c_dispatcher_adapter_stamps_publishing_instance(self) -> None:
+        """Set `Message.origin` to the adapter instance name when missing."""
+        qcom: Queue = Queue()
+        dispatcher = ThDispatcher(qlog=LoggerQueue(), qcom=qcom)
+        adapter = DispatcherAdapter(
+            qcom=qcom, dispatcher=dispatcher, instance_name="worker1"
+        )
+        message = Message()
+        stamped = Message()
+        stamped.origin = "other"
+
+        adapter.publish(message)
+        adapter.publish(stamped)
+
+        self.assertEqual(qcom.get_nowait().origin, "worker1")
+        self.assertEqual(qcom.get_nowait().origin, "other")
+
+    def test_01d_dispatcher_adapter_throttles_with_token_bucket(self) -> None:
+        """Reject publishing above `publish_rate` and refill over time."""
+        qcom: Queue = Queue()
+        dispatcher = ThDispatcher(qlog=LoggerQueue(), qcom=qcom)
+        adapter = DispatcherAdapter(
+            qcom=qcom, dispatcher=dispatcher, publish_rate=50.0, publish_burst=2
+        )
+
+        sent = [adapter.publish(Message()) for _ in range(5)]
+        time.sleep(0.05)
+
+        self.assertEqual(sent, [True, True, False, False, False])
+        self.assertTrue(adapter.publish(Message()))
+        self.assertEqual(qcom.qsize(), 3)
+        self.assertEqual((adapter.published, adapter.throttled), (3, 3))
+
+    def test_01e_dispatcher_adapter_routes_replies_to_requests(self) -> None:
+        """Resolve a worker request with the reply of a communication consumer."""
+        qcom: Queue = Queue()
+        dispatcher = ThDispatcher(qlog=LoggerQueue(), qcom=qcom)
+        worker = DispatcherAdapter(
+            qcom=qcom, dispatcher=dispatcher, instance_name="ping"
+        )
+        console = DispatcherAdapter(qcom=qcom, dispatcher=dispatcher)
+        consumer = console.register_consumer(3)
+        dispatcher.start()
+        try:
+            request = Message()
+            request.channel = 3
+            request.messages = ["ping host now"]
+            future = worker.request(request, timeout=2.0)
+
+            received = consumer.get(timeout=1.0)
+            answer = Message()
+            answer.messages = ["host is up"]
+            console.reply(received, answer)
+            reply = future.result(timeout=1.0)
+
+            orphan = Message()
+            orphan.channel = 4
+            missing = worker.request(orphan, timeout=2.0)
+            with self.assertRaises(LookupError):
+                missing.result(timeout=1.0)
+            lost = Message()
+            lost.channel = 3
+            with self.assertRaises(TimeoutError):
+                worker.request(lost, timeout=0.1).result(timeout=1.0)
+        finally:
+            dispatcher.stop()
+            dispatcher.join(timeout=1.0)
+
+        self.assertEqual(received.origin, "ping")
+        self.assertEqual(reply.messages, ["host is up"])
+        self.assertEqual(reply.in_reply_to, received.correlation_id)
+        self.assertEqual(dispatcher.requests.size, 0)
+        with self.assertRaises(ValueError):
+            console.reply(Message(), Message())
+
     def test_02_parser_validates_and_returns_schema_values(self) -> None:
         """Parse config values according to the declared schema."""
         with tempfile.TemporaryDirectory() as tmp_dir:
@@ -517,6 +595,152 @@ class TestLibsPlugins(unittest.TestCase):
             self.assertIn("non-integer channel identifier 'mail'", logs.warnings[0])
             self.assertIn("invalid interval 'bad'", logs.warnings[1])
 
+    def test_02h_parser_should_build_frozen_typed_snapshot(self) -> None:
+        """Build an immutable slotted snapshot reused across reloads."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config_file = Path(tmp_dir) / "plugin.conf"
+            cfg = ConfigTool(str(config_file), "plugin", auto_create=True)
+            cfg.set("plugin", varname="message_channel", value=[1, "2:5m"])
+            self.assertTrue(cfg.save())
+            self.assertTrue(cfg.load())
+
+            schema = PluginConfigSchema(
+                title="Snapshot test.",
+                fields=[
+                    PluginConfigField(
+                        name="message_channel",
+                        field_type=list,
+                        default=[],
+                        required=True,
+                        description="Interval notification targets.",
+                    ),
+                    PluginConfigField(
+                        name="sleep_period",
+                        field_type=str,
+                        default="60",
+                        required=False,
+                        description="Sleep period.",
+                    ),
+                ],
+            )
+
+            config = PluginConfigParser.snapshot(cfg, "plugin", schema)
+
+            self.assertIsInstance(config, PluginConfigSnapshot)
+            self.assertEqual(config.message_channel, (1, "2:5m"))
+            self.assertEqual(config.get("sleep_period"), "60")
+            self.assertEqual(config["sleep_period"], "60")
+            self.assertIsNone(config.get("missing"))
+            self.assertEqual(list(config), ["message_channel", "sleep_period"])
+            self.assertFalse(hasattr(config, "__dict__"))
+            with self.assertRaises(AttributeError):
+                config.sleep_period = "5"  # type: ignore[misc]
+            self.assertIs(type(config), PluginConfigParser.snapshot_type(schema))
+
+            other = PluginConfigParser.freeze(
+                schema, {"message_channel": [1, "2:5m"], "sleep_period": "5"}
+            )
+            self.assertEqual(other.changed(config), ["sleep_period"])
+            self.assertEqual(
+                config.changed({"message_channel": [1, "2:5m"], "sleep_period": "60"}),
+                [],
+            )
+
+    def test_02i_parser_should_reject_field_names_unusable_as_attributes(
+        self,
+    ) -> None:
+        """Reject snapshot fields that cannot be slot names."""
+        for name in ("smtp-user", "class", "get"):
+            schema = PluginConfigSchema(
+                title="Snapshot name test.",
+                fields=[
+                    PluginConfigField(
+                        name=name,
+                        field_type=str,
+                        default="",
+                        required=False,
+                        description="Field.",
+                    )
+                ],
+            )
+            with self.assertRaises(ValueError):
+                PluginConfigParser.snapshot_type(schema)
+
+    def test_02j_parser_should_decrypt_secrets_once_per_snapshot(self) -> None:
+        """Decrypt `secret=True` values with the main-section salt when parsed."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            config_file = Path(tmp_dir) / "plugin.conf"
+            cfg = ConfigTool(str(config_file), "main", auto_create=True)
+            cfg.set("main", varname="salt", value=1234)
+            cfg.set(
+                "plugin",
+                varname="password",
+                value=SimpleCrypto.multiple_encrypt(1234, "p@ss"),
+            )
+            self.assertTrue(cfg.save())
+            self.assertTrue(cfg.load())
+
+            schema = PluginConfigSchema(
+                title="Secret test.",
+                fields=[
+                    PluginConfigField(
+                        name="password",
+                        field_type=str,
+                        default="",
+                        required=False,
+                        description="Password.",
+                        secret=True,
+                    ),
+                    PluginConfigField(
+                        name="token",
+                        field_type=str,
+                        default="",
+                        required=False,
+                        description="Unset secret.",
+                        secret=True,
+                    ),
+                ],
+            )
+
+            qlog = LoggerQueue()
+            qcom: Queue = Queue()
+            dispatcher = ThDispatcher(qlog=qlog, qcom=qcom, debug=False, verbose=False)
+
+            def build_context(config) -> PluginContext:
+                return PluginContext(
+                    app_meta=AppName(app_name="AASd", app_version="2.1.0-DEV"),
+                    config=config,
+                    config_handler=cfg,
+                    debug=False,
+                    dispatcher=DispatcherAdapter(qcom=qcom, dispatcher=dispatcher),
+                    instance_name="plugin",
+                    logger=LoggerClient(queue=qlog, name="plugin"),
+                    plugin_id="test.secret",
+                    plugin_kind="worker",
+                    qlog=qlog,
+                    verbose=False,
+                )
+
+            with patch(
+                "libs.plugins.config.SimpleCrypto.multiple_decrypt",
+                wraps=SimpleCrypto.multiple_decrypt,
+            ) as decrypt:
+                config = PluginConfigParser.snapshot(cfg, "plugin", schema)
+                context = build_context(config)
+                for _ in range(3):
+                    self.assertEqual(context.secret("password"), "p@ss")
+            self.assertEqual(decrypt.call_count, 1)
+            self.assertIsNone(context.secret("token"))
+            self.assertNotEqual(config.password, "p@ss")
+            self.assertNotIn("p@ss", repr(config))
+            with self.assertRaises(TypeError):
+                config.secrets["password"] = "x"  # type: ignore[index]
+
+            # plain mapping configs return the raw value
+            self.assertEqual(
+                build_context({"password": "raw"}).secret("password"), "raw"
+            )
+
     def test_03_loader_should_reject_plugin_without_entry_point(self) -> None:
         """Reject plugin directories that do not expose `get_plugin_spec()`."""
         with tempfile.TemporaryDirectory() as tmp_dir:
@@ -0,0 +1,139 @@
+# -*- coding: UTF-8 -*-
+"""
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-14
+
+Purpose: Provide regression coverage for plugin CPU and memory accounting.
+"""
+
+import importlib.util
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import unittest
+
+from pathlib import Path
+from typing import List
+
+from libs.plugins import (
+    PluginHealth,
+    PluginHealthSnapshot,
+    PluginServiceReport,
+    PluginState,
+    PluginStateSnapshot,
+)
+from libs.plugins.service import PluginRegistryService
+from libs.plugins.usage import PluginUsageMonitor
+
+HOLDER_SOURCE: str = """
+def allocate(store, count):
+    store.extend(bytearray(1024) for _ in range(count))
+"""
+
+
+def _spin(stop: threading.Event) -> None:
+    """Burn CPU until `stop` is set."""
+    while not stop.is_set():
+        sum(range(1000))
+
+
+class _Runtime(object):
+    """Minimal runtime returning fixed snapshots."""
+
+    def health(self) -> PluginHealthSnapshot:
+        """Return a healthy snapshot."""
+        return PluginHealthSnapshot(health=PluginHealth.HEALTHY)
+
+    def state(self) -> PluginStateSnapshot:
+        """Return a running snapshot."""
+        return PluginStateSnapshot(state=PluginState.RUNNING)
+
+
+@unittest.skipUnless(
+    hasattr(time, "pthread_getcpuclockid"), "per-thread CPU clocks are unavailable"
+)
+class TestPluginUsageMonitor(unittest.TestCase):
+    """Cover CPU attribution, memory attribution and usage in snapshots."""
+
+    def test_01_sample_should_attribute_cpu_to_named_threads(self) -> None:
+        """Sum CPU of the instance and helper threads, keeping finished ones."""
+        monitor = PluginUsageMonitor()
+        monitor.register("busy", Path("."))
+        monitor.register("idle", Path("."))
+        stop = threading.Event()
+        threads: List[threading.Thread] = [
+            threading.Thread(target=_spin, args=(stop,), name="busy"),
+            threading.Thread(target=_spin, args=(stop,), name="busy.helper"),
+            threading.Thread(target=stop.wait, name="idle"),
+        ]
+        for item in threads:
+            item.start()
+        try:
+            time.sleep(0.2)
+            usage = monitor.sample()
+        finally:
+            stop.set()
+            for item in threads:
+                item.join()
+
+        self.assertEqual(usage["busy"].threads, 2)
+        self.assertGreater(usage["busy"].cpu_time or 0.0, 0.05)
+        self.assertGreater(usage["busy"].cpu_percent or 0.0, usage["idle"].cpu_percent)
+        self.assertIsNone(usage["busy"].memory)
+        after = monitor.sample()
+        self.assertEqual(after["busy"].threads, 0)
+        self.assertEqual(after["busy"].cpu_time, usage["busy"].cpu_time)
+        monitor.unregister("idle")
+        self.assertEqual(monitor.instances, ["busy"])
+
+    def test_02_sample_should_attribute_memory_to_plugin_directory(self) -> None:
+        """Count blocks allocated from files under the plugin directory."""
+        if tracemalloc.is_tracing():
+            self.skipTest("tracemalloc is already tracing")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            plugin_dir = Path(tmp_dir) / "holder"
+            plugin_dir.mkdir()
+            (plugin_dir / "load.py").write_text(HOLDER_SOURCE, encoding="utf-8")
+            spec = importlib.util.spec_from_file_location(
+                "aasd_plugin_holder_test", plugin_dir / "load.py"
+            )
+            assert spec is not None and spec.loader is not None
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+
+            monitor = PluginUsageMonitor(memory=True)
+            try:
+                monitor.register("holder", plugin_dir)
+                monitor.register("other", Path(tmp_dir) / "other")
+                store: List[bytearray] = []
+                module.allocate(store, 64)
+                usage = monitor.sample()
+            finally:
+                monitor.close()
+            sys.modules.pop("aasd_plugin_holder_test", None)
+
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertGreaterEqual(usage["holder"].memory or 0, 64 * 1024)
+        self.assertEqual(usage["other"].memory, 0)
+
+    def test_03_snapshots_should_carry_usage(self) -> None:
+        """Attach the sampled usage to state and health snapshots."""
+        report = PluginServiceReport(usage=PluginUsageMonitor())
+        report.runtimes["quiet"] = _Runtime()  # type: ignore[assignment]
+        report.usage.register("quiet", Path("."))  # type: ignore[union-attr]
+
+        state, health = PluginRegistryService.snapshots(report)["quiet"]
+
+        self.assertEqual(state.state, PluginState.RUNNING)
+        self.assertEqual(health.health, PluginHealth.HEALTHY)
+        self.assertIsNotNone(state.usage)
+        self.assertIs(state.usage, health.usage)
+        self.assertEqual(state.usage.threads, 0)  # type: ignore[union-attr]
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+# #[EOF]#######################################################################
@@ -0,0 +1,229 @@
+# -*- coding: UTF-8 -*-
+"""
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-17
+
+Purpose: Provide regression coverage for the worker runtime base and
+notification deadlines.
+"""
+
+import time
+import unittest
+
+from datetime import datetime
+from queue import Queue
+from threading import Event
+from typing import Any, Dict, List, Optional
+from unittest.mock import patch
+
+from jsktoolbox.configtool import Config as ConfigTool
+from jsktoolbox.logstool import LoggerClient, LoggerQueue
+
+from libs import AppName
+from libs.com.message import AtChannel, Channel, NotificationScheduler, ThDispatcher
+from libs.plugins import (
+    DispatcherAdapter,
+    PluginContext,
+    PluginHealth,
+    PluginState,
+    ThWorkerRuntime,
+)
+
+
+class _CountingEvent(Event):
+    """Stop event counting its `wait()` calls."""
+
+    waits: int = 0
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Count the call and wait."""
+        self.waits += 1
+        return super().wait(timeout)
+
+
+class _Clock(object):
+    """Fake `time` module advanced by `_ClockEvent.wait()`."""
+
+    def __init__(self, now: float) -> None:
+        """Start the clock at `now`."""
+        self.now = now
+
+    def monotonic(self) -> float:
+        """Return the fake monotonic time."""
+        return self.now
+
+    def time(self) -> float:
+        """Return the fake wall-clock time."""
+        return self.now
+
+
+class _ClockEvent(Event):
+    """Stop event advancing a fake clock instead of sleeping."""
+
+    def __init__(self, clock: _Clock, limit: float) -> None:
+        """Stop once the clock passes `limit`."""
+        super().__init__()
+        self.clock = clock
+        self.limit = limit
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Advance the clock by `timeout` and stop past the limit."""
+        if timeout is None or self.clock.now + timeout > self.limit:
+            self.set()
+            return True
+        self.clock.now += timeout
+        return False
+
+
+class _Worker(ThWorkerRuntime):
+    """Worker recording its ticks at a short fixed period."""
+
+    closed: bool = False
+    fail: bool = False
+    interval: float = 0.0
+    seen: List[List[int]] = []
+
+    @property
+    def period(self) -> float:
+        """Return the test tick interval."""
+        return self.interval
+
+    def close(self) -> None:
+        """Record the shutdown hook."""
+        self.closed = True
+
+    def tick(self, due: List[int]) -> bool:
+        """Record one tick."""
+        self.seen.append(due)
+        if self.fail:
+            raise ValueError("boom")
+        return True
+
+
+class TestWorkerRuntime(unittest.TestCase):
+    """Cover deadline computation and the worker tick loop."""
+
+    # #[PRIVATE METHODS]###############################################################
+    def __build_worker(self, config: Dict[str, Any]) -> _Worker:
+        """Build a worker with a counting stop event.
+
+        ### Arguments:
+        * config: Dict[str, Any] - Plugin configuration.
+
+        ### Returns:
+        _Worker - Initialized, not started worker.
+        """
+        qlog = LoggerQueue()
+        qcom: Queue = Queue()
+        context = PluginContext(
+            app_meta=AppName(app_name="AASd", app_version="2.3.2-DEV"),
+            config=config,
+            config_handler=ConfigTool("/tmp/unused.conf", "AASd", auto_create=True),
+            debug=False,
+            dispatcher=DispatcherAdapter(
+                qcom=qcom,
+                dispatcher=ThDispatcher(qlog=qlog, qcom=qcom),
+                instance_name="worker",
+            ),
+            instance_name="worker",
+            logger=LoggerClient(queue=qlog, name="worker"),
+            plugin_id="test.worker",
+            plugin_kind="worker",
+            qlog=qlog,
+            verbose=False,
+        )
+        worker = _Worker(context)
+        worker.seen = []
+        worker._stop_event = _CountingEvent()
+        worker.initialize()
+        return worker
+
+    # #[PUBLIC METHODS]################################################################
+    def test_01_next_due_should_return_next_schedule(self) -> None:
+        """Return the next cron minute and interval deadline."""
+        at = AtChannel(["1:30;8|20;*;*;*"])
+        after = datetime(2026, 4, 17, 8, 30, 15)
+        self.assertEqual(at.next_due(after), datetime(2026, 4, 17, 20, 30))
+        self.assertEqual(
+            at.next_due(datetime(2026, 4, 17, 21, 0)), datetime(2026, 4, 18, 8, 30)
+        )
+        self.assertIsNone(AtChannel(["1:0;0;30;2;*"]).next_due(after))
+
+        interval = Channel(["1", "2:1h"])
+        due: Optional[int] = interval.next_due
+        self.assertIsNotNone(due)
+        self.assertIsNone(Channel(["1"]).next_due)
+
+        scheduler = NotificationScheduler(message_channel=["1"])
+        self.assertIsNone(scheduler.next_due())
+        scheduler = NotificationScheduler(at_channel=["1:*;*;*;*;*"])
+        self.assertAlmostEqual(
+            scheduler.next_due() or 0.0, (int(time.time()) // 60 + 1) * 60, delta=60
+        )
+
+    def test_02_worker_should_tick_on_period_without_polling(self) -> None:
+        """Tick at startup and each period, waiting once per tick."""
+        worker = self.__build_worker({})
+        worker.interval = 0.05
+        worker.start()
+        time.sleep(0.3)
+        worker.stop(timeout=2.0)
+
+        self.assertGreaterEqual(worker.ticks, 4)
+        self.assertLessEqual(worker._stop_event.waits, worker.ticks + 1)  # type: ignore
+        self.assertTrue(worker.closed)
+        self.assertEqual(worker.state().state, PluginState.STOPPED)
+        self.assertEqual(worker.health().health, PluginHealth.HEALTHY)
+
+    def test_03_idle_worker_should_not_wake_between_ticks(self) -> None:
+        """Tick once with due channels, then block until stopped."""
+        worker = self.__build_worker({"message_channel": ["3"]})
+        worker.start()
+        time.sleep(0.2)
+        self.assertEqual(worker.state().state, PluginState.RUNNING)
+        worker.stop(timeout=2.0)
+
+        self.assertEqual(worker.seen, [[3]])
+        self.assertEqual(worker._stop_event.waits, 1)  # type: ignore
+        self.assertEqual(worker.state().state, PluginState.STOPPED)
+
+    def test_04_failed_tick_should_degrade_health(self) -> None:
+        """Keep running after a tick raises and report degraded health."""
+        worker = self.__build_worker({})
+        worker.fail = True
+        worker.start()
+        time.sleep(0.1)
+        self.assertTrue(worker.is_alive())
+        worker.stop(timeout=2.0)
+
+        self.assertEqual(worker.ticks, 1)
+        self.assertEqual(worker.health().health, PluginHealth.DEGRADED)
+        self.assertIn("boom", worker.health().message or "")
+
+    def test_04a_at_channel_should_tick_on_every_due_minute(self) -> None:
+        """Tick at each scheduled minute boundary without `sleep_period`."""
+        start = datetime(2026, 4, 17, 8, 30, 15).timestamp()
+        clock = _Clock(start)
+        worker = self.__build_worker({"at_channel": ["1:*;*;*;*;*"]})
+        worker._stop_event = _ClockEvent(clock, start + 135)
+        with patch("libs.plugins.worker.time", clock), patch(
+            "libs.com.message.MDateTime.now",
+            side_effect=lambda *args: datetime.fromtimestamp(clock.now),
+        ):
+            worker.run()
+
+        self.assertEqual(worker.seen, [[1], [1], [1]])
+        self.assertEqual(worker.state().state, PluginState.STOPPED)
+
+    def test_05_worker_without_tick_should_fail_on_instantiation(self) -> None:
+        """Refuse to build a worker subclass that does not implement `tick()`."""
+
+        class _Idle(ThWorkerRuntime):
+            pass
+
+        worker = self.__build_worker({})
+        with self.assertRaises(TypeError):
+            _Idle(worker._context)  # type: ignore
+
+
+# #[EOF]#######################################################################
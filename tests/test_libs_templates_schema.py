@@ -7,7 +7,7 @@
 """
 
 import unittest
-from typing import List
+from typing import List, Union
 
 from libs.templates import (
     PluginConfigField,
@@ -40,6 +40,16 @@ class TestLibsTemplatesSchema(unittest.TestCase):
         self.assertEqual(field.group, "routing")
         self.assertTrue(field.restart_required)
         self.assertEqual(field.type_name, "List")
+        self.assertEqual(
+            PluginConfigField(
+                name="speed",
+                field_type=Union[int, float],
+                default=1,
+                required=True,
+                description="Time scale.",
+            ).type_name,
+            "int|float",
+        )
 
     def test_02_schema_renderer_creates_template_rows(self) -> None:
         """Test nr 02."""
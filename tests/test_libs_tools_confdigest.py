@@ -0,0 +1,66 @@
+# -*- coding: UTF-8 -*-
+"""
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Provide regression coverage for configuration section digests.
+"""
+
+import unittest
+
+from libs.tools import ConfigChangeSet, ConfigDigest
+
+
+class TestConfigDigest(unittest.TestCase):
+    """Cover section hashing and change-set comparison."""
+
+    def test_01_digest_should_group_variables_by_section(self) -> None:
+        """Assign leading variables to the main section and split the rest."""
+        out = ConfigDigest.digest_lines(
+            [
+                "debug = False",
+                "[plugin_a]",
+                "channel = 1",
+                "# -----<end of section: 'plugin_a'>-----",
+                "[plugin_b]",
+                "channel = 2",
+            ],
+            "aasd",
+        )
+
+        self.assertEqual(sorted(out.keys()), ["aasd", "plugin_a", "plugin_b"])
+        self.assertNotEqual(out["plugin_a"], out["plugin_b"])
+
+    def test_02_digest_should_ignore_comments_and_blank_lines(self) -> None:
+        """Keep the digest stable when only descriptions are edited."""
+        first = ConfigDigest.digest_lines(
+            ["[plugin_a]", "# old description", "channel = 1 # inline"], None
+        )
+        second = ConfigDigest.digest_lines(
+            ["[plugin_a]", "", "# new description", "channel=1"], None
+        )
+
+        self.assertEqual(first, second)
+
+    def test_03_compare_should_report_added_changed_and_removed_sections(
+        self,
+    ) -> None:
+        """Report each section in exactly one change bucket."""
+        changes = ConfigDigest.compare(
+            {"aasd": "1", "plugin_a": "2", "plugin_b": "3"},
+            {"aasd": "1", "plugin_a": "20", "plugin_c": "4"},
+        )
+
+        self.assertEqual(changes.added, ["plugin_c"])
+        self.assertEqual(changes.changed, ["plugin_a"])
+        self.assertEqual(changes.removed, ["plugin_b"])
+        self.assertEqual(changes.sections, ["plugin_a", "plugin_b", "plugin_c"])
+        self.assertTrue(changes.has_changes)
+
+    def test_04_empty_change_set_should_report_no_changes(self) -> None:
+        """Return an empty change set for identical digests."""
+        self.assertFalse(ConfigDigest.compare({"a": "1"}, {"a": "1"}).has_changes)
+        self.assertFalse(ConfigChangeSet().has_changes)
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,149 @@
+# -*- coding: UTF-8 -*-
+"""
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Provide regression coverage for the config and plugins_dir watcher.
+"""
+
+import os
+import tempfile
+import time
+import unittest
+
+from threading import Event
+from typing import List
+
+from jsktoolbox.logstool import LoggerQueue
+
+from libs.tools import PollingBackend, ThFileWatcher
+from libs.tools.fswatch import InotifyBackend, WatchBackend
+
+
+class TestFileWatcher(unittest.TestCase):
+    """Cover watcher backends, debouncing, and change filtering."""
+
+    def setUp(self) -> None:
+        """Create a temporary config file and plugins directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config_file = os.path.join(self.tmp.name, "aasd.conf")
+        self.plugins_dir = os.path.join(self.tmp.name, "plugins")
+        os.mkdir(self.plugins_dir)
+        with open(self.config_file, "w") as file:
+            file.write("[aasd]\ndebug = False\n")
+
+    def tearDown(self) -> None:
+        """Remove the temporary directory."""
+        self.tmp.cleanup()
+
+    def test_01_polling_backend_should_report_only_changed_paths(self) -> None:
+        """Return changed paths and an empty list when woken up."""
+        backend = PollingBackend(interval=0.01)
+        backend.add(self.config_file)
+        backend.add(self.plugins_dir)
+
+        self.assertEqual(backend.wait(0.01), [])
+        os.symlink(self.tmp.name, os.path.join(self.plugins_dir, "demo"))
+        self.assertEqual(backend.wait(0.01), [self.plugins_dir])
+
+        backend.wake()
+        self.assertEqual(backend.wait(None), [])
+
+    def test_02_scan_should_report_config_file_and_plugin_entries(self) -> None:
+        """Report the config file and single plugin entries, not the directory."""
+        watcher = self.__build_watcher([], PollingBackend(interval=0.01))
+        watcher.scan()
+        self.assertEqual(watcher.scan(), [])
+
+        with open(self.config_file, "a") as file:
+            file.write("verbose = True\n")
+        os.symlink(self.tmp.name, os.path.join(self.plugins_dir, "demo"))
+
+        self.assertEqual(
+            watcher.scan(),
+            [self.config_file, os.path.join(self.plugins_dir, "demo")],
+        )
+
+    def test_03_watcher_should_debounce_bursts_into_one_callback(self) -> None:
+        """Deliver one callback for several edits inside the quiet period."""
+        calls: List[List[str]] = []
+        done = Event()
+
+        def _callback(paths: List[str]) -> None:
+            calls.append(paths)
+            done.set()
+
+        watcher = self.__build_watcher(
+            [], PollingBackend(interval=0.02), callback=_callback
+        )
+        watcher.start()
+        try:
+            time.sleep(0.05)
+            for value in range(3):
+                with open(self.config_file, "a") as file:
+                    file.write(f"# edit {value}\nx{value} = 1\n")
+                time.sleep(0.01)
+            self.assertTrue(done.wait(2.0))
+            time.sleep(0.3)
+        finally:
+            watcher.stop()
+            watcher.join(timeout=2.0)
+
+        self.assertFalse(watcher.is_alive())
+        self.assertEqual(calls, [[self.config_file]])
+
+    @unittest.skipUnless(InotifyBackend.available(), "inotify is not available")
+    def test_04_inotify_backend_should_report_directory_entries(self) -> None:
+        """Report full entry paths for events in watched directories."""
+        backend = InotifyBackend()
+        try:
+            backend.add(self.config_file)
+            backend.add(self.plugins_dir)
+            os.symlink(self.tmp.name, os.path.join(self.plugins_dir, "demo"))
+
+            self.assertIn(
+                os.path.join(self.plugins_dir, "demo"), backend.wait(1.0)
+            )
+            backend.wake()
+            self.assertEqual(backend.wait(1.0), [])
+        finally:
+            backend.close()
+
+    def test_05_backend_base_should_require_add_and_wait(self) -> None:
+        """Refuse to instantiate a backend that does not implement the hooks."""
+        with self.assertRaises(TypeError):
+            WatchBackend()  # type: ignore
+
+        class _Partial(WatchBackend):
+            def add(self, path: str) -> None:
+                pass
+
+        with self.assertRaises(TypeError):
+            _Partial()  # type: ignore
+
+    # #[PRIVATE METHODS]###############################################################
+    def __build_watcher(
+        self, sink: List[List[str]], backend: PollingBackend, callback=None
+    ) -> ThFileWatcher:
+        """Create a watcher bound to the temporary paths.
+
+        ### Arguments:
+        * sink: List[List[str]] - Collector used when no callback is given.
+        * backend: PollingBackend - Backend used by the watcher.
+        * callback: Optional callable receiving changed paths.
+
+        ### Returns:
+        ThFileWatcher - Configured watcher thread.
+        """
+        return ThFileWatcher(
+            qlog=LoggerQueue(),
+            config_file=self.config_file,
+            plugins_dir=self.plugins_dir,
+            callback=callback or sink.append,
+            debounce=0.1,
+            max_delay=1.0,
+            backend=backend,
+        )
+
+
+# #[EOF]#######################################################################
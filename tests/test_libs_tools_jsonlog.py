@@ -0,0 +1,172 @@
+# -*- coding: UTF-8 -*-
+"""
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Provide regression coverage for the structured JSON-lines log sink.
+"""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from queue import Queue
+
+from jsktoolbox.logstool import LoggerClient, LoggerEngine, LogsLevelKeys
+
+from libs.com.message import Message, ThDispatcher
+from libs.tools import BoundedLoggerQueue, JsonLinesLogEngine, ThJsonLogWriter
+
+
+class TestJsonLog(unittest.TestCase):
+    """Cover record parsing, buffered flushes, and rotation."""
+
+    def setUp(self) -> None:
+        """Prepare a temporary log directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "aasd.jsonl")
+
+    def tearDown(self) -> None:
+        """Remove the temporary log directory."""
+        self.tmp.cleanup()
+
+    def __read(self, path: str) -> list:
+        """Return parsed records from one JSON-lines file."""
+        with open(path, encoding="utf-8") as file:
+            return [json.loads(line) for line in file if line.strip()]
+
+    def test_01_should_build_structured_record(self) -> None:
+        """Promote the source prefix, channel, and message id to fields."""
+        writer = ThJsonLogWriter(path=self.path)
+        engine = JsonLinesLogEngine(writer=writer, level=LogsLevelKeys.INFO)
+
+        record = engine.build_record(
+            "[email] sent channel=2 message_id=abc-1 to='ops@example.com'"
+        )
+
+        self.assertEqual(record["level"], LogsLevelKeys.INFO)
+        self.assertEqual(record["source"], "email")
+        self.assertEqual(record["channel"], "2")
+        self.assertEqual(record["message_id"], "abc-1")
+        self.assertEqual(record["fields"], {"to": "ops@example.com"})
+        self.assertIn("ts", record)
+
+    def test_02_should_flush_on_size_threshold_and_on_stop(self) -> None:
+        """Write a full batch immediately and the remainder when stopping."""
+        writer = ThJsonLogWriter(path=self.path, flush_records=5, flush_interval=60.0)
+        engine = JsonLinesLogEngine(writer=writer, level=LogsLevelKeys.DEBUG)
+        writer.start()
+        for idx in range(5):
+            engine.send(f"[worker] step {idx}")
+        deadline = time.monotonic() + 2.0
+        while writer.written < 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(writer.written, 5)
+        for idx in range(5, 7):
+            engine.send(f"[worker] step {idx}")
+        time.sleep(0.05)
+        self.assertEqual(writer.written, 5)
+
+        writer.stop()
+        writer.join(timeout=2.0)
+
+        self.assertFalse(writer.is_alive())
+        records = self.__read(self.path)
+        self.assertEqual([rec["message"] for rec in records][-1], "step 6")
+        self.assertEqual(len(records), 7)
+
+    def test_03_should_flush_on_time_threshold(self) -> None:
+        """Flush a partial batch after the flush interval."""
+        writer = ThJsonLogWriter(path=self.path, flush_records=100, flush_interval=0.1)
+        writer.start()
+        writer.write({"message": "lonely"})
+        deadline = time.monotonic() + 2.0
+        while writer.written < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        writer.stop()
+        writer.join(timeout=2.0)
+
+        self.assertEqual(writer.written, 1)
+
+    def test_04_should_rotate_and_keep_configured_count(self) -> None:
+        """Rotate by size and drop files beyond `rotate_count`."""
+        writer = ThJsonLogWriter(
+            path=self.path,
+            flush_records=1,
+            flush_interval=0.01,
+            rotate_size=10,
+            rotate_count=2,
+        )
+        writer.start()
+        for idx in range(4):
+            writer.write({"message": f"record {idx}"})
+            deadline = time.monotonic() + 2.0
+            while writer.written < idx + 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        writer.stop()
+        writer.join(timeout=2.0)
+
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(self.__read(f"{self.path}.1")[0]["message"], "record 3")
+        self.assertEqual(self.__read(f"{self.path}.2")[0]["message"], "record 2")
+        self.assertFalse(os.path.exists(f"{self.path}.3"))
+
+    def test_05_should_receive_records_through_logger_engine(self) -> None:
+        """Deliver `LoggerClient` messages to the sink via `LoggerEngine`."""
+        writer = ThJsonLogWriter(path=self.path)
+        engine = LoggerEngine()
+        engine.logs_queue = BoundedLoggerQueue()
+        engine.add_engine(
+            LogsLevelKeys.WARNING,
+            JsonLinesLogEngine(writer=writer, level=LogsLevelKeys.WARNING),
+        )
+        client = LoggerClient(queue=engine.logs_queue, name="ping")
+        client.message_warning = "host down channel=7"
+        engine.send()
+        writer.start()
+        writer.stop()
+        writer.join(timeout=2.0)
+
+        records = self.__read(self.path)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["source"], "ping")
+        self.assertEqual(records[0]["channel"], "7")
+
+    def test_06_dispatcher_records_should_carry_channel_and_message_id(self) -> None:
+        """Trace a message from dispatcher log calls to top-level fields."""
+        writer = ThJsonLogWriter(path=self.path)
+        engine = LoggerEngine()
+        engine.logs_queue = BoundedLoggerQueue()
+        for level in (LogsLevelKeys.DEBUG, LogsLevelKeys.WARNING):
+            engine.add_engine(level, JsonLinesLogEngine(writer=writer, level=level))
+        qcom: Queue = Queue()
+        dispatcher = ThDispatcher(qlog=engine.logs_queue, qcom=qcom, debug=True)
+        message = Message()
+        message.channel = 5
+        message.subject = "unrouted"
+        qcom.put(message)
+        dispatcher.start()
+        qcom.join()
+        dispatcher.stop()
+        dispatcher.join(timeout=2.0)
+        engine.send()
+        writer.start()
+        writer.stop()
+        writer.join(timeout=2.0)
+
+        records = [
+            item for item in self.__read(self.path) if "message_id" in item
+        ]
+        self.assertEqual(
+            sorted(item["level"] for item in records),
+            [LogsLevelKeys.DEBUG, LogsLevelKeys.WARNING],
+        )
+        for item in records:
+            self.assertEqual(item["source"], "ThDispatcher")
+            self.assertEqual(item["channel"], "5")
+            self.assertEqual(item["message_id"], message.message_id)
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,152 @@
+# -*- coding: UTF-8 -*-
+"""
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Provide regression coverage for the bounded logging queue and processor.
+"""
+
+import time
+import unittest
+
+from threading import Thread
+from typing import List
+
+from jsktoolbox.libs.interfaces.logger_engine import ILoggerEngine
+from jsktoolbox.logstool import LoggerClient, LoggerEngine, LogsLevelKeys
+
+from libs.tools import BoundedLoggerQueue, ThLogProcessor
+
+
+class _CollectingEngine(ILoggerEngine):
+    """Collect messages delivered by `LoggerEngine.send()`."""
+
+    # #[CONSTRUCTOR]##################################################################
+    def __init__(self) -> None:
+        """Initialize the collector."""
+        self.messages: List[str] = []
+
+    # #[PUBLIC METHODS]################################################################
+    def send(self, message: str) -> None:
+        """Store one delivered message.
+
+        ### Arguments:
+        * message: str - Formatted log message.
+        """
+        self.messages.append(message)
+
+
+class TestBoundedLoggerQueue(unittest.TestCase):
+    """Cover rate limiting, drop accounting, and wakeups."""
+
+    def test_01_should_rate_limit_each_source_separately(self) -> None:
+        """Suppress one noisy source without affecting another one."""
+        queue = BoundedLoggerQueue(rate=0.001, burst=2, summary_interval=60.0)
+        noisy = LoggerClient(queue=queue, name="noisy")
+        quiet = LoggerClient(queue=queue, name="quiet")
+        for idx in range(5):
+            noisy.message_warning = f"flood {idx}"
+        quiet.message_info = "hello"
+
+        self.assertEqual(queue.qsize(), 3)
+        self.assertEqual(queue.suppressed, 3)
+        self.assertEqual(queue.emit_summaries(), 0)
+        self.assertEqual(queue.emit_summaries(force=True), 1)
+        entries = [queue.get() for _ in range(4)]
+        self.assertEqual(
+            entries[-1],
+            (LogsLevelKeys.WARNING, "[noisy] 3 messages suppressed by rate limit"),
+        )
+        self.assertIsNone(queue.get())
+
+    def test_02_should_drop_and_count_when_full(self) -> None:
+        """Drop entries above the size bound and bypass limits for severe levels."""
+        queue = BoundedLoggerQueue(maxsize=2, rate=0.001, burst=1)
+        client = LoggerClient(queue=queue, name="src")
+        for idx in range(4):
+            client.message_critical = f"critical {idx}"
+
+        self.assertEqual(queue.qsize(), 2)
+        self.assertEqual(queue.dropped, 2)
+        self.assertEqual(queue.suppressed, 0)
+        self.assertIsNotNone(queue.summary_timeout)
+        queue.get()
+        queue.get()
+        queue.emit_summaries(force=True)
+        self.assertEqual(
+            queue.get(),
+            (
+                LogsLevelKeys.WARNING,
+                "[BoundedLoggerQueue] 2 messages dropped, queue limit 2 reached",
+            ),
+        )
+        self.assertIsNone(queue.summary_timeout)
+
+    def test_02a_should_exempt_errors_and_apply_runtime_limits(self) -> None:
+        """Keep ERROR lines by default and honour limits changed later."""
+        queue = BoundedLoggerQueue(rate=0.001, burst=1)
+        client = LoggerClient(queue=queue, name="src")
+        for idx in range(3):
+            client.message_error = f"error {idx}"
+        self.assertEqual(queue.qsize(), 3)
+        self.assertEqual(queue.suppressed, 0)
+
+        queue.exempt_levels = [LogsLevelKeys.CRITICAL]
+        client.message_error = "limited"
+        client.message_error = "limited"
+        self.assertEqual(queue.suppressed, 1)
+
+        queue.rate = 0
+        for idx in range(3):
+            client.message_warning = f"unlimited {idx}"
+        self.assertEqual(queue.suppressed, 1)
+
+        queue.maxsize = 7
+        client.message_warning = "dropped"
+        self.assertEqual(queue.qsize(), 7)
+        self.assertEqual(queue.dropped, 1)
+
+        with self.assertRaises(KeyError):
+            queue.exempt_levels = ["FATAL"]
+
+    def test_03_wait_should_return_on_put_and_on_early_wake(self) -> None:
+        """Wake a blocked waiter on put and never miss a wake sent earlier."""
+        queue = BoundedLoggerQueue()
+        producer = Thread(target=lambda: (time.sleep(0.05), queue.put("x")))
+        producer.start()
+        start = time.monotonic()
+        self.assertTrue(queue.wait(5.0))
+        self.assertLess(time.monotonic() - start, 2.0)
+        producer.join()
+        queue.get()
+
+        queue.wake()
+        start = time.monotonic()
+        self.assertFalse(queue.wait(5.0))
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_04_processor_should_deliver_without_sleep_period(self) -> None:
+        """Deliver queued messages promptly and stop without timed sleeps."""
+        queue = BoundedLoggerQueue()
+        engine = LoggerEngine()
+        engine.logs_queue = queue
+        collector = _CollectingEngine()
+        engine.add_engine(LogsLevelKeys.INFO, collector)
+        processor = ThLogProcessor()
+        processor.logger_engine = engine
+        processor.logger_client = LoggerClient()
+        processor.start()
+        try:
+            LoggerClient(queue=queue, name="src").message_info = "delivered"
+            deadline = time.monotonic() + 2.0
+            while not collector.messages and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            processor.stop()
+            processor.join(timeout=2.0)
+
+        self.assertEqual(collector.messages, ["[src] delivered"])
+        self.assertFalse(processor.is_alive())
+
+
+# #[EOF]#######################################################################
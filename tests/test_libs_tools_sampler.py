@@ -0,0 +1,77 @@
+# -*- coding: UTF-8 -*-
+"""
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-13
+
+Purpose: Provide regression coverage for the stack sampler.
+"""
+
+import tempfile
+import threading
+import time
+import unittest
+
+from pathlib import Path
+
+from libs.tools.sampler import ThStackSampler
+
+
+def _busy_leaf(stop: threading.Event) -> None:
+    """Wait in a recognizable frame until `stop` is set."""
+    while not stop.is_set():
+        time.sleep(0.001)
+
+
+class TestThStackSampler(unittest.TestCase):
+    """Cover stack aggregation, the sampling thread and the collapsed output."""
+
+    def test_01_sample_should_root_stacks_at_thread_name(self) -> None:
+        """Collapse each thread stack outermost first under its thread name."""
+        stop = threading.Event()
+        worker = threading.Thread(target=_busy_leaf, args=(stop,), name="ping;01")
+        worker.start()
+        try:
+            sampler = ThStackSampler(path="unused.folded")
+            sampler.sample()
+            sampler.sample()
+        finally:
+            stop.set()
+            worker.join()
+
+        lines = [line for line in sampler.collapsed() if line.startswith("ping:01;")]
+        self.assertEqual(sampler.samples, 2)
+        self.assertEqual(sum(int(line.rsplit(" ", 1)[1]) for line in lines), 2)
+        stack = lines[0].rsplit(" ", 1)[0].split(";")
+        self.assertEqual(stack[0], "ping:01")
+        self.assertIn(f"{__name__}:_busy_leaf", stack)
+        self.assertLess(
+            stack.index("threading:Thread.run"), stack.index(f"{__name__}:_busy_leaf")
+        )
+
+    def test_02_thread_should_dump_flamegraph_lines_when_stopped(self) -> None:
+        """Sample until stopped and write `stack count` lines without itself."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "profiles" / "out.folded"
+            sampler = ThStackSampler(path=str(path), rate=5000)
+            self.assertEqual(sampler.rate, 1000)
+            sampler.start()
+            time.sleep(0.05)
+            sampler.stop()
+            sampler.join(timeout=2.0)
+
+            self.assertFalse(sampler.is_alive())
+            self.assertGreater(sampler.samples, 0)
+            self.assertEqual(sampler.dump(), len(sampler.collapsed()))
+            lines = path.read_text(encoding="utf-8").splitlines()
+
+        self.assertTrue(lines)
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            self.assertGreater(int(count), 0)
+            self.assertNotIn(ThStackSampler.__name__, stack.split(";")[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+# #[EOF]#######################################################################
@@ -0,0 +1,74 @@
+# -*- coding: UTF-8 -*-
+"""
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Regression tests for the SQL engine pool with server failover.
+"""
+
+import os
+import tempfile
+import unittest
+
+from importlib.util import find_spec
+
+if find_spec("sqlalchemy") is not None:
+    from sqlalchemy import text
+    from sqlalchemy.exc import DBAPIError
+
+    from libs.tools.sqlpool import SqlEnginePool
+
+
+@unittest.skipUnless(find_spec("sqlalchemy"), "SQLAlchemy is not installed")
+class TestSqlEnginePool(unittest.TestCase):
+    """Cover engine reuse and failover between servers."""
+
+    # #[PUBLIC METHODS]################################################################
+    def setUp(self) -> None:
+        """Prepare a working and a broken SQLite URL."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.url = f"sqlite:///{os.path.join(self.tmp.name, 'db.sqlite')}"
+        self.broken = f"sqlite:///{os.path.join(self.tmp.name, 'missing', 'db.sqlite')}"
+
+    def tearDown(self) -> None:
+        """Remove the SQLite files."""
+        self.tmp.cleanup()
+
+    def test_01_pool_should_fail_over_to_next_server(self) -> None:
+        """Switch to the next server and keep using it."""
+        pool = SqlEnginePool([self.broken, self.url])
+        try:
+            with pool.connect() as conn:
+                self.assertEqual(conn.execute(text("SELECT 1")).scalar(), 1)
+            with pool.connect():
+                pass
+        finally:
+            pool.dispose()
+
+        self.assertEqual((pool.active, pool.failovers), (1, 1))
+        self.assertEqual(len(pool.errors), 1)
+        self.assertIn("unable to open database file", pool.errors[0])
+
+    def test_02_pool_should_raise_when_every_server_fails(self) -> None:
+        """Raise the last connection error and a clear error without servers."""
+        pool = SqlEnginePool([self.broken])
+        try:
+            with self.assertRaises(DBAPIError):
+                pool.connect()
+        finally:
+            pool.dispose()
+        self.assertEqual((pool.active, pool.failovers), (0, 0))
+        with self.assertRaises(ValueError):
+            SqlEnginePool([]).connect()
+
+    def test_03_from_servers_should_build_mysql_urls(self) -> None:
+        """Build one URL per server in failover order."""
+        pool = SqlEnginePool.from_servers(
+            ["10.0.0.1", "10.0.0.2"], "lms", "user", "secret"
+        )
+        self.assertEqual([url.host for url in pool.urls], ["10.0.0.1", "10.0.0.2"])
+        self.assertEqual(pool.urls[0].drivername, "mysql+pymysql")
+        self.assertEqual(pool.urls[0].query["charset"], "utf8mb4")
+
+
+# #[EOF]#######################################################################
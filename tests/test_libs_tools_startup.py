@@ -0,0 +1,82 @@
+# -*- coding: UTF-8 -*-
+"""
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-12
+
+Purpose: Provide regression coverage for the startup profiler.
+"""
+
+import importlib
+import sys
+import tempfile
+import unittest
+
+from pathlib import Path
+
+from libs.tools.startup import StartupCategory, StartupProfiler
+
+
+class TestStartupProfiler(unittest.TestCase):
+    """Cover activation, span nesting, import timing and the report."""
+
+    def tearDown(self) -> None:
+        """Deactivate a profiler left by a failed test."""
+        profiler = StartupProfiler.active()
+        if profiler is not None:
+            profiler.finish()
+
+    def test_01_span_should_do_nothing_without_option(self) -> None:
+        """Keep the profiler inactive unless `--profile-startup` is given."""
+        finders = list(sys.meta_path)
+        self.assertIsNone(StartupProfiler.install(["aasd.py", "-d"]))
+        with StartupProfiler.span(StartupCategory.PHASE, "ignored"):
+            pass
+        self.assertIsNone(StartupProfiler.active())
+        self.assertEqual(sys.meta_path, finders)
+
+    def test_02_profiler_should_record_nested_steps_and_imports(self) -> None:
+        """Record phases, nested steps and own import time of new modules."""
+        profiler = StartupProfiler.install(["aasd.py", "--profile-startup"])
+        assert profiler is not None
+        self.assertIs(StartupProfiler.install(["--profile-startup"]), profiler)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            package = Path(tmp_dir) / "startup_probe"
+            package.mkdir()
+            (package / "__init__.py").write_text(
+                "from startup_probe import child\n", encoding="utf-8"
+            )
+            (package / "child.py").write_text("VALUE = 1\n", encoding="utf-8")
+            sys.path.insert(0, tmp_dir)
+            try:
+                with StartupProfiler.span(StartupCategory.PHASE, "config load"):
+                    with StartupProfiler.span(StartupCategory.SPEC, "probe"):
+                        module = importlib.import_module("startup_probe")
+            finally:
+                sys.path.remove(tmp_dir)
+                for name in ("startup_probe", "startup_probe.child"):
+                    sys.modules.pop(name, None)
+
+        report = profiler.finish()
+        self.assertIsNone(StartupProfiler.active())
+        self.assertFalse(
+            any(type(item).__name__ == "_ImportTimer" for item in sys.meta_path)
+        )
+        self.assertEqual(type(module.__loader__).__name__, "SourceFileLoader")
+
+        spans = {(item.category, item.name): item for item in profiler.spans}
+        self.assertEqual(spans[(StartupCategory.PHASE, "config load")].depth, 0)
+        self.assertEqual(spans[(StartupCategory.SPEC, "probe")].depth, 1)
+        parent = spans[(StartupCategory.IMPORT, "startup_probe")]
+        child = spans[(StartupCategory.IMPORT, "startup_probe.child")]
+        self.assertAlmostEqual(parent.own, parent.duration - child.duration)
+        self.assertEqual(child.depth, 1)
+
+        lines = report.splitlines()
+        self.assertTrue(lines[0].startswith("startup profile: "))
+        self.assertIn("phase    config load", report)
+        self.assertIn("spec       probe", report)
+        self.assertIn("imports: 2 modules", report)
+
+
+# #[EOF]#######################################################################
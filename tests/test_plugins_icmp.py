@@ -0,0 +1,204 @@
+# -*- coding: UTF-8 -*-
+"""
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Provide regression coverage for the ICMP reachability worker plugin.
+"""
+
+import threading
+import time
+import unittest
+
+from queue import Queue
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, patch
+
+from jsktoolbox.configtool import Config as ConfigTool
+from jsktoolbox.logstool import LoggerClient, LoggerQueue
+
+from libs import AppName
+from libs.com.message import Priority, ThDispatcher
+from libs.plugins import DispatcherAdapter, PluginConfigParser, PluginContext
+from plugins.icmp.load import HostStates, ReachabilityMonitor, get_plugin_spec
+
+
+class TestIcmpPlugin(unittest.TestCase):
+    """Cover failure thresholds, the bounded probe pool, and transitions."""
+
+    # #[PRIVATE METHODS]###############################################################
+    def __build_runtime(self, alive: Dict[str, bool], **config: Any) -> Any:
+        """Build an initialized runtime probing through a fake `Pinger`."""
+        qlog = LoggerQueue()
+        qcom: Queue = Queue()
+        dispatcher = ThDispatcher(qlog=qlog, qcom=qcom, debug=False, verbose=False)
+        context = PluginContext(
+            app_meta=AppName(app_name="AASd", app_version="2.4.27-DEV"),
+            config={
+                "message_channel": [1, "2:1h"],
+                "sleep_period": "60",
+                "hosts": ["10.0.0.1", "10.0.0.2", "not an address"],
+                "fail_threshold": 2,
+                "probe_workers": 4,
+                "probe_spread": 0,
+                "probe_timeout": 1,
+                **config,
+            },
+            config_handler=ConfigTool("/tmp/unused.conf", "AASd", auto_create=True),
+            debug=False,
+            dispatcher=DispatcherAdapter(qcom=qcom, dispatcher=dispatcher),
+            instance_name="icmp",
+            logger=LoggerClient(queue=qlog, name="icmp"),
+            plugin_id="test.icmp",
+            plugin_kind="worker",
+            qlog=qlog,
+            verbose=False,
+        )
+        context.dispatcher.publish = MagicMock()
+        pinger = MagicMock()
+        pinger.return_value.is_alive.side_effect = lambda ip: alive[ip]
+        with patch("plugins.icmp.load.Pinger", pinger):
+            runtime = get_plugin_spec().runtime_factory(context)
+            runtime.initialize()
+        return runtime
+
+    # #[PUBLIC METHODS]################################################################
+    def test_01_states_should_require_consecutive_failures(self) -> None:
+        """Declare a host down only after `threshold` failures in a row."""
+        states = HostStates(["10.0.0.1"], now=0.0)
+
+        self.assertFalse(states.record(0, False, 3, now=1.0))
+        self.assertFalse(states.record(0, True, 3, now=2.0))
+        self.assertFalse(states.record(0, False, 3, now=3.0))
+        self.assertFalse(states.record(0, False, 3, now=4.0))
+        self.assertTrue(states.record(0, False, 3, now=5.0))
+        self.assertFalse(states.record(0, False, 3, now=6.0))
+
+        self.assertEqual((states.down, states.last_down(0)), ([0], 3.0))
+        self.assertEqual(states.pop_changes(), [0])
+        self.assertEqual(states.pop_changes(), [])
+        self.assertTrue(states.record(0, True, 3, now=7.0))
+        self.assertEqual((states.down, states.last_up(0)), ([], 7.0))
+
+    def test_02_monitor_should_bound_concurrent_probes(self) -> None:
+        """Run at most `workers` probes at a time and report the cycle time."""
+        lock = threading.Lock()
+        running: List[int] = [0, 0]
+
+        def probe(address: str) -> bool:
+            with lock:
+                running[0] += 1
+                running[1] = max(running[1], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            return address != "10.0.0.7"
+
+        addresses = [f"10.0.0.{idx}" for idx in range(40)]
+        monitor = ReachabilityMonitor(addresses, probe, workers=8, threshold=1)
+        try:
+            changed = monitor.cycle()
+        finally:
+            monitor.close()
+
+        self.assertEqual(changed, [7])
+        self.assertEqual(running[1], 8)
+        self.assertLess(monitor.cycle_time, 40 * 0.02)
+
+    def test_03_monitor_should_spread_probe_starts(self) -> None:
+        """Start probes evenly over the configured spread."""
+        starts: List[float] = []
+        monitor = ReachabilityMonitor(
+            [f"10.0.0.{idx}" for idx in range(5)],
+            lambda address: starts.append(time.monotonic()) is None,
+            workers=5,
+            spread=0.2,
+        )
+        try:
+            monitor.cycle()
+        finally:
+            monitor.close()
+
+        self.assertGreaterEqual(starts[-1] - starts[0], 0.15)
+        self.assertGreaterEqual(monitor.cycle_time, 0.15)
+
+    def test_04_monitor_should_keep_state_on_probe_errors(self) -> None:
+        """Do not count a failing probe command as a down host."""
+
+        def probe(address: str) -> bool:
+            raise ChildProcessError("Command for testing ICMP echo not found.")
+
+        monitor = ReachabilityMonitor(["10.0.0.1"], probe, threshold=1)
+        try:
+            self.assertEqual(monitor.cycle(), [])
+        finally:
+            monitor.close()
+
+        self.assertEqual(len(monitor.errors), 1)
+        self.assertEqual(monitor.states.down, [])
+
+    def test_05_runtime_should_publish_only_transitions(self) -> None:
+        """Report down and up transitions once to every channel."""
+        alive = {"10.0.0.1": True, "10.0.0.2": False}
+        runtime = self.__build_runtime(alive)
+        publish: MagicMock = runtime._context.dispatcher.publish
+        try:
+            self.assertEqual(runtime.monitor.states.addresses, ["10.0.0.1", "10.0.0.2"])
+            self.assertTrue(runtime.cycle())
+            self.assertEqual(publish.call_count, 0)
+
+            self.assertTrue(runtime.cycle())
+            down = [call.args[0] for call in publish.call_args_list]
+            self.assertEqual(sorted(item.channel for item in down), [1, 2])
+            self.assertTrue(down[0].messages[0].startswith("10.0.0.2 is down at"))
+            self.assertEqual(down[0].priority, Priority.HIGH)
+
+            publish.reset_mock()
+            runtime.cycle()
+            self.assertEqual(publish.call_count, 0)
+
+            alive["10.0.0.2"] = True
+            runtime.cycle()
+            up = [call.args[0] for call in publish.call_args_list]
+            self.assertEqual(len(up), 2)
+            self.assertTrue(up[0].messages[0].startswith("10.0.0.2 is up now after"))
+        finally:
+            runtime.monitor.close()
+
+    def test_06_runtime_should_accept_only_sleep_period_changes(self) -> None:
+        """Keep running on a new `sleep_period`, restart on other changes."""
+        runtime = self.__build_runtime({})
+        schema = get_plugin_spec().config_schema
+        try:
+            current = dict(runtime._context.config)
+            self.assertTrue(
+                runtime.reconfigure(
+                    PluginConfigParser.freeze(schema, {**current, "sleep_period": "5"})
+                )
+            )
+            self.assertFalse(
+                runtime.reconfigure(
+                    PluginConfigParser.freeze(schema, {**current, "hosts": []})
+                )
+            )
+            self.assertFalse(runtime.reconfigure({**current, "sleep_period": "5"}))
+        finally:
+            runtime.monitor.close()
+
+    def test_07_runtime_should_skip_empty_hosts(self) -> None:
+        """Initialize from the default `hosts = []`, read as `['']`, silently."""
+        runtime = self.__build_runtime({}, hosts=[""])
+        try:
+            lines: List[Any] = []
+            while True:
+                line = runtime._context.qlog.get()
+                if line is None:
+                    break
+                lines.append(line)
+            self.assertEqual(runtime.monitor.states.addresses, [])
+            self.assertEqual([item for item in lines if item[0] == "ERROR"], [])
+        finally:
+            runtime.monitor.close()
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,287 @@
+# -*- coding: UTF-8 -*-
+"""
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Provide regression coverage for the LMS payment reminder worker plugin.
+"""
+
+import os
+import tempfile
+import unittest
+
+from importlib.util import find_spec
+from queue import Queue
+from typing import Any, List
+from unittest.mock import MagicMock, patch
+
+from jsktoolbox.configtool import Config as ConfigTool
+from jsktoolbox.logstool import LoggerClient, LoggerQueue
+
+from libs import AppName
+from libs.com.message import Multipart, ThDispatcher
+from libs.plugins import DispatcherAdapter, PluginContext
+
+if find_spec("sqlalchemy") is not None:
+    from sqlalchemy import create_engine, event, insert
+    from sqlalchemy.engine import Engine
+
+    from libs.tools import SqlEnginePool
+    from plugins.lmspayment.load import (
+        LMS_METADATA,
+        BalanceIndex,
+        CustomerBalance,
+        LmsCustomer,
+        LmsPaymentScanner,
+        get_plugin_spec,
+    )
+
+DAY = 24 * 60 * 60
+NOW = 1_800_000_000
+
+
+@unittest.skipUnless(find_spec("sqlalchemy"), "SQLAlchemy is not installed")
+class TestLmsPaymentPlugin(unittest.TestCase):
+    """Cover balances, batched streaming, and the reports."""
+
+    # #[PUBLIC METHODS]################################################################
+    def setUp(self) -> None:
+        """Create an SQLite database with a small LMS data set."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.url = f"sqlite:///{os.path.join(self.tmp.name, 'lms.db')}"
+        engine = create_engine(self.url)
+        LMS_METADATA.create_all(engine)
+        tables = LMS_METADATA.tables
+        customers = [
+            (1, "Jan", "Kowalski", 1),
+            (2, "Anna", "Nowak", 1),
+            (3, "Piotr", "Lis", 1),
+            (4, "Ewa", "Skip", 1),
+            (5, "Olga", "Dawna", 1),
+            (6, "Adam", "Usunięty", 1),
+        ]
+        with engine.begin() as conn:
+            conn.execute(
+                insert(tables["customers"]),
+                [
+                    dict(
+                        id=cid,
+                        name=name,
+                        lastname=lastname,
+                        mailingnotice=notice,
+                        pin=f"{cid}{cid}{cid}",
+                        paytime=-1,
+                        deleted=int(cid == 6),
+                    )
+                    for cid, name, lastname, notice in customers
+                ],
+            )
+            # invoices of 1, 2, and 6 are 3 days past a 7 day term
+            recent = NOW - 10 * DAY - 3600
+            old = NOW - 40 * DAY
+            conn.execute(
+                insert(tables["documents"]),
+                [
+                    dict(id=cid, cdate=old if cid in (4, 5) else recent, paytime=7)
+                    for cid in (1, 2, 4, 5, 6)
+                ],
+            )
+            conn.execute(
+                insert(tables["cash"]),
+                [dict(customerid=3, docid=None, time=1, value=20.0)]
+                + [
+                    dict(customerid=cid, docid=cid, time=2, value=-50.0)
+                    for cid in (1, 2, 4, 5, 6)
+                ],
+            )
+            conn.execute(
+                insert(tables["customercontacts"]),
+                [
+                    dict(customerid=1, contact="jan@example.com", type=40),
+                    dict(customerid=1, contact="old@example.com", type=8),
+                    dict(customerid=1, contact="600100200", type=33 | 16384),
+                    dict(customerid=5, contact="olga@example.com", type=8),
+                ],
+            )
+            conn.execute(
+                insert(tables["nodes"]),
+                [dict(ownerid=cid, access=1) for cid in (1, 2, 3, 5)],
+            )
+            conn.execute(insert(tables["tariffs"]), [dict(id=1)])
+            conn.execute(
+                insert(tables["assignments"]),
+                [dict(customerid=cid, tariffid=1) for cid in (1, 2, 5)],
+            )
+            conn.execute(
+                insert(tables["customerassignments"]),
+                [dict(customerid=4, customergroupid=5)],
+            )
+        engine.dispose()
+
+    def tearDown(self) -> None:
+        """Remove the SQLite database."""
+        self.tmp.cleanup()
+
+    def test_01_customer_should_track_debt_start(self) -> None:
+        """Start the debt at the document that made the balance negative."""
+        account = CustomerBalance()
+        self.assertTrue(account.add(-30.0, 1, 100, 14))
+        self.assertTrue(account.add(30.0, 2, None, None))
+        self.assertEqual((account.balance, account.debt_time), (0.0, 0))
+
+        account.add(10.0, 3, None, None)
+        account.add(-25.0, 4, 200, 0)
+        account.add(-5.0, 5, 300, 7)
+        self.assertFalse(account.add(1.0, 4, None, None))
+        customer = LmsCustomer(
+            id=1, name="Jan", lastname="", pin="1", paytime=-1, account=account
+        )
+        self.assertEqual((customer.balance, customer.debt_time), (-20.0, 200))
+        self.assertEqual(customer.deadline(default_paytime=7), 7)
+        self.assertEqual(customer.reminder_day(200 + 9 * DAY, 7, 14), 2)
+        self.assertIsNone(customer.reminder_day(200 + 6 * DAY, 7, 14))
+        self.assertEqual(customer.cutoff_days(200 + 9 * DAY, 7, 14), 13)
+
+    def test_02_scanner_should_load_related_rows_per_batch(self) -> None:
+        """Issue one query per related table and batch, not per customer."""
+        statements: List[str] = []
+
+        def count(conn, cursor, statement, *args: Any) -> None:
+            statements.append(statement)
+
+        pool = SqlEnginePool([self.url])
+        # the config handler reads an empty list as `['']`
+        scanner = LmsPaymentScanner(pool, batch_size=2, skip_groups=[5, ""])
+        event.listen(Engine, "before_cursor_execute", count)
+        try:
+            indebted = [[item.id for item in batch] for batch in scanner.indebted()]
+            # two statements replay the ledger, one streams the customers
+            self.assertEqual(len(statements), 3 + 3 * len(indebted))
+            batches = list(scanner.customers())
+        finally:
+            event.remove(Engine, "before_cursor_execute", count)
+            pool.dispose()
+
+        self.assertEqual(indebted, [[1, 2], [5]])
+        customers = {item.id: item for batch in batches for item in batch}
+        self.assertEqual(sorted(customers), [1, 2, 3, 5])
+        self.assertEqual(customers[1].contacts_with(40), ["jan@example.com"])
+        self.assertEqual(customers[1].contacts_with(33), [])
+        self.assertEqual((customers[3].balance, customers[3].tariffs), (20.0, 0))
+        self.assertEqual(customers[5].debt_time, NOW - 40 * DAY)
+
+    def test_03_runtime_should_publish_reminders_and_reports(self) -> None:
+        """Send reminders in the window and the diagnostic tables."""
+        qlog = LoggerQueue()
+        qcom: Queue = Queue()
+        dispatcher = ThDispatcher(qlog=qlog, qcom=qcom, debug=False, verbose=False)
+        context = PluginContext(
+            app_meta=AppName(app_name="AASd", app_version="2.4.28-DEV"),
+            config={
+                "at_channel": ["1:0;8;*;*;*"],
+                "message_channel": [1],
+                "diagnostic_channel": [9],
+                "payment_message": [3],
+                "default_paytime": 7,
+                "cutoff_time": 14,
+                "skip_group_id": [5],
+                "sql_server": ["10.0.0.1"],
+                "sql_database": "lms",
+                "sql_user": "aasd",
+                "sql_password": "secret",
+                "batch_size": 2,
+                "lms_url": "https://lms/?m=customerinfo&id=",
+                "user_url": "https://panel/",
+                "subject_prefix": "[ISP]",
+                "message_footer": ["ISP team"],
+            },
+            config_handler=ConfigTool("/tmp/unused.conf", "AASd", auto_create=True),
+            debug=False,
+            dispatcher=DispatcherAdapter(qcom=qcom, dispatcher=dispatcher),
+            instance_name="lmspayment",
+            logger=LoggerClient(queue=qlog, name="lmspayment"),
+            plugin_id="test.lmspayment",
+            plugin_kind="worker",
+            qlog=qlog,
+            verbose=False,
+        )
+        context.dispatcher.publish = MagicMock(return_value=True)
+        with patch(
+            "libs.tools.sqlpool.SqlEnginePool.from_servers",
+            return_value=SqlEnginePool([self.url]),
+        ):
+            runtime = get_plugin_spec().runtime_factory(context)
+            runtime.initialize()
+        try:
+            self.assertTrue(runtime.cycle([1, 9], now=NOW))
+        finally:
+            runtime.scanner.pool.dispose()
+
+        messages = [call.args[0] for call in context.dispatcher.publish.call_args_list]
+        reports = {item.subject: item for item in messages if item.channel == 9}
+        reminders = [item for item in messages if item.channel == 1]
+        self.assertEqual(len(reminders), 1)
+        self.assertEqual(reminders[0].to, ["jan@example.com"])
+        self.assertEqual(reminders[0].subject, "[ISP] Informacja o zaległej płatności.")
+        text = "\n".join(reminders[0].messages)
+        self.assertIn("wynosi: -50.00 PLN", text)
+        self.assertIn("za 11 dni", text)
+        self.assertIn("PIN: 111", text)
+
+        self.assertEqual(
+            sorted(reports),
+            [
+                "[ISP] Klienci bez taryf.",
+                "[ISP] Klienci bez zgody na kontakt.",
+                "[ISP] Klienci zadłużeni powyżej 30 dni.",
+            ],
+        )
+        debt = "".join(
+            reports["[ISP] Klienci zadłużeni powyżej 30 dni."].mmessages[Multipart.HTML]
+        )
+        self.assertIn("id=5'>5</a></td><td>Olga Dawna</td><td>-50.00</td>", debt)
+        self.assertIn("brak zgody email", debt)
+        contact = "".join(
+            reports["[ISP] Klienci bez zgody na kontakt."].mmessages[Multipart.HTML]
+        )
+        self.assertIn("Anna Nowak", contact)
+        self.assertNotIn("Jan Kowalski", contact)
+        tariff = "".join(reports["[ISP] Klienci bez taryf."].mmessages[Multipart.HTML])
+        self.assertIn("<td>Piotr Lis</td><td>aktywna usługa</td>", tariff)
+
+    def test_04_index_should_apply_only_new_cash_rows(self) -> None:
+        """Apply appended rows and replay customers with backdated rows."""
+        engine = create_engine(self.url)
+        cash = LMS_METADATA.tables["cash"]
+        index = BalanceIndex(rebuild_period=DAY)
+        try:
+            with engine.begin() as conn:
+                self.assertEqual(index.rebuild(conn, now=NOW), 6)
+                self.assertEqual((index.size, index.last_id), (6, 6))
+                conn.execute(
+                    insert(cash),
+                    [
+                        dict(customerid=1, docid=None, time=3, value=50.0),
+                        dict(customerid=5, docid=None, time=1, value=-10.0),
+                    ],
+                )
+                self.assertEqual(index.refresh(conn, now=NOW + 60), 2)
+                self.assertEqual(index.get(1).balance, 0.0)
+                self.assertEqual(index.get(1).debt_time, 0)
+                # a backdated row replays the ledger; without a document it
+                # opens the debt, so the later invoice does not date it
+                self.assertEqual(index.get(5).balance, -60.0)
+                self.assertEqual(index.get(5).debt_time, 0)
+                self.assertEqual(index.get(5).last_time, 2)
+                self.assertEqual(index.refresh(conn, now=NOW + 120), 0)
+
+                conn.execute(cash.delete().where(cash.c.id == 7))
+                self.assertEqual(index.refresh(conn, now=NOW + 180), 0)
+                self.assertEqual(index.get(1).balance, 0.0)
+                self.assertEqual(index.refresh(conn, now=NOW + DAY), 7)
+                self.assertEqual(index.get(1).balance, -50.0)
+        finally:
+            engine.dispose()
+
+
+# #[EOF]#######################################################################
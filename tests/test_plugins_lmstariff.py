@@ -0,0 +1,246 @@
+# -*- coding: UTF-8 -*-
+"""
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Provide regression coverage for the LMS tariff verification worker plugin.
+"""
+
+import os
+import tempfile
+import unittest
+
+from importlib.util import find_spec
+from queue import Queue
+from typing import Any, List
+from unittest.mock import MagicMock, patch
+
+from jsktoolbox.configtool import Config as ConfigTool
+from jsktoolbox.logstool import LoggerClient, LoggerQueue
+
+from libs import AppName
+from libs.com.message import ThDispatcher
+from libs.plugins import DispatcherAdapter, PluginContext
+
+if find_spec("sqlalchemy") is not None:
+    from sqlalchemy import create_engine, event, insert
+    from sqlalchemy.engine import Engine
+
+    from libs.tools import SqlEnginePool
+    from plugins.lmstariff.load import (
+        LMS_METADATA,
+        TariffIndex,
+        TariffState,
+        get_plugin_spec,
+    )
+
+DAY = 24 * 60 * 60
+NOW = 1_800_000_000
+
+
+@unittest.skipUnless(find_spec("sqlalchemy"), "SQLAlchemy is not installed")
+class TestLmsTariffPlugin(unittest.TestCase):
+    """Cover the incremental tariff index and the transition reports."""
+
+    # #[PUBLIC METHODS]################################################################
+    def assignment(self, id_: int, customer_id: int, **values: int) -> dict:
+        """Return an `assignments` row with LMS defaults."""
+        row = dict(
+            id=id_,
+            customerid=customer_id,
+            tariffid=1,
+            period=3,
+            datefrom=0,
+            dateto=0,
+            suspended=0,
+        )
+        row.update(values)
+        return row
+
+    def setUp(self) -> None:
+        """Create an SQLite database with a small LMS data set."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.url = f"sqlite:///{os.path.join(self.tmp.name, 'lms.db')}"
+        self.engine = create_engine(self.url)
+        LMS_METADATA.create_all(self.engine)
+        self.tables = LMS_METADATA.tables
+        with self.engine.begin() as conn:
+            conn.execute(
+                insert(self.tables["nodes"]),
+                [
+                    dict(id=1, name="jan-1", ownerid=1, moddate=10),
+                    dict(id=2, name="jan-2", ownerid=1, moddate=10),
+                    dict(id=3, name="anna", ownerid=2, moddate=10),
+                    dict(id=4, name="piotr", ownerid=3, moddate=10),
+                ],
+            )
+            conn.execute(
+                insert(self.tables["assignments"]),
+                [
+                    # linked to node 1 only, ends in two days
+                    self.assignment(1, 1, dateto=NOW + 2 * DAY),
+                    # covers the unlinked node 2
+                    self.assignment(2, 1),
+                    self.assignment(3, 2, suspended=1),
+                    # one-time charges do not count
+                    self.assignment(4, 3, period=0),
+                ],
+            )
+            conn.execute(
+                insert(self.tables["nodeassignments"]),
+                [dict(id=1, nodeid=1, assignmentid=1)],
+            )
+
+    def tearDown(self) -> None:
+        """Remove the SQLite database."""
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def test_01_index_should_evaluate_baseline_silently(self) -> None:
+        """Record node states on the first sync without transitions."""
+        index = TariffIndex()
+        with self.engine.connect() as conn:
+            self.assertEqual(index.sync(conn, now=NOW), [])
+        self.assertEqual(index.size, 4)
+        self.assertEqual(
+            [index.state(node_id) for node_id in (1, 2, 3, 4)],
+            [
+                TariffState.ACTIVE,
+                TariffState.ACTIVE,
+                TariffState.SUSPENDED,
+                TariffState.NONE,
+            ],
+        )
+        self.assertIsNone(index.state(5))
+
+    def test_02_index_should_read_only_changed_rows(self) -> None:
+        """Apply rows above the high-water marks and report transitions."""
+        statements: List[str] = []
+
+        def count(conn, cursor, statement, *args: Any) -> None:
+            statements.append(statement)
+
+        index = TariffIndex()
+        with self.engine.connect() as conn:
+            index.sync(conn, now=NOW)
+        with self.engine.begin() as conn:
+            conn.execute(
+                insert(self.tables["assignments"]),
+                [self.assignment(5, 3, datefrom=NOW + DAY)],
+            )
+            conn.execute(
+                self.tables["nodes"]
+                .update()
+                .where(self.tables["nodes"].c.id == 3)
+                .values(access=0, moddate=20)
+            )
+        event.listen(Engine, "before_cursor_execute", count)
+        try:
+            with self.engine.connect() as conn:
+                transitions = index.sync(conn, now=NOW + 60)
+        finally:
+            event.remove(Engine, "before_cursor_execute", count)
+        # three incremental reads and three fingerprints, no reload
+        self.assertEqual(len(statements), 6)
+        self.assertEqual((index.changes, index.resyncs), (2, 0))
+        # an assignment starting tomorrow does not cover the node yet
+        self.assertEqual(
+            [(item.node_id, item.old, item.new) for item in transitions],
+            [(4, TariffState.NONE, TariffState.INACTIVE)],
+        )
+
+        with self.engine.connect() as conn:
+            transitions = index.sync(conn, now=NOW + 3 * DAY)
+        self.assertEqual(
+            [(item.node_id, item.old, item.new) for item in transitions],
+            [
+                (1, TariffState.ACTIVE, TariffState.INACTIVE),
+                (4, TariffState.INACTIVE, TariffState.ACTIVE),
+            ],
+        )
+        self.assertEqual(index.changes, 0)
+        self.assertIn(
+            "jan-1 (#1, customer #1, access on): active -> inactive",
+            transitions[0].text,
+        )
+
+    def test_03_index_should_reload_on_fingerprint_mismatch(self) -> None:
+        """Pick up edited and deleted rows that carry no modification stamp."""
+        index = TariffIndex()
+        with self.engine.connect() as conn:
+            index.sync(conn, now=NOW)
+        assignments = self.tables["assignments"]
+        with self.engine.begin() as conn:
+            conn.execute(
+                assignments.update().where(assignments.c.id == 3).values(suspended=0)
+            )
+            conn.execute(
+                self.tables["nodeassignments"]
+                .delete()
+                .where(self.tables["nodeassignments"].c.id == 1)
+            )
+            conn.execute(
+                insert(self.tables["nodes"]), [dict(id=5, name="new", ownerid=4)]
+            )
+        with self.engine.connect() as conn:
+            transitions = index.sync(conn, now=NOW + 60)
+        self.assertEqual(index.resyncs, 1)
+        self.assertEqual(
+            [(item.node_id, item.old, item.new) for item in transitions],
+            [
+                (3, TariffState.SUSPENDED, TariffState.ACTIVE),
+                (5, None, TariffState.NONE),
+            ],
+        )
+        with self.engine.connect() as conn:
+            self.assertEqual(index.sync(conn, now=NOW + 120), [])
+        self.assertEqual(index.resyncs, 1)
+
+    def test_04_runtime_should_publish_transitions(self) -> None:
+        """Publish one report per due message channel."""
+        qlog = LoggerQueue()
+        qcom: Queue = Queue()
+        dispatcher = ThDispatcher(qlog=qlog, qcom=qcom, debug=False, verbose=False)
+        context = PluginContext(
+            app_meta=AppName(app_name="AASd", app_version="2.4.30-DEV"),
+            config={
+                "at_channel": ["1:0;8;*;*;*"],
+                "message_channel": [1, 2],
+                "sql_server": ["10.0.0.1"],
+                "sql_database": "lms",
+                "sql_user": "aasd",
+                "sql_password": "secret",
+                "subject_prefix": "[ISP]",
+            },
+            config_handler=ConfigTool("/tmp/unused.conf", "AASd", auto_create=True),
+            debug=False,
+            dispatcher=DispatcherAdapter(qcom=qcom, dispatcher=dispatcher),
+            instance_name="lmstariff",
+            logger=LoggerClient(queue=qlog, name="lmstariff"),
+            plugin_id="test.lmstariff",
+            plugin_kind="worker",
+            qlog=qlog,
+            verbose=False,
+        )
+        context.dispatcher.publish = MagicMock(return_value=True)
+        with patch(
+            "libs.tools.sqlpool.SqlEnginePool.from_servers",
+            return_value=SqlEnginePool([self.url]),
+        ):
+            runtime = get_plugin_spec().runtime_factory(context)
+            runtime.initialize()
+        try:
+            self.assertTrue(runtime.cycle([1], now=NOW))
+            self.assertTrue(runtime.cycle([1, 9], now=NOW + 3 * DAY))
+            self.assertTrue(runtime.cycle([9], now=NOW + 4 * DAY))
+        finally:
+            runtime.pool.dispose()
+
+        messages = [call.args[0] for call in context.dispatcher.publish.call_args_list]
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0].channel, 1)
+        self.assertEqual(messages[0].subject, "[ISP] Node tariff changes: 1")
+        self.assertIn("active -> inactive", messages[0].messages[0])
+
+
+# #[EOF]#######################################################################
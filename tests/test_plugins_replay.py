@@ -0,0 +1,117 @@
+# -*- coding: UTF-8 -*-
+"""
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-16
+
+Purpose: Provide regression coverage for the capture replay plugin.
+"""
+
+import json
+import os
+import tempfile
+import time
+import unittest
+
+from queue import Queue
+from typing import Any, Dict
+
+from jsktoolbox.configtool import Config as ConfigTool
+from jsktoolbox.logstool import LoggerClient, LoggerQueue
+
+from libs import AppName
+from libs.com.message import ThDispatcher
+from libs.plugins import DispatcherAdapter, PluginContext, PluginHealth, PluginState
+from plugins.replay.load import get_plugin_spec
+
+
+class TestReplayPlugin(unittest.TestCase):
+    """Cover replaying a capture file into a running dispatcher."""
+
+    # #[PRIVATE METHODS]###############################################################
+    def __build_context(
+        self, dispatcher: ThDispatcher, qcom: Queue, config: Dict[str, Any]
+    ) -> PluginContext:
+        """Build a plugin context bound to a running dispatcher.
+
+        ### Arguments:
+        * dispatcher: ThDispatcher - Dispatcher routing the messages.
+        * qcom: Queue - Dispatcher input queue.
+        * config: Dict[str, Any] - Plugin configuration.
+
+        ### Returns:
+        PluginContext - Context accepted by the runtime factory.
+        """
+        qlog = LoggerQueue()
+        return PluginContext(
+            app_meta=AppName(app_name="AASd", app_version="2.3.2-DEV"),
+            config=config,
+            config_handler=ConfigTool("/tmp/unused.conf", "AASd", auto_create=True),
+            debug=False,
+            dispatcher=DispatcherAdapter(
+                qcom=qcom, dispatcher=dispatcher, instance_name="replay"
+            ),
+            instance_name="replay",
+            logger=LoggerClient(queue=qlog, name="replay"),
+            plugin_id="test.replay",
+            plugin_kind="worker",
+            qlog=qlog,
+            verbose=False,
+        )
+
+    # #[PUBLIC METHODS]################################################################
+    def test_01_replay_should_publish_capture_to_target_channel(self) -> None:
+        """Publish every captured message, moved to the configured channel."""
+        qcom: Queue = Queue()
+        dispatcher = ThDispatcher(qlog=LoggerQueue(), qcom=qcom)
+        target = dispatcher.register_queue(7)
+        dispatcher.start()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "capture.jsonl")
+            with open(path, "w", encoding="utf-8") as file:
+                for idx in range(5):
+                    record = {"ts": 10.0 + idx, "ch": 1, "o": "icmp", "s": str(idx)}
+                    file.write(json.dumps(record) + "\n")
+            replay = get_plugin_spec().runtime_factory(
+                self.__build_context(
+                    dispatcher,
+                    qcom,
+                    {"capture_file": path, "speed": 0, "target_channel": 7},
+                )
+            )
+            try:
+                replay.initialize()
+                replay.start()
+                replay.join(timeout=5.0)
+                deadline = time.monotonic() + 5.0
+                while target.qsize() < 5 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            finally:
+                replay.stop(timeout=2.0)
+                dispatcher.stop()
+                dispatcher.join(timeout=2.0)
+
+        subjects = [target.get().subject for _ in range(target.qsize())]
+        self.assertEqual(subjects, ["0", "1", "2", "3", "4"])
+        self.assertEqual(replay.state().state, PluginState.STOPPED)
+        self.assertEqual(replay.health().health, PluginHealth.HEALTHY)
+        self.assertIn("published=5", replay.health().message or "")
+
+    def test_02_replay_should_report_missing_capture(self) -> None:
+        """Mark the runtime unhealthy when the capture file cannot be read."""
+        qcom: Queue = Queue()
+        dispatcher = ThDispatcher(qlog=LoggerQueue(), qcom=qcom)
+        replay = get_plugin_spec().runtime_factory(
+            self.__build_context(
+                dispatcher, qcom, {"capture_file": "/nonexistent/capture.jsonl"}
+            )
+        )
+        replay.initialize()
+        replay.start()
+        replay.join(timeout=2.0)
+
+        self.assertTrue(qcom.empty())
+        self.assertEqual(replay.health().health, PluginHealth.UNHEALTHY)
+        self.assertEqual(replay.state().state, PluginState.STOPPED)
+
+
+# #[EOF]#######################################################################
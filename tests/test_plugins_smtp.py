@@ -0,0 +1,302 @@
+# -*- coding: UTF-8 -*-
+"""
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Provide regression coverage for the SMTP communication plugin.
+"""
+
+import socketserver
+import threading
+import time
+import unittest
+
+from email import message_from_bytes
+from queue import Queue
+from typing import Any, List, Tuple
+
+from jsktoolbox.configtool import Config as ConfigTool
+from jsktoolbox.logstool import LoggerClient, LoggerQueue
+
+from libs import AppName
+from libs.com.message import Message, Multipart, ThDispatcher
+from libs.plugins import DispatcherAdapter, PluginContext
+from plugins.smtp.load import MessageDigest, SmtpConnectionPool, get_plugin_spec
+
+
+class _SmtpHandler(socketserver.StreamRequestHandler):
+    """Serve one SMTP session in the style of an aiosmtpd handler."""
+
+    def handle(self) -> None:
+        """Answer SMTP commands and store every accepted envelope."""
+        server: "_SmtpServer" = self.server  # type: ignore
+        with server.lock:
+            server.sessions.append(self.connection)
+        self.__reply("220 localhost test smtp")
+        mail_from: str = ""
+        rcpt_to: List[str] = []
+        while True:
+            line: bytes = self.rfile.readline()
+            if not line:
+                return None
+            command: str = line.decode().strip()
+            verb: str = command[:4].upper()
+            if verb == "EHLO":
+                self.__reply("250-localhost\r\n250 8BITMIME")
+            elif verb == "HELO" or verb == "NOOP" or verb == "RSET":
+                mail_from, rcpt_to = ("", []) if verb == "RSET" else (mail_from, rcpt_to)
+                self.__reply("250 OK")
+            elif verb == "MAIL":
+                mail_from, rcpt_to = command[10:].strip("<> "), []
+                self.__reply("250 OK")
+            elif verb == "RCPT":
+                rcpt_to.append(command[8:].strip("<> "))
+                self.__reply("250 OK")
+            elif verb == "DATA":
+                self.__reply("354 End data with <CR><LF>.<CR><LF>")
+                data: List[bytes] = []
+                while True:
+                    chunk: bytes = self.rfile.readline()
+                    if chunk in (b".\r\n", b""):
+                        break
+                    data.append(chunk[1:] if chunk.startswith(b"..") else chunk)
+                if server.reject and server.reject in b"".join(data):
+                    self.__reply("552 Message size exceeds fixed limit")
+                    continue
+                with server.lock:
+                    server.envelopes.append((mail_from, rcpt_to, b"".join(data)))
+                self.__reply("250 OK queued")
+            elif verb == "QUIT":
+                self.__reply("221 Bye")
+                return None
+            else:
+                self.__reply("502 Command not implemented")
+
+    def __reply(self, text: str) -> None:
+        """Send one reply line."""
+        self.wfile.write(f"{text}\r\n".encode())
+
+
+class _SmtpServer(socketserver.ThreadingTCPServer):
+    """Local SMTP stand-in collecting envelopes and session sockets."""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        """Bind to a free localhost port."""
+        super().__init__(("127.0.0.1", 0), _SmtpHandler)
+        self.lock = threading.Lock()
+        self.envelopes: List[Tuple[str, List[str], bytes]] = []
+        self.reject: bytes = b""
+        self.sessions: List[Any] = []
+
+    def drop_sessions(self) -> None:
+        """Close every open session, simulating a server-side idle timeout."""
+        with self.lock:
+            for sock in self.sessions:
+                try:
+                    sock.shutdown(2)
+                except OSError:
+                    pass
+            self.sessions.clear()
+
+
+class TestSmtpPlugin(unittest.TestCase):
+    """Cover pooled sessions, reconnects, and digests."""
+
+    def setUp(self) -> None:
+        """Start the local SMTP stand-in."""
+        self.server = _SmtpServer()
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.address = f"127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self) -> None:
+        """Stop the local SMTP stand-in."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    # #[PRIVATE METHODS]###############################################################
+    def __build_runtime(self, **config: Any) -> Any:
+        """Build an SMTP runtime bound to the local server."""
+        qlog = LoggerQueue()
+        qcom: Queue = Queue()
+        dispatcher = ThDispatcher(qlog=qlog, qcom=qcom, debug=False, verbose=False)
+        context = PluginContext(
+            app_meta=AppName(app_name="AASd", app_version="2.4.20-DEV"),
+            config={
+                "channel": 1,
+                "smtp_server": self.address,
+                "smtp_user": "",
+                "smtp_pass": "",
+                "address_from": "aasd@localhost",
+                "address_to": ["ops@localhost"],
+                "debug_bcc": [],
+                "smtp_idle_timeout": 60,
+                "batch_size": 100,
+                "digest_window": 0,
+                **config,
+            },
+            config_handler=ConfigTool("/tmp/unused.conf", "AASd", auto_create=True),
+            debug=False,
+            dispatcher=DispatcherAdapter(qcom=qcom, dispatcher=dispatcher),
+            instance_name="smtp",
+            logger=LoggerClient(queue=qlog, name="smtp"),
+            plugin_id="test.smtp",
+            plugin_kind="communication",
+            qlog=qlog,
+            verbose=False,
+        )
+        runtime = get_plugin_spec().runtime_factory(context)
+        runtime.initialize()
+        return runtime
+
+    def __message(self, subject: str, to: Any = None) -> Message:
+        """Build one plain-text dispatcher message."""
+        message = Message()
+        message.channel = 1
+        message.subject = subject
+        message.messages = [f"body of {subject}"]
+        if to is not None:
+            message.to = to
+        return message
+
+    # #[PUBLIC METHODS]################################################################
+    def test_01_should_send_a_burst_over_one_session(self) -> None:
+        """Deliver many messages with a single SMTP session."""
+        runtime = self.__build_runtime()
+
+        sent = runtime.process([self.__message(f"alert {idx}") for idx in range(20)])
+        sent += runtime.process([self.__message("late alert")])
+
+        self.assertEqual(sent, 21)
+        self.assertEqual(len(self.server.envelopes), 21)
+        self.assertEqual(runtime.pool.connects, 1)
+        self.assertEqual(runtime.pool.reuses, 1)
+        runtime.pool.close()
+
+    def test_02_should_reconnect_after_server_drop(self) -> None:
+        """Replace a session the server closed while it was idle."""
+        runtime = self.__build_runtime()
+        runtime.process([self.__message("first")])
+        self.server.drop_sessions()
+        time.sleep(0.05)
+
+        self.assertEqual(runtime.process([self.__message("second")]), 1)
+
+        self.assertEqual(runtime.pool.connects, 2)
+        self.assertEqual(len(self.server.envelopes), 2)
+        runtime.pool.close()
+
+    def test_03_pool_should_close_expired_idle_sessions(self) -> None:
+        """Quit sessions idle longer than `idle_timeout`."""
+        pool = SmtpConnectionPool(server=self.address, idle_timeout=0.05)
+        smtp = pool.acquire()
+        self.assertIsNotNone(smtp)
+        pool.release(smtp)  # type: ignore
+        time.sleep(0.1)
+
+        self.assertEqual(pool.prune(), 1)
+        self.assertIsNotNone(pool.acquire(timeout=1.0))
+        self.assertEqual(pool.connects, 2)
+
+    def test_04_should_digest_messages_per_recipient(self) -> None:
+        """Merge plain messages per recipient and keep HTML messages separate."""
+        runtime = self.__build_runtime(digest_window=60)
+        html = self.__message("html report", to="boss@localhost")
+        html.mmessages = {Multipart.PLAIN: ["plain"], Multipart.HTML: ["<b>x</b>"]}
+
+        sent = runtime.process(
+            [
+                self.__message("disk full", to=["a@localhost", "b@localhost"]),
+                self.__message("disk still full", to="a@localhost"),
+                html,
+            ]
+        )
+        self.assertEqual(sent, 1)
+        sent = runtime.process([], force=True)
+
+        self.assertEqual(sent, 2)
+        mails = {rcpt[0]: message_from_bytes(data) for _, rcpt, data in self.server.envelopes}
+        self.assertEqual(sorted(mails), ["a@localhost", "b@localhost", "boss@localhost"])
+        self.assertTrue(mails["a@localhost"]["Subject"].startswith("[2 messages]"))
+        self.assertIn("disk still full", mails["a@localhost"].get_payload(decode=True).decode())
+        self.assertEqual(mails["b@localhost"]["Subject"], "disk full")
+        self.assertTrue(mails["boss@localhost"].is_multipart())
+        runtime.pool.close()
+
+    def test_05_digest_should_release_only_due_recipients(self) -> None:
+        """Return digests once their window elapsed."""
+        digest = MessageDigest(window=0.05)
+        digest.add("a@localhost", self.__message("one"))
+
+        self.assertEqual(digest.pop_due(), [])
+        time.sleep(0.06)
+        self.assertEqual([name for name, _ in digest.pop_due()], ["a@localhost"])
+        self.assertIsNone(digest.next_deadline)
+
+    def test_06_should_defer_messages_when_server_is_down(self) -> None:
+        """Keep undeliverable messages for a later retry."""
+        runtime = self.__build_runtime()
+        self.server.shutdown()
+        self.server.server_close()
+
+        self.assertEqual(runtime.process([self.__message("lost")]), 0)
+        self.assertEqual(runtime.health().health, "degraded")
+
+    def test_07_should_coalesce_bursts_before_delivery(self) -> None:
+        """Merge queued messages with the same subject into one e-mail."""
+        runtime = self.__build_runtime(coalesce_window=0.1)
+        for idx in range(5):
+            runtime._queue.put(self.__message("disk full", to="ops@localhost"))
+        runtime._queue.put(self.__message("load high"))
+
+        runtime.start()
+        time.sleep(0.3)
+        runtime.stop(timeout=2.0)
+
+        subjects = sorted(
+            message_from_bytes(data)["Subject"] for _, _, data in self.server.envelopes
+        )
+        self.assertEqual(subjects, ["disk full", "load high"])
+        runtime._queue.join()
+
+    def test_08_should_drop_permanently_rejected_message(self) -> None:
+        """Skip an e-mail rejected with 552 and keep using the session."""
+        runtime = self.__build_runtime()
+        self.server.reject = b"Subject: too large"
+
+        sent = runtime.process(
+            [
+                self.__message("before"),
+                self.__message("too large"),
+                self.__message("after"),
+            ]
+        )
+
+        subjects = [
+            message_from_bytes(data)["Subject"] for _, _, data in self.server.envelopes
+        ]
+        self.assertEqual(sent, 2)
+        self.assertEqual(subjects, ["before", "after"])
+        self.assertEqual(runtime.pool.connects, 1)
+        self.assertEqual(runtime.deferred, 0)
+        runtime.pool.close()
+
+    def test_09_should_stop_retrying_after_retry_attempts(self) -> None:
+        """Drop a deferred e-mail once it failed `RETRY_ATTEMPTS` retries."""
+        runtime = self.__build_runtime()
+        self.server.shutdown()
+        self.server.server_close()
+
+        runtime.process([self.__message("lost")])
+        for _ in range(runtime.RETRY_ATTEMPTS - 1):
+            runtime.process([], force=True)
+            self.assertEqual(runtime.deferred, 1)
+        runtime.process([], force=True)
+
+        self.assertEqual(runtime.deferred, 0)
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,161 @@
+# -*- coding: UTF-8 -*-
+"""
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-15
+
+Purpose: Provide regression coverage for the load generator and null sink plugins.
+"""
+
+import time
+import unittest
+
+from queue import Queue
+from typing import Any, Dict
+
+from jsktoolbox.configtool import Config as ConfigTool
+from jsktoolbox.logstool import LoggerClient, LoggerQueue
+
+from libs import AppName
+from libs.com.message import Multipart, ThDispatcher
+from libs.plugins import DispatcherAdapter, PluginContext, PluginHealth, PluginState
+from plugins.nullsink.load import get_plugin_spec as get_nullsink_plugin_spec
+from plugins.nullsink.load import percentile
+from plugins.stress.load import Shape, build_message
+from plugins.stress.load import get_plugin_spec as get_stress_plugin_spec
+
+
+class TestStressPlugins(unittest.TestCase):
+    """Cover generated message shapes and the generator to sink round trip."""
+
+    # #[PRIVATE METHODS]###############################################################
+    def __build_context(
+        self,
+        dispatcher: ThDispatcher,
+        qcom: Queue,
+        instance_name: str,
+        config: Dict[str, Any],
+    ) -> PluginContext:
+        """Build a plugin context bound to a running dispatcher.
+
+        ### Arguments:
+        * dispatcher: ThDispatcher - Dispatcher routing the messages.
+        * qcom: Queue - Dispatcher input queue.
+        * instance_name: str - Runtime instance name.
+        * config: Dict[str, Any] - Plugin configuration.
+
+        ### Returns:
+        PluginContext - Context accepted by the runtime factories.
+        """
+        qlog = LoggerQueue()
+        return PluginContext(
+            app_meta=AppName(app_name="AASd", app_version="2.3.2-DEV"),
+            config=config,
+            config_handler=ConfigTool("/tmp/unused.conf", "AASd", auto_create=True),
+            debug=False,
+            dispatcher=DispatcherAdapter(
+                qcom=qcom, dispatcher=dispatcher, instance_name=instance_name
+            ),
+            instance_name=instance_name,
+            logger=LoggerClient(queue=qlog, name=instance_name),
+            plugin_id=f"test.{instance_name}",
+            plugin_kind="worker",
+            qlog=qlog,
+            verbose=False,
+        )
+
+    # #[PUBLIC METHODS]################################################################
+    def test_01_build_message_should_produce_configured_shapes(self) -> None:
+        """Build single-line, fragmented, multipart and many-recipient messages."""
+        line = build_message(Shape.LINE, 1, "stress", line_size=10)
+        fragments = build_message(Shape.FRAGMENTS, 2, "stress", fragments=5)
+        multipart = build_message(Shape.MULTIPART, 3, "stress", fragments=3)
+        recipients = build_message(Shape.RECIPIENTS, 4, "stress", recipients=7)
+        mixed = [build_message(Shape.MIXED, idx, "stress") for idx in range(4)]
+
+        self.assertEqual(line.messages, ["stress 1 s"])
+        self.assertEqual(len(fragments.messages), 5)
+        self.assertIsNotNone(multipart.mmessages)
+        self.assertEqual(len(multipart.mmessages[Multipart.PLAIN]), 3)  # type: ignore[index]
+        self.assertTrue(multipart.mmessages[Multipart.HTML][0].startswith("<p>"))  # type: ignore[index]
+        self.assertEqual(len(recipients.to or []), 7)
+        self.assertIn("seq=4 sent=", recipients.subject or "")
+        self.assertEqual(
+            [(item.subject or "").split()[1] for item in mixed],
+            [Shape.LINE, Shape.FRAGMENTS, Shape.MULTIPART, Shape.RECIPIENTS],
+        )
+        self.assertEqual(percentile([1.0, 2.0, 3.0, 4.0], 0.5), 3.0)
+        self.assertEqual(percentile([], 0.99), 0.0)
+
+    def test_02_sink_should_count_generated_messages_and_latency(self) -> None:
+        """Deliver every generated message to the sink with a measured latency."""
+        qlog = LoggerQueue()
+        qcom: Queue = Queue()
+        dispatcher = ThDispatcher(qlog=qlog, qcom=qcom, debug=False, verbose=False)
+        dispatcher.start()
+        sink = get_nullsink_plugin_spec().runtime_factory(
+            self.__build_context(
+                dispatcher, qcom, "nullsink", {"channel": 900, "report_interval": 0}
+            )
+        )
+        stress = get_stress_plugin_spec().runtime_factory(
+            self.__build_context(
+                dispatcher,
+                qcom,
+                "stress",
+                {
+                    "target_channels": [900, ""],
+                    "rate": 0,
+                    "count": 200,
+                    "shape": Shape.MIXED,
+                    "fragments": 3,
+                    "recipients": 3,
+                    "line_size": 20,
+                },
+            )
+        )
+        try:
+            sink.initialize()
+            stress.initialize()
+            sink.start()
+            stress.start()
+            stress.join(timeout=5.0)
+            deadline = time.monotonic() + 5.0
+            while sink.received < 200 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            latencies = list(sink.latencies)
+        finally:
+            stress.stop(timeout=2.0)
+            sink.stop(timeout=2.0)
+            dispatcher.stop()
+            dispatcher.join(timeout=2.0)
+
+        self.assertEqual(stress.state().state, PluginState.STOPPED)
+        self.assertIn("published=200", stress.health().message or "")
+        self.assertEqual(sink.received, 200)
+        self.assertEqual(len(latencies), 200)
+        self.assertTrue(all(value >= 0 for value in latencies))
+        self.assertEqual(sink.health().health, PluginHealth.HEALTHY)
+        self.assertIn("total=200", sink.health().message or "")
+
+    def test_03_stress_should_stay_idle_without_targets(self) -> None:
+        """Publish nothing until target channels are configured."""
+        qcom: Queue = Queue()
+        dispatcher = ThDispatcher(
+            qlog=LoggerQueue(), qcom=qcom, debug=False, verbose=False
+        )
+        stress = get_stress_plugin_spec().runtime_factory(
+            self.__build_context(
+                dispatcher, qcom, "stress_idle", {"target_channels": [""]}
+            )
+        )
+        stress.initialize()
+        stress.start()
+        time.sleep(0.05)
+        stress.stop(timeout=2.0)
+
+        self.assertTrue(qcom.empty())
+        self.assertEqual(stress.state().state, PluginState.STOPPED)
+        self.assertIn("idle", stress.health().message or "")
+
+
+# #[EOF]#######################################################################
@@ -0,0 +1,294 @@
+# -*- coding: UTF-8 -*-
+"""
+Author:  Jacek 'Szumak' Kotlarski --<szumak@virthost.pl>
+Created: 2026-04-10
+
+Purpose: Provide regression coverage for the ZFS snapshot worker plugin.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+from queue import Queue
+from typing import Any, Dict, List
+from unittest.mock import MagicMock
+
+from jsktoolbox.configtool import Config as ConfigTool
+from jsktoolbox.logstool import LoggerClient, LoggerQueue
+
+from libs import AppName
+from libs.com.message import ThDispatcher
+from libs.plugins import DispatcherAdapter, PluginContext
+from plugins.zfssnapshot.load import ZfsEntry, ZfsInventory, get_plugin_spec
+
+_FAKE_ZFS: str = """#!{python}
+import json
+import sys
+
+STATE = {state!r}
+with open(STATE) as file:
+    state = json.load(file)
+args = sys.argv[1:]
+state["calls"].append(args)
+entries = state["entries"]
+recursive = "-r" in args
+params = [item for item in args[1:] if item != "-r"]
+
+
+def datasets(root):
+    return [
+        item[0]
+        for item in entries
+        if "@" not in item[0]
+        and (item[0] == root or (recursive and item[0].startswith(root + "/")))
+    ]
+
+
+if args[0] == "list":
+    for item in sorted(entries, key=lambda item: item[4]):
+        print("\\t".join(str(field) for field in item))
+elif args[0] == "snapshot":
+    txg = max(item[4] for item in entries) + 1
+    for name in params:
+        if any(item[0] == name for item in entries):
+            sys.stderr.write("cannot create snapshot '%s': dataset already exists\\n" % name)
+            sys.exit(1)
+    for name in params:
+        root, snap = name.split("@")
+        for dataset in datasets(root):
+            entries.append([dataset + "@" + snap, 0, "-", "-", txg])
+elif args[0] == "destroy":
+    root, specs = params[0].split("@")
+    for dataset in datasets(root):
+        for spec in specs.split(","):
+            first, _, last = spec.partition("%")
+            snaps = sorted(
+                [item for item in entries if item[0].startswith(dataset + "@")],
+                key=lambda item: item[4],
+            )
+            names = [item[0].split("@")[1] for item in snaps]
+            if first not in names:
+                continue
+            for item in snaps[names.index(first) : names.index(last or first) + 1]:
+                entries.remove(item)
+with open(STATE, "w") as file:
+    json.dump(state, file)
+"""
+
+
+class TestZfsSnapshotPlugin(unittest.TestCase):
+    """Cover batched zfs calls against a fake `zfs` binary."""
+
+    def setUp(self) -> None:
+        """Install a fake `zfs` binary backed by a JSON pool description."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.state = os.path.join(self.tmp.name, "state.json")
+        self.zfs = os.path.join(self.tmp.name, "zfs")
+        with open(self.zfs, "w") as file:
+            file.write(_FAKE_ZFS.format(python=sys.executable, state=self.state))
+        os.chmod(self.zfs, 0o755)
+        self.__write_state(
+            [
+                ["tank", 600, 400, "/tank", 1],
+                ["tank/a", 100, 400, "/data/a", 2],
+                ["tank/a/child", 10, 400, "/data/a/child", 3],
+                ["tank/b", 100, 400, "/data/b", 4],
+                ["tank/other", 100, 400, "/data/other", 5],
+                ["tank/a@20260101-000000", 1, "-", "-", 10],
+                ["tank/a@20260101-010000", 1, "-", "-", 11],
+                ["tank/a@manual", 1, "-", "-", 12],
+                ["tank/a@20260101-020000", 1, "-", "-", 13],
+                ["tank/a@20260101-030000", 1, "-", "-", 14],
+                ["tank/other@20260101-000000", 1, "-", "-", 15],
+            ]
+        )
+
+    def tearDown(self) -> None:
+        """Remove the fake binary and its state."""
+        self.tmp.cleanup()
+
+    # #[PRIVATE METHODS]###############################################################
+    def __write_state(self, entries: List[List[Any]]) -> None:
+        """Store the fake pool entries and reset the call log."""
+        with open(self.state, "w") as file:
+            json.dump({"calls": [], "entries": entries}, file)
+
+    def __read_state(self) -> Dict[str, Any]:
+        """Return the fake pool entries and the recorded calls."""
+        with open(self.state) as file:
+            return json.load(file)
+
+    def __build_runtime(self, **config: Any) -> Any:
+        """Build a runtime bound to the fake `zfs` binary."""
+        qlog = LoggerQueue()
+        qcom: Queue = Queue()
+        dispatcher = ThDispatcher(qlog=qlog, qcom=qcom, debug=False, verbose=False)
+        context = PluginContext(
+            app_meta=AppName(app_name="AASd", app_version="2.4.19-DEV"),
+            config={
+                "message_channel": [1],
+                "volumes": ["/data/a", "tank/b"],
+                "snapshot_interval": "1h",
+                "max_snapshot_count": 2,
+                "min_free_space": 20,
+                "recursive": False,
+                "zfs_command": self.zfs,
+                **config,
+            },
+            config_handler=ConfigTool("/tmp/unused.conf", "AASd", auto_create=True),
+            debug=False,
+            dispatcher=DispatcherAdapter(qcom=qcom, dispatcher=dispatcher),
+            instance_name="zfssnapshot",
+            logger=LoggerClient(queue=qlog, name="zfssnapshot"),
+            plugin_id="test.zfssnapshot",
+            plugin_kind="worker",
+            qlog=qlog,
+            verbose=False,
+        )
+        context.dispatcher.publish = MagicMock()
+        return get_plugin_spec().runtime_factory(context)
+
+    # #[PUBLIC METHODS]################################################################
+    def test_01_inventory_should_keep_only_relevant_entries(self) -> None:
+        """Resolve mount points and skip datasets that are not configured."""
+        inventory = ZfsInventory()
+        lines = [
+            "tank\t600\t400\t/tank\t1\n",
+            "tank/a\t100\t400\t/data/a\t2\n",
+            "tank/other\t100\t400\t/data/other\t3\n",
+            "tank/a@x\t1\t-\t-\t4\n",
+            "tank/other@x\t1\t-\t-\t5\n",
+            "garbage line\n",
+        ]
+
+        self.assertEqual(inventory.feed(lines, ["/data/a"], False), 5)
+
+        self.assertEqual(inventory.resolve("/data/a"), "tank/a")
+        self.assertEqual(sorted(inventory.datasets), ["tank", "tank/a"])
+        self.assertEqual(list(inventory.snapshots), ["tank/a"])
+        self.assertEqual(inventory.free_space("tank/a"), 40)
+
+    def test_02_expired_ranges_should_not_span_foreign_snapshots(self) -> None:
+        """Split `%` ranges around snapshots not created by the plugin."""
+        names = ["20260101-000000", "20260101-010000", "manual", "20260101-020000"]
+        names += ["20260101-030000", "20260101-040000"]
+        snapshots = [
+            ZfsEntry(name=f"tank/a@{name}", used=1, available=None, mountpoint=None, createtxg=idx)
+            for idx, name in enumerate(names)
+        ]
+        runtime = self.__build_runtime()
+
+        self.assertEqual(
+            runtime.expired_ranges(snapshots, 1),
+            ["20260101-000000%20260101-010000", "20260101-020000%20260101-030000"],
+        )
+        self.assertEqual(runtime.expired_ranges(snapshots, 5), [])
+
+    def test_03_cycle_should_batch_zfs_calls(self) -> None:
+        """Use one list, one snapshot per pool, and one destroy per volume."""
+        runtime = self.__build_runtime()
+
+        self.assertTrue(runtime.cycle(snapshot_name="20260102-000000"))
+
+        state = self.__read_state()
+        self.assertEqual(
+            state["calls"],
+            [
+                ["list", "-Hp", "-o", "name,used,avail,mountpoint,createtxg", "-s", "createtxg", "-t", "all"],
+                ["snapshot", "tank/a@20260102-000000", "tank/b@20260102-000000"],
+                ["destroy", "tank/a@20260101-000000%20260101-010000,20260101-020000"],
+            ],
+        )
+        names = sorted(item[0] for item in state["entries"] if "@" in item[0])
+        self.assertEqual(
+            names,
+            [
+                "tank/a@20260101-030000",
+                "tank/a@20260102-000000",
+                "tank/a@manual",
+                "tank/b@20260102-000000",
+                "tank/other@20260101-000000",
+            ],
+        )
+
+    def test_04_cycle_should_use_recursive_forms(self) -> None:
+        """Pass `-r` to snapshot and destroy calls in recursive mode."""
+        runtime = self.__build_runtime(volumes=["tank/a"], recursive=True)
+
+        self.assertTrue(runtime.cycle(snapshot_name="20260102-000000"))
+
+        state = self.__read_state()
+        self.assertEqual(state["calls"][1], ["snapshot", "-r", "tank/a@20260102-000000"])
+        self.assertEqual(state["calls"][2][:2], ["destroy", "-r"])
+        self.assertIn(
+            "tank/a/child@20260102-000000", [item[0] for item in state["entries"]]
+        )
+
+    def test_04a_recursive_destroy_should_keep_child_snapshots(self) -> None:
+        """Split ranges around snapshots kept only on a descendant dataset."""
+        self.__write_state(
+            [
+                ["tank", 600, 400, "/tank", 1],
+                ["tank/a", 100, 400, "/data/a", 2],
+                ["tank/a/child", 10, 400, "/data/a/child", 3],
+                ["tank/a@20260101-000000", 1, "-", "-", 10],
+                ["tank/a/child@20260101-000000", 1, "-", "-", 10],
+                ["tank/a/child@operator", 1, "-", "-", 11],
+                ["tank/a@20260101-010000", 1, "-", "-", 12],
+                ["tank/a/child@20260101-010000", 1, "-", "-", 12],
+                ["tank/a@20260101-020000", 1, "-", "-", 13],
+                ["tank/a/child@20260101-020000", 1, "-", "-", 13],
+            ]
+        )
+        runtime = self.__build_runtime(
+            volumes=["tank/a"], recursive=True, max_snapshot_count=1
+        )
+
+        self.assertTrue(runtime.cycle(snapshot_name="20260102-000000"))
+
+        state = self.__read_state()
+        self.assertEqual(
+            state["calls"][2],
+            ["destroy", "-r", "tank/a@20260101-000000,20260101-010000%20260101-020000"],
+        )
+        self.assertEqual(
+            sorted(item[0] for item in state["entries"] if "@" in item[0]),
+            [
+                "tank/a/child@20260102-000000",
+                "tank/a/child@operator",
+                "tank/a@20260102-000000",
+            ],
+        )
+
+    def test_05_cycle_should_skip_and_notify_on_low_free_space(self) -> None:
+        """Publish a warning instead of snapshotting a nearly full pool."""
+        runtime = self.__build_runtime(min_free_space=50)
+
+        self.assertTrue(runtime.cycle(snapshot_name="20260102-000000"))
+
+        state = self.__read_state()
+        self.assertEqual([call[0] for call in state["calls"]], ["list"])
+        runtime._context.dispatcher.publish.assert_called_once()
+
+    def test_06_cycle_should_report_zfs_failures(self) -> None:
+        """Return `False` when the snapshot already exists in the pool."""
+        runtime = self.__build_runtime(volumes=["tank/b"])
+
+        self.assertTrue(runtime.cycle(snapshot_name="20260102-000000"))
+        os.chmod(self.zfs, 0o644)
+
+        self.assertFalse(runtime.cycle(snapshot_name="20260102-010000"))
+
+    def test_07_cycle_should_skip_empty_volume_list(self) -> None:
+        """Treat the default `volumes = []`, read as `['']`, as no volumes."""
+        runtime = self.__build_runtime(volumes=[""])
+
+        self.assertTrue(runtime.cycle(snapshot_name="20260102-000000"))
+
+        self.assertEqual(self.__read_state()["calls"], [])
+
+
+# #[EOF]#######################################################################
@@ -13,9 +13,16 @@ from typing import List, Optional
 from unittest.mock import PropertyMock, patch
 
 from jsktoolbox.configtool import Config as ConfigTool
-from jsktoolbox.logstool import LoggerClient, LoggerQueue, ThLoggerProcessor
+from jsktoolbox.logstool import (
+    LoggerClient,
+    LoggerEngine,
+    LoggerQueue,
+    ThLoggerProcessor,
+)
 
 from libs import AppConfig, AppName, Keys
+from libs.com.message import Message
+from libs.tools import BoundedLoggerQueue, ConfigChangeSet
 from libs.plugins import (
     PluginConfigParser,
     PluginDefinition,
@@ -91,6 +98,23 @@ class _FakeRuntime(object):
         self._stopped = True
 
 
+class _ReconfigurableRuntime(_FakeRuntime):
+    """Accept config snapshots swapped in place."""
+
+    # #[PUBLIC METHODS]#############################################################
+    def reconfigure(self, config) -> bool:
+        """Record the offered snapshot and accept it.
+
+        ### Arguments:
+        * config: Mapping[str, Any] - New config snapshot.
+
+        ### Returns:
+        bool - Always `True`.
+        """
+        self.offered = config
+        return True
+
+
 class _BrokenInitializeRuntime(_FakeRuntime):
     """Raise during initialization to simulate startup isolation."""
 
@@ -652,5 +676,400 @@ class TestServerDaemonPlugins(unittest.TestCase):
         start_mock.assert_not_called()
         stop_mock.assert_not_called()
 
+    def test_10_hup_should_keep_subsystems_when_config_is_unchanged(self) -> None:
+        """Skip the subsystem restart when reload reports no section changes."""
+        self.__assert_hup_restart(ConfigChangeSet(), expected_restarts=0)
+
+    def test_11_hup_should_restart_subsystems_when_config_changed(self) -> None:
+        """Restart subsystems when reload reports changed sections."""
+        self.__assert_hup_restart(
+            ConfigChangeSet(changed=["worker_plugin"]), expected_restarts=1
+        )
+
+    def test_12_restart_should_only_restart_affected_instances(self) -> None:
+        """Restart selected instances while others and the dispatcher keep running."""
+        cfg = ConfigTool(
+            str(Path("/tmp/aasd-daemon-test.conf")), "AASd", auto_create=True
+        )
+        cfg.set("aasd", varname="debug", value=False)
+        order: List[str] = []
+        runtimes: List[_FakeRuntime] = []
+        schema = PluginConfigSchema(title="Test plugin.", fields=[])
+
+        def _factory(name: str, kind: str) -> PluginDefinition:
+            def _runtime(_context):
+                runtime = _FakeRuntime(order, name)
+                runtimes.append(runtime)
+                return runtime
+
+            return PluginDefinition(
+                instance_name=name,
+                plugin_path=Path(f"/tmp/{name}"),
+                spec=PluginSpec(
+                    api_version=1,
+                    config_schema=schema,
+                    plugin_id=f"test.{name}",
+                    plugin_kind=kind,
+                    plugin_name=name,
+                    runtime_factory=_runtime,
+                ),
+            )
+
+        plugins = [
+            _factory("comm_plugin", PluginKind.COMMUNICATION),
+            _factory("worker_plugin", PluginKind.WORKER),
+        ]
+        app_conf = AppConfig(qlog=LoggerQueue(), app_name="AASd")
+        app_conf.config_file = str(Path("/tmp/aasd-daemon-test.conf"))
+        app_conf._cfh = cfg
+        app_meta = AppName(app_name="AASd", app_version="2.4.16-DEV")
+        logs = LoggerClient(queue=LoggerQueue(), name="AASd")
+
+        with patch.object(
+            AppConfig,
+            "get_plugins",
+            new_callable=PropertyMock,
+            return_value=plugins,
+        ), patch.object(
+            PluginConfigParser, "parse", return_value={}
+        ), patch(
+            "libs.plugins.service.time.sleep", return_value=None
+        ):
+            report = PluginRegistryService.start(
+                conf=app_conf, app_meta=app_meta, logs=logs
+            )
+            dispatch = report.dispatch
+            PluginRegistryService.restart(
+                report=report,
+                conf=app_conf,
+                app_meta=app_meta,
+                logs=logs,
+                instances=["worker_plugin"],
+            )
+
+        self.assertIs(report.dispatch, dispatch)
+        self.assertEqual(order, ["comm_plugin", "worker_plugin", "worker_plugin"])
+        self.assertEqual(runtimes[0].stop_calls, 0)
+        self.assertEqual(runtimes[1].stop_calls, 1)
+        self.assertIs(report.runtimes["worker_plugin"], runtimes[2])
+        self.assertEqual(len(report.managed_runtimes), 2)
+        self.assertEqual(report.started, ["comm_plugin", "worker_plugin"])
+        PluginRegistryService.stop(report=report, logs=logs)
+
+    def test_13_hup_should_restart_only_changed_plugin_instances(self) -> None:
+        """Delegate plugin-only changes to the partial restart path."""
+        obj = AASd.__new__(AASd)
+        obj.logs = LoggerClient(queue=LoggerQueue(), name="AASd")
+        obj.application = AppName(app_name="AASd", app_version="2.4.16-DEV")
+        obj._set_data(
+            key=Keys.CONF, value=AppConfig(qlog=LoggerQueue(), app_name="AASd")
+        )
+        report = PluginServiceReport(dispatch=object())  # type: ignore[arg-type]
+
+        with patch.object(
+            AppConfig,
+            "last_changes",
+            new_callable=PropertyMock,
+            return_value=ConfigChangeSet(changed=["worker_plugin"]),
+        ), patch.object(
+            PluginRegistryService, "restart", return_value=report
+        ) as restart_mock, patch.object(
+            AASd,
+            "_AASd__stop_subsystem",
+            side_effect=AssertionError("full restart must not be called"),
+        ):
+            out = obj._AASd__apply_changes(report, ["new_plugin"])
+
+        self.assertIs(out, report)
+        self.assertEqual(
+            restart_mock.call_args.kwargs["instances"],
+            ["new_plugin", "worker_plugin"],
+        )
+        self.assertEqual(
+            restart_mock.call_args.kwargs["reconfigure"], ["worker_plugin"]
+        )
+
+    def test_14_watcher_callback_should_request_reload(self) -> None:
+        """Collect changed plugin entries and set the reload flag."""
+        obj = AASd.__new__(AASd)
+        obj.logs = LoggerClient(queue=LoggerQueue(), name="AASd")
+        obj.hup = False
+        conf = AppConfig(qlog=LoggerQueue(), app_name="AASd")
+        conf.plugins_dir = "/tmp/aasd-plugins"
+        obj._set_data(key=Keys.CONF, value=conf)
+
+        obj._AASd__on_watched_change(
+            ["/tmp/aasd.conf", "/tmp/aasd-plugins/demo"]
+        )
+
+        self.assertTrue(obj.hup)
+        self.assertEqual(obj._AASd__pop_watched_entries(), ["demo"])
+        self.assertEqual(obj._AASd__pop_watched_entries(), [])
+
+    def test_14a_watcher_callbacks_should_accumulate_entries(self) -> None:
+        """Keep entries across consecutive callbacks and after a pop."""
+        obj = AASd.__new__(AASd)
+        obj.logs = LoggerClient(queue=LoggerQueue(), name="AASd")
+        obj.hup = False
+        conf = AppConfig(qlog=LoggerQueue(), app_name="AASd")
+        conf.plugins_dir = "/tmp/aasd-plugins"
+        obj._set_data(key=Keys.CONF, value=conf)
+
+        obj._AASd__on_watched_change(["/tmp/aasd-plugins/first"])
+        obj._AASd__on_watched_change(["/tmp/aasd-plugins/second"])
+        self.assertEqual(obj._AASd__pop_watched_entries(), ["first", "second"])
+
+        obj._AASd__on_watched_change(["/tmp/aasd-plugins/third"])
+        obj._AASd__on_watched_change(["/tmp/aasd-plugins/fourth"])
+        self.assertEqual(obj._AASd__pop_watched_entries(), ["third", "fourth"])
+
+    def test_14b_log_queue_should_follow_main_section_limits(self) -> None:
+        """Apply configured logging limits and skip unknown exempt levels."""
+        obj = AASd.__new__(AASd)
+        queue = BoundedLoggerQueue()
+        engine = LoggerEngine()
+        engine.logs_queue = queue
+        processor = ThLoggerProcessor()
+        processor.logger_engine = engine
+        obj.logs_processor = processor
+        obj.logs = LoggerClient(queue=LoggerQueue(), name="AASd")
+        obj._set_data(
+            key=Keys.CONF, value=AppConfig(qlog=LoggerQueue(), app_name="AASd")
+        )
+
+        with patch.object(
+            AppConfig, "log_queue_size", new_callable=PropertyMock, return_value=50
+        ), patch.object(
+            AppConfig, "log_rate", new_callable=PropertyMock, return_value=2.0
+        ), patch.object(
+            AppConfig, "log_burst", new_callable=PropertyMock, return_value=5
+        ), patch.object(
+            AppConfig,
+            "log_rate_exempt",
+            new_callable=PropertyMock,
+            return_value=["CRITICAL", "FATAL"],
+        ):
+            obj._AASd__init_log_queue()
+
+        self.assertEqual(queue.maxsize, 50)
+        self.assertEqual(queue.rate, 2.0)
+        self.assertEqual(queue.burst, 5)
+        self.assertEqual(queue.exempt_levels, ("CRITICAL",))
+        self.assertIn("FATAL", str(obj.logs.logs_queue.get()))
+
+        obj._AASd__init_log_queue()
+        self.assertEqual(queue.exempt_levels, BoundedLoggerQueue.EXEMPT_LEVELS)
+
+    def test_15_registry_should_apply_publish_limits_from_host_keys(self) -> None:
+        """Build rate-limited adapters from `publish_rate` and `publish_burst`."""
+        cfg = ConfigTool(
+            str(Path("/tmp/aasd-daemon-test.conf")), "AASd", auto_create=True
+        )
+        cfg.set("aasd", varname="debug", value=False)
+        cfg.set("limited", varname="publish_rate", value=2)
+        cfg.set("limited", varname="publish_burst", value=3)
+        cfg.set("bad_limit", varname="publish_rate", value="fast")
+        schema = PluginConfigSchema(title="Test plugin.", fields=[])
+        order: List[str] = []
+        plugins = [
+            PluginDefinition(
+                instance_name=name,
+                plugin_path=Path(f"/tmp/{name}"),
+                spec=PluginSpec(
+                    api_version=1,
+                    config_schema=schema,
+                    plugin_id=f"test.{name}",
+                    plugin_kind=PluginKind.WORKER,
+                    plugin_name=name,
+                    runtime_factory=lambda _context, name=name: _FakeRuntime(
+                        order, name
+                    ),
+                ),
+            )
+            for name in ("limited", "bad_limit", "free")
+        ]
+        app_conf = AppConfig(qlog=LoggerQueue(), app_name="AASd")
+        app_conf.config_file = str(Path("/tmp/aasd-daemon-test.conf"))
+        app_conf._cfh = cfg
+        logs = LoggerClient(queue=LoggerQueue(), name="AASd")
+
+        with patch.object(
+            AppConfig,
+            "get_plugins",
+            new_callable=PropertyMock,
+            return_value=plugins,
+        ), patch.object(
+            PluginConfigParser, "parse", return_value={}
+        ), patch(
+            "libs.plugins.service.time.sleep", return_value=None
+        ):
+            report = PluginRegistryService.start(
+                conf=app_conf,
+                app_meta=AppName(app_name="AASd", app_version="2.4.24-DEV"),
+                logs=logs,
+            )
+
+        adapter = report.adapters["limited"]
+        self.assertEqual(adapter.publish_rate, 2.0)
+        self.assertEqual(
+            [adapter.publish(Message()) for _ in range(4)], [True, True, True, False]
+        )
+        self.assertEqual((adapter.published, adapter.throttled), (3, 1))
+        self.assertEqual(report.adapters["bad_limit"].publish_rate, 0.0)
+        self.assertEqual(report.adapters["free"].publish_rate, 0.0)
+        PluginRegistryService.stop(report=report, logs=logs)
+
+    def test_16_restart_should_swap_config_snapshot_in_place(self) -> None:
+        """Swap snapshots into reconfigurable runtimes unless a field needs restart."""
+        cfg = ConfigTool(
+            str(Path("/tmp/aasd-daemon-test.conf")), "AASd", auto_create=True
+        )
+        cfg.set("aasd", varname="debug", value=False)
+        cfg.set("worker_plugin", varname="sleep_period", value="60")
+        cfg.set("worker_plugin", varname="hosts", value=["10.0.0.1"])
+        schema = PluginConfigSchema(
+            title="Test plugin.",
+            fields=[
+                PluginConfigField(
+                    name="sleep_period",
+                    field_type=str,
+                    default="60",
+                    required=True,
+                    description="Sleep period.",
+                ),
+                PluginConfigField(
+                    name="hosts",
+                    field_type=list,
+                    default=[],
+                    required=True,
+                    restart_required=True,
+                    description="Hosts.",
+                ),
+            ],
+        )
+        order: List[str] = []
+        runtimes: List[_FakeRuntime] = []
+        contexts: list = []
+
+        def _runtime(context):
+            contexts.append(context)
+            runtimes.append(_ReconfigurableRuntime(order, "worker_plugin"))
+            return runtimes[-1]
+
+        plugins = [
+            PluginDefinition(
+                instance_name="worker_plugin",
+                plugin_path=Path("/tmp/worker_plugin"),
+                spec=PluginSpec(
+                    api_version=1,
+                    config_schema=schema,
+                    plugin_id="test.worker_plugin",
+                    plugin_kind=PluginKind.WORKER,
+                    plugin_name="worker_plugin",
+                    runtime_factory=_runtime,
+                ),
+            )
+        ]
+        app_conf = AppConfig(qlog=LoggerQueue(), app_name="AASd")
+        app_conf.config_file = str(Path("/tmp/aasd-daemon-test.conf"))
+        app_conf._cfh = cfg
+        app_meta = AppName(app_name="AASd", app_version="2.4.31-DEV")
+        logs = LoggerClient(queue=LoggerQueue(), name="AASd")
+
+        with patch.object(
+            AppConfig,
+            "get_plugins",
+            new_callable=PropertyMock,
+            return_value=plugins,
+        ), patch("libs.plugins.service.time.sleep", return_value=None):
+            report = PluginRegistryService.start(
+                conf=app_conf, app_meta=app_meta, logs=logs
+            )
+            first = contexts[0].config
+            self.assertEqual(first.hosts, ("10.0.0.1",))
+
+            cfg.set("worker_plugin", varname="sleep_period", value="5")
+            PluginRegistryService.restart(
+                report=report,
+                conf=app_conf,
+                app_meta=app_meta,
+                logs=logs,
+                instances=["worker_plugin"],
+                reconfigure=["worker_plugin"],
+            )
+            self.assertEqual(len(runtimes), 1)
+            self.assertEqual(runtimes[0].stop_calls, 0)
+            self.assertIs(contexts[0].config, runtimes[0].offered)
+            self.assertEqual(contexts[0].config.sleep_period, "5")
+            self.assertEqual(first.sleep_period, "60")
+
+            cfg.set("worker_plugin", varname="hosts", value=["10.0.0.2"])
+            PluginRegistryService.restart(
+                report=report,
+                conf=app_conf,
+                app_meta=app_meta,
+                logs=logs,
+                instances=["worker_plugin"],
+                reconfigure=["worker_plugin"],
+            )
+
+        self.assertEqual(runtimes[0].stop_calls, 1)
+        self.assertEqual(len(runtimes), 2)
+        self.assertIs(report.contexts["worker_plugin"], contexts[1])
+        self.assertEqual(contexts[1].config.hosts, ("10.0.0.2",))
+        PluginRegistryService.stop(report=report, logs=logs)
+
+    # #[PRIVATE METHODS]###############################################################
+    def __assert_hup_restart(
+        self, changes: ConfigChangeSet, expected_restarts: int
+    ) -> None:
+        """Drive one `SIGHUP` cycle through `run()` and count restarts.
+
+        ### Arguments:
+        * changes: ConfigChangeSet - Change set reported by the reload.
+        * expected_restarts: int - Expected number of subsystem restarts.
+        """
+        obj = AASd.__new__(AASd)
+        obj.logs = LoggerClient(queue=LoggerQueue(), name="AASd")
+        obj.logs_processor = _FakeLoggerProcessor()  # type: ignore[assignment]
+        obj.hup = False
+        obj.loop = True
+        obj.application = AppName(app_name="AASd", app_version="2.4.15-DEV")
+        obj._set_data(
+            key=Keys.CONF, value=AppConfig(qlog=LoggerQueue(), app_name="AASd")
+        )
+        ticks: List[int] = []
+
+        def _sleep(_value: float) -> None:
+            ticks.append(1)
+            if len(ticks) == 1:
+                obj.hup = True
+            elif len(ticks) == 2:
+                obj.loop = False
+
+        with patch.object(
+            AASd,
+            "_AASd__start_subsystem",
+            return_value=PluginServiceReport(),
+        ) as start_mock, patch.object(
+            AASd,
+            "_AASd__stop_subsystem",
+            return_value=None,
+        ) as stop_mock, patch.object(
+            AppConfig, "reload", return_value=True
+        ), patch.object(
+            AppConfig,
+            "last_changes",
+            new_callable=PropertyMock,
+            return_value=changes,
+        ), patch(
+            "server.daemon.time.sleep", side_effect=_sleep
+        ):
+            with self.assertRaises(SystemExit):
+                obj.run()
+
+        self.assertEqual(start_mock.call_count, 1 + expected_restarts)
+        self.assertEqual(stop_mock.call_count, expected_restarts)
+
 
 # #[EOF]#######################################################################